@@ -10,7 +10,10 @@ from src.domain.conf import app_conf
 
 from src.domain.entities.core import IConfEnv
 
-from src.interface.server.components import CheaterBusterRouter
+from src.interface.server.components import (
+    CheaterBusterRouter,
+    app_lifespan,
+)
 
 from src.interface.middleware import LimitUploadSize
 
@@ -20,7 +23,10 @@ from src.interface.handlers import http_exception_handler
 def main() -> FastAPI:
     conf: IConfEnv = app_conf()
 
-    app = FastAPI(**conf.app_config)
+    app = FastAPI(
+        **conf.app_config,
+        lifespan=app_lifespan,
+    )
 
     app_router = CheaterBusterRouter(app, conf)
 
@@ -10,7 +10,10 @@ from src.domain.conf import app_conf
 
 from src.domain.entities.core import IConfEnv
 
-from src.interface.server.components import DashboardRouter
+from src.interface.server.components import (
+    DashboardRouter,
+    app_lifespan,
+)
 
 from src.interface.middleware import LimitUploadSize
 
@@ -18,7 +21,10 @@ from src.interface.middleware import LimitUploadSize
 def main() -> FastAPI:
     conf: IConfEnv = app_conf()
 
-    app = FastAPI(**conf.app_config)
+    app = FastAPI(
+        **conf.app_config,
+        lifespan=app_lifespan,
+    )
 
     app_router = DashboardRouter(app, conf)
 
@@ -1,11 +1,11 @@
 # coding utf-8
 
-from asyncio import run
-
 from celery.schedules import crontab
 
 from src.domain.entities.core import ITask
 
+from src.infrastructure.tasks import run_task
+
 from src.infrastructure.tasks.instagram import InstagramSessionCelery
 
 
@@ -28,6 +28,6 @@ celery.conf.update(
 
 @celery.task(name="instagram.update_sessions_data")
 def update_sessions_data():
-    return run(
+    return run_task(
         app.update_sessions_data(),
     )
@@ -1,11 +1,11 @@
 # coding utf-8
 
-from asyncio import run
-
 from celery.schedules import crontab
 
 from src.domain.entities.core import ITask
 
+from src.infrastructure.tasks import run_task
+
 from src.infrastructure.tasks.instagram import InstagramTrackingCelery
 
 
@@ -22,12 +22,23 @@ celery.conf.update(
             task="instagram.update_tracking_data",
             schedule=crontab(minute="*/5"),
         ).dict,
+        "aggregate_daily_stats": ITask(
+            task="instagram.aggregate_daily_stats",
+            schedule=crontab(minute=30),
+        ).dict,
     },
 )
 
 
 @celery.task(name="instagram.update_tracking_data")
 def update_tracking_data():
-    return run(
+    return run_task(
         app.update_tracking_data(),
     )
+
+
+@celery.task(name="instagram.aggregate_daily_stats")
+def aggregate_daily_stats():
+    return run_task(
+        app.aggregate_daily_stats(),
+    )
@@ -1,11 +1,11 @@
 # coding utf-8
 
-from asyncio import run
-
 from celery.schedules import crontab
 
 from src.domain.entities.core import ITask
 
+from src.infrastructure.tasks import run_task
+
 from src.infrastructure.tasks.pika import PikaAccountCelery
 
 
@@ -28,6 +28,6 @@ celery.conf.update(
 
 @celery.task(name="pika.update_account_balance")
 def update_account_balance():
-    return run(
+    return run_task(
         app.update_accounts(),
     )
@@ -0,0 +1,38 @@
+# coding utf-8
+
+from datetime import timedelta
+
+from src.domain.conf import app_conf
+
+from src.domain.entities.core import ITask
+
+from src.infrastructure.tasks import run_task
+
+from src.infrastructure.tasks.pixverse import PixverseStatusCelery
+
+
+conf = app_conf()
+
+
+app = PixverseStatusCelery()
+
+
+celery = app.celery
+
+celery.conf.update(
+    timezone="UTC",
+    use_timezone=True,
+    beat_schedule={
+        "poll_generation_status": ITask(
+            task="pixverse.poll_generation_status",
+            schedule=timedelta(seconds=conf.pixverse_status_interval),
+        ).dict,
+    },
+)
+
+
+@celery.task(name="pixverse.poll_generation_status")
+def poll_generation_status():
+    return run_task(
+        app.poll_statuses(),
+    )
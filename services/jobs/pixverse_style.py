@@ -1,11 +1,11 @@
 # coding utf-8
 
-from asyncio import run
-
 from celery.schedules import crontab
 
 from src.domain.entities.core import ITask
 
+from src.infrastructure.tasks import run_task
+
 from src.infrastructure.tasks.pixverse import PixverseStyleCelery
 
 
@@ -28,6 +28,6 @@ celery.conf.update(
 
 @celery.task(name="pixverse.clean_style_files")
 def clean_style_files():
-    return run(
+    return run_task(
         app.clean_files(),
     )
@@ -0,0 +1,38 @@
+# coding utf-8
+
+from datetime import timedelta
+
+from src.domain.conf import app_conf
+
+from src.domain.entities.core import ITask
+
+from src.infrastructure.tasks import run_task
+
+from src.infrastructure.tasks.wan import WanJobCelery
+
+
+conf = app_conf()
+
+
+app = WanJobCelery()
+
+
+celery = app.celery
+
+celery.conf.update(
+    timezone="UTC",
+    use_timezone=True,
+    beat_schedule={
+        "poll_generation_jobs": ITask(
+            task="wan.poll_generation_jobs",
+            schedule=timedelta(seconds=conf.wan_job_interval),
+        ).dict,
+    },
+)
+
+
+@celery.task(name="wan.poll_generation_jobs")
+def poll_generation_jobs():
+    return run_task(
+        app.poll_jobs(),
+    )
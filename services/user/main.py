@@ -10,13 +10,19 @@ from src.domain.conf import app_conf
 
 from src.domain.entities.core import IConfEnv
 
-from src.interface.server.components import UserRouter
+from src.interface.server.components import (
+    UserRouter,
+    app_lifespan,
+)
 
 
 def main() -> FastAPI:
     conf: IConfEnv = app_conf()
 
-    app = FastAPI(**conf.app_config)
+    app = FastAPI(
+        **conf.app_config,
+        lifespan=app_lifespan,
+    )
     app_router = UserRouter(app, conf)
 
     app.add_middleware(
@@ -138,6 +138,9 @@ WAN_ERROR = {
     9006: (status.HTTP_400_BAD_REQUEST, "Unknown platform error"),
     9001: (status.HTTP_409_CONFLICT, "File extension dosesn't provided"),
     6005: (status.HTTP_404_NOT_FOUND, "Requested generation data not found"),
+    6006: (status.HTTP_404_NOT_FOUND, "Requested job not found or expired"),
+    6007: (status.HTTP_502_BAD_GATEWAY, "Generation failed. Please retry later"),
+    6008: (status.HTTP_400_BAD_REQUEST, "Callback URL is not allowed"),
     4009: (status.HTTP_401_UNAUTHORIZED, "Invalid account credentials provided"),
     4007: (
         status.HTTP_400_BAD_REQUEST,
@@ -194,6 +197,22 @@ TOPMEDIA_ERROR = {
 
 INSTAGRAM_SESSION = "instagram:session:{username}"
 
+PIXVERSE_STATUS = "pixverse:status:{video_id}"
+
+PIXVERSE_PENDING = "pixverse:pending"
+
+# video_status PixVerse, при которых генерация завершилась неудачей
+# (6 — удалена, 7 — не прошла модерацию, 8 — ошибка генерации)
+PIXVERSE_FAILED_STATUSES = {6, 7, 8}
+
+WAN_JOB = "wan:job:{job_id}"
+
+WAN_PENDING = "wan:pending"
+
+INSTAGRAM_PROFILE = "instagram:profile:{kind}:{key}"
+
+UPLOAD_ASSET = "upload:{provider}:{account_id}:{digest}"
+
 ERROR_TRANSLATIONS = {
     # pixverse errors
     "Invalid req": "Некорректный запрос",
@@ -274,6 +293,12 @@ ALLOWED_MIME_TYPES = {
 
 HEIF_EXTENSIONS = {".heic", ".heif"}
 
+IMAGE_FORMATS = {
+    "JPEG": (".jpg", "image/jpeg"),
+    "PNG": (".png", "image/png"),
+    "WEBP": (".webp", "image/webp"),
+}
+
 UPLOAD_DIR = "uploads"
 
 BODY_TOYBOX_PROMT = """
@@ -658,6 +683,22 @@ SUBTITLE_COMMAND = [
     "{output_path}",
 ]
 
+# декодирование аудиофайла в PCM (16 бит, моно) в stdout
+PCM_DECODE_COMMAND = [
+    "ffmpeg",
+    "-v",
+    "error",
+    "-i",
+    "{input_path}",
+    "-f",
+    "s16le",
+    "-ac",
+    "1",
+    "-ar",
+    "{sample_rate}",
+    "pipe:1",
+]
+
 BASE_STATIC_DIR = "uploads"
 
 FILES_PATTERN = {
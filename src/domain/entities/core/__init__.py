@@ -10,6 +10,8 @@ from .error import IError
 
 from .engine import IEngine
 
+from .pool import IPoolMetrics
+
 from .repository import IRepository
 
 from .table import ITable
@@ -28,6 +30,7 @@ __all__: list[str] = [
     "IOpenAPI",
     "IError",
     "IEngine",
+    "IPoolMetrics",
     "IRepository",
     "ITable",
     "ITask",
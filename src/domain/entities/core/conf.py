@@ -64,6 +64,66 @@ class IConfEnv(BaseSettings):
         Field(...),
     ]
 
+    database_replica_dsn_url: Annotated[
+        str | None,
+        Field(default=None),
+    ]
+    """DSN реплики базы данных для чтения.
+
+    Тип:
+        str | None
+    Значение по умолчанию:
+        None (роль replica использует основной пул)
+    """
+
+    database_pool_size: Annotated[
+        int,
+        Field(default=10),
+    ]
+    """Размер общего пула соединений к базе данных на процесс.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        10
+    """
+
+    database_max_overflow: Annotated[
+        int,
+        Field(default=20),
+    ]
+    """Количество дополнительных соединений сверх размера пула.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        20
+    """
+
+    database_pool_timeout: Annotated[
+        int,
+        Field(default=30),
+    ]
+    """Время ожидания свободного соединения из пула (в секундах).
+
+    Тип:
+        int
+    Значение по умолчанию:
+        30
+    """
+
+    database_pool_recycle: Annotated[
+        int,
+        Field(default=60),
+    ]
+    """Время жизни соединения в пуле до переподключения (в секундах).
+
+    Тип:
+        int
+    Значение по умолчанию:
+        60
+    """
+
     rabbitmq_dsn_url: Annotated[
         str,
         Field(...),
@@ -107,6 +167,548 @@ class IConfEnv(BaseSettings):
         Field(...),
     ]
 
+    http_max_connections: Annotated[
+        int,
+        Field(default=100),
+    ]
+    """Максимальное число одновременных соединений на один базовый URL.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        100
+    """
+
+    http_max_keepalive_connections: Annotated[
+        int,
+        Field(default=20),
+    ]
+    """Число keep-alive соединений, удерживаемых в пуле на один базовый URL.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        20
+    """
+
+    http_keepalive_expiry: Annotated[
+        float,
+        Field(default=30.0),
+    ]
+    """Время жизни простаивающего keep-alive соединения (в секундах).
+
+    Тип:
+        float
+    Значение по умолчанию:
+        30.0
+    """
+
+    http_2: Annotated[
+        bool,
+        Field(default=False),
+    ]
+    """Использовать HTTP/2 для внешних API (требуется пакет h2).
+
+    Тип:
+        bool
+    Значение по умолчанию:
+        False
+    """
+
+    circuit_failure_threshold: Annotated[
+        int,
+        Field(default=5),
+    ]
+    """Число ошибок подряд, после которого запросы к внешнему сервису отключаются.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        5
+    """
+
+    circuit_recovery_timeout: Annotated[
+        float,
+        Field(default=30.0),
+    ]
+    """Время до пробного запроса к отключенному внешнему сервису (в секундах).
+
+    Тип:
+        float
+    Значение по умолчанию:
+        30.0
+    """
+
+    circuit_half_open_calls: Annotated[
+        int,
+        Field(default=1),
+    ]
+    """Число одновременных пробных запросов к восстанавливающемуся сервису.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        1
+    """
+
+    bulkhead_max_concurrency: Annotated[
+        int,
+        Field(default=50),
+    ]
+    """Максимум одновременных запросов к одному внешнему сервису на процесс.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        50
+    """
+
+    bulkhead_timeout: Annotated[
+        float,
+        Field(default=5.0),
+    ]
+    """Время ожидания свободного слота для запроса к внешнему сервису (в секундах).
+
+    Тип:
+        float
+    Значение по умолчанию:
+        5.0
+    """
+
+    pixverse_status_interval: Annotated[
+        float,
+        Field(default=5.0),
+    ]
+    """Период опроса статусов генераций PixVerse фоновой задачей (в секундах).
+
+    Тип:
+        float
+    Значение по умолчанию:
+        5.0
+    """
+
+    pixverse_status_window: Annotated[
+        int,
+        Field(default=3600),
+    ]
+    """Сколько секунд после создания генерация PixVerse остается в опросе.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        3600
+    """
+
+    wan_job_interval: Annotated[
+        float,
+        Field(default=2.0),
+    ]
+    """Период опроса статусов задач генерации Wan (в секундах).
+
+    Тип:
+        float
+    Значение по умолчанию:
+        2.0
+    """
+
+    wan_job_timeout: Annotated[
+        float,
+        Field(default=120.0),
+    ]
+    """Сколько секунд блокирующий эндпоинт Wan ждет результат задачи.
+
+    Тип:
+        float
+    Значение по умолчанию:
+        120.0
+    """
+
+    wan_job_ttl: Annotated[
+        int,
+        Field(default=86400),
+    ]
+    """Время хранения задачи генерации Wan и ее результата (в секундах).
+
+    Тип:
+        int
+    Значение по умолчанию:
+        86400
+    """
+
+    speech_max_workers: Annotated[
+        int,
+        Field(default=2),
+    ]
+    """Число одновременных распознаваний faster-whisper (`num_workers`).
+
+    Модель openai-whisper не потокобезопасна и всегда работает в одном
+    потоке.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        2
+    """
+
+    speech_preload: Annotated[
+        list[str],
+        Field(default=[]),
+    ]
+    """Модели распознавания речи, загружаемые при старте ("whisper", "faster_whisper").
+
+    Тип:
+        list[str]
+    Значение по умолчанию:
+        []
+    """
+
+    media_max_processes: Annotated[
+        int,
+        Field(default=2),
+    ]
+    """Максимум одновременно запущенных процессов ffmpeg/ffprobe.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        2
+    """
+
+    media_process_timeout: Annotated[
+        float,
+        Field(default=600.0),
+    ]
+    """Таймаут процесса ffmpeg/ffprobe (в секундах).
+
+    Тип:
+        float
+    Значение по умолчанию:
+        600.0
+    """
+
+    rocket_max_workers: Annotated[
+        int,
+        Field(default=8),
+    ]
+    """Число потоков для одновременных запросов к rocketapi.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        8
+    """
+
+    instagram_tracking_batch: Annotated[
+        int,
+        Field(default=100),
+    ]
+    """Максимум отслеживаний, обновляемых за один запуск фоновой задачи.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        100
+    """
+
+    instagram_tracking_concurrency: Annotated[
+        int,
+        Field(default=4),
+    ]
+    """Максимум одновременно обновляемых отслеживаемых пользователей.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        4
+    """
+
+    instagram_tracking_request_budget: Annotated[
+        int,
+        Field(default=500),
+    ]
+    """Максимум запросов к rocketapi за один запуск обновления отслеживаний.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        500
+    """
+
+    instagram_session_concurrency: Annotated[
+        int,
+        Field(default=4),
+    ]
+    """Максимум одновременно обновляемых сессий Instagram.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        4
+    """
+
+    instagram_session_attempts: Annotated[
+        int,
+        Field(default=3),
+    ]
+    """Максимум попыток обновления одной сессии.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        3
+    """
+
+    instagram_profile_ttl: Annotated[
+        int,
+        Field(default=600),
+    ]
+    """Время жизни профиля Instagram в кэше (сек.).
+
+    Тип:
+        int
+    Значение по умолчанию:
+        600
+    """
+
+    instagram_profile_missing_ttl: Annotated[
+        int,
+        Field(default=120),
+    ]
+    """Время жизни отметки о несуществующем профиле в кэше (сек.).
+
+    Тип:
+        int
+    Значение по умолчанию:
+        120
+    """
+
+    instagram_profile_cache_size: Annotated[
+        int,
+        Field(default=1024),
+    ]
+    """Максимум профилей в кэше процесса.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        1024
+    """
+
+    instagram_profile_redis: Annotated[
+        bool,
+        Field(default=False),
+    ]
+    """Хранить кэш профилей также в Redis (общий для процессов).
+
+    Тип:
+        bool
+    Значение по умолчанию:
+        False
+    """
+
+    instagram_snapshot_retention: Annotated[
+        int,
+        Field(default=14),
+    ]
+    """Сколько последних снимков подписчиков и подписок хранить на пользователя.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        14
+    """
+
+    oss_max_workers: Annotated[
+        int,
+        Field(default=4),
+    ]
+    """Максимум одновременных загрузок в OSS.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        4
+    """
+
+    oss_multipart_threshold: Annotated[
+        int,
+        Field(default=10 * 1024 * 1024),
+    ]
+    """Размер файла, начиная с которого загрузка в OSS идет по частям (байт).
+
+    Тип:
+        int
+    Значение по умолчанию:
+        10485760
+    """
+
+    oss_part_size: Annotated[
+        int,
+        Field(default=5 * 1024 * 1024),
+    ]
+    """Размер части при загрузке в OSS по частям (байт).
+
+    Тип:
+        int
+    Значение по умолчанию:
+        5242880
+    """
+
+    oss_part_workers: Annotated[
+        int,
+        Field(default=4),
+    ]
+    """Максимум одновременно отправляемых частей при загрузке в OSS.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        4
+    """
+
+    upload_cache_ttl: Annotated[
+        int,
+        Field(default=86400),
+    ]
+    """Время жизни записи о загруженном к провайдеру файле (сек.).
+
+    Тип:
+        int
+    Значение по умолчанию:
+        86400
+    """
+
+    upload_cache_url_ttl: Annotated[
+        int,
+        Field(default=900),
+    ]
+    """Время жизни записи о файле, доступном по временной ссылке (сек.).
+
+    Тип:
+        int
+    Значение по умолчанию:
+        900
+    """
+
+    image_max_workers: Annotated[
+        int,
+        Field(default=2),
+    ]
+    """Максимум одновременно обрабатываемых изображений (Pillow).
+
+    Тип:
+        int
+    Значение по умолчанию:
+        2
+    """
+
+    image_processes: Annotated[
+        bool,
+        Field(default=False),
+    ]
+    """Обрабатывать изображения в пуле процессов вместо пула потоков.
+
+    Тип:
+        bool
+    Значение по умолчанию:
+        False
+    """
+
+    image_max_sides: Annotated[
+        dict[str, int],
+        Field(
+            default={
+                "default": 1536,
+                "ximilar": 1024,
+            }
+        ),
+    ]
+    """Максимальная сторона изображения перед отправкой провайдеру
+    по эндпоинтам (`default` — для остальных, 0 — без уменьшения).
+
+    Тип:
+        dict[str, int]
+    Значение по умолчанию:
+        {"default": 1536, "ximilar": 1024}
+    """
+
+    image_quality: Annotated[
+        int,
+        Field(default=85),
+    ]
+    """Качество JPEG при подготовке изображения для провайдера.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        85
+    """
+
+    image_cache_size: Annotated[
+        int,
+        Field(default=64),
+    ]
+    """Сколько подготовленных изображений хранить в кэше процесса.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        64
+    """
+
+    media_cache_max_age: Annotated[
+        int,
+        Field(default=31536000),
+    ]
+    """Срок кэширования файлов из `/media` клиентом (сек., 0 — без кэша).
+
+    Сгенерированные файлы не перезаписываются (имена — uuid), поэтому
+    по умолчанию отдаются как `immutable` на год.
+
+    Тип:
+        int
+    Значение по умолчанию:
+        31536000
+    """
+
+    callback_allowed_hosts: Annotated[
+        list[str],
+        Field(default=[]),
+    ]
+    """Хосты, на которые разрешено отправлять webhook (`callback_url`).
+
+    `example.com` — только сам хост, `.example.com` — и его поддомены.
+
+    Тип:
+        list[str]
+    Значение по умолчанию:
+        [] (webhook отключены)
+    """
+
+    callback_allowed_schemes: Annotated[
+        list[str],
+        Field(default=["https"]),
+    ]
+    """Разрешенные схемы адресов webhook.
+
+    Тип:
+        list[str]
+    Значение по умолчанию:
+        ["https"]
+    """
+
+    callback_timeout: Annotated[
+        float,
+        Field(default=5.0),
+    ]
+    """Таймаут отправки webhook (в секундах).
+
+    Тип:
+        float
+    Значение по умолчанию:
+        5.0
+    """
+
     allowed_hosts: Annotated[
         list[str],
         Field(default=["*"]),
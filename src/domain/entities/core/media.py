@@ -15,7 +15,8 @@ class IMediaFile:
         if not self._path.exists() or not self._path.is_file():
             raise FileNotFoundError("Media file does not exist.")
 
-        self._size = self._path.stat().st_size
+        self._stat = self._path.stat()
+        self._size = self._stat.st_size
         self._mime_type = guess_type(str(self._path))[0] or "application/octet-stream"
 
     @property
@@ -30,6 +31,19 @@ class IMediaFile:
     ) -> int:
         return self._size
 
+    @property
+    def modified(
+        self,
+    ) -> float:
+        return self._stat.st_mtime
+
+    @property
+    def etag(
+        self,
+    ) -> str:
+        # файл меняется только перезаписью, поэтому хватает mtime и размера
+        return f'"{self._stat.st_mtime_ns:x}-{self._size:x}"'
+
     @property
     def mime_type(
         self,
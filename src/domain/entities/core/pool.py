@@ -0,0 +1,57 @@
+# coding utf-8
+
+from typing import Annotated
+
+from pydantic import Field
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .base import ISchema
+
+
+class IPoolMetrics(ISchema):
+    role: Annotated[
+        str,
+        Field(...),
+    ]
+    url: Annotated[
+        str,
+        Field(...),
+    ]
+    size: Annotated[
+        int | None,
+        Field(default=None),
+    ]
+    checked_in: Annotated[
+        int | None,
+        Field(default=None),
+    ]
+    checked_out: Annotated[
+        int | None,
+        Field(default=None),
+    ]
+    overflow: Annotated[
+        int | None,
+        Field(default=None),
+    ]
+
+    @classmethod
+    def from_engine(
+        cls,
+        engine: AsyncEngine,
+        role: str,
+    ) -> "IPoolMetrics":
+        pool = engine.pool
+
+        def stat(name: str) -> int | None:
+            method = getattr(pool, name, None)
+            return method() if callable(method) else None
+
+        return cls(
+            role=role,
+            url=engine.url.render_as_string(hide_password=True),
+            size=stat("size"),
+            checked_in=stat("checkedin"),
+            checked_out=stat("checkedout"),
+            overflow=stat("overflow"),
+        )
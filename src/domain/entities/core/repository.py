@@ -1,6 +1,10 @@
 # coding utf-8
 
-from typing import Callable, Any
+from typing import (
+    Any,
+    Callable,
+    Generator,
+)
 
 from datetime import date as date_type
 
@@ -15,6 +19,7 @@ from sqlalchemy import (
     update,
     and_,
     func,
+    bindparam,
 )
 
 from sqlalchemy.orm import (
@@ -22,6 +27,8 @@ from sqlalchemy.orm import (
     with_loader_criteria,
 )
 
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+
 from .base import ISchema
 
 from .table import ITable
@@ -152,6 +159,82 @@ class IRepository:
         )
         return data
 
+    def __group_rows(
+        self,
+        data: list[ISchema | dict[str, Any]],
+        chunk_size: int,
+    ) -> Generator[list[dict[str, Any]], None, None]:
+        # `ISchema.dict` отбрасывает None, а многострочный VALUES требует
+        # одинаковый набор столбцов, поэтому строки группируются по ключам
+        groups: dict[frozenset[str], list[dict[str, Any]]] = {}
+
+        for item in data:
+            row: dict[str, Any] = item if isinstance(item, dict) else item.dict
+            groups.setdefault(frozenset(row), []).append(row)
+
+        for rows in groups.values():
+            for start in range(0, len(rows), chunk_size):
+                yield rows[start : start + chunk_size]
+
+    async def add_many(
+        self,
+        data: list[ISchema | dict[str, Any]],
+        chunk_size: int = 1000,
+    ) -> int:
+        """Добавляет записи многострочными INSERT пачками по `chunk_size`.
+
+        Args:
+            data (list): Записи для вставки
+            chunk_size (int): Максимум строк в одном INSERT
+
+        Returns:
+            int: Число переданных записей
+        """
+        if not data:
+            return 0
+
+        async with self._engine.get_session() as session:
+            for rows in self.__group_rows(data, chunk_size):
+                await session.execute(
+                    insert(self._model).values(rows),
+                )
+            await session.commit()
+
+        return len(data)
+
+    async def upsert_many(
+        self,
+        data: list[ISchema | dict[str, Any]],
+        update_fields: list[str],
+        chunk_size: int = 1000,
+    ) -> int:
+        """Добавляет или обновляет записи (INSERT ... ON DUPLICATE KEY UPDATE).
+
+        Конфликт определяется первичным ключом и уникальными индексами таблицы.
+
+        Args:
+            data (list): Записи для вставки
+            update_fields (list[str]): Столбцы, обновляемые при конфликте
+            chunk_size (int): Максимум строк в одном INSERT
+
+        Returns:
+            int: Число переданных записей
+        """
+        if not data:
+            return 0
+
+        async with self._engine.get_session() as session:
+            for rows in self.__group_rows(data, chunk_size):
+                query = mysql_insert(self._model).values(rows)
+                await session.execute(
+                    query.on_duplicate_key_update(
+                        {field: query.inserted[field] for field in update_fields},
+                    ),
+                )
+            await session.commit()
+
+        return len(data)
+
     async def update_record(
         self,
         id: int,
@@ -166,6 +249,37 @@ class IRepository:
         )
         return data
 
+    async def increment_field(
+        self,
+        field_name: str,
+        values: dict[int, int],
+    ) -> None:
+        """Увеличивает числовое поле у нескольких записей одним executemany.
+
+        Args:
+            field_name (str): Имя числового столбца
+            values (dict[int, int]): Приращения по id записи
+        """
+        if not values:
+            return
+
+        table = self._model.__table__
+
+        async with self._engine.get_session() as session:
+            connection = await session.connection()
+            await connection.execute(
+                update(table)
+                .where(table.c.id == bindparam("record_id"))
+                .values(
+                    {field_name: table.c[field_name] + bindparam("amount")},
+                ),
+                [
+                    {"record_id": id, "amount": amount}
+                    for id, amount in values.items()
+                ],
+            )
+            await session.commit()
+
     async def delete_record(
         self,
         id: int,
@@ -4,8 +4,6 @@ from typing import Annotated, Optional, List
 
 from pydantic import Field, field_validator
 
-from fastapi import UploadFile
-
 from base64 import b64encode
 
 from ..core import ISchema
@@ -51,15 +49,14 @@ class XimilarCardBody(ISchema):
     ]
 
     @classmethod
-    async def from_upload(
+    def from_bytes(
         cls,
-        image: UploadFile,
+        image_bytes: bytes,
+        content_type: str,
     ) -> "XimilarCardBody":
-        image_bytes = await image.read()
-
         base64_str = b64encode(image_bytes).decode("utf-8")
 
-        data_uri = f"data:{image.content_type};base64,{base64_str}"
+        data_uri = f"data:{content_type};base64,{base64_str}"
 
         return cls(
             records=[XimilarImage(base64=data_uri)],
@@ -25,6 +25,10 @@ from .pika import PikaError
 
 from .wan import WanError
 
+from .upstream import UpstreamError
+
+from .media import MediaError
+
 __all__: list[str] = [
     "PixverseError",
     "EngineError",
@@ -37,4 +41,6 @@ __all__: list[str] = [
     "QwenError",
     "PikaError",
     "WanError",
+    "UpstreamError",
+    "MediaError",
 ]
@@ -15,8 +15,10 @@ class InstagramError(IError):
         status_code: int,
         detail: str,
         extra: dict[str] = {},
+        code: int | str | None = None,
     ) -> None:
         self.extra = extra
+        self.code = code
         super().__init__(
             status_code=status_code,
             detail=detail,
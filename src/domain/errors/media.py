@@ -0,0 +1,38 @@
+# coding utf-8
+
+from ..entities.core import IError
+
+
+class MediaError(IError):
+    """
+    Исключение, возникающее при ошибке внешнего процесса обработки медиа
+    (ffmpeg, ffprobe): ненулевой код возврата или превышение таймаута.
+
+    Args:
+        program (str): Имя программы
+        code (str): Причина (`failed` или `timeout`)
+        returncode (int, optional): Код возврата процесса
+        stderr (str): Последние строки stderr процесса
+    """
+
+    def __init__(
+        self,
+        program: str,
+        code: str,
+        returncode: int | None = None,
+        stderr: str = "",
+        extra: dict[str] = {},
+    ) -> None:
+        self.extra = extra
+        self.code = code
+        self.program = program
+        self.returncode = returncode
+        self.stderr = stderr
+        super().__init__(
+            status_code=500,
+            detail=(
+                f"{program} timed out"
+                if code == "timeout"
+                else f"{program} exited with code {returncode}"
+            ),
+        )
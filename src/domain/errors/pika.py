@@ -20,6 +20,7 @@ class PikaError(IError):
         extra: dict[str] = {},
     ) -> None:
         self.extra = extra
+        self.code = status_code
         args = dict(
             zip(
                 ("status_code", "detail"),
@@ -0,0 +1,37 @@
+# coding utf-8
+
+from ..entities.core import IError
+
+
+class UpstreamError(IError):
+    """
+    Исключение, возникающее, когда внешний сервис временно недоступен:
+    цепь автомата разомкнута или исчерпан лимит одновременных запросов.
+
+    Args:
+        upstream (str): Имя внешнего сервиса
+        code (str): Причина отказа (`circuit_open` или `bulkhead_full`)
+        retry_after (float): Через сколько секунд стоит повторить запрос
+    """
+
+    def __init__(
+        self,
+        upstream: str,
+        code: str,
+        retry_after: float = 0,
+        extra: dict[str] = {},
+    ) -> None:
+        self.extra = extra
+        self.code = code
+        self.upstream = upstream
+        self.retry_after = retry_after
+        super().__init__(
+            status_code=503,
+            detail=(
+                f"Upstream service {upstream} is temporarily unavailable, "
+                f"retry the request in {max(1, round(retry_after))}s"
+                if code == "circuit_open"
+                else f"Upstream service {upstream} is overloaded, "
+                "retry the request later"
+            ),
+        )
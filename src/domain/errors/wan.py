@@ -20,6 +20,7 @@ class WanError(IError):
         extra: dict[str] = {},
     ) -> None:
         self.extra = extra
+        self.code = status_code
         args = dict(
             zip(
                 ("status_code", "detail"),
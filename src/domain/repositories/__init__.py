@@ -4,8 +4,17 @@ from .engines import (
     IClickHouse,
     IDatabase,
     ICelery,
+    IRedis,
     ClickHouseRepository,
     DatabaseRepository,
+    EngineRegistry,
+    engine_registry,
+)
+
+from .scheduler import (
+    AccountScheduler,
+    leased_account,
+    release_accounts,
 )
 
 __all__: list[str] = [
@@ -17,4 +26,13 @@ __all__: list[str] = [
     "DatabaseRepository",
     # celery
     "ICelery",
+    # redis
+    "IRedis",
+    # registry
+    "EngineRegistry",
+    "engine_registry",
+    # scheduler
+    "AccountScheduler",
+    "leased_account",
+    "release_accounts",
 ]
@@ -12,6 +12,13 @@ from .database import (
 
 from .celery import ICelery
 
+from .redis import IRedis
+
+from .registry import (
+    EngineRegistry,
+    engine_registry,
+)
+
 
 __all__: list[str] = [
     # clickhouse
@@ -22,4 +29,9 @@ __all__: list[str] = [
     "DatabaseRepository",
     # celery
     "ICelery",
+    # redis
+    "IRedis",
+    # registry
+    "EngineRegistry",
+    "engine_registry",
 ]
@@ -1,14 +1,10 @@
 # coding utf-8
 
-from functools import cached_property
-
 from sqlalchemy.orm import sessionmaker
 
-from sqlalchemy.ext.asyncio import (
-    AsyncEngine,
-    AsyncSession,
-    create_async_engine,
-)
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..registry import engine_registry
 
 from ....entities.core import (
     IConfEnv,
@@ -25,21 +21,22 @@ class IClickHouse(IEngine):
             conf,
         )
 
-    @cached_property
+    @property
     def engine(
         self,
     ) -> AsyncEngine:
-        return create_async_engine(
+        return engine_registry.engine(
             self._conf.clickhouse_dsn_url,
+            "clickhouse",
             future=True,
         )
 
-    @cached_property
+    @property
     def session_factory(
         self,
     ) -> sessionmaker:
-        return sessionmaker(
-            self.engine,
-            expire_on_commit=False,
-            class_=AsyncSession,
+        return engine_registry.session_factory(
+            self._conf.clickhouse_dsn_url,
+            "clickhouse",
+            future=True,
         )
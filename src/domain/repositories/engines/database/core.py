@@ -1,14 +1,12 @@
 # coding utf-8
 
-from functools import cached_property
+from typing import Any
 
 from sqlalchemy.orm import sessionmaker
 
-from sqlalchemy.ext.asyncio import (
-    AsyncEngine,
-    AsyncSession,
-    create_async_engine,
-)
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..registry import engine_registry
 
 from ....entities.core import (
     IConfEnv,
@@ -17,33 +15,72 @@ from ....entities.core import (
 
 
 class IDatabase(IEngine):
+    """Доступ к основной базе данных.
+
+    Экземпляры дешевы: движок и фабрика сессий берутся из процессного
+    реестра `engine_registry`, поэтому все репозитории разделяют один пул.
+
+    Args:
+        conf (IConfEnv): Конфигурация приложения
+        role (str): Роль подключения ("primary" или "replica")
+    """
+
     def __init__(
         self,
         conf: IConfEnv,
+        role: str = "primary",
     ) -> None:
         super().__init__(
             conf,
         )
+        self._role = role
+
+    @property
+    def role(
+        self,
+    ) -> str:
+        # без DSN реплики чтение идет через основной пул, а не через второй
+        # пул к той же базе
+        if self._role == "replica" and self._conf.database_replica_dsn_url:
+            return "replica"
+        return "primary"
+
+    @property
+    def dsn(
+        self,
+    ) -> str:
+        if self.role == "replica":
+            return self._conf.database_replica_dsn_url
+        return self._conf.database_dsn_url
+
+    @property
+    def options(
+        self,
+    ) -> dict[str, Any]:
+        return {
+            "pool_size": self._conf.database_pool_size,
+            "max_overflow": self._conf.database_max_overflow,
+            "pool_timeout": self._conf.database_pool_timeout,
+            "pool_recycle": self._conf.database_pool_recycle,
+            "pool_pre_ping": True,
+        }
 
-    @cached_property
+    @property
     def engine(
         self,
     ) -> AsyncEngine:
-        return create_async_engine(
-            self._conf.database_dsn_url,
-            pool_size=10,
-            max_overflow=20,
-            pool_timeout=30,
-            pool_recycle=60,
-            pool_pre_ping=True,
+        return engine_registry.engine(
+            self.dsn,
+            self.role,
+            **self.options,
         )
 
-    @cached_property
+    @property
     def session_factory(
         self,
     ) -> sessionmaker:
-        return sessionmaker(
-            self.engine,
-            expire_on_commit=False,
-            class_=AsyncSession,
+        return engine_registry.session_factory(
+            self.dsn,
+            self.role,
+            **self.options,
         )
@@ -0,0 +1,7 @@
+# coding utf-8
+
+from .core import IRedis
+
+__all__: list[str] = [
+    "IRedis",
+]
@@ -0,0 +1,32 @@
+# coding utf-8
+
+from redis.asyncio import Redis
+
+from ..registry import engine_registry
+
+from ....entities.core import IConfEnv
+
+
+class IRedis:
+    """Доступ к Redis.
+
+    Клиент берется из процессного реестра `engine_registry`, поэтому
+    все экземпляры разделяют один пул соединений на event loop.
+
+    Args:
+        conf (IConfEnv): Конфигурация приложения
+    """
+
+    def __init__(
+        self,
+        conf: IConfEnv,
+    ) -> None:
+        self._conf = conf
+
+    @property
+    def client(
+        self,
+    ) -> Redis:
+        return engine_registry.redis(
+            self._conf.redis_dsn_url,
+        )
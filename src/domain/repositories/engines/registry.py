@@ -0,0 +1,172 @@
+# coding utf-8
+
+from typing import Any
+
+from weakref import WeakKeyDictionary
+
+from asyncio import (
+    AbstractEventLoop,
+    get_running_loop,
+)
+
+from sqlalchemy.orm import sessionmaker
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+
+from redis.asyncio import Redis
+
+from ...entities.core import IPoolMetrics
+
+
+class EngineRegistry:
+    """Процессный реестр движков SQLAlchemy.
+
+    Хранит по одному `AsyncEngine` и фабрике сессий на пару (DSN, роль),
+    поэтому все репозитории процесса разделяют один пул соединений
+    независимо от количества созданных экземпляров `IDatabase`.
+
+    Там же хранятся клиенты Redis (по одному пулу соединений на DSN).
+
+    Движки привязаны к event loop: соединения asyncio-драйверов нельзя
+    переиспользовать между циклами (Celery запускает задачи через `asyncio.run`).
+    """
+
+    def __init__(
+        self,
+    ) -> None:
+        self._engines: WeakKeyDictionary[
+            AbstractEventLoop,
+            dict[tuple[str, str], AsyncEngine],
+        ] = WeakKeyDictionary()
+        self._factories: WeakKeyDictionary[
+            AbstractEventLoop,
+            dict[tuple[str, str], sessionmaker],
+        ] = WeakKeyDictionary()
+        self._redis: WeakKeyDictionary[
+            AbstractEventLoop,
+            dict[str, Redis],
+        ] = WeakKeyDictionary()
+
+    def engine(
+        self,
+        dsn: str,
+        role: str = "primary",
+        **options: Any,
+    ) -> AsyncEngine:
+        """Возвращает общий движок для DSN и роли, создавая его при первом обращении.
+
+        Args:
+            dsn (str): Строка подключения к базе данных
+            role (str): Роль подключения (primary/replica)
+            **options: Параметры `create_async_engine` (используются только при создании)
+
+        Returns:
+            AsyncEngine: Общий движок процесса
+        """
+        engines: dict[tuple[str, str], AsyncEngine] = self._engines.setdefault(
+            get_running_loop(),
+            {},
+        )
+        key = (dsn, role)
+
+        if key not in engines:
+            engines[key] = create_async_engine(
+                dsn,
+                **options,
+            )
+        return engines[key]
+
+    def session_factory(
+        self,
+        dsn: str,
+        role: str = "primary",
+        **options: Any,
+    ) -> sessionmaker:
+        """Возвращает общую фабрику сессий для DSN и роли.
+
+        Args:
+            dsn (str): Строка подключения к базе данных
+            role (str): Роль подключения (primary/replica)
+            **options: Параметры `create_async_engine`
+
+        Returns:
+            sessionmaker: Фабрика асинхронных сессий
+        """
+        factories: dict[tuple[str, str], sessionmaker] = self._factories.setdefault(
+            get_running_loop(),
+            {},
+        )
+        key = (dsn, role)
+
+        if key not in factories:
+            factories[key] = sessionmaker(
+                self.engine(dsn, role, **options),
+                expire_on_commit=False,
+                class_=AsyncSession,
+            )
+        return factories[key]
+
+    def redis(
+        self,
+        dsn: str,
+    ) -> Redis:
+        """Возвращает общий клиент Redis для DSN.
+
+        Args:
+            dsn (str): Строка подключения к Redis
+
+        Returns:
+            Redis: Асинхронный клиент с общим пулом соединений
+        """
+        clients: dict[str, Redis] = self._redis.setdefault(
+            get_running_loop(),
+            {},
+        )
+
+        if dsn not in clients:
+            clients[dsn] = Redis.from_url(
+                dsn,
+                decode_responses=True,
+            )
+        return clients[dsn]
+
+    def metrics(
+        self,
+    ) -> list[IPoolMetrics]:
+        """Возвращает состояние пулов соединений текущего event loop.
+
+        Returns:
+            list[IPoolMetrics]: Метрики по каждому зарегистрированному движку
+        """
+        engines: dict[tuple[str, str], AsyncEngine] = self._engines.get(
+            get_running_loop(),
+            {},
+        )
+        return [
+            IPoolMetrics.from_engine(
+                engine,
+                role=role,
+            )
+            for (_, role), engine in engines.items()
+        ]
+
+    async def dispose(
+        self,
+    ) -> None:
+        """Закрывает все пулы соединений текущего event loop."""
+        loop: AbstractEventLoop = get_running_loop()
+
+        self._factories.pop(loop, None)
+
+        for engine in self._engines.pop(loop, {}).values():
+            await engine.dispose()
+
+        for client in self._redis.pop(loop, {}).values():
+            await client.aclose()
+
+
+engine_registry = EngineRegistry()
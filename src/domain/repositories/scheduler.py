@@ -0,0 +1,296 @@
+# coding utf-8
+
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+)
+
+import logging
+
+from functools import wraps
+
+from time import monotonic
+
+from contextvars import ContextVar
+
+from collections import defaultdict
+
+from asyncio import (
+    CancelledError,
+    Task,
+    create_task,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+_leases: ContextVar[list[tuple["AccountScheduler", Any]] | None] = ContextVar(
+    "account_leases",
+    default=None,
+)
+
+
+class AccountScheduler:
+    """Планировщик аккаунтов внешнего провайдера.
+
+    Держит в памяти пул активных аккаунтов по ключу (обычно app_id),
+    периодически обновляя его из базы данных, и выдает аккаунты без
+    обращения к базе на каждом запросе:
+
+    - выбирается наименее загруженный аккаунт (в работе, затем usage_count),
+      при равенстве предпочтение отдается аккаунту с большим балансом;
+    - число одновременных задач на аккаунт ограничено `max_in_flight`;
+    - выбор и резервирование выполняются без `await` между ними, поэтому
+      два конкурентных запроса не получат один и тот же слот;
+    - счетчики использования копятся в памяти и записываются пачкой.
+
+    Args:
+        loader: Загрузка активных аккаунтов по ключу пула
+        flusher: Запись накопленных приращений usage_count ({id: n})
+        refresh_interval (float): Период обновления пула из базы (сек.)
+        flush_interval (float): Период записи счетчиков в базу (сек.)
+        max_in_flight (int): Максимум одновременных задач на аккаунт
+        lease_ttl (float): Через сколько секунд неосвобожденная аренда истекает
+    """
+
+    _schedulers: dict[str, "AccountScheduler"] = {}
+
+    def __init__(
+        self,
+        loader: Callable[[str | None], Awaitable[list[Any]]],
+        flusher: Callable[[dict[int, int]], Awaitable[Any]],
+        refresh_interval: float = 30.0,
+        flush_interval: float = 5.0,
+        max_in_flight: int = 10,
+        lease_ttl: float = 600.0,
+    ) -> None:
+        self._loader = loader
+        self._flusher = flusher
+        self._refresh_interval = refresh_interval
+        self._flush_interval = flush_interval
+        self._max_in_flight = max_in_flight
+        self._lease_ttl = lease_ttl
+
+        self._pools: dict[str | None, list[Any]] = {}
+        self._loaded_at: dict[str | None, float] = {}
+        self._in_flight: defaultdict[int, list[float]] = defaultdict(list)
+        self._usage: defaultdict[int, int] = defaultdict(int)
+        self._pending: defaultdict[int, int] = defaultdict(int)
+        self._flushed_at: float = monotonic()
+        self._flush_task: Task | None = None
+
+    @classmethod
+    def for_provider(
+        cls,
+        name: str,
+        *args,
+        **kwargs,
+    ) -> "AccountScheduler":
+        """Возвращает общий для процесса планировщик провайдера.
+
+        Репозитории аккаунтов создаются во многих модулях, поэтому
+        планировщик регистрируется по имени при первом обращении.
+        """
+        if name not in cls._schedulers:
+            cls._schedulers[name] = cls(*args, **kwargs)
+        return cls._schedulers[name]
+
+    @classmethod
+    async def flush_all(
+        cls,
+    ) -> None:
+        """Записывает накопленные счетчики всех планировщиков процесса."""
+        for scheduler in cls._schedulers.values():
+            await scheduler.flush()
+
+    async def __refresh(
+        self,
+        key: str | None,
+    ) -> list[Any]:
+        accounts: list[Any] = list(await self._loader(key) or [])
+
+        for account in accounts:
+            # значение из базы уже включает записанные приращения
+            self._usage[account.id] = int(account.usage_count or 0)
+
+        self._pools[key] = accounts
+        self._loaded_at[key] = monotonic()
+
+        return accounts
+
+    def __load(
+        self,
+        account: Any,
+    ) -> list[float]:
+        expires: float = monotonic() - self._lease_ttl
+        leases: list[float] = [
+            leased_at
+            for leased_at in self._in_flight[account.id]
+            if leased_at > expires
+        ]
+        self._in_flight[account.id] = leases
+        return leases
+
+    def __select(
+        self,
+        accounts: list[Any],
+    ) -> Any | None:
+        candidates: list[tuple[tuple[int, int, int], Any]] = []
+
+        for account in accounts:
+            in_flight: int = len(self.__load(account))
+
+            if in_flight >= self._max_in_flight:
+                continue
+
+            candidates.append(
+                (
+                    (
+                        in_flight,
+                        self._usage[account.id] + self._pending[account.id],
+                        -int(getattr(account, "balance", 0) or 0),
+                    ),
+                    account,
+                )
+            )
+
+        if not candidates:
+            return None
+
+        return min(candidates, key=lambda item: item[0])[1]
+
+    async def acquire(
+        self,
+        key: str | None = None,
+    ) -> Any | None:
+        """Выдает аккаунт из пула и резервирует под него слот.
+
+        Args:
+            key (str | None): Ключ пула (app_id) или None для общего пула
+
+        Returns:
+            Any | None: Аккаунт или None, если свободных аккаунтов нет
+        """
+        accounts: list[Any] | None = self._pools.get(key)
+
+        if (
+            accounts is None
+            or monotonic() - self._loaded_at.get(key, 0) >= self._refresh_interval
+        ):
+            accounts = await self.__refresh(key)
+
+        account: Any | None = self.__select(accounts)
+
+        if account is None:
+            return None
+
+        self._in_flight[account.id].append(monotonic())
+        self._pending[account.id] += 1
+
+        leases: list[tuple[AccountScheduler, Any]] | None = _leases.get()
+        if leases is not None:
+            leases.append((self, account))
+
+        self.__schedule_flush()
+
+        return account
+
+    def release(
+        self,
+        account: Any,
+    ) -> None:
+        """Освобождает слот, зарезервированный под аккаунт."""
+        leases: list[float] = self._in_flight.get(account.id, [])
+        if leases:
+            leases.pop(0)
+
+    def invalidate(
+        self,
+    ) -> None:
+        """Сбрасывает пулы аккаунтов: следующий `acquire` загрузит их из базы.
+
+        Вызывается после изменения или удаления аккаунта (отключение,
+        исчерпанный баланс), чтобы он не выдавался до планового обновления.
+        """
+        self._pools.clear()
+        self._loaded_at.clear()
+
+    def __schedule_flush(
+        self,
+    ) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        if monotonic() - self._flushed_at < self._flush_interval:
+            return
+        self._flush_task = create_task(self.flush())
+        self._flush_task.add_done_callback(self.__on_flushed)
+
+    @staticmethod
+    def __on_flushed(
+        task: Task,
+    ) -> None:
+        # приращения уже возвращены в очередь в `flush`, здесь только лог
+        if task.cancelled():
+            logger.warning("account scheduler: usage flush cancelled")
+        elif task.exception() is not None:
+            logger.warning(
+                "account scheduler: usage flush failed (%s)",
+                task.exception().__class__.__name__,
+            )
+
+    async def flush(
+        self,
+    ) -> None:
+        """Записывает накопленные приращения usage_count одной пачкой."""
+        pending: dict[int, int] = dict(self._pending)
+        self._pending.clear()
+        self._flushed_at = monotonic()
+
+        if not pending:
+            return
+
+        try:
+            await self._flusher(pending)
+        except (Exception, CancelledError):
+            # не записанные приращения уйдут следующей записью
+            for id, amount in pending.items():
+                self._pending[id] += amount
+            raise
+
+        for id, amount in pending.items():
+            self._usage[id] += amount
+
+
+def leased_account() -> Any | None:
+    """Возвращает аккаунт, последним выданный в текущем вызове `release_accounts`.
+
+    Используется для ключа автомата отключения по аккаунту: id аккаунта
+    не меняется при повторной авторизации, в отличие от токена.
+    """
+    leases: list[tuple[AccountScheduler, Any]] | None = _leases.get()
+    return leases[-1][1] if leases else None
+
+
+def release_accounts(
+    func: Callable[..., Awaitable[Any]],
+) -> Callable[..., Awaitable[Any]]:
+    """Освобождает все аккаунты, выданные планировщиками во время вызова.
+
+    Используется на методах клиентов, которые берут аккаунт через
+    `fetch_next_account`: слот аккаунта освобождается после завершения
+    генерации, в том числе при ошибке.
+    """
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        token = _leases.set([])
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            for scheduler, account in _leases.get():
+                scheduler.release(account)
+            _leases.reset(token)
+
+    return wrapper
@@ -23,9 +23,10 @@ from .account import update_account_token
 from .error import format_error_with_request
 
 from .media import (
-    stream_media,
+    serve_media,
     overlay_subtitles,
     has_audio,
+    probe_duration,
 )
 
 from .user import add_user_tokens, check_user_tokens
@@ -34,11 +35,59 @@ from .webhhok import fetch_webhook_id
 
 from .sleep import waiter
 
+from .retry import (
+    RetryBudget,
+    RetryDecision,
+    RetryPolicy,
+)
+
+from .breaker import (
+    CircuitBreaker,
+    Bulkhead,
+)
+
 from .srt import generate_srt
 
 from .translate import (
     translate_batch,
     transcribe_audio,
+    transcribe_words,
+)
+
+from .audio import AudioTimeline
+
+from .process import (
+    MediaRunner,
+    media_runner,
+)
+
+from .speech import (
+    SpeechModelRegistry,
+    speech_models,
+)
+
+from .snapshot import RelationSnapshot
+
+from .oss import (
+    OSSUploader,
+    oss_uploader,
+)
+
+from .image import (
+    ImageProcessor,
+    image_processor,
+)
+
+from .redis_cache import RedisJSONCache
+
+from .upload_cache import (
+    UploadCache,
+    upload_cache,
+)
+
+from .callback import (
+    CallbackSender,
+    callback_sender,
 )
 
 from .location import (
@@ -59,17 +108,39 @@ __all__: list[str] = [
     "format_error_with_request",
     "convert_heic_to_jpg",
     "upload_chatgpt_files",
-    "stream_media",
+    "serve_media",
     "overlay_subtitles",
     "add_user_tokens",
     "check_user_tokens",
     "fetch_webhook_id",
     "upload_qwen_file",
     "waiter",
+    "RetryBudget",
+    "RetryDecision",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "Bulkhead",
     "generate_srt",
     "translate_batch",
     "transcribe_audio",
+    "transcribe_words",
+    "AudioTimeline",
+    "SpeechModelRegistry",
+    "speech_models",
+    "RelationSnapshot",
+    "OSSUploader",
+    "oss_uploader",
+    "RedisJSONCache",
+    "UploadCache",
+    "upload_cache",
+    "ImageProcessor",
+    "image_processor",
+    "CallbackSender",
+    "callback_sender",
     "has_audio",
+    "probe_duration",
+    "MediaRunner",
+    "media_runner",
     "extract_gps_from_exif",
     "reverse_geocode",
 ]
@@ -0,0 +1,124 @@
+# coding utf-8
+
+import wave
+
+import numpy as np
+
+from ..constants import PCM_DECODE_COMMAND
+
+from .process import media_runner
+
+
+class AudioTimeline:
+    """Звуковая дорожка фиксированной длины для озвучки видео.
+
+    Вместо склейки `before + clip + after` у `AudioSegment`, которая
+    копирует всю дорожку на каждом слове, выделяет один буфер PCM на всю
+    длительность видео и записывает фрагменты TTS на место. Подгонка по
+    длине, дополнение тишиной и нормализация выполняются над массивами,
+    экспорт — один раз в конце. Фрагменты декодируются в PCM процессом
+    ffmpeg через `media_runner`, не блокируя event loop.
+
+    Args:
+        duration_ms (int): Длительность дорожки (мс)
+        sample_rate (int): Частота дискретизации (Гц)
+    """
+
+    # запас до 0 dBFS, как у pydub.effects.normalize
+    HEADROOM_DB: float = 0.1
+
+    def __init__(
+        self,
+        duration_ms: int,
+        sample_rate: int = 24000,
+    ) -> None:
+        self._sample_rate = sample_rate
+        self._samples: np.ndarray = np.zeros(
+            self.__to_samples(duration_ms),
+            dtype=np.float32,
+        )
+
+    def __to_samples(
+        self,
+        ms: int | float,
+    ) -> int:
+        return max(0, int(round(ms * self._sample_rate / 1000)))
+
+    async def __decode(
+        self,
+        path: str,
+    ) -> np.ndarray:
+        pcm: bytes = await media_runner.output(
+            [
+                arg.format(
+                    input_path=path,
+                    sample_rate=self._sample_rate,
+                )
+                for arg in PCM_DECODE_COMMAND
+            ],
+        )
+        return np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768
+
+    def __normalize(
+        self,
+        samples: np.ndarray,
+    ) -> np.ndarray:
+        peak: float = float(np.max(np.abs(samples))) if samples.size else 0.0
+        if peak == 0.0:
+            return samples
+        return samples * (10 ** (-self.HEADROOM_DB / 20) / peak)
+
+    async def place(
+        self,
+        path: str,
+        start_ms: int,
+        end_ms: int,
+        normalize: bool = True,
+    ) -> bool:
+        """Записывает фрагмент в интервал [start_ms, end_ms).
+
+        Фрагмент обрезается по длине интервала, остаток интервала
+        заполняется тишиной.
+
+        Args:
+            path (str): Путь к аудиофайлу фрагмента
+            start_ms (int): Начало интервала (мс)
+            end_ms (int): Конец интервала (мс)
+            normalize (bool): Нормализовать громкость фрагмента
+
+        Returns:
+            bool: False, если интервал или фрагмент пустые
+        """
+        start: int = self.__to_samples(start_ms)
+        end: int = min(self.__to_samples(end_ms), self._samples.size)
+
+        if end <= start:
+            return False
+
+        samples: np.ndarray = (await self.__decode(path))[: end - start]
+
+        if not samples.size:
+            return False
+
+        if normalize:
+            samples = self.__normalize(samples)
+
+        self._samples[start:end] = 0.0
+        self._samples[start : start + samples.size] = samples
+
+        return True
+
+    def export(
+        self,
+        path: str,
+    ) -> str:
+        """Сохраняет дорожку в WAV (16 бит, моно)."""
+        pcm: np.ndarray = (np.clip(self._samples, -1.0, 1.0) * 32767).astype("<i2")
+
+        with wave.open(path, "wb") as file:
+            file.setnchannels(1)
+            file.setsampwidth(2)
+            file.setframerate(self._sample_rate)
+            file.writeframes(pcm.tobytes())
+
+        return path
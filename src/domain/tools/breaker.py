@@ -0,0 +1,232 @@
+# coding utf-8
+
+from typing import AsyncGenerator
+
+from enum import Enum
+
+from time import monotonic
+
+from weakref import WeakKeyDictionary
+
+from collections import OrderedDict
+
+from contextlib import asynccontextmanager
+
+from asyncio import (
+    AbstractEventLoop,
+    Semaphore,
+    TimeoutError,
+    get_running_loop,
+    wait_for,
+)
+
+from ..errors import UpstreamError
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Автомат отключения запросов к деградировавшему внешнему сервису.
+
+    После `failure_threshold` ошибок подряд цепь размыкается, и запросы
+    сразу получают `UpstreamError` вместо ожидания таймаутов. Через
+    `recovery_timeout` секунд пропускается `half_open_calls` пробных
+    запросов: успех замыкает цепь, ошибка снова размыкает ее.
+
+    Args:
+        name (str): Имя внешнего сервиса (для сообщения об ошибке)
+        failure_threshold (int): Число ошибок подряд до размыкания
+        recovery_timeout (float): Время в разомкнутом состоянии (сек.)
+        half_open_calls (int): Число одновременных пробных запросов
+    """
+
+    _breakers: OrderedDict[str, "CircuitBreaker"] = OrderedDict()
+
+    # ключи по аккаунтам появляются и исчезают вместе с аккаунтами
+    _max_breakers: int = 1024
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_calls: int = 1,
+    ) -> None:
+        self._name = name
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._half_open_calls = half_open_calls
+
+        self._state: CircuitState = CircuitState.CLOSED
+        self._failures: int = 0
+        self._opened_at: float = 0.0
+        self._probes: int = 0
+
+    @classmethod
+    def for_key(
+        cls,
+        key: str,
+        name: str,
+        *args,
+        **kwargs,
+    ) -> "CircuitBreaker":
+        """Возвращает общий для процесса автомат по ключу (сервис или аккаунт).
+
+        Реестр ограничен `_max_breakers`: при переполнении удаляется давно
+        не использованный замкнутый автомат (разомкнутые сохраняются).
+        """
+        breaker: CircuitBreaker | None = cls._breakers.get(key)
+
+        if breaker is not None:
+            cls._breakers.move_to_end(key)
+            return breaker
+
+        breaker = cls._breakers[key] = cls(name, *args, **kwargs)
+
+        if len(cls._breakers) > cls._max_breakers:
+            stale: str = next(
+                (
+                    stale
+                    for stale, candidate in cls._breakers.items()
+                    if candidate.state is CircuitState.CLOSED
+                ),
+                next(iter(cls._breakers)),
+            )
+            del cls._breakers[stale]
+
+        return breaker
+
+    @classmethod
+    def states(
+        cls,
+    ) -> dict[str, str]:
+        """Возвращает состояния всех автоматов процесса."""
+        return {key: breaker.state for key, breaker in cls._breakers.items()}
+
+    @property
+    def state(
+        self,
+    ) -> CircuitState:
+        if (
+            self._state is CircuitState.OPEN
+            and monotonic() - self._opened_at >= self._recovery_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def acquire(
+        self,
+    ) -> None:
+        """Пропускает запрос или отклоняет его с `UpstreamError`."""
+        state: CircuitState = self.state
+
+        if state is CircuitState.CLOSED:
+            return
+
+        if state is CircuitState.HALF_OPEN and self._probes < self._half_open_calls:
+            self._probes += 1
+            return
+
+        raise UpstreamError(
+            self._name,
+            "circuit_open",
+            retry_after=max(
+                0.0,
+                self._recovery_timeout - (monotonic() - self._opened_at),
+            ),
+        )
+
+    def release(
+        self,
+    ) -> None:
+        """Возвращает пробный слот, если запрос прерван без результата."""
+        if self._state is CircuitState.HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def record_success(
+        self,
+    ) -> None:
+        self._failures = 0
+        self._probes = 0
+        self._state = CircuitState.CLOSED
+
+    def record_failure(
+        self,
+    ) -> None:
+        self._failures += 1
+
+        if (
+            self._state is CircuitState.HALF_OPEN
+            or self._failures >= self._failure_threshold
+        ):
+            self._state = CircuitState.OPEN
+            self._opened_at = monotonic()
+            self._probes = 0
+
+
+class Bulkhead:
+    """Ограничение числа одновременных запросов к внешнему сервису.
+
+    Запросы сверх лимита ждут свободный слот не дольше `timeout` секунд,
+    после чего получают `UpstreamError`, чтобы не копить корутины и
+    соединения с базой на медленном сервисе.
+
+    Args:
+        name (str): Имя внешнего сервиса
+        max_concurrency (int): Максимум одновременных запросов
+        timeout (float): Время ожидания свободного слота (сек.)
+    """
+
+    _semaphores: WeakKeyDictionary[AbstractEventLoop, dict[str, Semaphore]] = (
+        WeakKeyDictionary()
+    )
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int = 50,
+        timeout: float = 5.0,
+    ) -> None:
+        self._name = name
+        self._max_concurrency = max_concurrency
+        self._timeout = timeout
+
+    def __semaphore(
+        self,
+    ) -> Semaphore:
+        # семафор привязан к event loop, поэтому хранится по циклу
+        semaphores: dict[str, Semaphore] = self._semaphores.setdefault(
+            get_running_loop(),
+            {},
+        )
+        if self._name not in semaphores:
+            semaphores[self._name] = Semaphore(self._max_concurrency)
+        return semaphores[self._name]
+
+    @asynccontextmanager
+    async def slot(
+        self,
+    ) -> AsyncGenerator[None, None]:
+        """Занимает слот на время запроса."""
+        semaphore: Semaphore = self.__semaphore()
+
+        try:
+            await wait_for(
+                semaphore.acquire(),
+                self._timeout,
+            )
+        except TimeoutError:
+            raise UpstreamError(
+                self._name,
+                "bulkhead_full",
+            )
+
+        try:
+            yield
+        finally:
+            semaphore.release()
@@ -0,0 +1,189 @@
+# coding utf-8
+
+from typing import Any
+
+from ipaddress import (
+    IPv4Address,
+    IPv6Address,
+    ip_address,
+)
+
+from socket import (
+    IPPROTO_TCP,
+    gaierror,
+)
+
+from urllib.parse import urlsplit
+
+from weakref import WeakKeyDictionary
+
+from asyncio import (
+    AbstractEventLoop,
+    get_running_loop,
+)
+
+from httpx import (
+    AsyncClient,
+    Limits,
+    Response,
+    Timeout,
+)
+
+from ..conf import app_conf
+
+from ..entities.core import IConfEnv
+
+
+conf: IConfEnv = app_conf()
+
+
+class CallbackSender:
+    """Отправка webhook с результатами на адрес, переданный клиентом.
+
+    Адрес проверяется по списку разрешенных хостов (`example.com` —
+    только сам хост, `.example.com` — и его поддомены). Перед отправкой
+    хост разрешается в IP, и запрос отклоняется, если среди адресов есть
+    внутренние (частные, loopback, link-local и т.п.). Запросы идут
+    через один клиент на event loop с короткими таймаутами и без
+    перехода по редиректам.
+
+    Args:
+        allowed_hosts (list[str]): Разрешенные хосты
+        allowed_schemes (list[str], optional): Разрешенные схемы URL
+        timeout (float): Таймаут запроса (сек.)
+    """
+
+    _clients: WeakKeyDictionary[AbstractEventLoop, AsyncClient] = (
+        WeakKeyDictionary()
+    )
+
+    def __init__(
+        self,
+        allowed_hosts: list[str],
+        allowed_schemes: list[str] | None = None,
+        timeout: float = 5.0,
+    ) -> None:
+        self._allowed_hosts = [host.lower() for host in allowed_hosts]
+        self._allowed_schemes = allowed_schemes or ["https"]
+        self._timeout = timeout
+
+    def __is_allowed_host(
+        self,
+        host: str,
+    ) -> bool:
+        return any(
+            host.endswith(allowed) or host == allowed.lstrip(".")
+            if allowed.startswith(".")
+            else host == allowed
+            for allowed in self._allowed_hosts
+        )
+
+    def validate(
+        self,
+        url: str,
+    ) -> str:
+        """Проверяет схему и хост адреса.
+
+        Returns:
+            str: Хост адреса
+
+        Raises:
+            ValueError: Адрес не разрешен
+        """
+        parts = urlsplit(url)
+        host: str = (parts.hostname or "").lower()
+
+        if parts.scheme not in self._allowed_schemes:
+            raise ValueError(f"Callback scheme is not allowed: {parts.scheme}")
+
+        if not host or not self.__is_allowed_host(host):
+            raise ValueError(f"Callback host is not allowed: {host}")
+
+        return host
+
+    @staticmethod
+    def __is_internal(
+        address: IPv4Address | IPv6Address,
+    ) -> bool:
+        if isinstance(address, IPv6Address) and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        return not address.is_global or address.is_multicast
+
+    async def __check_addresses(
+        self,
+        host: str,
+    ) -> None:
+        try:
+            infos = await get_running_loop().getaddrinfo(
+                host,
+                None,
+                proto=IPPROTO_TCP,
+            )
+        except gaierror as err:
+            raise ValueError(f"Callback host is not resolvable: {host}") from err
+
+        for *_, sockaddr in infos:
+            if self.__is_internal(ip_address(sockaddr[0].split("%")[0])):
+                raise ValueError(
+                    f"Callback host resolves to internal address: {host}",
+                )
+
+    def __client(
+        self,
+    ) -> AsyncClient:
+        loop: AbstractEventLoop = get_running_loop()
+        client: AsyncClient | None = self._clients.get(loop)
+
+        if client is None or client.is_closed:
+            client = self._clients[loop] = AsyncClient(
+                timeout=Timeout(self._timeout, connect=min(self._timeout, 3.0)),
+                limits=Limits(max_connections=20, max_keepalive_connections=5),
+                follow_redirects=False,
+                trust_env=False,
+            )
+
+        return client
+
+    async def check(
+        self,
+        url: str,
+    ) -> None:
+        """Проверяет адрес и IP, в которые разрешается его хост.
+
+        Raises:
+            ValueError: Адрес не разрешен или ведет во внутреннюю сеть
+        """
+        await self.__check_addresses(self.validate(url))
+
+    async def post(
+        self,
+        url: str,
+        payload: dict[str, Any],
+    ) -> Response:
+        """Отправляет `payload` на разрешенный внешний адрес.
+
+        Raises:
+            ValueError: Адрес не разрешен или ведет во внутреннюю сеть
+        """
+        await self.check(url)
+
+        return await self.__client().post(
+            url,
+            json=payload,
+        )
+
+    @classmethod
+    async def close_clients(
+        cls,
+    ) -> None:
+        """Закрывает клиент текущего event loop."""
+        client: AsyncClient | None = cls._clients.pop(get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+callback_sender = CallbackSender(
+    allowed_hosts=conf.callback_allowed_hosts,
+    allowed_schemes=conf.callback_allowed_schemes,
+    timeout=conf.callback_timeout,
+)
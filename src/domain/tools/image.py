@@ -0,0 +1,306 @@
+# coding utf-8
+
+from typing import (
+    Any,
+    Callable,
+)
+
+from io import BytesIO
+
+from hashlib import sha256
+
+from functools import partial
+
+from collections import OrderedDict
+
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+
+from asyncio import get_running_loop
+
+from PIL import (
+    Image,
+    ImageOps,
+)
+
+from pillow_heif import register_heif_opener
+
+from ..conf import app_conf
+
+from ..entities.core import IConfEnv
+
+from ..constants import IMAGE_FORMATS
+
+
+conf: IConfEnv = app_conf()
+
+
+# декодер HEIF регистрируется один раз на процесс
+register_heif_opener()
+
+
+def _decode(
+    data: bytes,
+) -> Image.Image:
+    if not data:
+        raise ValueError("Файл слишком мал или пуст — возможно, он нечитабелен.")
+
+    # поворот по EXIF применяется к пикселям, т.к. метаданные не сохраняются
+    return ImageOps.exif_transpose(
+        Image.open(
+            BytesIO(
+                data,
+            ),
+        ),
+    )
+
+
+def _encode(
+    image: Image.Image,
+    format: str,
+    quality: int | None = None,
+) -> bytes:
+    buffer = BytesIO()
+
+    # exif/icc не передаются, поэтому метаданные в результат не попадают
+    image.save(
+        buffer,
+        format=format,
+        **({"quality": quality} if quality and format != "PNG" else {}),
+    )
+
+    return buffer.getvalue()
+
+
+def _pipeline(
+    data: bytes,
+    format: str = "JPEG",
+    mode: str | None = "RGB",
+    max_side: int | None = None,
+    quality: int | None = None,
+) -> bytes:
+    image: Image.Image = _decode(data)
+
+    if mode is not None and image.mode != mode:
+        image = image.convert(mode)
+
+    if max_side and max(image.size) > max_side:
+        image.thumbnail(
+            (max_side, max_side),
+            Image.Resampling.LANCZOS,
+        )
+
+    return _encode(image, format, quality)
+
+
+def _digest(
+    data: bytes,
+) -> str:
+    return sha256(data).hexdigest()
+
+
+def _save(
+    data: bytes,
+    path: str,
+    **options: Any,
+) -> str:
+    with open(path, "wb") as file:
+        file.write(_pipeline(data, **options))
+
+    return path
+
+
+def _merge(
+    first: bytes,
+    second: bytes,
+) -> bytes:
+    base: Image.Image = _decode(first).convert("RGBA")
+
+    # второе изображение подгоняется под размер первого
+    overlay: Image.Image = _decode(second).convert("RGBA").resize(base.size)
+
+    return _encode(
+        Image.alpha_composite(base, overlay),
+        "PNG",
+    )
+
+
+class ImageProcessor:
+    """Обработка изображений (Pillow) вне event loop.
+
+    Декодирование и кодирование выполняются в ограниченном пуле потоков
+    или, при `processes=True`, процессов. Все загрузки используют один
+    конвейер: декодирование → поворот по EXIF → цветовой режим →
+    уменьшение → кодирование без метаданных.
+
+    Перед отправкой провайдеру (`prepare`) изображение уменьшается до
+    стороны, заданной для эндпоинта в `max_sides`; результат кэшируется
+    по хэшу исходника.
+
+    Args:
+        max_workers (int): Максимум одновременно обрабатываемых изображений
+        processes (bool): Использовать пул процессов вместо пула потоков
+        max_sides (dict[str, int], optional): Максимальная сторона по
+            эндпоинтам, `default` — для остальных
+        quality (int): Качество JPEG при подготовке
+        cache_size (int): Сколько подготовленных изображений держать в кэше
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        processes: bool = False,
+        max_sides: dict[str, int] | None = None,
+        quality: int = 85,
+        cache_size: int = 64,
+    ) -> None:
+        self._max_sides = max_sides or {}
+        self._quality = quality
+        self._cache_size = cache_size
+        self._prepared: OrderedDict[tuple[str, int, str], tuple[bytes, str, str]] = (
+            OrderedDict()
+        )
+        self._executor: Executor = (
+            ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=register_heif_opener,
+            )
+            if processes
+            else ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="image",
+            )
+        )
+
+    async def __run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        return await get_running_loop().run_in_executor(
+            self._executor,
+            partial(func, *args, **kwargs),
+        )
+
+    async def process(
+        self,
+        data: bytes,
+        format: str = "JPEG",
+        mode: str | None = "RGB",
+        max_side: int | None = None,
+        quality: int | None = None,
+    ) -> tuple[bytes, str, str]:
+        """Перекодирует изображение.
+
+        Args:
+            data (bytes): Исходное изображение (в т.ч. HEIC/HEIF)
+            format (str): Формат результата (`JPEG`, `PNG`, `WEBP`)
+            mode (str, optional): Цветовой режим (`None` — не менять)
+            max_side (int, optional): Максимальная сторона в пикселях
+            quality (int, optional): Качество JPEG/WEBP
+
+        Returns:
+            tuple[bytes, str, str]: Изображение, расширение и MIME-тип
+
+        Raises:
+            ValueError: Пустой файл
+        """
+        ext, content_type = IMAGE_FORMATS[format]
+
+        image_bytes: bytes = await self.__run(
+            _pipeline,
+            data,
+            format=format,
+            mode=mode,
+            max_side=max_side,
+            quality=quality,
+        )
+
+        return image_bytes, ext, content_type
+
+    async def prepare(
+        self,
+        data: bytes,
+        endpoint: str,
+    ) -> tuple[bytes, str, str]:
+        """Готовит изображение к отправке провайдеру (JPEG без метаданных).
+
+        Args:
+            data (bytes): Исходное изображение (в т.ч. HEIC/HEIF)
+            endpoint (str): Эндпоинт (ключ `max_sides`)
+
+        Returns:
+            tuple[bytes, str, str]: Изображение, расширение и MIME-тип
+        """
+        max_side: int = self._max_sides.get(
+            endpoint,
+            self._max_sides.get("default", 0),
+        )
+
+        key: tuple[str, int, str] = (
+            endpoint,
+            max_side,
+            await self.__run(_digest, data),
+        )
+
+        prepared = self._prepared.get(key)
+        if prepared is not None:
+            self._prepared.move_to_end(key)
+            return prepared
+
+        prepared = await self.process(
+            data,
+            max_side=max_side or None,
+            quality=self._quality,
+        )
+
+        self._prepared[key] = prepared
+        while len(self._prepared) > self._cache_size:
+            self._prepared.popitem(last=False)
+
+        return prepared
+
+    async def save(
+        self,
+        data: bytes,
+        path: str,
+        format: str = "JPEG",
+        mode: str | None = "RGB",
+        max_side: int | None = None,
+        quality: int | None = None,
+    ) -> str:
+        """Перекодирует изображение и записывает его в `path`."""
+        return await self.__run(
+            _save,
+            data,
+            path,
+            format=format,
+            mode=mode,
+            max_side=max_side,
+            quality=quality,
+        )
+
+    async def merge(
+        self,
+        first: bytes,
+        second: bytes,
+    ) -> bytes:
+        """Накладывает второе изображение на первое (PNG)."""
+        return await self.__run(
+            _merge,
+            first,
+            second,
+        )
+
+
+image_processor = ImageProcessor(
+    max_workers=conf.image_max_workers,
+    processes=conf.image_processes,
+    max_sides=conf.image_max_sides,
+    quality=conf.image_quality,
+    cache_size=conf.image_cache_size,
+)
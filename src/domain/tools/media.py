@@ -1,8 +1,12 @@
 # coding utf-8
 
-from typing import (
-    Any,
-    Generator,
+from typing import Mapping
+
+from datetime import datetime
+
+from email.utils import (
+    formatdate,
+    parsedate_to_datetime,
 )
 
 from json import (
@@ -10,98 +14,100 @@ from json import (
     JSONDecodeError,
 )
 
-from subprocess import CompletedProcess, run
+from subprocess import CompletedProcess
+
+from fastapi.responses import (
+    FileResponse,
+    Response,
+)
 
-from fastapi.responses import StreamingResponse
+from ..conf import app_conf
 
-from ..entities.core import IMediaFile
+from ..entities.core import (
+    IConfEnv,
+    IMediaFile,
+)
 
 from ..constants import CHUNK_SIZE, SUBTITLE_COMMAND
 
+from .process import media_runner
 
-def read_file_chunked(
-    path: str,
-    start: int = 0,
-    end: int | None = None,
-) -> Generator[bytes, Any, None]:
-    with open(path, "rb") as f:
-        f.seek(start)
-        remaining = (end - start + 1) if end is not None else None
-
-        while True:
-            read_len = min(CHUNK_SIZE, remaining) if remaining else CHUNK_SIZE
-            data = f.read(read_len)
-            if not data:
-                break
-            yield data
-            if remaining:
-                remaining -= len(data)
-                if remaining <= 0:
-                    break
-
-
-def parse_range(
-    range_header: str,
-    file_size: int,
-) -> tuple[int, int]:
-    if not range_header.lower().startswith("bytes="):
-        raise ValueError("Invalid Range header format")
-
-    parts = range_header.removeprefix("bytes=").split("-")
-    try:
-        start = int(parts[0])
-        end = int(parts[1]) if len(parts) > 1 and parts[1] else file_size - 1
-    except (IndexError, ValueError):
-        raise ValueError("Invalid Range values")
 
-    if start > end or end >= file_size:
-        raise ValueError("Range out of bounds")
+conf: IConfEnv = app_conf()
 
-    return start, end
 
+def is_not_modified(
+    media: IMediaFile,
+    if_none_match: str | None = None,
+    if_modified_since: str | None = None,
+) -> bool:
+    """Проверяет условный запрос (`If-None-Match` / `If-Modified-Since`).
 
-def stream_media(
-    media: IMediaFile, range_header: str | None = None
-) -> StreamingResponse:
-    if media.is_video and range_header:
-        start, end = parse_range(range_header, media.size)
-        length = end - start + 1
-
-        headers = {
-            "Content-Range": f"bytes {start}-{end}/{media.size}",
-            "Accept-Ranges": "bytes",
-            "Content-Length": str(length),
-            "Content-Type": media.mime_type,
+    `If-Modified-Since` учитывается только без `If-None-Match` (RFC 9110).
+    """
+    if if_none_match is not None:
+        tags: set[str] = {
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
         }
-
-        return StreamingResponse(
-            read_file_chunked(media.path, start, end),
-            status_code=206,
+        return "*" in tags or media.etag in tags
+
+    if if_modified_since is not None:
+        try:
+            since: datetime = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return int(media.modified) <= since.timestamp()
+
+    return False
+
+
+def serve_media(
+    media: IMediaFile,
+    request_headers: Mapping[str, str],
+) -> Response:
+    """Отдает файл с кэшированием и поддержкой Range.
+
+    Повторный запрос с совпадающим `ETag` / `Last-Modified` получает 304
+    без тела. Остальное делает `FileResponse`: одиночные и множественные
+    (`multipart/byteranges`) диапазоны, `If-Range` и HEAD; файл читается
+    частями по `CHUNK_SIZE` в пуле потоков.
+    """
+    headers: dict[str, str] = {
+        "ETag": media.etag,
+        "Last-Modified": formatdate(media.modified, usegmt=True),
+        "Cache-Control": (
+            f"public, max-age={conf.media_cache_max_age}, immutable"
+            if conf.media_cache_max_age
+            else "no-cache"
+        ),
+    }
+
+    if is_not_modified(
+        media,
+        request_headers.get("if-none-match"),
+        request_headers.get("if-modified-since"),
+    ):
+        return Response(
+            status_code=304,
             headers=headers,
-            media_type=media.mime_type,
         )
 
-    else:
-        headers = {
-            "Accept-Ranges": "bytes" if media.is_video else "none",
-            "Content-Length": str(media.size),
-            "Content-Type": media.mime_type,
-        }
+    response = FileResponse(
+        media.path,
+        headers=headers,
+        media_type=media.mime_type,
+    )
+    response.chunk_size = CHUNK_SIZE
 
-        return StreamingResponse(
-            read_file_chunked(media.path),
-            status_code=200,
-            headers=headers,
-            media_type=media.mime_type,
-        )
+    return response
 
 
-def overlay_subtitles(
+async def overlay_subtitles(
     input_path: str,
     subtitle_path: str,
     font_name: str,
     output_path: str,
-) -> CompletedProcess[bytes]:
+) -> CompletedProcess[str]:
     command = [
         arg.format(
             input_path=input_path,
@@ -112,7 +118,7 @@ def overlay_subtitles(
         for arg in SUBTITLE_COMMAND
     ]
 
-    return run(command, check=True)
+    return await media_runner.run(command)
 
 
 async def has_audio(filepath: str) -> bool:
@@ -128,9 +134,24 @@ async def has_audio(filepath: str) -> bool:
         "json",
         filepath,
     ]
-    result = run(cmd, capture_output=True, text=True)
+    result = await media_runner.run(cmd, check=False)
     try:
         info = loads(result.stdout or "{}")
     except JSONDecodeError:
         return False
     return bool(info.get("streams"))
+
+
+async def probe_duration(filepath: str) -> float:
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-show_entries",
+        "format=duration",
+        "-of",
+        "json",
+        filepath,
+    ]
+    result = await media_runner.run(cmd)
+    return float(loads(result.stdout)["format"]["duration"])
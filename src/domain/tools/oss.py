@@ -0,0 +1,235 @@
+# coding utf-8
+
+import logging
+
+from typing import Any
+
+from threading import Lock
+
+from time import monotonic
+
+from collections import (
+    Counter,
+    OrderedDict,
+)
+
+from concurrent.futures import ThreadPoolExecutor
+
+from asyncio import get_running_loop
+
+from oss2 import (
+    Bucket,
+    Session,
+    StsAuth,
+)
+from oss2.models import PartInfo
+
+from ..conf import app_conf
+
+from ..entities.core import IConfEnv
+
+
+conf: IConfEnv = app_conf()
+
+
+logger = logging.getLogger(__name__)
+
+
+class OSSUploader:
+    """Загрузка файлов в Alibaba OSS вне event loop.
+
+    SDK `oss2` синхронный, поэтому передача выполняется в отдельном
+    ограниченном пуле потоков. Объекты `Bucket` кэшируются по
+    STS-учетным данным и используют общую HTTP-сессию (пул соединений).
+    Файлы больше `multipart_threshold` загружаются по частям, части
+    отправляются параллельно. Объем и время загрузок накапливаются в
+    `metrics` и отдаются в `/metrics`.
+
+    Args:
+        max_workers (int): Максимум одновременных загрузок
+        multipart_threshold (int): Размер, начиная с которого файл грузится
+            по частям (байт)
+        part_size (int): Размер части (байт)
+        part_workers (int): Максимум одновременно отправляемых частей
+        max_buckets (int): Сколько объектов `Bucket` держать в кэше
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        multipart_threshold: int = 10 * 1024 * 1024,
+        part_size: int = 5 * 1024 * 1024,
+        part_workers: int = 4,
+        max_buckets: int = 32,
+    ) -> None:
+        self._multipart_threshold = multipart_threshold
+        self._part_size = part_size
+        self._max_buckets = max_buckets
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="oss",
+        )
+        # части отправляются из отдельного пула, чтобы загрузки не ждали
+        # свободных потоков основного пула
+        self._part_executor = ThreadPoolExecutor(
+            max_workers=part_workers,
+            thread_name_prefix="oss-part",
+        )
+        self._session = Session()
+        self._buckets: OrderedDict[tuple[str, ...], Bucket] = OrderedDict()
+        self._lock = Lock()
+        self._counter: Counter = Counter()
+
+    def metrics(
+        self,
+    ) -> dict[str, Any]:
+        """Возвращает число загрузок, объем и среднюю скорость (МБ/с)."""
+        seconds: float = self._counter["milliseconds"] / 1000
+        return {
+            **self._counter,
+            "throughput": (
+                round(self._counter["bytes"] / seconds / 1024 / 1024, 3)
+                if seconds
+                else 0.0
+            ),
+        }
+
+    def __bucket(
+        self,
+        access_key_id: str,
+        access_key_secret: str,
+        security_token: str,
+        endpoint: str,
+        bucket_name: str,
+    ) -> Bucket:
+        key: tuple[str, ...] = (
+            access_key_id,
+            security_token,
+            endpoint,
+            bucket_name,
+        )
+
+        with self._lock:
+            bucket: Bucket | None = self._buckets.get(key)
+
+            if bucket is None:
+                bucket = Bucket(
+                    StsAuth(access_key_id, access_key_secret, security_token),
+                    endpoint,
+                    bucket_name=bucket_name,
+                    session=self._session,
+                )
+                self._buckets[key] = bucket
+
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self._max_buckets:
+                self._buckets.popitem(last=False)
+
+        return bucket
+
+    def __put_multipart(
+        self,
+        bucket: Bucket,
+        key: str,
+        data: bytes,
+    ) -> Any:
+        upload_id: str = bucket.init_multipart_upload(key).upload_id
+
+        try:
+            futures = [
+                self._part_executor.submit(
+                    bucket.upload_part,
+                    key,
+                    upload_id,
+                    number,
+                    data[offset : offset + self._part_size],
+                )
+                for number, offset in enumerate(
+                    range(0, len(data), self._part_size),
+                    start=1,
+                )
+            ]
+            parts: list[PartInfo] = [
+                PartInfo(number, future.result().etag)
+                for number, future in enumerate(futures, start=1)
+            ]
+            return bucket.complete_multipart_upload(key, upload_id, parts)
+        except Exception:
+            bucket.abort_multipart_upload(key, upload_id)
+            raise
+
+    def __put(
+        self,
+        bucket: Bucket,
+        key: str,
+        data: bytes,
+    ) -> Any:
+        if len(data) >= self._multipart_threshold:
+            return self.__put_multipart(bucket, key, data)
+        return bucket.put_object(key, data)
+
+    async def upload(
+        self,
+        data: bytes,
+        key: str,
+        access_key_id: str,
+        access_key_secret: str,
+        security_token: str,
+        endpoint: str,
+        bucket_name: str,
+    ) -> Any:
+        """Загружает объект в OSS.
+
+        Args:
+            data (bytes): Содержимое файла
+            key (str): Путь объекта в бакете
+            access_key_id (str): STS AccessKeyId
+            access_key_secret (str): STS AccessKeySecret
+            security_token (str): STS SecurityToken
+            endpoint (str): Адрес OSS
+            bucket_name (str): Имя бакета
+
+        Returns:
+            Any: Результат `oss2` (`PutObjectResult` и т.п.)
+        """
+        bucket: Bucket = self.__bucket(
+            access_key_id,
+            access_key_secret,
+            security_token,
+            endpoint,
+            bucket_name,
+        )
+
+        started: float = monotonic()
+
+        result: Any = await get_running_loop().run_in_executor(
+            self._executor,
+            self.__put,
+            bucket,
+            key,
+            data,
+        )
+
+        elapsed: float = monotonic() - started
+
+        self._counter["uploads"] += 1
+        self._counter["bytes"] += len(data)
+        self._counter["milliseconds"] += int(elapsed * 1000)
+
+        logger.info(
+            "oss: uploaded %s (%s bytes in %.2fs, %.2f MB/s)",
+            key,
+            len(data),
+            elapsed,
+            len(data) / elapsed / 1024 / 1024 if elapsed else 0.0,
+        )
+
+        return result
+
+
+oss_uploader = OSSUploader(
+    max_workers=conf.oss_max_workers,
+    multipart_threshold=conf.oss_multipart_threshold,
+    part_size=conf.oss_part_size,
+    part_workers=conf.oss_part_workers,
+)
@@ -0,0 +1,203 @@
+# coding utf-8
+
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+)
+
+from collections import deque
+
+from subprocess import CompletedProcess
+
+from weakref import WeakKeyDictionary
+
+from asyncio import (
+    AbstractEventLoop,
+    CancelledError,
+    Semaphore,
+    StreamReader,
+    TimeoutError,
+    create_subprocess_exec,
+    gather,
+    get_running_loop,
+    wait_for,
+)
+from asyncio.subprocess import PIPE
+
+from ..conf import app_conf
+
+from ..entities.core import IConfEnv
+
+from ..errors import MediaError
+
+
+conf: IConfEnv = app_conf()
+
+
+class MediaRunner:
+    """Асинхронный запуск ffmpeg/ffprobe.
+
+    Процессы запускаются через `asyncio` и не блокируют event loop;
+    число одновременных процессов ограничено, у каждого есть таймаут,
+    а при отмене запроса процесс завершается. stderr сохраняется
+    (последние `stderr_lines` строк) и попадает в `MediaError`.
+
+    Args:
+        max_concurrency (int): Максимум одновременных процессов
+        timeout (float): Таймаут процесса по умолчанию (сек.)
+        stderr_lines (int): Сколько последних строк stderr хранить
+    """
+
+    _semaphores: WeakKeyDictionary[AbstractEventLoop, Semaphore] = (
+        WeakKeyDictionary()
+    )
+
+    def __init__(
+        self,
+        max_concurrency: int = 2,
+        timeout: float = 600.0,
+        stderr_lines: int = 20,
+    ) -> None:
+        self._max_concurrency = max_concurrency
+        self._timeout = timeout
+        self._stderr_lines = stderr_lines
+
+    def __semaphore(
+        self,
+    ) -> Semaphore:
+        # семафор привязан к event loop, поэтому хранится по циклу
+        loop: AbstractEventLoop = get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = Semaphore(self._max_concurrency)
+        return self._semaphores[loop]
+
+    @staticmethod
+    async def __read(
+        stream: StreamReader,
+        sink: Callable[[str], Any],
+    ) -> None:
+        while line := await stream.readline():
+            sink(line.decode(errors="replace").rstrip())
+
+    @staticmethod
+    async def __collect(
+        stream: StreamReader,
+        chunks: list[bytes],
+    ) -> None:
+        while chunk := await stream.read(1 << 16):
+            chunks.append(chunk)
+
+    async def __execute(
+        self,
+        command: list[str],
+        stdout: Callable[[StreamReader], Awaitable[Any]],
+        timeout: float | None,
+        check: bool,
+    ) -> tuple[int, str]:
+        stderr: deque[str] = deque(maxlen=self._stderr_lines)
+
+        async with self.__semaphore():
+            process = await create_subprocess_exec(
+                *command,
+                stdout=PIPE,
+                stderr=PIPE,
+            )
+
+            try:
+                await wait_for(
+                    gather(
+                        stdout(process.stdout),
+                        self.__read(
+                            process.stderr,
+                            stderr.append,
+                        ),
+                        process.wait(),
+                    ),
+                    timeout or self._timeout,
+                )
+            except (TimeoutError, CancelledError) as err:
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                if isinstance(err, TimeoutError):
+                    raise MediaError(
+                        command[0],
+                        "timeout",
+                        stderr="\n".join(stderr),
+                    )
+                raise
+
+        if check and process.returncode != 0:
+            raise MediaError(
+                command[0],
+                "failed",
+                returncode=process.returncode,
+                stderr="\n".join(stderr),
+            )
+
+        return process.returncode, "\n".join(stderr)
+
+    async def run(
+        self,
+        command: list[str],
+        timeout: float | None = None,
+        check: bool = True,
+    ) -> CompletedProcess[str]:
+        """Запускает процесс и ждет его завершения.
+
+        Args:
+            command (list[str]): Команда и аргументы
+            timeout (float, optional): Таймаут (по умолчанию из конструктора)
+            check (bool): Бросать `MediaError` при ненулевом коде возврата
+
+        Returns:
+            CompletedProcess[str]: Код возврата, stdout и хвост stderr
+
+        Raises:
+            MediaError: Процесс завершился с ошибкой или по таймауту
+        """
+        stdout: list[str] = []
+
+        returncode, stderr = await self.__execute(
+            command,
+            lambda stream: self.__read(stream, stdout.append),
+            timeout,
+            check,
+        )
+
+        return CompletedProcess(
+            command,
+            returncode,
+            "\n".join(stdout),
+            stderr,
+        )
+
+    async def output(
+        self,
+        command: list[str],
+        timeout: float | None = None,
+    ) -> bytes:
+        """Запускает процесс и возвращает его stdout без декодирования.
+
+        Используется для двоичного вывода (например, PCM из `pipe:1`).
+
+        Raises:
+            MediaError: Процесс завершился с ошибкой или по таймауту
+        """
+        chunks: list[bytes] = []
+
+        await self.__execute(
+            command,
+            lambda stream: self.__collect(stream, chunks),
+            timeout,
+            True,
+        )
+
+        return b"".join(chunks)
+
+
+media_runner = MediaRunner(
+    max_concurrency=conf.media_max_processes,
+    timeout=conf.media_process_timeout,
+)
@@ -0,0 +1,116 @@
+# coding utf-8
+
+import json
+
+import logging
+
+from typing import Any
+
+from collections import Counter
+
+from redis.exceptions import RedisError
+
+from ..repositories import IRedis
+
+
+logger = logging.getLogger(__name__)
+
+
+class RedisJSONCache:
+    """JSON значения в Redis со счетчиками попаданий.
+
+    Ошибки Redis не прерывают запрос: чтение считается промахом, запись
+    пропускается. Без `engine` кэш всегда пуст, но счетчики ведутся.
+    Счетчики всех кэшей процесса доступны через `metrics`.
+
+    Args:
+        name (str): Имя кэша в метриках и логах
+        engine (IRedis, optional): Подключение к Redis
+    """
+
+    _metrics: dict[str, Counter] = {}
+
+    def __init__(
+        self,
+        name: str,
+        engine: IRedis | None = None,
+    ) -> None:
+        self._name = name
+        self._engine = engine
+        self._counter: Counter = self._metrics.setdefault(name, Counter())
+
+    @classmethod
+    def metrics(
+        cls,
+    ) -> dict[str, dict[str, int]]:
+        """Возвращает счетчики попаданий, промахов и ошибок по кэшам."""
+        return {name: dict(counter) for name, counter in cls._metrics.items()}
+
+    def count(
+        self,
+        event: str,
+    ) -> None:
+        """Увеличивает счетчик события (`hits`, `misses`, ...)."""
+        self._counter[event] += 1
+
+    def __failed(
+        self,
+        operation: str,
+        err: RedisError,
+    ) -> None:
+        self._counter["errors"] += 1
+        logger.warning(
+            "%s cache: %s failed (%s)",
+            self._name,
+            operation,
+            err.__class__.__name__,
+        )
+
+    async def get(
+        self,
+        key: str,
+    ) -> tuple[bool, Any, float | None]:
+        """Читает значение вместе с остатком TTL ключа.
+
+        Попадания не считаются: что считать попаданием, решает вызывающий.
+
+        Args:
+            key (str): Ключ Redis
+
+        Returns:
+            tuple[bool, Any, float | None]: Найден ли ключ, значение и
+                остаток TTL (сек.; `None` — ключ без срока)
+        """
+        if self._engine is None:
+            return False, None, None
+
+        try:
+            async with self._engine.client.pipeline(transaction=False) as pipe:
+                data, expires_in = await pipe.get(key).pttl(key).execute()
+        except RedisError as err:
+            self.__failed("read", err)
+            return False, None, None
+
+        if data is None:
+            return False, None, None
+
+        return True, json.loads(data), expires_in / 1000 if expires_in > 0 else None
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: int,
+    ) -> None:
+        """Сохраняет значение на `ttl` секунд."""
+        if self._engine is None:
+            return
+
+        try:
+            await self._engine.client.set(
+                key,
+                json.dumps(value),
+                ex=ttl,
+            )
+        except RedisError as err:
+            self.__failed("write", err)
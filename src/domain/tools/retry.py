@@ -0,0 +1,278 @@
+# coding utf-8
+
+import logging
+
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    TypeVar,
+)
+
+from enum import Enum
+
+from time import monotonic
+
+from random import uniform
+
+from asyncio import sleep
+
+from collections import Counter
+
+from fastapi import HTTPException
+
+from ..errors import UpstreamError
+
+
+T = TypeVar("T")
+
+
+logger = logging.getLogger(__name__)
+
+
+RETRY_STATUSES: frozenset[int] = frozenset({408, 409, 425, 429})
+
+
+class RetryDecision(str, Enum):
+    RETRY = "retry"
+    REAUTH = "reauth"
+    FATAL = "fatal"
+
+
+class RetryBudget:
+    """Бюджет повторов для одного внешнего сервиса.
+
+    Каждый вызов пополняет бюджет на `ratio`, каждый повтор списывает единицу.
+    Когда сервис деградирует, повторы быстро исчерпывают бюджет и запросы
+    перестают умножать нагрузку на него.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        reserve: float = 10.0,
+    ) -> None:
+        self._ratio = ratio
+        self._reserve = reserve
+        self._tokens = reserve
+
+    def deposit(
+        self,
+    ) -> None:
+        self._tokens = min(self._reserve, self._tokens + self._ratio)
+
+    def withdraw(
+        self,
+    ) -> bool:
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+class RetryPolicy:
+    """Политика повторов запросов к внешнему сервису.
+
+    Заменяет ручные циклы `for attempt in range(10)` в клиентах:
+
+    - экспоненциальная задержка с джиттером и общий дедлайн на вызов;
+    - классификация ошибок: коды провайдера, требующие переавторизации
+      или не подлежащие повтору, и HTTP статусы;
+    - общий бюджет повторов на сервис;
+    - хук переавторизации, который заменяет токен для следующих попыток;
+    - счетчики попыток по вызовам (`metrics`).
+
+    Args:
+        name (str): Имя внешнего сервиса (ключ бюджета и метрик)
+        max_attempts (int): Максимум попыток на один вызов
+        base_delay (float): Начальная задержка между попытками (сек.)
+        max_delay (float): Максимальная задержка между попытками (сек.)
+        deadline (float): Общий лимит времени на вызов со всеми повторами (сек.)
+        fatal_codes (set): Коды провайдера, при которых повтор бессмыслен
+        reauth_codes (set): Коды провайдера, при которых нужна переавторизация
+        retry_codes (set): Коды провайдера, которые стоит повторить несмотря на 4xx
+        retry_statuses (set): HTTP статусы 4xx, которые стоит повторить
+        budget (RetryBudget, optional): Бюджет повторов
+    """
+
+    _metrics: dict[str, Counter] = {}
+
+    def __init__(
+        self,
+        name: str,
+        max_attempts: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 4.0,
+        deadline: float = 30.0,
+        fatal_codes: set[int | str] = frozenset(),
+        reauth_codes: set[int | str] = frozenset(),
+        retry_codes: set[int | str] = frozenset(),
+        retry_statuses: set[int] = RETRY_STATUSES,
+        budget: RetryBudget | None = None,
+    ) -> None:
+        self._name = name
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._deadline = deadline
+        self._fatal_codes = fatal_codes
+        self._reauth_codes = reauth_codes
+        self._retry_codes = retry_codes
+        self._retry_statuses = retry_statuses
+        self._budget = budget or RetryBudget()
+        self._counter: Counter = self._metrics.setdefault(name, Counter())
+
+    @classmethod
+    def metrics(
+        cls,
+    ) -> dict[str, dict[str, int]]:
+        """Возвращает счетчики вызовов, попыток и исходов по сервисам."""
+        return {name: dict(counter) for name, counter in cls._metrics.items()}
+
+    def classify(
+        self,
+        err: BaseException,
+    ) -> RetryDecision:
+        """Определяет, как поступить с ошибкой попытки.
+
+        Args:
+            err (BaseException): Ошибка попытки
+
+        Returns:
+            RetryDecision: Повторить, переавторизоваться или завершить вызов
+        """
+        # сервис отключен автоматом или перегружен: повтор только добавит нагрузку
+        if isinstance(err, UpstreamError):
+            return RetryDecision.FATAL
+
+        code: int | str | None = getattr(err, "code", None)
+
+        if code is not None:
+            if code in self._fatal_codes:
+                return RetryDecision.FATAL
+            if code in self._reauth_codes:
+                return RetryDecision.REAUTH
+            if code in self._retry_codes:
+                return RetryDecision.RETRY
+
+        if isinstance(err, HTTPException):
+            if err.status_code == 401:
+                return RetryDecision.REAUTH
+            if err.status_code in self._retry_statuses or err.status_code >= 500:
+                return RetryDecision.RETRY
+            return RetryDecision.FATAL
+
+        return RetryDecision.RETRY
+
+    def __delay(
+        self,
+        attempt: int,
+    ) -> float:
+        return uniform(
+            0,
+            min(self._max_delay, self._base_delay * 2**attempt),
+        )
+
+    async def run(
+        self,
+        call: Callable[..., Awaitable[T]],
+        token: Callable[[], Awaitable[Any]] | None = None,
+        reauth: Callable[[], Awaitable[Any]] | None = None,
+        check: Callable[[T], Any] | None = None,
+    ) -> T:
+        """Выполняет вызов с повторами.
+
+        Args:
+            call: Корутина попытки; если задан `token`, получает токен аргументом
+            token: Получение токена (вызывается один раз на вызов)
+            reauth: Переавторизация, возвращает новый токен
+            check: Проверка ответа; исключение считается неудачной попыткой
+
+        Returns:
+            T: Результат успешной попытки
+
+        Raises:
+            Exception: Ошибка последней попытки
+        """
+        started: float = monotonic()
+
+        credentials: Any = await token() if token is not None else None
+        reauthenticated: bool = False
+
+        self._budget.deposit()
+        self._counter["calls"] += 1
+
+        attempt: int = 0
+
+        while True:
+            attempt += 1
+            self._counter["attempts"] += 1
+
+            try:
+                result: T = await (
+                    call(credentials) if token is not None else call()
+                )
+                if check is not None:
+                    check(result)
+            except Exception as err:
+                decision: RetryDecision = self.classify(err)
+                last_attempt: bool = attempt >= self._max_attempts
+
+                if decision is RetryDecision.FATAL or (
+                    decision is RetryDecision.REAUTH and reauth is None
+                ):
+                    self.__record(attempt, "fatal")
+                    raise err
+
+                # как и раньше, перед последней попыткой токен обновляется
+                # даже без явной ошибки авторизации
+                if (
+                    reauth is not None
+                    and not reauthenticated
+                    and not last_attempt
+                    and (
+                        decision is RetryDecision.REAUTH
+                        or attempt == self._max_attempts - 1
+                    )
+                ):
+                    credentials = await reauth()
+                    reauthenticated = True
+                    self._counter["reauths"] += 1
+
+                    if decision is RetryDecision.REAUTH:
+                        continue
+
+                delay: float = self.__delay(attempt)
+
+                if last_attempt:
+                    self.__record(attempt, "exhausted")
+                    raise err
+                if monotonic() - started + delay >= self._deadline:
+                    self.__record(attempt, "deadline")
+                    raise err
+                if not self._budget.withdraw():
+                    self.__record(attempt, "budget")
+                    raise err
+
+                self._counter["retries"] += 1
+
+                logger.debug(
+                    "%s: attempt %s failed (%s), retrying in %.2fs",
+                    self._name,
+                    attempt,
+                    err.__class__.__name__,
+                    delay,
+                )
+                await sleep(delay)
+                continue
+
+            self.__record(attempt, "success")
+            return result
+
+    def __record(
+        self,
+        attempt: int,
+        outcome: str,
+    ) -> None:
+        self._counter[outcome] += 1
+        self._counter[f"attempts_{attempt}"] += 1
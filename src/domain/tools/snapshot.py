@@ -0,0 +1,92 @@
+# coding utf-8
+
+from typing import Iterable
+
+import zlib
+
+import numpy as np
+
+
+class RelationSnapshot:
+    """Снимок связей пользователя: отсортированный массив id в Instagram.
+
+    Новые подписчики, отписки и взаимные подписки вычисляются разностью
+    и пересечением массивов (numpy) без построчной работы с БД. Для
+    хранения id кодируются разностями соседних значений и сжимаются
+    zlib, поэтому снимок на миллион подписчиков занимает единицы МБ.
+
+    Args:
+        ids (np.ndarray): Уникальные id по возрастанию (int64)
+    """
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+    ) -> None:
+        self._ids = ids
+
+    @classmethod
+    def from_ids(
+        cls,
+        ids: Iterable[int],
+    ) -> "RelationSnapshot":
+        return cls(
+            np.unique(np.fromiter(ids, dtype=np.int64)),
+        )
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: bytes | None,
+    ) -> "RelationSnapshot":
+        if not data:
+            return cls(np.empty(0, dtype=np.int64))
+        deltas: np.ndarray = np.frombuffer(zlib.decompress(data), dtype="<i8")
+        return cls(np.cumsum(deltas, dtype=np.int64))
+
+    def to_bytes(
+        self,
+    ) -> bytes:
+        return zlib.compress(
+            np.diff(self._ids, prepend=0).astype("<i8").tobytes(),
+        )
+
+    @property
+    def ids(
+        self,
+    ) -> np.ndarray:
+        return self._ids
+
+    def __len__(
+        self,
+    ) -> int:
+        return int(self._ids.size)
+
+    def __and__(
+        self,
+        other: "RelationSnapshot",
+    ) -> "RelationSnapshot":
+        return RelationSnapshot(
+            np.intersect1d(self._ids, other.ids, assume_unique=True),
+        )
+
+    def __sub__(
+        self,
+        other: "RelationSnapshot",
+    ) -> "RelationSnapshot":
+        return RelationSnapshot(
+            np.setdiff1d(self._ids, other.ids, assume_unique=True),
+        )
+
+    def page(
+        self,
+        size: int,
+        after: int | None = None,
+    ) -> list[int]:
+        """Возвращает до `size` id, больших `after` (ключевая пагинация)."""
+        start: int = (
+            int(np.searchsorted(self._ids, after, side="right"))
+            if after is not None
+            else 0
+        )
+        return self._ids[start : start + size].tolist()
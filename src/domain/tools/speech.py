@@ -0,0 +1,134 @@
+# coding utf-8
+
+from typing import (
+    Any,
+    Callable,
+    TypeVar,
+)
+
+from threading import Lock
+
+from concurrent.futures import ThreadPoolExecutor
+
+from asyncio import get_running_loop
+
+import whisper
+
+from faster_whisper import WhisperModel
+
+from ..conf import app_conf
+
+from ..entities.core import IConfEnv
+
+
+T = TypeVar("T")
+
+
+conf: IConfEnv = app_conf()
+
+
+class SpeechModelRegistry:
+    """Реестр моделей распознавания речи процесса.
+
+    Каждая модель загружается один раз при первом обращении (или при
+    старте приложения через `preload`) и разделяется всеми запросами.
+    Загрузка и распознавание выполняются в пуле потоков модели, поэтому
+    не блокируют event loop. Модель не обязана быть потокобезопасной
+    (openai-whisper ставит хуки kv-cache на общий модуль), поэтому по
+    умолчанию у каждой модели один поток и вызовы выполняются по
+    очереди; параллельность задается в `workers` только для моделей,
+    которые ее поддерживают (faster-whisper с `num_workers`).
+
+    Args:
+        loaders (dict): Функции загрузки моделей по имени
+        workers (dict[str, int], optional): Число потоков по моделям
+            (по умолчанию 1)
+    """
+
+    def __init__(
+        self,
+        loaders: dict[str, Callable[[], Any]],
+        workers: dict[str, int] | None = None,
+    ) -> None:
+        self._loaders = loaders
+        self._models: dict[str, Any] = {}
+        self._lock = Lock()
+        self._executors: dict[str, ThreadPoolExecutor] = {
+            name: ThreadPoolExecutor(
+                max_workers=(workers or {}).get(name, 1),
+                thread_name_prefix=f"speech-{name}",
+            )
+            for name in loaders
+        }
+
+    def __load(
+        self,
+        name: str,
+    ) -> Any:
+        # повторная проверка под блокировкой: два потока не загрузят модель дважды
+        with self._lock:
+            if name not in self._models:
+                self._models[name] = self._loaders[name]()
+            return self._models[name]
+
+    async def get(
+        self,
+        name: str,
+    ) -> Any:
+        """Возвращает модель, загружая ее при первом обращении."""
+        model: Any | None = self._models.get(name)
+
+        if model is None:
+            model = await get_running_loop().run_in_executor(
+                self._executors[name],
+                self.__load,
+                name,
+            )
+
+        return model
+
+    async def preload(
+        self,
+        *names: str,
+    ) -> None:
+        """Загружает модели заранее (при старте приложения)."""
+        for name in names:
+            await self.get(name)
+
+    async def run(
+        self,
+        name: str,
+        func: Callable[[Any], T],
+    ) -> T:
+        """Выполняет `func(model)` в пуле потоков модели.
+
+        Args:
+            name (str): Имя модели
+            func: Функция, получающая модель (например, вызов `transcribe`)
+
+        Returns:
+            T: Результат функции
+        """
+        model: Any = await self.get(name)
+
+        return await get_running_loop().run_in_executor(
+            self._executors[name],
+            func,
+            model,
+        )
+
+
+speech_models = SpeechModelRegistry(
+    loaders={
+        "whisper": lambda: whisper.load_model("base"),
+        "faster_whisper": lambda: WhisperModel(
+            "small",
+            device="cpu",
+            compute_type="int8",
+            num_workers=conf.speech_max_workers,
+        ),
+    },
+    workers={
+        "faster_whisper": conf.speech_max_workers,
+    },
+)
@@ -2,8 +2,6 @@
 
 from typing import Any
 
-import whisper
-
 from openai import OpenAI
 
 from deep_translator import GoogleTranslator
@@ -12,6 +10,8 @@ from ..conf import app_conf
 
 from ..constants import SEPARATOR
 
+from .speech import speech_models
+
 
 config = app_conf()
 
@@ -61,10 +61,27 @@ async def translate_batch(
 async def transcribe_audio(
     filepath: str,
 ) -> str | list:
-    model = whisper.load_model("base")
-
-    result = model.transcribe(
-        filepath,
-        verbose=False,
+    result = await speech_models.run(
+        "whisper",
+        lambda model: model.transcribe(
+            filepath,
+            verbose=False,
+        ),
     )
     return result["segments"]
+
+
+async def transcribe_words(
+    filepath: str,
+) -> list:
+    # сегменты faster-whisper ленивые: распознавание идет при переборе,
+    # поэтому список собирается в потоке пула
+    return await speech_models.run(
+        "faster_whisper",
+        lambda model: list(
+            model.transcribe(
+                filepath,
+                word_timestamps=True,
+            )[0]
+        ),
+    )
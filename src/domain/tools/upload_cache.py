@@ -0,0 +1,108 @@
+# coding utf-8
+
+from typing import Any
+
+from hashlib import sha256
+
+from asyncio import to_thread
+
+from ..conf import app_conf
+
+from ..repositories import IRedis
+
+from ..constants import UPLOAD_ASSET
+
+from ..entities.core import IConfEnv
+
+from .redis_cache import RedisJSONCache
+
+
+conf: IConfEnv = app_conf()
+
+
+class UploadCache:
+    """Кэш загруженных к провайдеру файлов по хэшу содержимого.
+
+    Загруженный файл виден только аккаунту, под которым он загружен,
+    поэтому ключ включает провайдера, аккаунт и sha256 содержимого.
+    Значение — данные, по которым провайдер находит файл (путь, ссылка).
+    Повтор запроса и повторная отправка того же файла на тот же аккаунт
+    не загружают файл заново. Ошибки Redis считаются промахом, счетчики
+    кэша — в `RedisJSONCache.metrics` под именем `upload`.
+
+    Args:
+        engine (IRedis): Подключение к Redis
+        ttl (int): Время жизни записи по умолчанию (сек.)
+        inline_size (int): До какого размера хэш считается в event loop
+    """
+
+    def __init__(
+        self,
+        engine: IRedis,
+        ttl: int = 86400,
+        inline_size: int = 1024 * 1024,
+    ) -> None:
+        self._cache = RedisJSONCache("upload", engine)
+        self._ttl = ttl
+        self._inline_size = inline_size
+
+    async def digest(
+        self,
+        data: bytes,
+    ) -> str:
+        """Возвращает sha256 содержимого (большие файлы — вне event loop)."""
+        if len(data) <= self._inline_size:
+            return sha256(data).hexdigest()
+        return await to_thread(lambda: sha256(data).hexdigest())
+
+    async def fetch(
+        self,
+        provider: str,
+        account_id: int,
+        digest: str,
+    ) -> dict[str, Any] | None:
+        """Ищет ранее загруженный файл.
+
+        Args:
+            provider (str): Провайдер (`pixverse`, `wan`, `qwen`)
+            account_id (int): Идентификатор аккаунта провайдера
+            digest (str): sha256 содержимого
+
+        Returns:
+            dict | None: Сохраненные данные файла или `None`
+        """
+        found, asset, _ = await self._cache.get(
+            UPLOAD_ASSET.format(
+                provider=provider,
+                account_id=account_id,
+                digest=digest,
+            )
+        )
+
+        self._cache.count("hits" if found else "misses")
+        return asset
+
+    async def store(
+        self,
+        provider: str,
+        account_id: int,
+        digest: str,
+        asset: dict[str, Any],
+        ttl: int | None = None,
+    ) -> None:
+        """Сохраняет данные загруженного файла (`ttl` — срок ссылки)."""
+        await self._cache.set(
+            UPLOAD_ASSET.format(
+                provider=provider,
+                account_id=account_id,
+                digest=digest,
+            ),
+            asset,
+            ttl or self._ttl,
+        )
+
+
+upload_cache = UploadCache(
+    engine=IRedis(conf),
+    ttl=conf.upload_cache_ttl,
+)
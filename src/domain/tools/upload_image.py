@@ -8,15 +8,11 @@ from typing import Any
 
 from base64 import b64decode
 
-from io import BytesIO
-
-from PIL import Image
+from fastapi import UploadFile, HTTPException
 
-from pillow_heif import register_heif_opener
+from .oss import oss_uploader
 
-from oss2 import StsAuth, Bucket
-
-from fastapi import UploadFile, HTTPException
+from .image import image_processor
 
 from ..entities.chatgpt import IFile
 
@@ -37,74 +33,48 @@ async def upload_file(
     access_key_id: str,
     access_key_secret: str,
     security_token: str,
-) -> bool:
-    bucket = Bucket(
-        StsAuth(access_key_id, access_key_secret, security_token),
-        BUCKET_URL,
-        bucket_name=BUCKET_NAME,
-    )
-    return bucket.put_object(
-        f"upload/{filename}",
+) -> Any:
+    return await oss_uploader.upload(
         image_bytes,
+        f"upload/{filename}",
+        access_key_id,
+        access_key_secret,
+        security_token,
+        BUCKET_URL,
+        BUCKET_NAME,
     )
 
 
 async def upload_qwen_file(
     data: QwenUploadData,
     image_bytes: bytes,
-) -> bool:
-    bucket = Bucket(
-        StsAuth(
-            data.access_key_id,
-            data.access_key_secret,
-            data.security_token,
-        ),
-        f"https://{data.endpoint}",
-        bucket_name=data.bucketname,
-    )
-    return bucket.put_object(
-        data.file_path,
+) -> Any:
+    return await oss_uploader.upload(
         image_bytes,
+        data.file_path,
+        data.access_key_id,
+        data.access_key_secret,
+        data.security_token,
+        f"https://{data.endpoint}",
+        data.bucketname,
     )
 
 
 async def convert_heic_to_jpg(
     image_bytes: bytes,
-) -> tuple[bytes, str]:
-    register_heif_opener()
-
-    if not image_bytes:
-        raise ValueError("Файл слишком мал или пуст — возможно, он нечитабелен.")
-
-    image = Image.open(
-        BytesIO(
-            image_bytes,
-        )
-    ).convert("RGB")
-
-    buffer = BytesIO()
-
-    image.save(buffer, format="JPEG")
-    return buffer.getvalue(), ".jpg", "image/jpeg"
+) -> tuple[bytes, str, str]:
+    return await image_processor.process(
+        image_bytes,
+    )
 
 
 async def convert_image_to_rgb_jpeg(
     image_bytes: bytes,
 ) -> tuple[bytes, str, str]:
-    image = Image.open(
-        BytesIO(
-            image_bytes,
-        ),
+    return await image_processor.process(
+        image_bytes,
     )
 
-    if image.mode != "RGB":
-        image = image.convert("RGB")
-
-    buffer = BytesIO()
-    image.save(buffer, format="JPEG")
-
-    return buffer.getvalue(), ".jpg", "image/jpeg"
-
 
 def save_upload_file(
     file: UploadFile,
@@ -162,21 +132,20 @@ async def upload_chatgpt_file(
     ).dict
 
 
-def b64_json_to_image(
+async def b64_json_to_image(
     b64_string: str,
-):
+) -> str:
     os.makedirs(os.path.join(UPLOAD_DIR, "photo"), exist_ok=True)
     image_bytes = b64decode(b64_string)
 
-    image = Image.open(BytesIO(image_bytes))
-
     unique_name = f"{uuid.uuid4()}.jpg"
 
     save_path = os.path.join(UPLOAD_DIR, "photo", unique_name)
 
-    image.save(save_path)
-
-    return save_path
+    return await image_processor.save(
+        image_bytes,
+        save_path,
+    )
 
 
 async def upload_chatgpt_files(
@@ -6,6 +6,12 @@ from ..conf import app_conf
 
 from functools import wraps
 
+from asyncio import (
+    Task,
+    create_task,
+    shield,
+)
+
 from fastapi import Request
 
 from fastapi.responses import JSONResponse
@@ -61,6 +67,10 @@ application_repository = ApplicationRepository(
 )
 
 
+# ссылки на задачи возврата токенов, чтобы их не собрал сборщик мусора
+_refunds: set[Task] = set()
+
+
 async def add_user_tokens(
     data: IWebhook,
 ) -> ISchema:
@@ -170,16 +180,18 @@ def check_user_tokens(method_cost: int):
                 many=True,
             )
 
-            user = None
+            charged: bool = False
             if applications and data.app_id in {
                 app.application_id for app in applications
             }:
-                user = await user_repository.fetch_with_filters(
-                    user_id=data.user_id,
-                    app_id=data.app_id,
+                # токены резервируются до генерации и возвращаются при ошибке
+                charged = await user_repository.debit_balance(
+                    data.user_id,
+                    data.app_id,
+                    method_cost,
                 )
 
-                if user is None or user.balance < method_cost:
+                if not charged:
                     raise PixverseError(
                         402,
                         extra={
@@ -187,19 +199,23 @@ def check_user_tokens(method_cost: int):
                         },
                     )
 
-            result = await func(*args, **kwargs)
-
-            if user:
-                user_data = UserUpdateData(
-                    user_id=data.user_id,
-                    app_id=data.app_id,
-                    balance=user.balance - method_cost,
-                    app_id_usage=user.app_id_usage + 1,
-                )
-
-                await user_repository.create_or_update_user_data(user_data)
-
-            return result
+            try:
+                return await func(*args, **kwargs)
+            except BaseException:
+                if charged:
+                    # возврат идет отдельной задачей: отмена запроса (разрыв
+                    # соединения, таймаут) не прерывает его на середине
+                    refund: Task = create_task(
+                        user_repository.refund_balance(
+                            data.user_id,
+                            data.app_id,
+                            method_cost,
+                        ),
+                    )
+                    _refunds.add(refund)
+                    refund.add_done_callback(_refunds.discard)
+                    await shield(refund)
+                raise
 
         return wrapper
 
@@ -24,6 +24,7 @@ from .common import (
     media_router,
     webhook_router,
     product_router,
+    metrics_router,
 )
 
 from .instagram import instagram_router
@@ -78,6 +79,7 @@ __all__: list[str] = [
     "media_router",
     "instagram_router",
     "webhook_router",
+    "metrics_router",
     "product_router",
     "cosmetic_router",
     "qwen_router",
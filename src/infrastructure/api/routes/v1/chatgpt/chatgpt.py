@@ -10,12 +10,7 @@ from os import (
 
 import asyncio
 import os
-import json
-from pydub import AudioSegment
-from pydub.effects import normalize
 import edge_tts
-from faster_whisper import WhisperModel
-from subprocess import run
 
 from fastapi import (
     HTTPException,
@@ -27,17 +22,25 @@ from fastapi import (
     APIRouter,
 )
 
+from fastapi.responses import JSONResponse
+
+from pydantic import HttpUrl
+
 from uuid import uuid4
 
 import tempfile
 
 from ......domain.tools import (
     transcribe_audio,
+    transcribe_words,
     translate_batch,
     overlay_subtitles,
     generate_srt,
     has_audio,
+    probe_duration,
+    media_runner,
     check_user_tokens,
+    AudioTimeline,
 )
 
 from ......domain.constants import (
@@ -70,6 +73,8 @@ from ......interface.schemas.external import (
     ChatGPTInstagram,
     ChatGPTSubtitle,
     ChatGPTResp,
+    IWanResponse,
+    IWanJob,
 )
 
 from .....factroies.api.v1 import (
@@ -91,6 +96,46 @@ def split_words(text: str) -> list[str]:
     return [w.strip() for w in re.findall(r"\S+", text) if w.strip()]
 
 
+async def fetch_job_response(
+    view: WanView,
+    data: IWanResponse,
+    wait: bool,
+    callback_url: HttpUrl | None,
+) -> ChatGPTResp | JSONResponse:
+    """Создает задачу генерации и возвращает результат или саму задачу.
+
+    При `wait` запрос ждет результат не дольше `wan_job_timeout`; если
+    генерация не успела завершиться (или `wait` выключен), возвращается
+    задача со статусом 202, результат которой забирается через
+    `/jobs/{job_id}` или приходит на `callback_url`.
+    """
+    job: IWanJob = await view.submit_job(
+        data,
+        str(callback_url) if callback_url else None,
+    )
+
+    if wait:
+        job = await view.wait_job(
+            job.job_id,
+        )
+
+        if job.status == "success":
+            return ChatGPTResp(
+                url=job.url,
+            )
+
+        if job.status == "error":
+            raise HTTPException(
+                status_code=502,
+                detail=job.detail,
+            )
+
+    return JSONResponse(
+        status_code=202,
+        content=job.dict,
+    )
+
+
 @chatgpt_router.post(
     "/text2photo",
     response_model=ChatGPTResp,
@@ -102,26 +147,22 @@ async def text_to_photo(
     body: IBody = Depends(),
     # app_id: str = Query(),
     # user_id: str = Query(),
+    wait: bool = Query(default=True),
+    callback_url: HttpUrl | None = Query(default=None),
     view: WanView = Depends(WanViewFactory.create),
-) -> ChatGPTResp:
+) -> ChatGPTResp | JSONResponse:
     data = await view.text_to_image(
         body,
         body.user_id,
         body.app_id,
     )
 
-    while True:
-        status = await view.fetch_media_status(
-            data.media_id,
-        )
-        if status.media_urls == "generating":
-            await asyncio.sleep(2)
-
-            continue
-
-        return ChatGPTResp(
-            url=status.media_urls[0],
-        )
+    return await fetch_job_response(
+        view,
+        data,
+        wait,
+        callback_url,
+    )
 
 
 @chatgpt_router.post(
@@ -136,8 +177,10 @@ async def image_to_image(
     body: IBody = Depends(),
     # app_id: str = Query(),
     # user_id: str = Query(),
+    wait: bool = Query(default=True),
+    callback_url: HttpUrl | None = Query(default=None),
     view: WanView = Depends(WanViewFactory.create),
-) -> ChatGPTResp:
+) -> ChatGPTResp | JSONResponse:
     data = await view.photo_to_photo(
         body,
         image,
@@ -145,18 +188,12 @@ async def image_to_image(
         body.app_id,
     )
 
-    while True:
-        status = await view.fetch_media_status(
-            data.media_id,
-        )
-        if status.media_urls == "generating":
-            await asyncio.sleep(2)
-
-            continue
-
-        return ChatGPTResp(
-            url=status.media_urls[0],
-        )
+    return await fetch_job_response(
+        view,
+        data,
+        wait,
+        callback_url,
+    )
 
 
 @chatgpt_router.post(
@@ -169,8 +206,10 @@ async def template_to_photo(
     request: Request,
     image: UploadFile,
     body: T2PBody = Depends(),
+    wait: bool = Query(default=True),
+    callback_url: HttpUrl | None = Query(default=None),
     view: WanView = Depends(WanViewFactory.create),
-) -> ChatGPTResp:
+) -> ChatGPTResp | JSONResponse:
     data = await view.template_to_photo(
         body.id,
         image,
@@ -178,18 +217,12 @@ async def template_to_photo(
         body.app_id,
     )
 
-    while True:
-        status = await view.fetch_media_status(
-            data.media_id,
-        )
-        if status.media_urls == "generating":
-            await asyncio.sleep(2)
-
-            continue
-
-        return ChatGPTResp(
-            url=status.media_urls[0],
-        )
+    return await fetch_job_response(
+        view,
+        data,
+        wait,
+        callback_url,
+    )
 
 
 @chatgpt_router.post(
@@ -203,8 +236,10 @@ async def template_to_avatar(
     image: UploadFile,
     body: IT2ABody,
     data: T2PBody = Depends(),
+    wait: bool = Query(default=True),
+    callback_url: HttpUrl | None = Query(default=None),
     view: WanView = Depends(WanViewFactory.create),
-) -> ChatGPTResp:
+) -> ChatGPTResp | JSONResponse:
     data = await view.template_to_avatar(
         data.id,
         body,
@@ -213,18 +248,26 @@ async def template_to_avatar(
         data.app_id,
     )
 
-    while True:
-        status = await view.fetch_media_status(
-            data.media_id,
-        )
-        if status.media_urls == "generating":
-            await asyncio.sleep(2)
+    return await fetch_job_response(
+        view,
+        data,
+        wait,
+        callback_url,
+    )
 
-            continue
 
-        return ChatGPTResp(
-            url=status.media_urls[0],
-        )
+@chatgpt_router.get(
+    "/jobs/{job_id}",
+    response_model=IWanJob,
+    response_model_exclude_none=True,
+)
+async def fetch_job(
+    job_id: str,
+    view: WanView = Depends(WanViewFactory.create),
+) -> IWanJob:
+    return await view.fetch_job(
+        job_id,
+    )
 
 
 @chatgpt_router.post(
@@ -355,7 +398,7 @@ async def video_to_subtitle(
         with open(srt_path, "w", encoding="utf-8") as f:
             f.write(srt_content)
 
-        overlay_subtitles(input_path, srt_path, font_name, output_path)
+        await overlay_subtitles(input_path, srt_path, font_name, output_path)
 
     except Exception:
         raise HTTPException(
@@ -400,28 +443,11 @@ async def video_to_voice(
 
     try:
         # --- Длительность видео ---
-        cmd = [
-            "ffprobe",
-            "-v",
-            "error",
-            "-show_entries",
-            "format=duration",
-            "-of",
-            "json",
-            input_path,
-        ]
-        result = run(cmd, capture_output=True, text=True, check=True)
-        duration_sec = float(json.loads(result.stdout)["format"]["duration"])
+        duration_sec = await probe_duration(input_path)
         total_ms = int(duration_sec * 1000)
 
         # --- Транскрибация с word_timestamps ---
-        model = WhisperModel("small", device="cpu", compute_type="int8")
-        segments, info = model.transcribe(
-            input_path,
-            word_timestamps=True,
-            # language="ru",  # если известен
-        )
-        segments = list(segments)
+        segments = await transcribe_words(input_path)
         segments = [s for s in segments if s.words and s.text.strip()]
 
         if not segments:
@@ -447,7 +473,7 @@ async def video_to_voice(
                 }
             )
 
-        timeline = AudioSegment.silent(duration=total_ms)
+        timeline = AudioTimeline(total_ms)
 
         for item in all_segments_data:
             orig_words = item["orig_words"]
@@ -466,22 +492,7 @@ async def video_to_voice(
                 communicate = edge_tts.Communicate(translated_text, voice)
                 await communicate.save(tts_file)
 
-                tts_audio = AudioSegment.from_file(tts_file)
-                target_dur = end_ms_global - start_ms_global
-                if len(tts_audio) > target_dur:
-                    tts_audio = tts_audio[:target_dur]
-                elif len(tts_audio) < target_dur:
-                    tts_audio = tts_audio + AudioSegment.silent(
-                        duration=target_dur - len(tts_audio)
-                    )
-                try:
-                    tts_audio = normalize(tts_audio)
-                except:
-                    pass
-
-                before = timeline[:start_ms_global]
-                after = timeline[end_ms_global:]
-                timeline = before + tts_audio + after
+                await timeline.place(tts_file, start_ms_global, end_ms_global)
                 os.remove(tts_file)
                 continue
 
@@ -499,47 +510,16 @@ async def video_to_voice(
                 if not os.path.exists(tts_file):
                     continue
                 word = orig_words[i]
-                start_ms = int(word.start * 1000)
-                end_ms = int(word.end * 1000)
-                target_dur = end_ms - start_ms
-
-                if target_dur <= 0 or start_ms >= total_ms:
-                    os.remove(tts_file)
-                    continue
-
-                tts_audio = AudioSegment.from_file(tts_file)
-                if len(tts_audio) == 0:
-                    os.remove(tts_file)
-                    continue
-
-                if len(tts_audio) > target_dur:
-                    tts_audio = tts_audio[:target_dur]
-                elif len(tts_audio) < target_dur:
-                    tts_audio = tts_audio + AudioSegment.silent(
-                        duration=target_dur - len(tts_audio)
-                    )
-
-                try:
-                    tts_audio = normalize(tts_audio)
-                except:
-                    pass
-
-                before = timeline[:start_ms]
-                after = timeline[end_ms:]
-                timeline = before + tts_audio + after
 
+                await timeline.place(
+                    tts_file,
+                    int(word.start * 1000),
+                    int(word.end * 1000),
+                )
                 os.remove(tts_file)
 
-        # --- Финальная длина ---
-        if len(timeline) != total_ms:
-            timeline = (
-                timeline[:total_ms]
-                if len(timeline) > total_ms
-                else timeline + AudioSegment.silent(duration=total_ms - len(timeline))
-            )
-
         # --- Экспорт ---
-        timeline.export(output_audio_path, format="wav")
+        timeline.export(output_audio_path)
 
         cmd = [
             "ffmpeg",
@@ -560,7 +540,7 @@ async def video_to_voice(
             str(duration_sec),
             output_path,
         ]
-        run(cmd, check=True)
+        await media_runner.run(cmd)
 
         return ChatGPTSubtitle(url=output_path)
 
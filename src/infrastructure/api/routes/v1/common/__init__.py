@@ -8,9 +8,12 @@ from .webhook import webhook_router
 
 from .product import product_router
 
+from .metrics import metrics_router
+
 __all__: list[str] = [
     "application_router",
     "media_router",
     "webhook_router",
     "product_router",
+    "metrics_router",
 ]
@@ -4,32 +4,41 @@ from pathlib import Path
 
 from fastapi import (
     APIRouter,
-    Header,
     HTTPException,
+    Request,
 )
 
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response
 
 from ......domain.entities.core import IMediaFile
 
-from ......domain.tools import stream_media
+from ......domain.tools import serve_media
 
 media_router = APIRouter(tags=["Media"])
 
 
-@media_router.get(
+MEDIA_ROOT = Path("uploads")
+
+
+@media_router.api_route(
     "/media/{full_path:path}",
+    methods=["GET", "HEAD"],
     include_in_schema=False,
 )
 async def get_media(
     full_path: str,
-    range: str | None = Header(default=None),
-) -> StreamingResponse:
+    request: Request,
+) -> Response:
     try:
         full_path = full_path.replace("uploads/", "")
 
-        file = IMediaFile(Path("uploads") / full_path)
-        return stream_media(file, range)
+        file = IMediaFile(MEDIA_ROOT / full_path)
+
+        # путь с `..` не должен выходить за каталог загрузок
+        if not file.path.is_relative_to(MEDIA_ROOT.resolve()):
+            raise FileNotFoundError(full_path)
+
+        return serve_media(file, request.headers)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="File not found")
     except ValueError as e:
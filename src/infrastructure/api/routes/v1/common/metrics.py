@@ -0,0 +1,38 @@
+# coding utf-8
+
+from typing import Any
+
+from fastapi import (
+    APIRouter,
+    Depends,
+)
+
+from ......domain.tools import (
+    validate_token,
+    CircuitBreaker,
+    RetryPolicy,
+    RedisJSONCache,
+    oss_uploader,
+)
+
+from ......domain.repositories import engine_registry
+
+
+metrics_router = APIRouter(tags=["Metrics"])
+
+
+@metrics_router.get(
+    "/metrics",
+    include_in_schema=False,
+)
+async def fetch_metrics(
+    _: str = Depends(validate_token),
+) -> dict[str, Any]:
+    """Состояние пулов и счетчики процесса, обслужившего запрос."""
+    return {
+        "pools": [pool.dict for pool in engine_registry.metrics()],
+        "breakers": CircuitBreaker.states(),
+        "retries": RetryPolicy.metrics(),
+        "caches": RedisJSONCache.metrics(),
+        "oss": oss_uploader.metrics(),
+    }
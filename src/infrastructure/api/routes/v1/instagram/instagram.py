@@ -9,6 +9,7 @@ from fastapi import (
 from typing import Literal
 
 from fastapi_pagination import Page
+from fastapi_pagination.cursor import CursorPage
 
 from ....views.v1 import (
     InstagramView,
@@ -214,7 +215,7 @@ async def fetch_subscribers(
     uuid: str,
     relation_type: Literal["new", "old", "unsub"] = "old",
     view: InstagramView = Depends(InstagramViewFactory.create),
-) -> Page[InstagramFollower]:
+) -> CursorPage[InstagramFollower]:
     return await view.fetch_subscribers(
         body,
         uuid,
@@ -230,7 +231,7 @@ async def fetch_tracking_subscribers(
     body: IInstagramUser,
     view: InstagramView = Depends(InstagramViewFactory.create),
     relation_type: Literal["new", "old", "unsub"] = "old",
-) -> Page[InstagramFollower]:
+) -> CursorPage[InstagramFollower]:
     return await view.fetch_tracking_subscribers(
         body,
         username,
@@ -245,7 +246,7 @@ async def fetch_secret_fans(
     body: IInstagramUser,
     uuid: str,
     view: InstagramView = Depends(InstagramViewFactory.create),
-) -> Page[InstagramFollower]:
+) -> CursorPage[InstagramFollower]:
     return await view.fetch_secret_fans(
         body,
         uuid,
@@ -259,7 +260,7 @@ async def fetch_tracking_secret_fans(
     body: IInstagramUser,
     username: str,
     view: InstagramView = Depends(InstagramViewFactory.create),
-) -> Page[InstagramFollower]:
+) -> CursorPage[InstagramFollower]:
     return await view.fetch_tracking_secret_fans(
         body,
         username,
@@ -288,7 +289,7 @@ async def fetch_subscribtions(
     uuid: str,
     relation_type: Literal["mutual", "not_followed_by"] = "mutual",
     view: InstagramView = Depends(InstagramViewFactory.create),
-) -> Page[InstagramFollower]:
+) -> CursorPage[InstagramFollower]:
     return await view.fetch_subscribtions(
         body,
         uuid,
@@ -304,7 +305,7 @@ async def fetch_tracking_subscribtions(
     username: str,
     relation_type: Literal["mutual", "not_followed_by"] = "mutual",
     view: InstagramView = Depends(InstagramViewFactory.create),
-) -> Page[InstagramFollower]:
+) -> CursorPage[InstagramFollower]:
     return await view.fetch_tracking_subscribtions(
         body,
         username,
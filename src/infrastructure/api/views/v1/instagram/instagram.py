@@ -1,6 +1,7 @@
 # # coding utf-8
 
 from fastapi_pagination import Page
+from fastapi_pagination.cursor import CursorPage
 
 from ......interface.controllers.api.v1 import InstagramController
 
@@ -124,7 +125,7 @@ class InstagramView:
         body: IInstagramUser,
         uuid: str,
         relation_type: str,
-    ) -> Page[InstagramFollower]:
+    ) -> CursorPage[InstagramFollower]:
         return await self._controller.fetch_subscribers(
             body,
             uuid,
@@ -136,7 +137,7 @@ class InstagramView:
         body: IInstagramUser,
         username: str,
         relation_type: str,
-    ) -> Page[InstagramFollower]:
+    ) -> CursorPage[InstagramFollower]:
         return await self._controller.fetch_tracking_subscribers(
             body,
             username,
@@ -147,7 +148,7 @@ class InstagramView:
         self,
         body: IInstagramUser,
         uuid: str,
-    ) -> Page[InstagramFollower]:
+    ) -> CursorPage[InstagramFollower]:
         return await self._controller.fetch_secret_fans(
             body,
             uuid,
@@ -157,7 +158,7 @@ class InstagramView:
         self,
         body: IInstagramUser,
         username: str,
-    ) -> Page[InstagramFollower]:
+    ) -> CursorPage[InstagramFollower]:
         return await self._controller.fetch_tracking_secret_fans(
             body,
             username,
@@ -168,7 +169,7 @@ class InstagramView:
         body: IInstagramUser,
         uuid: str,
         relation_type: str,
-    ) -> Page[InstagramFollower]:
+    ) -> CursorPage[InstagramFollower]:
         return await self._controller.fetch_subscribtions(
             body,
             uuid,
@@ -180,7 +181,7 @@ class InstagramView:
         body: IInstagramUser,
         username: str,
         relation_type: str,
-    ) -> Page[InstagramFollower]:
+    ) -> CursorPage[InstagramFollower]:
         return await self._controller.fetch_tracking_subscribtions(
             body,
             username,
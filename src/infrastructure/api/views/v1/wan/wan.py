@@ -5,6 +5,7 @@ from ......interface.controllers.api.v1 import WanController
 from ......interface.schemas.external import (
     IWanResponse,
     IWanMediaResponse,
+    IWanJob,
 )
 
 
@@ -94,3 +95,33 @@ class WanView:
             *args,
             **kwargs,
         )
+
+    async def submit_job(
+        self,
+        *args,
+        **kwargs,
+    ) -> IWanJob:
+        return await self._controller.submit_job(
+            *args,
+            **kwargs,
+        )
+
+    async def fetch_job(
+        self,
+        *args,
+        **kwargs,
+    ) -> IWanJob:
+        return await self._controller.fetch_job(
+            *args,
+            **kwargs,
+        )
+
+    async def wait_job(
+        self,
+        *args,
+        **kwargs,
+    ) -> IWanJob:
+        return await self._controller.wait_job(
+            *args,
+            **kwargs,
+        )
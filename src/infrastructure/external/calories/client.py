@@ -1,11 +1,7 @@
 # coding utf-8
 
-import os
-
 from fastapi import UploadFile
 
-from asyncio import sleep
-
 from .core import CaloriesCore
 
 from base64 import b64encode
@@ -22,14 +18,14 @@ from ....interface.schemas.external import (
     ChatGPTCaloriesResponse,
     ChatGPTErrorResponse,
     ChatGPTCalories,
-    ChatGPTError,
     ChatGPTWeightCalories,
     ChatGPTWeightCaloriesResponse,
 )
 
-from ....domain.constants import HEIF_EXTENSIONS
-
-from ....domain.tools import convert_heic_to_jpg
+from ....domain.tools import (
+    image_processor,
+    RetryPolicy,
+)
 
 from ....domain.errors import CaloriesError
 
@@ -42,6 +38,16 @@ telegram_bot = IBotReporter(
     conf,
 )
 
+retry_policy = RetryPolicy(
+    "calories",
+    retry_codes={
+        "rate_limit_exceeded",
+        "server_error",
+        "server_is_overloaded",
+        "engine_overloaded",
+    },
+)
+
 
 class CaloriesClient:
     """Клиентский интерфейс для работы с ChatGPT API.
@@ -61,230 +67,111 @@ class CaloriesClient:
     ) -> None:
         self._core = core
 
-    async def __handle_failure(
+    def __check_response(
         self,
-        last_error: ChatGPTError,
-        status_code: int | None = None,
-        extra: dict[str] = {},
-    ) -> CaloriesError:
-        error = CaloriesError(
-            status_code=status_code if status_code is not None else 400,
-            detail=last_error.message,
-            extra=extra,
-        )
-        raise error
+        data: ChatGPTCaloriesResponse
+        | ChatGPTWeightCaloriesResponse
+        | ChatGPTErrorResponse,
+    ) -> None:
+        if isinstance(data, ChatGPTErrorResponse):
+            raise CaloriesError(
+                status_code=400,
+                detail=data.error.message,
+                code=data.error.code,
+            )
 
     async def photo_to_calories(
         self,
         image: UploadFile,
     ) -> ChatGPTCalories:
-        max_attempts = 10
-
-        last_error = None
+        image_bytes, _, _ = await image_processor.prepare(
+            await image.read(),
+            "calories",
+        )
 
-        ext = str(os.path.splitext(image.filename)[-1]).lower()
-        image_bytes = await image.read()
+        image_base64 = b64encode(image_bytes).decode("utf-8")
 
-        if ext in HEIF_EXTENSIONS:
-            image_bytes, ext, _ = await convert_heic_to_jpg(
-                image_bytes,
+        async def call() -> ChatGPTCaloriesResponse | ChatGPTErrorResponse:
+            return await self._core.post(
+                token=conf.chatgpt_token,
+                endpoint=ChatGPTEndpoint.CHAT,
+                body=CaloriesBody.create_image(
+                    image_url=f"data:image/jpeg;base64,{image_base64}"
+                ),
             )
 
-        image_base64 = b64encode(image_bytes).decode("utf-8")
-
-        for attempt in range(max_attempts):
-            token = conf.chatgpt_token
-            try:
-
-                async def call(
-                    token: str,
-                ) -> ChatGPTCaloriesResponse | ChatGPTErrorResponse:
-                    return await self._core.post(
-                        token=token,
-                        endpoint=ChatGPTEndpoint.CHAT,
-                        body=CaloriesBody.create_image(
-                            image_url=f"data:image/jpeg;base64,{image_base64}"
-                        ),
-                    )
-
-                data: ChatGPTCaloriesResponse | ChatGPTErrorResponse = await call(token)
-
-                if not isinstance(data, ChatGPTErrorResponse):
-                    return data.fetch_data()
-
-                last_error = data.error
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    try:
-                        data = await call(token)
-
-                        if not data.error:
-                            return data.fetch_data()
-
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(last_error)
-                await sleep(1)
-        return await self.__handle_failure(
-            last_error,
-            extra={"Токен авторизации": token},
+        data: ChatGPTCaloriesResponse = await retry_policy.run(
+            call,
+            check=self.__check_response,
         )
 
+        return data.fetch_data()
+
     async def text_to_calories(
         self,
         description: str,
     ) -> ChatGPTCalories:
-        max_attempts = 10
-
-        last_error = None
-
-        for attempt in range(max_attempts):
-            token = conf.chatgpt_token
-            try:
-
-                async def call(
-                    token: str,
-                ) -> ChatGPTCaloriesResponse | ChatGPTErrorResponse:
-                    return await self._core.post(
-                        token=token,
-                        endpoint=ChatGPTEndpoint.CHAT,
-                        body=CaloriesBody.create_text(
-                            description=description,
-                        ),
-                    )
-
-                data: ChatGPTCaloriesResponse | ChatGPTErrorResponse = await call(token)
-
-                if not isinstance(data, ChatGPTErrorResponse):
-                    return data.fetch_data()
-
-                last_error = data.error
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    try:
-                        data = await call(token)
-
-                        if not data.error:
-                            return data.fetch_data()
-
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(last_error)
-                await sleep(1)
-        return await self.__handle_failure(
-            last_error,
-            extra={"Токен авторизации": token},
+        async def call() -> ChatGPTCaloriesResponse | ChatGPTErrorResponse:
+            return await self._core.post(
+                token=conf.chatgpt_token,
+                endpoint=ChatGPTEndpoint.CHAT,
+                body=CaloriesBody.create_text(
+                    description=description,
+                ),
+            )
+
+        data: ChatGPTCaloriesResponse = await retry_policy.run(
+            call,
+            check=self.__check_response,
         )
 
+        return data.fetch_data()
+
     async def text_to_weight_calories(
         self,
         description: str,
     ) -> ChatGPTWeightCalories:
-        max_attempts = 10
-
-        last_error = None
-
-        for attempt in range(max_attempts):
-            token = conf.chatgpt_token
-            try:
-
-                async def call(
-                    token: str,
-                ) -> ChatGPTWeightCaloriesResponse | ChatGPTErrorResponse:
-                    return await self._core.post(
-                        token=token,
-                        weight=True,
-                        endpoint=ChatGPTEndpoint.CHAT,
-                        body=CaloriesWeightBody.create_text(
-                            description=description,
-                        ),
-                    )
-
-                data: ChatGPTWeightCaloriesResponse | ChatGPTErrorResponse = await call(
-                    token
-                )
-
-                if not isinstance(data, ChatGPTErrorResponse):
-                    return data.fetch_data()
-
-                last_error = data.error
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    try:
-                        data = await call(token)
-
-                        if not data.error:
-                            return data.fetch_data()
-
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(last_error)
-                await sleep(1)
-        return await self.__handle_failure(
-            last_error,
-            extra={"Токен авторизации": token},
+        async def call() -> ChatGPTWeightCaloriesResponse | ChatGPTErrorResponse:
+            return await self._core.post(
+                token=conf.chatgpt_token,
+                weight=True,
+                endpoint=ChatGPTEndpoint.CHAT,
+                body=CaloriesWeightBody.create_text(
+                    description=description,
+                ),
+            )
+
+        data: ChatGPTWeightCaloriesResponse = await retry_policy.run(
+            call,
+            check=self.__check_response,
         )
 
+        return data.fetch_data()
+
     async def photo_to_weight_calories(
         self,
         image: UploadFile,
     ) -> ChatGPTWeightCalories:
-        max_attempts = 10
-
-        last_error = None
+        image_bytes, _, _ = await image_processor.prepare(
+            await image.read(),
+            "calories",
+        )
 
-        ext = str(os.path.splitext(image.filename)[-1]).lower()
-        image_bytes = await image.read()
+        image_base64 = b64encode(image_bytes).decode("utf-8")
 
-        if ext in HEIF_EXTENSIONS:
-            image_bytes, ext, _ = await convert_heic_to_jpg(
-                image_bytes,
+        async def call() -> ChatGPTWeightCaloriesResponse | ChatGPTErrorResponse:
+            return await self._core.post(
+                token=conf.chatgpt_token,
+                weight=True,
+                endpoint=ChatGPTEndpoint.CHAT,
+                body=CaloriesWeightBody.create_image(
+                    image_url=f"data:image/jpeg;base64,{image_base64}"
+                ),
             )
 
-        image_base64 = b64encode(image_bytes).decode("utf-8")
-
-        for attempt in range(max_attempts):
-            token = conf.chatgpt_token
-            try:
-
-                async def call(
-                    token: str,
-                ) -> ChatGPTWeightCaloriesResponse | ChatGPTErrorResponse:
-                    return await self._core.post(
-                        token=token,
-                        weight=True,
-                        endpoint=ChatGPTEndpoint.CHAT,
-                        body=CaloriesWeightBody.create_image(
-                            image_url=f"data:image/jpeg;base64,{image_base64}"
-                        ),
-                    )
-
-                data: ChatGPTWeightCaloriesResponse | ChatGPTErrorResponse = await call(
-                    token
-                )
-
-                if not isinstance(data, ChatGPTErrorResponse):
-                    return data.fetch_data()
-
-                last_error = data.error
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    try:
-                        data = await call(token)
-
-                        if not data.error:
-                            print(data)
-                            return data.fetch_data()
-
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(last_error)
-                await sleep(1)
-        return await self.__handle_failure(
-            last_error,
-            extra={"Токен авторизации": token},
+        data: ChatGPTWeightCaloriesResponse = await retry_policy.run(
+            call,
+            check=self.__check_response,
         )
+
+        return data.fetch_data()
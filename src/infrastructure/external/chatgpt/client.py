@@ -4,14 +4,8 @@ import os
 
 from fastapi import UploadFile
 
-from asyncio import sleep
-
 from base64 import b64encode
 
-from io import BytesIO
-
-from PIL import Image
-
 from .core import ChatGPTCore
 
 from ....domain.conf import app_conf
@@ -37,7 +31,8 @@ from ....domain.tools import (
     upload_chatgpt_file,
     upload_chatgpt_files,
     b64_json_to_image,
-    convert_heic_to_jpg,
+    image_processor,
+    RetryPolicy,
 )
 
 from ....domain.entities.chatgpt import (
@@ -60,14 +55,13 @@ from ....interface.schemas.external import (
     ChatGPTResponse,
     ChatGPTResp,
     ChatGPTErrorResponse,
-    ChatGPTError,
     GenerationData,
     UsrData,
     ChatGPTAntiquesResponse,
     Antiques,
 )
 
-from ....domain.constants import BODY_TOYBOX_PROMT, HEIF_EXTENSIONS
+from ....domain.constants import BODY_TOYBOX_PROMT
 
 
 conf: IConfEnv = app_conf()
@@ -86,6 +80,29 @@ user_data_database = UserDataRepository(
 )
 
 
+# временные ошибки OpenAI; остальные коды ответа с ошибкой (модерация,
+# неверный запрос, квота) не повторяются
+retry_policy = RetryPolicy(
+    "chatgpt",
+    deadline=120.0,
+    retry_codes={
+        "rate_limit_exceeded",
+        "server_error",
+        "server_is_overloaded",
+        "engine_overloaded",
+        "service_unavailable",
+        "timeout",
+        "request_timeout",
+    },
+)
+
+
+antiques_retry_policy = RetryPolicy(
+    "chatgpt_antiques",
+    max_attempts=2,
+)
+
+
 class ChatGPTClient:
     """Клиентский интерфейс для работы с ChatGPT API.
 
@@ -110,7 +127,7 @@ class ChatGPTClient:
         data: ChatGPTResponse,
     ) -> ChatGPTResp:
         video_data = ChatGPTResp(
-            url=b64_json_to_image(data.data[0].b64_json),
+            url=await b64_json_to_image(data.data[0].b64_json),
         )
         await user_generations_database.add_record(
             GenerationData(
@@ -129,9 +146,11 @@ class ChatGPTClient:
         return video_data
 
     async def file_to_base64(self, file: UploadFile) -> str:
-        data = await file.read()
+        data, _, mime = await image_processor.prepare(
+            await file.read(),
+            "chatgpt",
+        )
         b64 = b64encode(data).decode()
-        mime = file.content_type
         return f"data:{mime};base64,{b64}"
 
     async def build_swap_payload(
@@ -154,59 +173,36 @@ class ChatGPTClient:
             ],
         }
 
-    async def __handle_failure(
+    def __check_response(
         self,
-        last_error: ChatGPTError | str,
-        status_code: int | None = None,
-        extra: dict[str] = {},
-    ) -> PhotoGeneratorError:
-        error = PhotoGeneratorError(
-            status_code=status_code if status_code is not None else 400,
-            detail=last_error.message
-            if isinstance(last_error, ChatGPTError)
-            else last_error,
-            extra=extra,
-        )
-
-        raise error
+        data: ChatGPTResponse | ChatGPTErrorResponse,
+    ) -> None:
+        if isinstance(data, ChatGPTErrorResponse):
+            raise PhotoGeneratorError(
+                status_code=400,
+                detail=data.error.message,
+                code=data.error.code,
+            )
 
     async def text_to_photo(
         self,
         body: IBody,
         prompt: str,
     ) -> ChatGPTResp:
-        max_attempts = 10
-
-        last_error = None
-
-        for attempt in range(max_attempts):
-            token = conf.chatgpt_token
-            try:
-                data: ChatGPTResponse | ChatGPTErrorResponse = await self._core.post(
-                    token=token,
-                    endpoint=ChatGPTEndpoint.TEXT,
-                    body=PhotoBody(
-                        prompt=body.prompt if prompt is None else prompt,
-                    ),
-                )
-
-                if isinstance(data, ChatGPTErrorResponse):
-                    last_error = data.error
-                else:
-                    return await self.__handle_success(
-                        body,
-                        data,
-                    )
-
-            except Exception as err:
-                last_error = str(err)
-
-            if attempt < max_attempts - 1:
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_error,
-            extra={"Токен авторизации": token},
+        data: ChatGPTResponse = await retry_policy.run(
+            lambda: self._core.post(
+                token=conf.chatgpt_token,
+                endpoint=ChatGPTEndpoint.TEXT,
+                body=PhotoBody(
+                    prompt=body.prompt if prompt is None else prompt,
+                ),
+            ),
+            check=self.__check_response,
+        )
+
+        return await self.__handle_success(
+            body,
+            data,
         )
 
     async def photo_to_photo(
@@ -215,42 +211,24 @@ class ChatGPTClient:
         image: UploadFile,
         prompt: str,
     ) -> ChatGPTResp:
-        max_attempts = 10
-
-        last_error = None
-
         files = await upload_chatgpt_file(
             body,
             image,
             prompt,
         )
 
-        for attempt in range(max_attempts):
-            token = conf.chatgpt_token
-            try:
-                data: ChatGPTResponse | ChatGPTErrorResponse = await self._core.post(
-                    token=token,
-                    endpoint=ChatGPTEndpoint.PHOTO,
-                    files=files,
-                )
-
-                if isinstance(data, ChatGPTErrorResponse):
-                    last_error = data.error
-                else:
-                    return await self.__handle_success(
-                        body,
-                        data,
-                    )
-
-            except Exception as err:
-                last_error = str(err)
-
-            if attempt < max_attempts - 1:
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_error,
-            extra={"Токен авторизации": token},
+        data: ChatGPTResponse = await retry_policy.run(
+            lambda: self._core.post(
+                token=conf.chatgpt_token,
+                endpoint=ChatGPTEndpoint.PHOTO,
+                files=files,
+            ),
+            check=self.__check_response,
+        )
+
+        return await self.__handle_success(
+            body,
+            data,
         )
 
     async def template_to_photo(
@@ -258,10 +236,6 @@ class ChatGPTClient:
         body: T2PBody,
         image: UploadFile,
     ) -> ChatGPTResp:
-        max_attempts = 10
-
-        last_error = None
-
         template: Template | None = await templates_database.fetch_template(
             "id",
             body.id,
@@ -276,32 +250,18 @@ class ChatGPTClient:
             image,
         )
 
-        for attempt in range(max_attempts):
-            token = conf.chatgpt_token
-            try:
-                data: ChatGPTResponse | ChatGPTErrorResponse = await self._core.post(
-                    token=token,
-                    endpoint=ChatGPTEndpoint.PHOTO,
-                    files=files,
-                )
-
-                if isinstance(data, ChatGPTErrorResponse):
-                    last_error = data.error
-                else:
-                    return await self.__handle_success(
-                        body,
-                        data,
-                    )
-
-            except Exception as err:
-                last_error = str(err)
-
-            if attempt < max_attempts - 1:
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_error,
-            extra={"Токен авторизации": token},
+        data: ChatGPTResponse = await retry_policy.run(
+            lambda: self._core.post(
+                token=conf.chatgpt_token,
+                endpoint=ChatGPTEndpoint.PHOTO,
+                files=files,
+            ),
+            check=self.__check_response,
+        )
+
+        return await self.__handle_success(
+            body,
+            data,
         )
 
     async def toybox_to_photo(
@@ -309,10 +269,6 @@ class ChatGPTClient:
         body: TB2PBody,
         image: UploadFile,
     ) -> ChatGPTResp:
-        max_attempts = 10
-
-        last_error = None
-
         data: IBody | PhotoGeneratorTemplates = (
             IBody(
                 user_id=body.user_id,
@@ -332,32 +288,18 @@ class ChatGPTClient:
             image,
         )
 
-        for attempt in range(max_attempts):
-            token = conf.chatgpt_token
-            try:
-                data: ChatGPTResponse | ChatGPTErrorResponse = await self._core.post(
-                    token=token,
-                    endpoint=ChatGPTEndpoint.PHOTO,
-                    files=files,
-                )
-
-                if isinstance(data, ChatGPTErrorResponse):
-                    last_error = data.error
-                else:
-                    return await self.__handle_success(
-                        body,
-                        data,
-                    )
-
-            except Exception as err:
-                last_error = str(err)
-
-            if attempt < max_attempts - 1:
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_error,
-            extra={"Токен авторизации": token},
+        data: ChatGPTResponse = await retry_policy.run(
+            lambda: self._core.post(
+                token=conf.chatgpt_token,
+                endpoint=ChatGPTEndpoint.PHOTO,
+                files=files,
+            ),
+            check=self.__check_response,
+        )
+
+        return await self.__handle_success(
+            body,
+            data,
         )
 
     async def reshape_photo(
@@ -365,10 +307,6 @@ class ChatGPTClient:
         body: R2PBody,
         image: UploadFile,
     ) -> ChatGPTResp:
-        max_attempts = 10
-
-        last_error = None
-
         body_prompt = R2PBodyPrompt.reshape(
             body.area,
             body.strength,
@@ -379,32 +317,18 @@ class ChatGPTClient:
             image,
         )
 
-        for attempt in range(max_attempts):
-            token = conf.chatgpt_token
-            try:
-                data = await self._core.post(
-                    token=token,
-                    endpoint=ChatGPTEndpoint.PHOTO,
-                    files=files,
-                )
-
-                if isinstance(data, ChatGPTErrorResponse):
-                    last_error = data.error
-                else:
-                    return await self.__handle_success(
-                        body,
-                        data,
-                    )
-
-            except Exception as err:
-                last_error = str(err)
-
-            if attempt < max_attempts - 1:
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_error,
-            extra={"Токен авторизации": token},
+        data: ChatGPTResponse = await retry_policy.run(
+            lambda: self._core.post(
+                token=conf.chatgpt_token,
+                endpoint=ChatGPTEndpoint.PHOTO,
+                files=files,
+            ),
+            check=self.__check_response,
+        )
+
+        return await self.__handle_success(
+            body,
+            data,
         )
 
     async def face_to_swap(
@@ -415,9 +339,6 @@ class ChatGPTClient:
         if len(images) != 2:
             raise ValueError("Для face swap требуется ровно 2 изображения")
 
-        max_attempts = 10
-        last_error = None
-        token = conf.chatgpt_token
         prompt = R2PBodyPrompt.face_swap().prompt
 
         # Объединяем два изображения в одно
@@ -427,104 +348,53 @@ class ChatGPTClient:
         files = [("image", ("face_swap.png", merged_bytes, "image/png"))]
 
         # Пытаемся отправить запрос несколько раз
-        for attempt in range(max_attempts):
-            try:
-                data: ChatGPTResponse | ChatGPTErrorResponse = await self._core.post(
-                    token=token,
-                    endpoint=ChatGPTEndpoint.PHOTO,
-                    data=IFaceSwapData(prompt=prompt),
-                    files=files,
-                )
-
-                if isinstance(data, ChatGPTErrorResponse):
-                    last_error = data.error
-                else:
-                    return await self.__handle_success(body, data)
-
-            except Exception as err:
-                last_error = str(err)
-
-            # Пауза перед новой попыткой
-            if attempt < max_attempts - 1:
-                await sleep(1)
-
-        # Если все попытки неудачны
-        return await self.__handle_failure(
-            last_error,
-            extra={"Токен авторизации": token},
+        data: ChatGPTResponse = await retry_policy.run(
+            lambda: self._core.post(
+                token=conf.chatgpt_token,
+                endpoint=ChatGPTEndpoint.PHOTO,
+                data=IFaceSwapData(prompt=prompt),
+                files=files,
+            ),
+            check=self.__check_response,
+        )
+
+        return await self.__handle_success(
+            body,
+            data,
         )
 
     async def photo_to_antiques(
         self,
         image: UploadFile,
     ) -> Antiques:
-        max_attempts = 1
-
-        last_error = None
+        image_bytes, _, _ = await image_processor.prepare(
+            await image.read(),
+            "chatgpt",
+        )
 
-        ext = str(os.path.splitext(image.filename)[-1]).lower()
-        image_bytes = await image.read()
+        image_base64 = b64encode(image_bytes).decode("utf-8")
 
-        if ext in HEIF_EXTENSIONS:
-            image_bytes, ext, _ = await convert_heic_to_jpg(
-                image_bytes,
+        async def call() -> ChatGPTAntiquesResponse:
+            data = await self._core.post(
+                token=conf.chatgpt_token,
+                is_response=False,
+                endpoint=ChatGPTEndpoint.CHAT,
+                body=AntiquesBody.create_image(
+                    image_url=f"data:image/jpeg;base64,{image_base64}"
+                ),
             )
+            return ChatGPTAntiquesResponse(**data)
 
-        image_base64 = b64encode(image_bytes).decode("utf-8")
-
-        for attempt in range(max_attempts):
-            token = conf.chatgpt_token
-            try:
-
-                async def call(
-                    token: str,
-                ):
-                    data = await self._core.post(
-                        token=token,
-                        is_response=False,
-                        endpoint=ChatGPTEndpoint.CHAT,
-                        body=AntiquesBody.create_image(
-                            image_url=f"data:image/jpeg;base64,{image_base64}"
-                        ),
-                    )
-                    return ChatGPTAntiquesResponse(**data)
-
-                data = await call(token)
-
-                if not isinstance(data, ChatGPTErrorResponse):
-                    return data.fetch_data()
-
-                last_error = data.error
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    try:
-                        data = await call(token)
-
-                        if not data.error:
-                            return data.fetch_data()
-
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(last_error)
-                await sleep(1)
-        return await self.__handle_failure(
-            last_error,
-            extra={"Токен авторизации": token},
+        data: ChatGPTAntiquesResponse = await antiques_retry_policy.run(
+            call,
         )
 
+        return data.fetch_data()
+
     @staticmethod
     async def _merge_two_images(image1: UploadFile, image2: UploadFile) -> bytes:
         """Объединяем два изображения в одно для отправки в ChatGPT."""
-        img1 = Image.open(BytesIO(await image1.read())).convert("RGBA")
-        img2 = Image.open(BytesIO(await image2.read())).convert("RGBA")
-
-        # Подгоняем размер второго изображения под первое
-        img2 = img2.resize(img1.size)
-
-        merged = Image.alpha_composite(img1, img2)
-
-        buf = BytesIO()
-        merged.save(buf, format="PNG")
-        buf.seek(0)
-        return buf.read()
+        return await image_processor.merge(
+            await image1.read(),
+            await image2.read(),
+        )
@@ -10,12 +10,27 @@ from datetime import (
     timezone,
 )
 
+from weakref import WeakKeyDictionary
+
+from importlib.util import find_spec
+
+from http.cookiejar import (
+    CookieJar,
+    DefaultCookiePolicy,
+)
+
 from httpx import (
     AsyncClient,
+    Limits,
     Response,
+    TransportError,
 )
 
-from asyncio import sleep
+from asyncio import (
+    AbstractEventLoop,
+    get_running_loop,
+    sleep,
+)
 
 from playwright.async_api import (
     async_playwright,
@@ -24,7 +39,10 @@ from playwright.async_api import (
     TimeoutError,
 )
 
+from ...domain.conf import app_conf
+
 from ...domain.entities.core import (
+    IConfEnv,
     ISchema,
 )
 
@@ -33,43 +51,153 @@ from ...domain.constants import (
     DEFAULT_TIMEOUT,
 )
 
+from ...domain.tools import (
+    CircuitBreaker,
+    Bulkhead,
+)
+
+from ...domain.repositories import leased_account
+
+
+conf: IConfEnv = app_conf()
+
 
 class HttpClient:
     """Клиент для взаимодействия с Web3 API.
 
     Обеспечивает асинхронное подключение и выполнение запросов к Web3 сервисам.
-    Поддерживает повторное использование соединений и автоматическое управление ресурсами.
+    Соединения переиспользуются: на каждый базовый URL в рамках event loop
+    создается один долгоживущий `AsyncClient` с keep-alive пулом, который
+    разделяют все экземпляры ядер (PixverseCore, QwenCore, WanCore и т.д.).
+
+    Запросы проходят через автомат отключения (по базовому URL и, если
+    передан `account`, по аккаунту) и ограничение одновременных запросов
+    на сервис: при деградации сервиса запросы сразу получают 503
+    (`UpstreamError`), а не копятся в ожидании таймаутов.
 
     Args:
         url (str): Базовый URL API сервиса
         headers (dict[str, Any]): Заголовки для всех запросов (например, авторизация)
     """
 
+    _pools: WeakKeyDictionary[AbstractEventLoop, dict[str, AsyncClient]] = (
+        WeakKeyDictionary()
+    )
+
     def __init__(
         self,
         url: str | dict[str, str],
+        limits: Limits | None = None,
+        http2: bool = conf.http_2,
+        name: str | None = None,
     ) -> None:
         """Инициализация Web3 клиента.
 
         Args:
             url (str): Базовый URL (например, "https://api.web3.service")
-            headers (dict): Стандартные заголовки для запросов
+            limits (Limits, optional): Лимиты пула соединений (по умолчанию из конфигурации)
+            http2 (bool): Использовать HTTP/2, если установлен пакет h2
+            name (str, optional): Имя сервиса (по умолчанию из имени класса ядра)
         """
         self._url = url
+        self._limits = limits or Limits(
+            max_connections=conf.http_max_connections,
+            max_keepalive_connections=conf.http_max_keepalive_connections,
+            keepalive_expiry=conf.http_keepalive_expiry,
+        )
+        self._http2 = http2 and find_spec("h2") is not None
+        self._name = name or type(self).__name__.removesuffix("Core").lower()
+        self._bulkhead = Bulkhead(
+            self._name,
+            max_concurrency=conf.bulkhead_max_concurrency,
+            timeout=conf.bulkhead_timeout,
+        )
+
+    def __create_client(
+        self,
+    ) -> AsyncClient:
+        """Создает пуловый клиент без сохранения cookies между запросами.
+
+        Клиент разделяется между аккаунтами, поэтому cookies из ответов
+        не сохраняются: авторизация передается только через заголовки запроса.
+        """
+        return AsyncClient(
+            limits=self._limits,
+            http2=self._http2,
+            cookies=CookieJar(
+                policy=DefaultCookiePolicy(
+                    allowed_domains=(),
+                ),
+            ),
+        )
 
     async def get_client(
         self,
-        headers: dict[str, Any],
-        timeout: int,
-    ) -> AsyncGenerator[AsyncClient, Any]:
-        """Асинхронный генератор HTTP клиента с управлением контекстом.
+        api_url: str,
+    ) -> AsyncClient:
+        """Возвращает пуловый HTTP клиент для базового URL.
 
-        Yields:
-            AsyncClient: Экземпляр асинхронного HTTP клиента
+        Клиенты привязаны к текущему event loop, так как соединения
+        нельзя переиспользовать между циклами (Celery запускает задачи
+        через отдельный `asyncio.run`).
 
+        Args:
+            api_url (str): Базовый URL сервиса
+
+        Returns:
+            AsyncClient: Долгоживущий экземпляр асинхронного HTTP клиента
         """
-        async with AsyncClient(headers=headers, timeout=timeout) as client:
-            yield client
+        clients: dict[str, AsyncClient] = self._pools.setdefault(
+            get_running_loop(),
+            {},
+        )
+        client: AsyncClient | None = clients.get(api_url)
+
+        if client is None or client.is_closed:
+            client = clients[api_url] = self.__create_client()
+
+        return client
+
+    @classmethod
+    async def close_clients(
+        cls,
+    ) -> None:
+        """Закрывает все пуловые клиенты текущего event loop.
+
+        Вызывается при остановке приложения (lifespan).
+        """
+        clients: dict[str, AsyncClient] = cls._pools.pop(
+            get_running_loop(),
+            {},
+        )
+        for client in clients.values():
+            await client.aclose()
+
+    def __fetch_breakers(
+        self,
+        api_url: str,
+        account: str | int | None,
+    ) -> list[CircuitBreaker]:
+        keys: list[str] = [api_url]
+
+        if account is None:
+            # по умолчанию — аккаунт, выданный планировщиком под этот вызов
+            leased = leased_account()
+            account = leased.id if leased is not None else None
+
+        if account is not None:
+            keys.append(f"{api_url}#{account}")
+
+        return [
+            CircuitBreaker.for_key(
+                key,
+                self._name,
+                failure_threshold=conf.circuit_failure_threshold,
+                recovery_timeout=conf.circuit_recovery_timeout,
+                half_open_calls=conf.circuit_half_open_calls,
+            )
+            for key in keys
+        ]
 
     async def __make_request(
         self,
@@ -78,6 +206,7 @@ class HttpClient:
         endpoint: str,
         headers: dict[str, Any],
         timeout: int,
+        account: str | int | None = None,
         **kwargs: Any,
     ) -> AsyncGenerator[Response, Any]:
         """Внутренний метод выполнения запроса.
@@ -85,25 +214,56 @@ class HttpClient:
         Args:
             method (str): HTTP метод ("GET", "POST" и т.д.)
             endpoint (str): Конечная точка API
+            account (str | int, optional): Аккаунт для отдельного автомата отключения
             **kwargs: Дополнительные параметры для запроса
 
         Yields:
             Response: Объект ответа от сервера
 
+        Raises:
+            UpstreamError: Сервис отключен автоматом или перегружен
         """
-        async for client in self.get_client(headers, timeout):
-            api_url: str = (
-                self._url.get(url_method) if url_method is not None else self._url
-            )
+        api_url: str = (
+            self._url.get(url_method) if url_method is not None else self._url
+        )
 
-            try:
-                yield await client.request(
+        breakers: list[CircuitBreaker] = self.__fetch_breakers(
+            api_url,
+            account,
+        )
+        acquired: list[CircuitBreaker] = []
+
+        try:
+            for breaker in breakers:
+                breaker.acquire()
+                acquired.append(breaker)
+
+            async with self._bulkhead.slot():
+                client: AsyncClient = await self.get_client(api_url)
+
+                response: Response = await client.request(
                     method,
                     url="".join((api_url, endpoint)),
+                    headers=headers,
+                    timeout=timeout,
                     **kwargs,
                 )
-            finally:
-                await client.aclose()
+        except TransportError:
+            for breaker in acquired:
+                breaker.record_failure()
+            raise
+        except BaseException:
+            for breaker in acquired:
+                breaker.release()
+            raise
+
+        for breaker in breakers:
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+        yield response
 
     async def send_request(
         self,
@@ -117,6 +277,7 @@ class HttpClient:
         params: ISchema | None = None,
         data: ISchema | None = None,
         is_serialized: bool = True,
+        account: str | int | None = None,
     ) -> dict[str, Any]:
         """Основной метод отправки запроса к API.
 
@@ -124,6 +285,7 @@ class HttpClient:
             method (str): HTTP метод ("GET", "POST" и т.д.)
             endpoint (str): Относительный путь конечной точки
             body (ISchema, optional): Тело запроса, соответствующее схеме
+            account (str | int, optional): Аккаунт для отдельного автомата отключения
 
         Returns:
             dict[str, Any]: Ответ API в виде словаря
@@ -135,6 +297,7 @@ class HttpClient:
             endpoint,
             headers.dict if headers else None,
             timeout,
+            account,
             json=[i.dict for i in body]
             if isinstance(body, list)
             else body.dict
@@ -0,0 +1,112 @@
+# coding utf-8
+
+from typing import Any
+
+from time import monotonic
+
+from collections import OrderedDict
+
+from ....domain.tools import RedisJSONCache
+
+from ....domain.repositories import IRedis
+
+from ....domain.constants import INSTAGRAM_PROFILE
+
+
+class ProfileCache:
+    """Кэш ответов rocketapi с профилями Instagram.
+
+    Профили хранятся по ключу (`username` / `id`, значение) в LRU кэше
+    процесса и, если передан `engine`, в Redis, чтобы кэш был общим для
+    воркеров. Несуществующие профили кэшируются отдельно с коротким
+    TTL. Ошибки Redis не прерывают запрос: значение считается промахом.
+    Счетчики — в `RedisJSONCache.metrics` под именем `instagram_profile`.
+
+    Args:
+        engine (IRedis, optional): Подключение к Redis
+        ttl (int): Время жизни профиля (сек.)
+        missing_ttl (int): Время жизни отметки о несуществующем профиле (сек.)
+        max_size (int): Максимум записей в кэше процесса
+    """
+
+    def __init__(
+        self,
+        engine: IRedis | None = None,
+        ttl: int = 600,
+        missing_ttl: int = 120,
+        max_size: int = 1024,
+    ) -> None:
+        self._ttl = ttl
+        self._missing_ttl = missing_ttl
+        self._max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any] | None]] = (
+            OrderedDict()
+        )
+        self._cache = RedisJSONCache("instagram_profile", engine)
+
+    def __remember(
+        self,
+        key: str,
+        profile: dict[str, Any] | None,
+        ttl: float | None = None,
+    ) -> None:
+        if ttl is None:
+            ttl = self._missing_ttl if profile is None else self._ttl
+        self._entries[key] = (monotonic() + ttl, profile)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    async def fetch(
+        self,
+        kind: str,
+        value: str | int,
+    ) -> tuple[bool, dict[str, Any] | None]:
+        """Ищет профиль в кэше.
+
+        Args:
+            kind (str): Тип ключа (`username` / `id`)
+            value (str | int): Значение ключа
+
+        Returns:
+            tuple[bool, dict | None]: Найден ли ключ и ответ rocketapi;
+                `(True, None)` — профиль отмечен как несуществующий
+        """
+        key: str = INSTAGRAM_PROFILE.format(kind=kind, key=value)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, profile = entry
+            if expires_at > monotonic():
+                self._entries.move_to_end(key)
+                self._cache.count("hits" if profile is not None else "missing_hits")
+                return True, profile
+            del self._entries[key]
+
+        # вместе со значением читается остаток TTL ключа: локальная
+        # копия не должна пережить запись в Redis
+        found, profile, expires_in = await self._cache.get(key)
+        if found:
+            self.__remember(key, profile, expires_in)
+            self._cache.count("hits" if profile is not None else "missing_hits")
+            return True, profile
+
+        self._cache.count("misses")
+        return False, None
+
+    async def store(
+        self,
+        kind: str,
+        value: str | int,
+        profile: dict[str, Any] | None,
+    ) -> None:
+        """Сохраняет ответ rocketapi (`None` — профиль не существует)."""
+        key: str = INSTAGRAM_PROFILE.format(kind=kind, key=value)
+
+        self.__remember(key, profile)
+
+        await self._cache.set(
+            key,
+            profile,
+            self._missing_ttl if profile is None else self._ttl,
+        )
@@ -1,8 +1,18 @@
 # # coding utf-8
 
+from typing import Any
+
+from fastapi import HTTPException
+
 from fastapi_pagination import (
     Page,
     paginate,
+    create_page,
+    resolve_params,
+)
+from fastapi_pagination.cursor import (
+    CursorPage,
+    CursorParams,
 )
 
 from collections import defaultdict
@@ -12,8 +22,6 @@ from pendulum import (
     now,
 )
 
-from asyncio import sleep
-
 from .core import (
     InstagramCore,
     InstagramGPTCore,
@@ -29,6 +37,8 @@ from ....domain.typing.enums import ChatGPTEndpoint
 
 from ....domain.repositories import IDatabase
 
+from ....domain.tools import RetryPolicy
+
 from ....domain.entities.instagram import (
     ISession,
     InstagramChatGPTBody,
@@ -60,6 +70,7 @@ from ...orm.database.repositories import (
     InstagramUserPostsRepository,
     InstagramUserRelationsRepository,
     InstagramTrackingRepository,
+    InstagramDailyStatsRepository,
 )
 
 
@@ -89,6 +100,20 @@ user_tracking_repository = InstagramTrackingRepository(
     IDatabase(conf),
 )
 
+daily_stats_repository = InstagramDailyStatsRepository(
+    IDatabase(conf),
+)
+
+retry_policy = RetryPolicy(
+    "instagram_gpt",
+    retry_codes={
+        "rate_limit_exceeded",
+        "server_error",
+        "server_is_overloaded",
+        "engine_overloaded",
+    },
+)
+
 
 class InstagramClient:
     def __init__(
@@ -136,6 +161,20 @@ class InstagramClient:
             user_id,
         )
 
+    async def aggregate_daily_stats(
+        self,
+    ) -> dict[str, Any]:
+        return await self._core.aggregate_daily_stats()
+
+    async def update_all_tracked_users_data(
+        self,
+    ) -> dict[str, Any]:
+        return await self._core.refresh_tracked_users(
+            limit=conf.instagram_tracking_batch,
+            concurrency=conf.instagram_tracking_concurrency,
+            request_budget=conf.instagram_tracking_request_budget,
+        )
+
     async def remove_user_tracking(
         self,
         uuid: str,
@@ -198,6 +237,9 @@ class InstagramClient:
             related=["statistics", "publications"],
         )
 
+        # записи отдаются как есть из InstagramUserStats: в дневной
+        # статистике нет лайков, комментариев и публикаций из ответа
+
         return InstagramUserResponse(
             **InstagramUser.model_validate(data).dict,
             posts=[IInstagramPost.model_validate(post) for post in data.publications],
@@ -235,122 +277,167 @@ class InstagramClient:
             user_id=user.id,
         )
 
+    @staticmethod
+    def __cursor_params() -> tuple[CursorParams, int | None]:
+        params: CursorParams = resolve_params()
+        cursor: str | None = params.to_raw_params().cursor
+
+        if cursor is None:
+            return params, None
+        if not str(cursor).isdigit():
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid cursor value",
+            )
+        return params, int(cursor)
+
+    @staticmethod
+    def __relations_page(
+        relations: list[Any],
+        params: CursorParams,
+    ) -> CursorPage[InstagramFollower]:
+        # источник отдает на одну запись больше размера страницы
+        has_next: bool = len(relations) > params.size
+        relations = relations[: params.size]
+
+        return create_page(
+            [InstagramFollower.model_validate(relation) for relation in relations],
+            params=params,
+            next_=str(relations[-1].id) if has_next else None,
+        )
+
+    @staticmethod
+    def __snapshot_page(
+        relations: list[InstagramFollower],
+        ids: list[int],
+        params: CursorParams,
+    ) -> CursorPage[InstagramFollower]:
+        # следующая страница и курсор — по id (их на один больше размера
+        # страницы): пропуск записи без профиля не обрывает пагинацию
+        has_next: bool = len(ids) > params.size
+        ids = ids[: params.size]
+        page: set[str] = {str(pk) for pk in ids}
+
+        return create_page(
+            [relation for relation in relations if relation.pk in page],
+            params=params,
+            next_=str(ids[-1]) if has_next else None,
+        )
+
     async def fetch_subscribers(
         self,
         body: IInstagramUser,
         uuid: str,
         relation_type: str,
-    ) -> Page[InstagramFollower]:
-        items: list[InstagramFollower] = await self._core.fetch_subscribers(
+    ) -> CursorPage[InstagramFollower]:
+        params, after = self.__cursor_params()
+        relations, ids = await self._core.fetch_subscribers(
             uuid,
             relation_type,
+            params.size,
+            after,
         )
-
-        items = list({item.username: item for item in items}.values())
-        return paginate(items)
+        return self.__snapshot_page(relations, ids, params)
 
     async def fetch_tracking_subscribers(
         self,
         body: IInstagramUser,
         username: str,
         relation_type: str,
-    ) -> Page[InstagramFollower]:
-        items: list[InstagramFollower] = await self._core.fetch_tracking_subscribers(
+    ) -> CursorPage[InstagramFollower]:
+        params, after = self.__cursor_params()
+        relations, ids = await self._core.fetch_tracking_subscribers(
             username,
             relation_type,
+            params.size,
+            after,
         )
-        items = list({item.username: item for item in items}.values())
-        return paginate(items)
+        return self.__snapshot_page(relations, ids, params)
 
     async def fetch_subscribtions(
         self,
         body: IInstagramUser,
         uuid: str,
         relation_type: str,
-    ) -> Page[InstagramFollower]:
-        items: list[InstagramFollower] = await self._core.fetch_subscribtions(
+    ) -> CursorPage[InstagramFollower]:
+        params, after = self.__cursor_params()
+        relations, ids = await self._core.fetch_subscribtions(
             uuid,
             relation_type,
+            params.size,
+            after,
         )
-        items = list({item.username: item for item in items}.values())
-        return paginate(items)
+        return self.__snapshot_page(relations, ids, params)
 
     async def fetch_tracking_subscribtions(
         self,
         body: IInstagramUser,
         username: str,
-    ) -> Page[InstagramFollower]:
-        items: list[InstagramFollower] = await self._core.fetch_tracking_subscribtions(
+        relation_type: str,
+    ) -> CursorPage[InstagramFollower]:
+        params, after = self.__cursor_params()
+        relations, ids = await self._core.fetch_tracking_subscribtions(
             username,
+            relation_type,
+            params.size,
+            after,
         )
-        items = list({item.username: item for item in items}.values())
-        return paginate(items)
+        return self.__snapshot_page(relations, ids, params)
 
     async def fetch_secret_fans(
         self,
         body: IInstagramUser,
         uuid: str,
         relation_type: str = "secret_fan",
-    ) -> Page[InstagramFollower]:
+    ) -> CursorPage[InstagramFollower]:
+        params, after = self.__cursor_params()
         user_session = await session_repository.fetch_uuid(
             uuid,
         )
-        subcribtions = await user_relations_repository.fetch_with_filters(
-            relation_type=relation_type,
+        # секретные фанаты не выводятся из подписчиков и подписок, поэтому
+        # остаются строками InstagramUserRelations, а не снимками
+        relations = await user_relations_repository.fetch_page(
             user_id=user_session.user_id,
-            many=True,
-        )
-
-        items: list[InstagramFollower] = list(
-            map(
-                lambda subscribtion: InstagramFollower.model_validate(
-                    subscribtion,
-                ),
-                subcribtions,
-            )
+            relation_type=relation_type,
+            size=params.size,
+            after=after,
         )
-
-        items = list({item.username: item for item in items}.values())
-
-        return paginate(items)
+        return self.__relations_page(relations, params)
 
     async def fetch_tracking_secret_fans(
         self,
         body: IInstagramUser,
         username: str,
         relation_type: str = "secret_fan",
-    ) -> Page[InstagramFollower]:
+    ) -> CursorPage[InstagramFollower]:
+        params, after = self.__cursor_params()
         user = await user_repository.fetch_with_filters(
             username=username,
         )
-        subcribtions = await user_relations_repository.fetch_with_filters(
-            relation_type=relation_type,
+        relations = await user_relations_repository.fetch_page(
             user_id=user.id,
-            many=True,
+            relation_type=relation_type,
+            size=params.size,
+            after=after,
         )
+        return self.__relations_page(relations, params)
 
-        items: list[InstagramFollower] = list(
-            map(
-                lambda subscribtion: InstagramFollower.model_validate(
-                    subscribtion,
-                ),
-                subcribtions,
+    def __check_response(
+        self,
+        data: ChatGPTInstagramResponse | ChatGPTErrorResponse,
+    ) -> None:
+        if isinstance(data, ChatGPTErrorResponse):
+            raise InstagramError(
+                status_code=400,
+                detail=data.error.message,
+                code=data.error.code,
             )
-        )
-
-        items = list({item.username: item for item in items}.values())
-
-        return paginate(items)
 
     async def image_to_post(
         self,
         uuid: str,
         body: T2PBody,
     ) -> ChatGPTInstagram:
-        max_attempts = 10
-
-        last_error = None
-
         user = await session_repository.fetch_with_filters(uuid=uuid)
 
         if user is None:
@@ -359,95 +446,67 @@ class InstagramClient:
                 detail="User with requested `uuid` is not Found",
             )
 
-        for attempt in range(max_attempts):
-            token = conf.chatgpt_token
-            try:
-
-                async def call(
-                    token: str,
-                ) -> ChatGPTInstagramResponse | ChatGPTErrorResponse:
-                    return await self._gpt.post(
-                        token=token,
-                        endpoint=ChatGPTEndpoint.CHAT,
-                        body=InstagramChatGPTBody.generate_post(
-                            body.prompt,
-                        ),
-                    )
-
-                data: ChatGPTInstagramResponse | ChatGPTErrorResponse = await call(
-                    token
-                )
-
-                if not isinstance(data, ChatGPTErrorResponse):
-                    return data.fetch_data()
-
-                last_error = data.error
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    try:
-                        data = await call(token)
-
-                        if not data.error:
-                            # return await self.__handle_success(
-                            #     body,
-                            #     data,
-                            # )
-                            return data.fetch_data()
-
-                    except Exception as final_err:
-                        raise final_err
-                    # return await self.__handle_failure(last_error)
-                await sleep(1)
-        # return await self.__handle_failure(
-        #     last_error,
-        #     extra={"Токен авторизации": token},
-        # )
-
-    async def user_subscribers_chart(
-        self,
-        uuid: str,
-    ) -> Page[ChartData]:
-        user_session = await session_repository.fetch_uuid(uuid)
+        async def call() -> ChatGPTInstagramResponse | ChatGPTErrorResponse:
+            return await self._gpt.post(
+                token=conf.chatgpt_token,
+                endpoint=ChatGPTEndpoint.CHAT,
+                body=InstagramChatGPTBody.generate_post(
+                    body.prompt,
+                ),
+            )
 
-        subscribers = await user_relations_repository.fetch_with_filters(
-            relation_type="follower",
-            user_id=user_session.user_id,
-            many=True,
+        data: ChatGPTInstagramResponse = await retry_policy.run(
+            call,
+            check=self.__check_response,
         )
 
-        total = len(subscribers)
+        return data.fetch_data()
 
-        if total == 0:
-            return paginate([])
-
-        # Настройка месяцев графика
-        months_count = 6
+    async def __subscribers_chart(
+        self,
+        user_id: int,
+        months_count: int = 6,
+    ) -> Page[ChartData]:
+        # Значение месяца — число подписчиков в последний день с данными
         last_month = now()
         all_months = [
             (last_month.subtract(months=i)).format("YYYY-MM")
             for i in reversed(range(months_count))
         ]
 
-        # Генерируем нарастающий прогресс для первых n-1 месяцев
-        base_growth = [2**i for i in range(months_count - 1)]  # 1,2,4,8,16...
-        sum_base = sum(base_growth)
+        daily = await daily_stats_repository.fetch_since(
+            user_id,
+            last_month.subtract(months=months_count - 1).start_of("month").date(),
+        )
 
-        # Масштабируем рост так, чтобы последний месяц = total
-        counts = [round(total * b / sum_base) for b in base_growth]
+        if not daily:
+            return paginate([])
 
-        # Последний месяц = точное итоговое число
-        counts.append(total)
+        monthly: dict[str, int] = {
+            stats.day.strftime("%Y-%m"): stats.followers_count for stats in daily
+        }
 
-        # Коррекция, чтобы каждый следующий месяц >= предыдущего
-        for i in range(1, months_count):
-            if counts[i] < counts[i - 1]:
-                counts[i] = counts[i - 1]
+        # Месяцы без данных наследуют значение предыдущего месяца
+        counts: list[int] = []
+        count: int = 0
+        for month in all_months:
+            count = monthly.get(month, count)
+            counts.append(count)
 
         items = [ChartData(month=m, count=c) for m, c in zip(all_months, counts)]
 
         return paginate(items)
 
+    async def user_subscribers_chart(
+        self,
+        uuid: str,
+    ) -> Page[ChartData]:
+        user_session = await session_repository.fetch_uuid(uuid)
+
+        return await self.__subscribers_chart(
+            user_session.user_id,
+        )
+
     async def fetch_public_statistics(
         self,
         body: IInstagramUser,
@@ -460,6 +519,9 @@ class InstagramClient:
             related=["statistics", "publications"],
         )
 
+        # записи отдаются как есть из InstagramUserStats: в дневной
+        # статистике нет лайков, комментариев и публикаций из ответа
+
         return InstagramUserResponse(
             **InstagramUser.model_validate(data).dict,
             posts=[IInstagramPost.model_validate(post) for post in data.publications],
@@ -478,40 +540,6 @@ class InstagramClient:
             username=username,
         )
 
-        subscribers = await user_relations_repository.fetch_with_filters(
-            relation_type="follower",
-            user_id=tracking_user.id,
-            many=True,
+        return await self.__subscribers_chart(
+            tracking_user.id,
         )
-
-        total = len(subscribers)
-
-        if total == 0:
-            return paginate([])
-
-        # Настройка месяцев графика
-        months_count = 6
-        last_month = now()
-        all_months = [
-            (last_month.subtract(months=i)).format("YYYY-MM")
-            for i in reversed(range(months_count))
-        ]
-
-        # Генерируем нарастающий прогресс для первых n-1 месяцев
-        base_growth = [2**i for i in range(months_count - 1)]  # 1,2,4,8,16...
-        sum_base = sum(base_growth)
-
-        # Масштабируем рост так, чтобы последний месяц = total
-        counts = [round(total * b / sum_base) for b in base_growth]
-
-        # Последний месяц = точное итоговое число
-        counts.append(total)
-
-        # Коррекция, чтобы каждый следующий месяц >= предыдущего
-        for i in range(1, months_count):
-            if counts[i] < counts[i - 1]:
-                counts[i] = counts[i - 1]
-
-        items = [ChartData(month=m, count=c) for m, c in zip(all_months, counts)]
-
-        return paginate(items)
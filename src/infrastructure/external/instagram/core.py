@@ -1,12 +1,33 @@
 # coding: utf-8
 
+import logging
+
 from typing import (
     Any,
+    Awaitable,
     Callable,
-    Generator,
 )
 
-from datetime import date
+from datetime import (
+    date,
+    timedelta,
+)
+
+from math import ceil
+
+from time import monotonic
+
+from collections import (
+    Counter,
+    defaultdict,
+)
+
+from asyncio import (
+    Semaphore,
+    Task,
+    create_task,
+    gather,
+)
 
 from inspect import signature
 
@@ -16,9 +37,10 @@ from pendulum import now
 
 from functools import wraps
 
-from rocketapi import InstagramAPI
-
-from rocketapi.exceptions import BadResponseException
+from rocketapi.exceptions import (
+    BadResponseException,
+    NotFoundException,
+)
 
 from instaloader import (
     ProfileNotExistsException,
@@ -31,6 +53,13 @@ from fastapi import HTTPException
 
 from ..core import HttpClient
 
+from .rocket import (
+    AsyncInstagramAPI,
+    RequestBudget,
+)
+
+from .cache import ProfileCache
+
 from ....domain.entities.core import IConfEnv
 
 from ....domain.conf import app_conf
@@ -38,9 +67,11 @@ from ....domain.conf import app_conf
 from ....domain.errors import InstagramError
 
 from ....domain.constants import CHATGPT_API_URL
+from ....domain.tools import RelationSnapshot
 from ....domain.entities.instagram import ISession
 from ....domain.entities.chatgpt import IAuthHeaders
 from ....domain.typing.enums import RequestMethod
+from ....domain.repositories import IRedis
 from ....domain.repositories.engines.database import IDatabase
 
 from ....interface.schemas.api import (
@@ -70,20 +101,29 @@ from ...orm.database.models import (
     InstagramSessions,
     InstagramTracking,
     InstagramUsers,
+    InstagramUserStats,
+    InstagramUserRelations,
+    InstagramRelationSnapshots,
 )
 from ...orm.database.repositories import (
     InstagramSessionRepository,
     InstagramUserRepository,
     InstagramUserStatsRepository,
     InstagramUserPostsRepository,
-    InstagramUserRelationsRepository,
     InstagramTrackingRepository,
+    InstagramUserRelationsRepository,
+    InstagramRelationSnapshotRepository,
+    InstagramRelatedProfileRepository,
+    InstagramDailyStatsRepository,
 )
 
 
 conf: IConfEnv = app_conf()
 
 
+logger = logging.getLogger(__name__)
+
+
 db = IDatabase(conf)
 
 session_repository = InstagramSessionRepository(
@@ -106,24 +146,75 @@ user_posts_repository = InstagramUserPostsRepository(
 )
 
 
+user_tracking_repository = InstagramTrackingRepository(
+    db,
+)
+
+
 user_relations_repository = InstagramUserRelationsRepository(
     db,
 )
 
 
-user_tracking_repository = InstagramTrackingRepository(
+snapshot_repository = InstagramRelationSnapshotRepository(
+    db,
+)
+
+
+related_profile_repository = InstagramRelatedProfileRepository(
     db,
 )
 
 
+daily_stats_repository = InstagramDailyStatsRepository(
+    db,
+)
+
+
+profile_cache = ProfileCache(
+    engine=IRedis(conf) if conf.instagram_profile_redis else None,
+    ttl=conf.instagram_profile_ttl,
+    missing_ttl=conf.instagram_profile_missing_ttl,
+    max_size=conf.instagram_profile_cache_size,
+)
+
+
+# категории связей в эндпоинтах и их тип в ответе
+SNAPSHOT_RELATIONS: dict[str, str] = {
+    "old": "follower",
+    "new": "follower",
+    "unsub": "unfollower",
+    "mutual": "mutual",
+    "not_followed_by": "not_followed_by",
+}
+
+
+# поля профиля связи, обновляемые при повторной записи
+RELATED_PROFILE_FIELDS: list[str] = [
+    "username",
+    "full_name",
+    "profile_picture",
+    "updated_at",
+]
+
+
+# типы строк InstagramUserRelations, из которых собирается первый снимок:
+# до снимков пользователь, встреченный в обоих списках, писался один раз
+LEGACY_RELATIONS: dict[str, tuple[str, ...]] = {
+    "follower": ("follower", "mutual", "not_followed_by"),
+    "following": ("following", "mutual", "not_following_back"),
+}
+
+
 class InstagramCore:
     def __init__(
         self,
         conf: IConfEnv = conf,
     ) -> None:
         self._conf = conf
-        self._api = InstagramAPI(
+        self._api = AsyncInstagramAPI(
             token=conf.rocket_token,
+            max_workers=conf.rocket_max_workers,
         )
 
     def __validate_uuid(
@@ -191,61 +282,50 @@ class InstagramCore:
 
     #     user_followers = self.__paginate(self._api.get_user_followers(user.))
 
-    def __paginate(
-        self,
-        fetch_func: Callable[..., dict[str, Any]],
-        user_id: int,
-        count: int = 50,
-    ) -> Generator[dict[str, Any], None, None]:
-        """
-        Универсальный пагинатор для Instagram API.
-        Возвращает генератор пользователей (followers/following).
-        """
-        next_max_id: str | None = None
-        while True:
-            try:
-                response = fetch_func(
-                    user_id=user_id,
-                    count=count,
-                    max_id=next_max_id,
-                )
-            except BadResponseException:
-                # 🚫 Нет данных (например, у пользователя нет подписчиков)
-                break
-            except Exception as err:
-                raise RuntimeError(f"Instagram API error: {err}") from err
-
-            users = response.get("users", [])
-            if not users:
-                # 🚫 Если ответ пустой — просто выходим
-                break
-
-            for user in users:
-                yield user
-
-            next_max_id = response.get("next_max_id")
-            if not next_max_id:
-                break
-
-    def __get_user_info(
+    async def __get_user_info(
         self,
         indetificator: str | int,
         is_username: bool = True,
         find_method: bool = True,
+        cached: bool = True,
     ):
-        try:
-            if not is_username:
-                response = self._api.get_user_info_by_id(
-                    user_id=indetificator,
-                )
-            else:
-                response = self._api.get_user_info(
-                    username=indetificator,
-                )
-        except (BadResponseException, Exception):
+        kind: str = "username" if is_username else "id"
+
+        found, response = (
+            await profile_cache.fetch(kind, indetificator)
+            if cached
+            else (False, None)
+        )
+
+        if found and response is None:
             raise InstagramError.from_exception(
                 ProfileNotExistsException,
             )
+
+        if not found:
+            try:
+                if not is_username:
+                    response = await self._api.get_user_info_by_id(
+                        user_id=indetificator,
+                    )
+                else:
+                    response = await self._api.get_user_info(
+                        username=indetificator,
+                    )
+            except NotFoundException:
+                # кэшируется только ответ 404: лимиты и ошибки rocketapi
+                # (BadResponseException) временные
+                await profile_cache.store(kind, indetificator, None)
+                raise InstagramError.from_exception(
+                    ProfileNotExistsException,
+                )
+            except Exception:
+                raise InstagramError.from_exception(
+                    ProfileNotExistsException,
+                )
+
+            await profile_cache.store(kind, indetificator, response)
+
         if not find_method:
             loaded_response = IRocketBodyUser(**response)
 
@@ -260,7 +340,7 @@ class InstagramCore:
         session: ISession | None = None,
         uuid: str | None = None,
         user_id: str = None,
-    ):
+    ) -> tuple[InstagramUsers, dict[str, float]]:
         if session is None:
             session_data = await session_repository.fetch_with_filters(
                 uuid=uuid,
@@ -268,73 +348,109 @@ class InstagramCore:
 
             session = ISession.model_validate(session_data)
 
-        user = await self.__update_user_data(
-            session.ds_user_id if user_id is None else user_id,
-        )
+        instagram_id = session.ds_user_id if user_id is None else user_id
 
-        likes, comments, publications = await self.__update_user_posts(
-            session.ds_user_id if user_id is None else user_id,
-        )
+        timings: dict[str, float] = {}
+        started: float = monotonic()
 
-        (
-            followers,
-            following,
-            mutual,
-            non_following,
-            non_followers,
-        ) = await self.__fetch_user_relations(
-            session.ds_user_id if user_id is None else user_id,
-        )
+        async def timed(
+            stage: str,
+            awaitable: Awaitable[Any],
+        ) -> Any:
+            stage_started: float = monotonic()
+            try:
+                return await awaitable
+            finally:
+                timings[stage] = round(monotonic() - stage_started, 3)
+
+        # Этапы не зависят друг от друга: id в Instagram известен заранее
+        stages: list[Task] = [
+            create_task(timed("profile", self.__update_user_data(instagram_id))),
+            create_task(timed("posts", self.__fetch_user_media(instagram_id))),
+            create_task(
+                timed(
+                    "followers",
+                    self.__crawl_relations(
+                        self._api.get_user_followers,
+                        instagram_id,
+                    ),
+                )
+            ),
+            create_task(
+                timed(
+                    "following",
+                    self.__crawl_relations(
+                        self._api.get_user_following,
+                        instagram_id,
+                    ),
+                )
+            ),
+        ]
 
-        await self.__update_user_posts(
-            user_id=user_id,
-        )
+        try:
+            (
+                user,
+                media,
+                (followers, follower_profiles),
+                (following, following_profiles),
+            ) = await gather(*stages)
+        except BaseException:
+            # ошибка одного этапа останавливает остальные запросы к API
+            for stage in stages:
+                stage.cancel()
+            raise
+
+        posts: list[InstagramPost] = [
+            InstagramPost.from_rocket(
+                post,
+                user_id=user.id,
+            )
+            for post in media
+        ]
 
-        user_stats = await user_stats_repository.fetch_with_filters(
-            user_id=user.id,
-            created_at=now().date(),
+        profiles, snapshots = self.__relation_rows(
+            user.id,
+            {"follower": followers, "following": following},
+            {**follower_profiles, **following_profiles},
         )
 
-        if user_id is not None:
-            tracking_data = UserTracking(
-                target_user_id=user.id,
-                owner_user_id=session_data.user_id,
-            )
+        await self.__seed_snapshots(user.id)
 
-            tracking = await user_tracking_repository.fetch_with_filters(
-                target_user_id=user.id,
-                owner_user_id=session_data.user_id,
+        async def write() -> None:
+            # upsert профилей повторяем, поэтому идет вне транзакции обновления
+            await related_profile_repository.upsert_many(
+                profiles,
+                update_fields=RELATED_PROFILE_FIELDS,
             )
-
-            if tracking is None:
-                await user_tracking_repository.add_record(
-                    tracking_data,
+            await user_stats_repository.save_refresh(
+                stats=self.__generate_stats(
+                    user.id,
+                    *self.__post_counts(posts),
+                    *self.__relation_counts(followers, following),
+                ),
+                posts=posts,
+                snapshots=snapshots,
+                tracking=UserTracking(
+                    target_user_id=user.id,
+                    owner_user_id=session_data.user_id,
                 )
-
-            tracking = await user_tracking_repository.fetch_with_filters(
-                target_user_id=user.id,
-                owner_user_id=session_data.user_id,
+                if user_id is not None
+                else None,
             )
 
-        stats_data = self.__generate_stats(
-            user.id,
-            likes,
-            comments,
-            publications,
-            followers,
-            following,
-            mutual,
-            non_following,
-            non_followers,
-            tracking.id if user_id is not None else None,
-        )
-
-        if user_stats is None:
-            await user_stats_repository.add_record(
-                stats_data,
-            )
+        await timed("write", write())
 
-        return user
+        await self.__prune_snapshots(user.id)
+
+        timings["total"] = round(monotonic() - started, 3)
+
+        logger.info(
+            "instagram: user %s stats refresh %s",
+            instagram_id,
+            timings,
+        )
+
+        return user, timings
 
     def __generate_stats(
         self,
@@ -362,84 +478,197 @@ class InstagramCore:
             tracking_id=tracking_id,
         )
 
-    async def __fetch_user_relations(
+    async def __crawl_relations(
         self,
+        api_method: Callable[..., Awaitable[dict[str, Any]]],
+        instagram_id: int | str,
+    ) -> tuple[RelationSnapshot, dict[int, dict[str, Any]]]:
+        """Обходит подписчиков или подписки пользователя.
+
+        Returns:
+            tuple: Снимок id и профили связей по id в Instagram
+        """
+        profiles: dict[int, dict[str, Any]] = {}
+
+        async for page in self._api.paginate(api_method, instagram_id):
+            for item in page:
+                if item.get("pk") is None:
+                    continue
+                profiles[int(item["pk"])] = {
+                    "id": int(item["pk"]),
+                    "username": item["username"],
+                    "full_name": item.get("full_name"),
+                    "profile_picture": item["profile_pic_url"],
+                }
+
+        return RelationSnapshot.from_ids(profiles), profiles
+
+    @staticmethod
+    def __relation_rows(
         user_id: int,
-    ):
-        user = await user_repository.fetch_with_filters(user_id=user_id)
+        snapshots: dict[str, RelationSnapshot],
+        profiles: dict[int, dict[str, Any]],
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        # Связи хранятся снимками id, данные профилей — одной строкой на аккаунт
+        created_at = now()
 
-        followers_objs = []
-        following_objs = []
+        return (
+            [{**profile, "updated_at": created_at} for profile in profiles.values()],
+            [
+                {
+                    "user_id": user_id,
+                    "relation_type": relation_type,
+                    "ids": snapshot.to_bytes(),
+                    "count": len(snapshot),
+                    "created_at": created_at,
+                }
+                for relation_type, snapshot in snapshots.items()
+            ],
+        )
 
-        # Сохраняем followers/following в базу
-        for relation_type, api_method, container in [
-            ("follower", self._api.get_user_followers, followers_objs),
-            ("following", self._api.get_user_following, following_objs),
-        ]:
-            raw_list = self.__paginate(api_method, user_id)
-            for item in raw_list:
-                follower_data = InstagramFollower(
-                    **item, relation_type=relation_type, user_id=user.id
-                )
-                exists = await user_relations_repository.fetch_with_filters(
-                    user_id=user.id, related_username=follower_data.username
-                )
-                if exists is None:
-                    await user_relations_repository.add_record(follower_data)
-                container.append(follower_data)
+    @staticmethod
+    def __relation_counts(
+        followers: RelationSnapshot,
+        following: RelationSnapshot,
+    ) -> tuple[int, int, int, int, int]:
+        return (
+            len(followers),
+            len(following),
+            len(followers & following),
+            len(following - followers),
+            len(followers - following),
+        )
+
+    async def __seed_snapshots(
+        self,
+        user_id: int,
+    ) -> bool:
+        """Создает первые снимки связей из строк `InstagramUserRelations`.
+
+        Без этого первый снимок пользователя, обойденного до перехода на
+        снимки, целиком считался бы новыми подписчиками. Выполняется
+        только для пользователя без снимков подписчиков.
+
+        Returns:
+            bool: Снимки созданы
+        """
+        if await snapshot_repository.fetch_latest(user_id, "follower", limit=1):
+            return False
+
+        rows: list[InstagramUserRelations] = (
+            await user_relations_repository.fetch_relations(
+                user_id,
+                [
+                    relation_type
+                    for relation_types in LEGACY_RELATIONS.values()
+                    for relation_type in relation_types
+                ],
+            )
+        )
 
-        # Создаем словари для вычислений множеств (ключ — username, значение — полный объект)
-        followers_dict = {f.username: f for f in followers_objs}
-        following_dict = {f.username: f for f in following_objs}
+        relations: dict[str, set[int]] = {
+            relation_type: set() for relation_type in LEGACY_RELATIONS
+        }
+        profiles: dict[int, dict[str, Any]] = {}
+
+        for row in rows:
+            if not row.related_user_id.isdigit():
+                continue
+            pk = int(row.related_user_id)
+            for relation_type, legacy_types in LEGACY_RELATIONS.items():
+                if row.relation_type in legacy_types:
+                    relations[relation_type].add(pk)
+            # строки идут по возрастанию id: остается последний профиль
+            profiles[pk] = {
+                "id": pk,
+                "username": row.related_username,
+                "full_name": row.related_full_name,
+                "profile_picture": row.profile_picture,
+                "updated_at": row.created_at,
+            }
+
+        if not relations["follower"]:
+            return False
+
+        created_at = max(row.created_at for row in rows)
+
+        await related_profile_repository.upsert_many(
+            list(profiles.values()),
+            update_fields=RELATED_PROFILE_FIELDS,
+        )
 
-        # Вычисляем категории
-        mutual_usernames = set(followers_dict.keys()) & set(following_dict.keys())
-        not_following_back_usernames = set(following_dict.keys()) - set(
-            followers_dict.keys()
+        snapshots: dict[str, RelationSnapshot] = {
+            relation_type: RelationSnapshot.from_ids(ids)
+            for relation_type, ids in relations.items()
+        }
+
+        await snapshot_repository.add_many(
+            [
+                {
+                    "user_id": user_id,
+                    "relation_type": relation_type,
+                    "ids": snapshot.to_bytes(),
+                    "count": len(snapshot),
+                    "created_at": created_at,
+                }
+                for relation_type, snapshot in snapshots.items()
+            ],
         )
-        not_followed_by_usernames = set(followers_dict.keys()) - set(
-            following_dict.keys()
+
+        logger.info(
+            "instagram: seeded snapshots for user %s from %s relations",
+            user_id,
+            len(rows),
         )
 
-        # Функция для сохранения категорий в базу
-        async def save_category(usernames, source_dict, relation_type):
-            for username in usernames:
-                exists = await user_relations_repository.fetch_with_filters(
-                    user_id=user.id,
-                    related_username=username,
-                    relation_type=relation_type,
-                )
-                if exists is None:
-                    record = source_dict[username].copy(
-                        update={"relation_type": relation_type}
-                    )
-                    await user_relations_repository.add_record(record)
+        return True
+
+    async def __prune_snapshots(
+        self,
+        user_id: int,
+    ) -> None:
+        # хранятся последние снимки: их хватает для прироста за день
+        for relation_type in ("follower", "following"):
+            await snapshot_repository.prune(
+                user_id,
+                relation_type,
+                self._conf.instagram_snapshot_retention,
+            )
 
-        await save_category(
-            mutual_usernames,
-            followers_dict,
-            "mutual",
+    async def __fetch_user_relations(
+        self,
+        user_id: int,
+    ):
+        user = await user_repository.fetch_with_filters(user_id=user_id)
+
+        (followers, follower_profiles), (following, following_profiles) = (
+            await gather(
+                self.__crawl_relations(self._api.get_user_followers, user_id),
+                self.__crawl_relations(self._api.get_user_following, user_id),
+            )
         )
-        await save_category(
-            not_following_back_usernames,
-            following_dict,
-            "not_following_back",
+
+        profiles, snapshots = self.__relation_rows(
+            user.id,
+            {"follower": followers, "following": following},
+            {**follower_profiles, **following_profiles},
         )
-        await save_category(
-            not_followed_by_usernames,
-            followers_dict,
-            "not_followed_by",
+
+        await related_profile_repository.upsert_many(
+            profiles,
+            update_fields=RELATED_PROFILE_FIELDS,
         )
 
-        # Возвращаем как раньше
-        return (
-            len(followers_objs),
-            len(following_objs),
-            len(mutual_usernames),
-            len(not_following_back_usernames),
-            len(not_followed_by_usernames),
+        await self.__seed_snapshots(user.id)
+
+        await snapshot_repository.add_many(
+            snapshots,
         )
 
+        await self.__prune_snapshots(user.id)
+
+        return self.__relation_counts(followers, following)
+
     async def __update_user_data(
         self,
         user_id: int,
@@ -454,7 +683,7 @@ class InstagramCore:
         user_data = await call(user_id)
 
         if user_data is None:
-            user = self.__get_user_info(
+            user = await self.__get_user_info(
                 user_id,
                 is_username=False,
                 find_method=False,
@@ -470,21 +699,38 @@ class InstagramCore:
 
         return user_data
 
-    async def __update_user_posts(
+    async def __fetch_user_media(
         self,
         user_id: int,
-    ):
-        user = await user_repository.fetch_with_filters(
-            user_id=user_id,
-        )
+    ) -> list[dict[str, Any]]:
         try:
-            response = self._api.get_user_media(
+            response = await self._api.get_user_media(
                 user_id=user_id,
                 count=12,
             )
-            loaded_response = RocketBodyMedia(**response)
+            return RocketBodyMedia(**response).items
         except (BadResponseException, Exception):
-            return (0, 0, 0)
+            return []
+
+    @staticmethod
+    def __post_counts(
+        posts: list[InstagramPost],
+    ) -> tuple[int, int, int]:
+        likes_count = sum(map(lambda post: post.likes_count, posts))
+
+        comments_count = sum(map(lambda post: post.comments_count, posts))
+
+        publications_count = len(posts)
+
+        return (likes_count, comments_count, publications_count)
+
+    async def __update_user_posts(
+        self,
+        user_id: int,
+    ):
+        user = await user_repository.fetch_with_filters(
+            user_id=user_id,
+        )
 
         posts = list(
             map(
@@ -492,7 +738,7 @@ class InstagramCore:
                     post,
                     user_id=user.id,
                 ),
-                loaded_response.items,
+                await self.__fetch_user_media(user_id),
             ),
         )
 
@@ -506,13 +752,7 @@ class InstagramCore:
                     post,
                 )
 
-        likes_count = sum(map(lambda post: post.likes_count, posts))
-
-        comments_count = sum(map(lambda post: post.comments_count, posts))
-
-        publications_count = len(posts)
-
-        return (likes_count, comments_count, publications_count)
+        return self.__post_counts(posts)
 
     async def save_user_session(
         self,
@@ -526,7 +766,7 @@ class InstagramCore:
             user_uuid = user_session.uuid
 
         if user_session is None:
-            user = await self.__update_user_stats(
+            user, _ = await self.__update_user_stats(
                 session=session,
             )
 
@@ -562,7 +802,7 @@ class InstagramCore:
             related=["statistics"],
         )
         if user_data is None:
-            user = self.__get_user_info(
+            user = await self.__get_user_info(
                 username,
                 is_username=True,
             )
@@ -590,106 +830,135 @@ class InstagramCore:
             uuid=uuid,
         )
 
-    @__validate_uuid("uuid", "user_id")
-    async def fetch_subscribers(
+    async def __fetch_snapshot_page(
         self,
-        uuid: str,
-        relation_type: str,
-        session_param: int | None = None,
-    ):
-        user_session: InstagramSessions = await session_repository.fetch_with_filters(
-            uuid=uuid,
-        )
+        user_id: int,
+        instagram_id: int | str,
+        category: str,
+        size: int,
+        after: int | None = None,
+        crawl: bool = False,
+    ) -> tuple[list[InstagramFollower], list[int]]:
+        """Страница связей, вычисленная по снимкам подписчиков и подписок.
+
+        `new` и `unsub` — разность двух последних снимков подписчиков,
+        `mutual` и `not_followed_by` — пересечение и разность последних
+        снимков подписчиков и подписок. Возвращается до `size + 1`
+        id по возрастанию (id в Instagram служит курсором) и записи для
+        тех из них, чей профиль сохранен: наличие следующей страницы и
+        курсор определяются по id, а не по записям.
+        Если снимков нет, они создаются из старых строк связей, а если нет
+        и их и `crawl` включен, связи загружаются из Instagram.
+        """
 
-        async def call(
-            user_id: int,
-        ):
-            created_at = date.today() if relation_type == "new" else None
-            return await user_relations_repository.fetch_with_filters(
-                user_id=user_id,
-                many=True,
-                relation_type="unsub" if relation_type == "unsub" else "follower",
-                created_at=created_at,
+        async def call() -> tuple[
+            list[InstagramRelationSnapshots],
+            list[InstagramRelationSnapshots],
+        ]:
+            return await gather(
+                snapshot_repository.fetch_latest(user_id, "follower"),
+                snapshot_repository.fetch_latest(user_id, "following", limit=1),
             )
 
-        user_subscribers = await call(session_param)
+        followers, following = await call()
 
-        if len(user_subscribers) <= 0 and relation_type == "new":
-            subscribers = self.__paginate(
-                self._api.get_user_followers,
-                user_session.ds_user_id,
-            )
+        if not followers and await self.__seed_snapshots(user_id):
+            followers, following = await call()
 
-            for subscriber in subscribers:
-                subscriber_data = InstagramFollower(
-                    **subscriber,
-                    user_id=session_param,
-                    relation_type="follower",
-                )
+        if not followers and after is None and crawl:
+            await self.__fetch_user_relations(instagram_id)
+            followers, following = await call()
 
-                await user_relations_repository.add_record(
-                    subscriber_data,
-                )
+        if not followers:
+            return [], []
 
-        user_subscribers = await call(session_param)
+        current = RelationSnapshot.from_bytes(followers[0].ids)
+        previous = (
+            RelationSnapshot.from_bytes(followers[1].ids)
+            if len(followers) > 1
+            else None
+        )
 
-        return list(
-            map(
-                lambda subscriber: InstagramFollower.model_validate(
-                    subscriber,
-                ),
-                user_subscribers,
+        if category == "new":
+            # первый снимок целиком считается новыми подписчиками
+            selected = current - previous if previous is not None else current
+        elif category == "unsub":
+            selected = (
+                previous - current
+                if previous is not None
+                else RelationSnapshot.from_ids([])
             )
-        )
+        elif category in ("mutual", "not_followed_by"):
+            subscriptions = RelationSnapshot.from_bytes(
+                following[0].ids if following else None,
+            )
+            selected = (
+                current & subscriptions
+                if category == "mutual"
+                else current - subscriptions
+            )
+        else:
+            selected = current
+
+        ids: list[int] = selected.page(size + 1, after)
+        profiles = await related_profile_repository.fetch_by_ids(ids)
+
+        return [
+            InstagramFollower(
+                user_id=user_id,
+                relation_type=SNAPSHOT_RELATIONS[category],
+                pk=str(pk),
+                username=profiles[pk].username,
+                full_name=profiles[pk].full_name,
+                profile_pic_url=profiles[pk].profile_picture,
+                created_at=followers[0].created_at,
+            )
+            for pk in ids
+            if pk in profiles
+        ], ids
 
     @__validate_uuid("uuid", "user_id")
-    async def fetch_subscribtions(
+    async def fetch_subscribers(
         self,
         uuid: str,
         relation_type: str,
+        size: int,
+        after: int | None = None,
         session_param: int | None = None,
-    ):
+    ) -> tuple[list[InstagramFollower], list[int]]:
         user_session: InstagramSessions = await session_repository.fetch_with_filters(
             uuid=uuid,
         )
 
-        async def call(
-            user_id: int,
-        ):
-            return await user_relations_repository.fetch_with_filters(
-                user_id=user_id,
-                many=True,
-                relation_type=relation_type,
-            )
-
-        user_subscribtions = await call(session_param)
-
-        if len(user_subscribtions) <= 0:
-            subscribtions = self.__paginate(
-                self._api.get_user_following,
-                user_session.ds_user_id,
-            )
-
-            for subscribtion in subscribtions:
-                subscriber_data = InstagramFollower(
-                    **subscribtion,
-                    user_id=session_param,
-                    relation_type="following",
-                )
-
-                await user_relations_repository.add_record(
-                    subscriber_data,
-                )
+        return await self.__fetch_snapshot_page(
+            session_param,
+            user_session.ds_user_id,
+            relation_type,
+            size,
+            after,
+            crawl=relation_type == "new",
+        )
 
-        user_subscribers = await call(session_param)
+    @__validate_uuid("uuid", "user_id")
+    async def fetch_subscribtions(
+        self,
+        uuid: str,
+        relation_type: str,
+        size: int,
+        after: int | None = None,
+        session_param: int | None = None,
+    ) -> tuple[list[InstagramFollower], list[int]]:
+        user_session: InstagramSessions = await session_repository.fetch_with_filters(
+            uuid=uuid,
+        )
 
-        return list(
-            map(
-                lambda subscriber: InstagramFollower.model_validate(
-                    subscriber,
-                ),
-                user_subscribers,
-            )
+        return await self.__fetch_snapshot_page(
+            session_param,
+            user_session.ds_user_id,
+            relation_type,
+            size,
+            after,
+            crawl=True,
         )
 
     @__validate_uuid("uuid")
@@ -698,108 +967,326 @@ class InstagramCore:
         uuid: str,
         session_param: int | None = None,
     ) -> InstagramUpdateUserResponse:
-        await self.__update_user_stats(
+        _, timings = await self.__update_user_stats(
             uuid=uuid,
         )
         return InstagramUpdateUserResponse(
             uuid=uuid,
+            timings=timings,
         )
 
-    async def fetch_tracking_subscribers(
+    @staticmethod
+    def __fetch_count(
+        profile: dict[str, Any],
+        key: str,
+        edge: str,
+    ) -> int:
+        # профиль по id (private API) и веб-профиль хранят счетчики по-разному
+        if key in profile:
+            return int(profile[key] or 0)
+        return int(profile.get(edge, {}).get("count", 0))
+
+    async def __refresh_tracked_user(
         self,
-        username: str,
-        relation_type: str,
-    ):
-        user: InstagramUsers = await user_repository.fetch_with_filters(
-            username=username,
+        user: InstagramUsers,
+        trackings: list[tuple[int, InstagramUserStats | None]],
+        budget: RequestBudget,
+    ) -> str:
+        if not budget.reserve(1):
+            return "deferred"
+
+        # счетчики нужны свежие: кэш только обновляется
+        profile: dict[str, Any] = await self.__get_user_info(
+            user.user_id,
+            is_username=False,
+            find_method=False,
+            cached=False,
         )
 
-        async def call(
-            user_id: int,
-        ):
-            created_at = date.today() if relation_type == "new" else None
-            return await user_relations_repository.fetch_with_filters(
-                user_id=user_id,
-                many=True,
-                relation_type="unsub" if relation_type == "unsub" else "follower",
-                created_at=created_at,
-            )
+        followers: int = self.__fetch_count(
+            profile,
+            "follower_count",
+            "edge_followed_by",
+        )
+        following: int = self.__fetch_count(
+            profile,
+            "following_count",
+            "edge_follow",
+        )
+
+        previous: InstagramUserStats | None = max(
+            (stats for _, stats in trackings if stats is not None),
+            key=lambda stats: stats.id,
+            default=None,
+        )
 
-        user_subscribers = await call(user.id)
+        # связи обходятся заново, только если изменились счетчики подписок
+        changed: bool = previous is None or (
+            previous.followers_count,
+            previous.following_count,
+        ) != (followers, following)
+
+        cost: int = 1 + (
+            ceil(followers / 50) + ceil(following / 50) if changed else 0
+        )
+
+        if not budget.reserve(cost):
+            return "deferred"
+
+        likes, comments, publications = await self.__update_user_posts(
+            user.user_id,
+        )
 
-        if len(user_subscribers) <= 0 and relation_type == "new":
-            subscribers = self.__paginate(
-                self._api.get_user_followers,
+        if changed:
+            relations = await self.__fetch_user_relations(
                 user.user_id,
             )
+        else:
+            relations = (
+                previous.followers_count,
+                previous.following_count,
+                previous.mutual_subscriptions_count,
+                previous.non_reciprocal_followers_count,
+                previous.non_reciprocal_following_count,
+            )
 
-            for subscriber in subscribers:
-                subscriber_data = InstagramFollower(
-                    **subscriber,
-                    user_id=user.id,
-                    relation_type="follower",
+        await user_stats_repository.add_many(
+            [
+                self.__generate_stats(
+                    user.id,
+                    likes,
+                    comments,
+                    publications,
+                    *relations,
+                    tracking_id,
                 )
+                for tracking_id, _ in trackings
+            ]
+        )
 
-                await user_relations_repository.add_record(
-                    subscriber_data,
-                )
+        return "crawled" if changed else "unchanged"
 
-            user_subscribers = await call(user.id)
+    async def refresh_tracked_users(
+        self,
+        limit: int = 100,
+        concurrency: int = 4,
+        request_budget: int = 500,
+    ) -> dict[str, Any]:
+        """Обновляет статистику отслеживаемых пользователей без данных за сегодня.
 
-        return list(
-            map(
-                lambda subscriber: InstagramFollower.model_validate(
-                    subscriber,
-                ),
-                user_subscribers,
-            )
+        Цель, которую отслеживают несколько владельцев, обходится один раз.
+        Обновления идут параллельно (не больше `concurrency`), а число
+        запросов к rocketapi за запуск ограничено `request_budget`:
+        не уместившиеся в бюджет цели остаются устаревшими до следующего запуска.
+
+        Args:
+            limit (int): Максимум отслеживаний за запуск
+            concurrency (int): Максимум одновременно обновляемых целей
+            request_budget (int): Максимум запросов к rocketapi за запуск
+
+        Returns:
+            dict[str, Any]: Отчет запуска (исходы, запросы, скорость, задержки)
+        """
+        started: float = monotonic()
+
+        rows = await user_tracking_repository.fetch_stale(
+            now().date(),
+            limit,
         )
 
-    async def fetch_tracking_subscribtions(
-        self,
-        username: str,
-    ):
-        user: InstagramUsers = await user_repository.fetch_with_filters(
-            username=username,
+        # цель, которую отслеживают несколько владельцев, обходится один раз
+        targets: dict[
+            int,
+            tuple[InstagramUsers, list[tuple[int, InstagramUserStats | None]]],
+        ] = {}
+
+        for tracking, user, stats in rows:
+            targets.setdefault(user.id, (user, []))[1].append((tracking.id, stats))
+
+        budget = RequestBudget(request_budget)
+        semaphore = Semaphore(concurrency)
+
+        outcomes: Counter = Counter()
+        latencies: list[float] = []
+
+        async def refresh(
+            user: InstagramUsers,
+            trackings: list[tuple[int, InstagramUserStats | None]],
+        ) -> None:
+            async with semaphore:
+                user_started: float = monotonic()
+                try:
+                    outcome: str = await self.__refresh_tracked_user(
+                        user,
+                        trackings,
+                        budget,
+                    )
+                except Exception as err:
+                    logger.warning(
+                        "instagram: tracking refresh failed for %s (%s)",
+                        user.username,
+                        err.__class__.__name__,
+                    )
+                    outcome = "failed"
+
+                outcomes[outcome] += 1
+                if outcome in ("crawled", "unchanged"):
+                    latencies.append(monotonic() - user_started)
+
+        await gather(
+            *(refresh(user, trackings) for user, trackings in targets.values())
         )
 
-        async def call(
-            user_id: int,
-        ):
-            return await user_relations_repository.fetch_with_filters(
-                user_id=user_id,
-                many=True,
-                relation_type=relation_type,
-            )
+        duration: float = monotonic() - started
+
+        report: dict[str, Any] = {
+            "selected": len(targets),
+            "crawled": outcomes["crawled"],
+            "unchanged": outcomes["unchanged"],
+            "deferred": outcomes["deferred"],
+            "failed": outcomes["failed"],
+            "requests": budget.used,
+            "duration": round(duration, 3),
+            "throughput": round(len(latencies) / duration, 3) if duration else 0.0,
+            "latency_avg": (
+                round(sum(latencies) / len(latencies), 3) if latencies else 0.0
+            ),
+            "latency_max": round(max(latencies), 3) if latencies else 0.0,
+        }
 
-        user_subscribtions = await call(user.id)
+        logger.info(
+            "instagram: tracking refresh %s",
+            report,
+        )
 
-        if len(user_subscribtions) <= 0:
-            subscribtions = self.__paginate(
-                self._api.get_user_following,
-                user.user_id,
+        return report
+
+    async def aggregate_daily_stats(
+        self,
+        days: int = 2,
+    ) -> dict[str, Any]:
+        """Пересчитывает дневную статистику подписчиков по снимкам связей.
+
+        Для каждого из последних `days` дней (включая сегодня) берутся
+        последние за день снимки подписчиков и подписок пользователя, а
+        новые подписчики и отписки считаются относительно последнего
+        снимка до этого дня. Записи за день перезаписываются, поэтому
+        задачу можно запускать повторно.
+
+        Args:
+            days (int): Сколько последних дней пересчитать
+
+        Returns:
+            dict[str, Any]: Отчет о запуске
+        """
+        started: float = monotonic()
+        today: date = date.today()
+
+        rows: list[dict[str, Any]] = []
+
+        for offset in range(days):
+            day: date = today - timedelta(days=offset)
+
+            latest: dict[int, dict[str, InstagramRelationSnapshots]] = defaultdict(
+                dict,
             )
+            for snapshot in await snapshot_repository.fetch_day(day):
+                latest[snapshot.user_id][snapshot.relation_type] = snapshot
 
-            for subscribtion in subscribtions:
-                subscriber_data = InstagramFollower(
-                    **subscribtion,
-                    user_id=user.id,
-                    relation_type="following",
+            previous = await snapshot_repository.fetch_previous(
+                list(latest),
+                day,
+            )
+
+            for user_id, snapshots in latest.items():
+                if "follower" not in snapshots:
+                    continue
+
+                followers = RelationSnapshot.from_bytes(snapshots["follower"].ids)
+                following = RelationSnapshot.from_bytes(
+                    snapshots["following"].ids if "following" in snapshots else None,
+                )
+                # первый снимок пользователя — точка отсчета без прироста
+                before = (
+                    RelationSnapshot.from_bytes(previous[user_id].ids)
+                    if user_id in previous
+                    else followers
                 )
 
-                await user_relations_repository.add_record(
-                    subscriber_data,
+                rows.append(
+                    {
+                        "user_id": user_id,
+                        "day": day,
+                        "followers_count": len(followers),
+                        "following_count": len(following),
+                        "mutual_count": len(followers & following),
+                        "new_followers_count": len(followers - before),
+                        "unfollowers_count": len(before - followers),
+                    }
                 )
 
-            user_subscribers = await call(user.id)
+        await daily_stats_repository.upsert_many(
+            rows,
+            update_fields=[
+                "followers_count",
+                "following_count",
+                "mutual_count",
+                "new_followers_count",
+                "unfollowers_count",
+            ],
+        )
 
-        return list(
-            map(
-                lambda subscriber: InstagramFollower.model_validate(
-                    subscriber,
-                ),
-                user_subscribers,
-            )
+        report: dict[str, Any] = {
+            "days": days,
+            "rows": len(rows),
+            "duration": round(monotonic() - started, 3),
+        }
+
+        logger.info(
+            "instagram: daily stats %s",
+            report,
+        )
+
+        return report
+
+    async def fetch_tracking_subscribers(
+        self,
+        username: str,
+        relation_type: str,
+        size: int,
+        after: int | None = None,
+    ) -> tuple[list[InstagramFollower], list[int]]:
+        user: InstagramUsers = await user_repository.fetch_with_filters(
+            username=username,
+        )
+
+        return await self.__fetch_snapshot_page(
+            user.id,
+            user.user_id,
+            relation_type,
+            size,
+            after,
+            crawl=relation_type == "new",
+        )
+
+    async def fetch_tracking_subscribtions(
+        self,
+        username: str,
+        relation_type: str,
+        size: int,
+        after: int | None = None,
+    ) -> tuple[list[InstagramFollower], list[int]]:
+        user: InstagramUsers = await user_repository.fetch_with_filters(
+            username=username,
+        )
+
+        return await self.__fetch_snapshot_page(
+            user.id,
+            user.user_id,
+            relation_type,
+            size,
+            after,
+            crawl=True,
         )
 
 
@@ -0,0 +1,212 @@
+# coding utf-8
+
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+)
+
+from functools import partial
+
+from concurrent.futures import ThreadPoolExecutor
+
+from asyncio import (
+    Task,
+    create_task,
+    get_running_loop,
+)
+
+from rocketapi import InstagramAPI
+
+from rocketapi.exceptions import BadResponseException
+
+
+class RequestBudget:
+    """Лимит запросов к rocketapi на один запуск фоновой задачи.
+
+    Резервирование выполняется без `await`, поэтому конкурентные
+    обновления не превысят лимит.
+
+    Args:
+        limit (int): Максимум запросов
+    """
+
+    def __init__(
+        self,
+        limit: int,
+    ) -> None:
+        self._limit = limit
+        self._used = 0
+
+    @property
+    def used(
+        self,
+    ) -> int:
+        return self._used
+
+    def reserve(
+        self,
+        amount: int,
+    ) -> bool:
+        if self._used + amount > self._limit:
+            return False
+        self._used += amount
+        return True
+
+
+class AsyncInstagramAPI:
+    """Асинхронный доступ к rocketapi.
+
+    SDK синхронный (requests), поэтому его вызовы выполняются в общем
+    ограниченном пуле потоков и не блокируют event loop сервиса.
+    Пагинатор запрашивает следующую страницу, пока вызывающий код
+    сохраняет текущую.
+
+    Args:
+        token (str): Токен rocketapi
+        max_workers (int): Размер пула потоков для запросов
+    """
+
+    _executors: dict[int, ThreadPoolExecutor] = {}
+
+    def __init__(
+        self,
+        token: str,
+        max_workers: int = 8,
+    ) -> None:
+        self._api = InstagramAPI(
+            token=token,
+        )
+        # пул общий для процесса, чтобы лимит не умножался на число ядер
+        if max_workers not in self._executors:
+            self._executors[max_workers] = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="rocketapi",
+            )
+        self._executor = self._executors[max_workers]
+
+    async def __call(
+        self,
+        method: str,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        return await get_running_loop().run_in_executor(
+            self._executor,
+            partial(
+                getattr(self._api, method),
+                **kwargs,
+            ),
+        )
+
+    async def get_user_info(
+        self,
+        username: str,
+    ) -> dict[str, Any]:
+        return await self.__call(
+            "get_user_info",
+            username=username,
+        )
+
+    async def get_user_info_by_id(
+        self,
+        user_id: int | str,
+    ) -> dict[str, Any]:
+        return await self.__call(
+            "get_user_info_by_id",
+            user_id=user_id,
+        )
+
+    async def get_user_media(
+        self,
+        user_id: int | str,
+        count: int = 12,
+    ) -> dict[str, Any]:
+        return await self.__call(
+            "get_user_media",
+            user_id=user_id,
+            count=count,
+        )
+
+    async def get_user_followers(
+        self,
+        user_id: int | str,
+        count: int = 50,
+        max_id: str | None = None,
+    ) -> dict[str, Any]:
+        return await self.__call(
+            "get_user_followers",
+            user_id=user_id,
+            count=count,
+            max_id=max_id,
+        )
+
+    async def get_user_following(
+        self,
+        user_id: int | str,
+        count: int = 50,
+        max_id: str | None = None,
+    ) -> dict[str, Any]:
+        return await self.__call(
+            "get_user_following",
+            user_id=user_id,
+            count=count,
+            max_id=max_id,
+        )
+
+    async def paginate(
+        self,
+        fetch_func: Callable[..., Awaitable[dict[str, Any]]],
+        user_id: int | str,
+        count: int = 50,
+    ) -> AsyncGenerator[list[dict[str, Any]], None]:
+        """Возвращает страницы пользователей (followers/following).
+
+        Следующая страница запрашивается сразу после получения текущей,
+        до того как вызывающий код ее обработает. Ошибка ответа на первой
+        странице означает пустой список, на следующих — `RuntimeError`.
+
+        Args:
+            fetch_func: Метод получения страницы (`get_user_followers`, ...)
+            user_id (int | str): Идентификатор пользователя Instagram
+            count (int): Размер страницы
+        """
+
+        async def fetch_page(
+            max_id: str | None,
+        ) -> dict[str, Any]:
+            try:
+                return await fetch_func(
+                    user_id=user_id,
+                    count=count,
+                    max_id=max_id,
+                )
+            except BadResponseException as err:
+                # 🚫 Нет данных (например, у пользователя нет подписчиков);
+                # ошибка на следующих страницах обрывает обход, и неполный
+                # список не должен сохраниться как снимок
+                if max_id is None:
+                    return {}
+                raise RuntimeError(f"Instagram API error: {err}") from err
+            except Exception as err:
+                raise RuntimeError(f"Instagram API error: {err}") from err
+
+        page: Task | None = create_task(fetch_page(None))
+
+        try:
+            while page is not None:
+                response: dict[str, Any] = await page
+                page = None
+
+                users: list[dict[str, Any]] = response.get("users", [])
+                if not users:
+                    break
+
+                next_max_id: str | None = response.get("next_max_id")
+                if next_max_id:
+                    page = create_task(fetch_page(next_max_id))
+
+                yield users
+        finally:
+            if page is not None:
+                page.cancel()
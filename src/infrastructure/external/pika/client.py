@@ -1,7 +1,5 @@
 # coding utf-8
 
-from asyncio import sleep
-
 from os import (
     getenv,
     path,
@@ -22,7 +20,10 @@ from ....domain.conf import app_conf
 
 from ....domain.errors import PikaError
 
-from ....domain.repositories import IDatabase
+from ....domain.repositories import (
+    IDatabase,
+    release_accounts,
+)
 
 from ....domain.typing.enums import (
     PikaEndpoint,
@@ -31,6 +32,7 @@ from ....domain.typing.enums import (
 
 from ....domain.tools import (
     update_account_token,
+    RetryPolicy,
 )
 
 from ....domain.entities.core import (
@@ -98,6 +100,36 @@ user_data_database = UserDataRepository(
 )
 
 
+retry_policy = RetryPolicy(
+    "pika",
+    fatal_codes={
+        25,
+        35,
+        55,
+    },
+    reauth_codes={
+        8,
+    },
+    retry_codes={
+        9,
+    },
+)
+
+
+status_retry_policy = RetryPolicy(
+    "pika_status",
+    fatal_codes={
+        8,
+        35,
+    },
+)
+
+
+auth_retry_policy = RetryPolicy(
+    "pika_auth",
+)
+
+
 class PikaClient:
     def __init__(
         self,
@@ -111,19 +143,14 @@ class PikaClient:
         self,
         account: PikaAccounts,
     ) -> PikaAccountData:
-        max_attempts = 10
-
-        for attempt in range(max_attempts):
-            try:
-                return await self._session.fetch_auth_token(
-                    credentials=UserCredentials(
-                        username=account.username,
-                        password=account.password,
-                    )
+        return await auth_retry_policy.run(
+            lambda: self._session.fetch_auth_token(
+                credentials=UserCredentials(
+                    username=account.username,
+                    password=account.password,
                 )
-            except Exception:
-                await sleep(1)
-        raise RuntimeError("Canno't auth current account")
+            ),
+        )
 
     async def __handle_success(
         self,
@@ -151,17 +178,23 @@ class PikaClient:
             video_id=data.data.id,
         )
 
-    async def __handle_failure(
+    def __check_response(
         self,
-        status_code: int,
-        extra: dict[str] = {},
-    ) -> PikaError:
-        error = PikaError(
-            status_code=999 if status_code is None else status_code,
-            extra=extra,
-        )
+        data: PikaGenerationResponse | PikaVideoResponse | PikaResponse,
+        account: PikaAccounts,
+    ) -> None:
+        if not isinstance(data, PikaResponse):
+            return
 
-        raise error
+        raise PikaError(
+            status_code=8 if data.message == "Unauthorized" else data.code,
+            extra={
+                "Данные аккаунта": {
+                    "логин": account.username,
+                    "пароль": account.password,
+                }
+            },
+        )
 
     def __fetch_ext(
         self,
@@ -219,10 +252,18 @@ class PikaClient:
         self,
         account,
     ) -> PikaAccountData:
-        return await self.auth_user(
+        account_data: PikaAccountData = await self.auth_user(
+            account,
+        )
+
+        await update_account_token(
             account,
+            **account_data.dict,
+            project="pika",
         )
 
+        return account_data
+
     async def fetch_account_credits(
         self,
         token: str,
@@ -243,6 +284,7 @@ class PikaClient:
 
         return data.credits
 
+    @release_accounts
     async def text_to_video(
         self,
         body: PikaT2VBody,
@@ -258,80 +300,34 @@ class PikaClient:
 
         account_id = account.id
 
-        max_attempts = 10
-
-        last_err_code = None
-
-        for attempt in range(max_attempts):
-            account_data: PikaAccountData = await self.__get_account_data(
-                account,
+        async def call(
+            account_data: PikaAccountData,
+        ) -> PikaGenerationResponse | PikaResponse:
+            return await self._core.post(
+                token=account_data.token,
+                url_method=PikaMethod.GENEREATE,
+                endpoint=PikaEndpoint.V2,
+                data=IT2VBody(
+                    prompt=body.prompt,
+                    user_id=account_data.user_id,
+                ),
             )
-            try:
-
-                async def call(
-                    account_data: PikaAccountData,
-                ) -> PikaGenerationResponse | PikaResponse:
-                    return await self._core.post(
-                        token=account_data.token,
-                        url_method=PikaMethod.GENEREATE,
-                        endpoint=PikaEndpoint.V2,
-                        data=IT2VBody(
-                            prompt=body.prompt,
-                            user_id=account_data.user_id,
-                        ),
-                    )
-
-                data: PikaGenerationResponse | PikaResponse = await call(
-                    account_data,
-                )
-
-                if isinstance(data, PikaResponse) and data.message == "Unauthorized":
-                    raise PikaError(status_code=8)
-
-                elif data.success is True:
-                    return await self.__handle_success(
-                        data,
-                        account_id,
-                        user_id,
-                        app_id,
-                    )
-
-                last_err_code = data.code
 
-            except Exception:
-                if attempt == max_attempts - 1:
-                    account_data = await self.__reauthenticate(
-                        account,
-                    )
-
-                    await update_account_token(
-                        account,
-                        **account_data.dict,
-                        project="pika",
-                    )
-
-                    try:
-                        data = await call(
-                            account_data,
-                        )
-
-                        if not isinstance(data, PikaResponse):
-                            return data
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.error)
-                await sleep(1)
+        data: PikaGenerationResponse | PikaResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_data(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
+        )
 
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        return await self.__handle_success(
+            data,
+            account_id,
+            user_id,
+            app_id,
         )
 
+    @release_accounts
     async def image_to_video(
         self,
         body: PikaT2VBody,
@@ -353,87 +349,41 @@ class PikaClient:
 
         account_id = account.id
 
-        max_attempts = 10
-
-        last_err_code = None
-
-        for attempt in range(max_attempts):
-            account_data: PikaAccountData = await self.__get_account_data(
-                account,
+        async def call(
+            account_data: PikaAccountData,
+        ) -> PikaGenerationResponse | PikaResponse:
+            return await self._core.post(
+                token=account_data.token,
+                url_method=PikaMethod.GENEREATE,
+                endpoint=PikaEndpoint.V1,
+                data=IP2VBody(
+                    prompt=body.prompt,
+                    user_id=account_data.user_id,
+                ),
+                files={
+                    "image": (
+                        image_data.filename,
+                        BytesIO(image_data.bytes),
+                        "image/jpeg",
+                    ),
+                },
             )
-            try:
-
-                async def call(
-                    account_data: PikaAccountData,
-                ) -> PikaGenerationResponse | PikaResponse:
-                    return await self._core.post(
-                        token=account_data.token,
-                        url_method=PikaMethod.GENEREATE,
-                        endpoint=PikaEndpoint.V1,
-                        data=IP2VBody(
-                            prompt=body.prompt,
-                            user_id=account_data.user_id,
-                        ),
-                        files={
-                            "image": (
-                                image_data.filename,
-                                BytesIO(image_data.bytes),
-                                "image/jpeg",
-                            ),
-                        },
-                    )
 
-                data: PikaGenerationResponse | PikaResponse = await call(
-                    account_data,
-                )
-
-                if isinstance(data, PikaResponse) and data.message == "Unauthorized":
-                    raise PikaError(status_code=8)
-
-                elif data.success is True:
-                    return await self.__handle_success(
-                        data,
-                        account_id,
-                        user_id,
-                        app_id,
-                    )
-
-                last_err_code = data.code
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    account_data = await self.__reauthenticate(
-                        account,
-                    )
-
-                    await update_account_token(
-                        account,
-                        **account_data.dict,
-                        project="pika",
-                    )
-
-                    try:
-                        data = await call(
-                            account_data,
-                        )
-
-                        if not isinstance(data, PikaResponse):
-                            return data
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.error)
-                await sleep(1)
+        data: PikaGenerationResponse | PikaResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_data(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
+        )
 
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        return await self.__handle_success(
+            data,
+            account_id,
+            user_id,
+            app_id,
         )
 
+    @release_accounts
     async def template_to_video(
         self,
         body: PikaV2VBody,
@@ -455,87 +405,41 @@ class PikaClient:
 
         account_id = account.id
 
-        max_attempts = 10
-
-        last_err_code = None
-
-        for attempt in range(max_attempts):
-            account_data: PikaAccountData = await self.__get_account_data(
-                account,
-            )
-            try:
-
-                async def call(
-                    account_data: PikaAccountData,
-                ) -> PikaGenerationResponse | PikaResponse:
-                    return await self._core.post(
-                        token=account_data.token,
-                        url_method=PikaMethod.GENEREATE,
-                        endpoint=PikaEndpoint.EFFECTS,
-                        data=II2VBody(
-                            pika_ffect=body.template_id,
-                            user_id=account_data.user_id,
-                        ),
-                        files={
-                            "image": (
-                                image_data.filename,
-                                BytesIO(image_data.bytes),
-                                "image/jpeg",
-                            )
-                        },
-                    )
-
-                data: PikaGenerationResponse | PikaResponse = await call(
-                    account_data,
-                )
-
-                if isinstance(data, PikaResponse) and data.message == "Unauthorized":
-                    raise PikaError(status_code=8)
-
-                elif data.success is True:
-                    return await self.__handle_success(
-                        data,
-                        account_id,
-                        user_id,
-                        app_id,
-                    )
-
-                last_err_code = data.code
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    account_data = await self.__reauthenticate(
-                        account,
-                    )
-
-                    await update_account_token(
-                        account,
-                        **account_data.dict,
-                        project="pika",
+        async def call(
+            account_data: PikaAccountData,
+        ) -> PikaGenerationResponse | PikaResponse:
+            return await self._core.post(
+                token=account_data.token,
+                url_method=PikaMethod.GENEREATE,
+                endpoint=PikaEndpoint.EFFECTS,
+                data=II2VBody(
+                    pika_ffect=body.template_id,
+                    user_id=account_data.user_id,
+                ),
+                files={
+                    "image": (
+                        image_data.filename,
+                        BytesIO(image_data.bytes),
+                        "image/jpeg",
                     )
+                },
+            )
 
-                    try:
-                        data = await call(
-                            account_data,
-                        )
-
-                        if not isinstance(data, PikaResponse):
-                            return data
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.error)
-                await sleep(1)
+        data: PikaGenerationResponse | PikaResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_data(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
+        )
 
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        return await self.__handle_success(
+            data,
+            account_id,
+            user_id,
+            app_id,
         )
 
+    @release_accounts
     async def twist_to_video(
         self,
         body: PikaT2VBody,
@@ -557,87 +461,41 @@ class PikaClient:
 
         account_id = account.id
 
-        max_attempts = 10
-
-        last_err_code = None
-
-        for attempt in range(max_attempts):
-            account_data: PikaAccountData = await self.__get_account_data(
-                account,
-            )
-            try:
-
-                async def call(
-                    account_data: PikaAccountData,
-                ) -> PikaGenerationResponse | PikaResponse:
-                    return await self._core.post(
-                        token=account_data.token,
-                        url_method=PikaMethod.GENEREATE,
-                        endpoint=PikaEndpoint.V2,
-                        data=IV2TBody(
-                            prompt=body.prompt,
-                            user_id=account_data.user_id,
-                        ),
-                        files={
-                            "video": (
-                                video_data.filename,
-                                BytesIO(video_data.bytes),
-                                "video/mp4",
-                            )
-                        },
+        async def call(
+            account_data: PikaAccountData,
+        ) -> PikaGenerationResponse | PikaResponse:
+            return await self._core.post(
+                token=account_data.token,
+                url_method=PikaMethod.GENEREATE,
+                endpoint=PikaEndpoint.V2,
+                data=IV2TBody(
+                    prompt=body.prompt,
+                    user_id=account_data.user_id,
+                ),
+                files={
+                    "video": (
+                        video_data.filename,
+                        BytesIO(video_data.bytes),
+                        "video/mp4",
                     )
+                },
+            )
 
-                data: PikaGenerationResponse | PikaResponse = await call(
-                    account_data,
-                )
-
-                if isinstance(data, PikaResponse) and data.message == "Unauthorized":
-                    raise PikaError(status_code=8)
-
-                elif data.success is True:
-                    return await self.__handle_success(
-                        data,
-                        account_id,
-                        user_id,
-                        app_id,
-                    )
-
-                last_err_code = data.code
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    account_data = await self.__reauthenticate(
-                        account,
-                    )
-
-                    await update_account_token(
-                        account,
-                        **account_data.dict,
-                        project="pika",
-                    )
-
-                    try:
-                        data = await call(
-                            account_data,
-                        )
-
-                        if not isinstance(data, PikaResponse):
-                            return data
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.error)
-                await sleep(1)
+        data: PikaGenerationResponse | PikaResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_data(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
+        )
 
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        return await self.__handle_success(
+            data,
+            account_id,
+            user_id,
+            app_id,
         )
 
+    @release_accounts
     async def addition_to_video(
         self,
         body: PikaT2VBody,
@@ -664,92 +522,46 @@ class PikaClient:
 
         account_id = account.id
 
-        max_attempts = 10
-
-        last_err_code = None
-
-        for attempt in range(max_attempts):
-            account_data: PikaAccountData = await self.__get_account_data(
-                account,
+        async def call(
+            account_data: PikaAccountData,
+        ) -> PikaGenerationResponse | PikaResponse:
+            return await self._core.post(
+                token=account_data.token,
+                url_method=PikaMethod.GENEREATE,
+                endpoint=PikaEndpoint.V2,
+                data=IV2VBody(
+                    prompt=body.prompt,
+                    user_id=account_data.user_id,
+                ),
+                files={
+                    "video": (
+                        video_data.filename,
+                        BytesIO(video_data.bytes),
+                        "video/mp4",
+                    ),
+                    "image": (
+                        image_data.filename,
+                        BytesIO(image_data.bytes),
+                        "image/jpeg",
+                    ),
+                },
             )
-            try:
-
-                async def call(
-                    account_data: PikaAccountData,
-                ) -> PikaGenerationResponse | PikaResponse:
-                    return await self._core.post(
-                        token=account_data.token,
-                        url_method=PikaMethod.GENEREATE,
-                        endpoint=PikaEndpoint.V2,
-                        data=IV2VBody(
-                            prompt=body.prompt,
-                            user_id=account_data.user_id,
-                        ),
-                        files={
-                            "video": (
-                                video_data.filename,
-                                BytesIO(video_data.bytes),
-                                "video/mp4",
-                            ),
-                            "image": (
-                                image_data.filename,
-                                BytesIO(image_data.bytes),
-                                "image/jpeg",
-                            ),
-                        },
-                    )
-
-                data: PikaGenerationResponse | PikaResponse = await call(
-                    account_data,
-                )
-
-                if isinstance(data, PikaResponse) and data.message == "Unauthorized":
-                    raise PikaError(status_code=8)
-
-                elif data.success is True:
-                    return await self.__handle_success(
-                        data,
-                        account_id,
-                        user_id,
-                        app_id,
-                    )
-
-                last_err_code = data.code
 
-            except Exception:
-                if attempt == max_attempts - 1:
-                    account_data = await self.__reauthenticate(
-                        account,
-                    )
-
-                    await update_account_token(
-                        account,
-                        **account_data.dict,
-                        project="pika",
-                    )
-
-                    try:
-                        data = await call(
-                            account_data,
-                        )
-
-                        if not isinstance(data, PikaResponse):
-                            return data
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.error)
-                await sleep(1)
+        data: PikaGenerationResponse | PikaResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_data(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
+        )
 
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        return await self.__handle_success(
+            data,
+            account_id,
+            user_id,
+            app_id,
         )
 
+    @release_accounts
     async def swap_to_video(
         self,
         files: list[UploadFile],
@@ -775,93 +587,42 @@ class PikaClient:
 
         account_id = account.id
 
-        max_attempts = 10
-
-        last_err_code = None
-
-        for attempt in range(max_attempts):
-            account_data: PikaAccountData = await self.__get_account_data(
-                account,
+        async def call(
+            account_data: PikaAccountData,
+        ) -> PikaGenerationResponse | PikaResponse:
+            return await self._core.post(
+                token=account_data.token,
+                url_method=PikaMethod.GENEREATE,
+                endpoint=PikaEndpoint.V2,
+                data=IV2SBody(
+                    user_id=account_data.user_id,
+                ),
+                files={
+                    "video": (
+                        video_data.filename,
+                        BytesIO(video_data.bytes),
+                        "video/mp4",
+                    ),
+                    "image": (
+                        image_data.filename,
+                        BytesIO(image_data.bytes),
+                        "image/jpeg",
+                    ),
+                },
             )
-            try:
-
-                async def call(
-                    account_data: PikaAccountData,
-                ) -> PikaGenerationResponse | PikaResponse:
-                    return await self._core.post(
-                        token=account_data.token,
-                        url_method=PikaMethod.GENEREATE,
-                        endpoint=PikaEndpoint.V2,
-                        data=IV2SBody(
-                            user_id=account_data.user_id,
-                        ),
-                        files={
-                            "video": (
-                                video_data.filename,
-                                BytesIO(video_data.bytes),
-                                "video/mp4",
-                            ),
-                            "image": (
-                                image_data.filename,
-                                BytesIO(image_data.bytes),
-                                "image/jpeg",
-                            ),
-                        },
-                    )
-
-                data: PikaGenerationResponse | PikaResponse = await call(
-                    account_data,
-                )
-
-                if isinstance(data, PikaResponse) and data.message == "Unauthorized":
-                    raise PikaError(status_code=8)
-
-                elif data.success is True:
-                    return await self.__handle_success(
-                        data,
-                        account_id,
-                        user_id,
-                        app_id,
-                    )
-
-                last_err_code = data.code
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    # account_data = await self.__reauthenticate(
-                    #     account,
-                    # )
 
-                    # await update_account_token(
-                    #     account,
-                    #     **account_data.dict,
-                    #     project="pika",
-                    # )
-
-                    account_data = await self.__get_account_data(
-                        account,
-                    )
-
-                    try:
-                        data = await call(
-                            account_data,
-                        )
-
-                        if not isinstance(data, PikaResponse):
-                            return data
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.error)
-                await sleep(1)
+        data: PikaGenerationResponse | PikaResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_data(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
+        )
 
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        return await self.__handle_success(
+            data,
+            account_id,
+            user_id,
+            app_id,
         )
 
     async def fetch_video_status(
@@ -883,85 +644,33 @@ class PikaClient:
             generation_data.account_id,
         )
 
-        max_attempts = 10
-
-        last_err_code = None
-
-        for attempt in range(max_attempts):
-            account_data = await self.__get_account_data(
-                account,
+        async def call(
+            account_data: PikaAccountData,
+        ) -> PikaVideoResponse:
+            data: bytes = await self._core.post(
+                cookie=account_data.cookies,
+                is_serialized=False,
+                url_method=PikaMethod.BASE,
+                endpoint=PikaEndpoint.STATUS,
+                body=[II2GBody(ids=[id])],
             )
-            try:
-
-                async def call(
-                    account_data: PikaAccountData,
-                    id: str,
-                ) -> PikaVideoResponse:
-                    data: bytes = await self._core.post(
-                        cookie=account_data.cookies,
-                        is_serialized=False,
-                        url_method=PikaMethod.BASE,
-                        endpoint=PikaEndpoint.STATUS,
-                        body=[II2GBody(ids=[id])],
-                    )
-
-                    decoded: str = data.decode()
-
-                    str_data: str = next(
-                        line[2:]
-                        for line in decoded.splitlines()
-                        if line.startswith("1:")
-                    )
-
-                    return PikaVideoResponse.from_data(
-                        loads(str_data),
-                    )
-
-                data: PikaVideoResponse | PikaResponse = await call(
-                    account_data.cookies,
-                    id,
-                )
 
-                if isinstance(data, PikaResponse) and data.message == "Unauthorized":
-                    raise PikaError(status_code=8)
+            decoded: str = data.decode()
 
-                return data
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    # account_data = await self.__reauthenticate(
-                    #     account,
-                    # )
-
-                    # await update_account_token(
-                    #     account,
-                    #     **account_data.dict,
-                    #     project="pika",
-                    # )
+            str_data: str = next(
+                line[2:]
+                for line in decoded.splitlines()
+                if line.startswith("1:")
+            )
 
-                    account_data = await self.__get_account_data(
-                        account,
-                    )
+            return PikaVideoResponse.from_data(
+                loads(str_data),
+            )
 
-                    try:
-                        data = await call(
-                            account_data,
-                            id,
-                        )
-
-                        if not isinstance(data, PikaResponse):
-                            return data
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.error)
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        data: PikaVideoResponse | PikaResponse = await status_retry_policy.run(
+            call,
+            token=lambda: self.__get_account_data(account),
+            check=lambda data: self.__check_response(data, account),
         )
+
+        return data
@@ -6,9 +6,9 @@ from fastapi import UploadFile
 
 from .core import PixverseCore
 
-from uuid import uuid4
+from .status import GenerationStatusCache
 
-from asyncio import sleep
+from uuid import uuid4
 
 from math import ceil
 
@@ -29,7 +29,11 @@ from ...orm.database.repositories import (
     PixverseAccountsTokensRepository,
 )
 
-from ....domain.repositories import IDatabase
+from ....domain.repositories import (
+    IDatabase,
+    IRedis,
+    release_accounts,
+)
 
 from ....domain.entities.pixverse import (
     IT2VBody,
@@ -43,11 +47,16 @@ from ....domain.entities.pixverse import (
 
 from ....domain.tools import (
     upload_file,
+    upload_cache,
     update_account_token,
     convert_heic_to_jpg,
+    RetryPolicy,
 )
 
-from ....domain.constants import HEIF_EXTENSIONS
+from ....domain.constants import (
+    HEIF_EXTENSIONS,
+    PIXVERSE_FAILED_STATUSES,
+)
 
 from ....interface.schemas.external import (
     AuthRes,
@@ -104,6 +113,33 @@ pixverse_account_token_database = PixverseAccountsTokensRepository(
     engine=IDatabase(conf),
 )
 
+status_cache = GenerationStatusCache(
+    engine=IRedis(conf),
+    window=conf.pixverse_status_window,
+    ttl=int(conf.pixverse_status_interval * 6),
+)
+
+retry_policy = RetryPolicy(
+    "pixverse",
+    fatal_codes={
+        10005,
+        400017,
+        400018,
+        400019,
+        500008,
+        500043,
+        500054,
+        500063,
+        500070,
+        500090,
+    },
+    reauth_codes={
+        10001,
+        10003,
+        400012,
+    },
+)
+
 
 class PixVerseClient:
     """Клиентский интерфейс для работы с PixVerse API.
@@ -210,6 +246,123 @@ class PixVerseClient:
             raise error
         return data
 
+    async def __upload_images(
+        self,
+        token: str,
+        account_id: int,
+        images: list[tuple[bytes, str, str]],
+    ) -> list[str]:
+        """Загружает изображения, пропуская уже загруженные на аккаунт.
+
+        Args:
+            token (str): Токен аккаунта
+            account_id (int): Идентификатор аккаунта
+            images (list[tuple[bytes, str, str]]): Содержимое, расширение
+                и sha256 изображений
+
+        Returns:
+            list[str]: Имена файлов в хранилище PixVerse
+        """
+        token_data: UTResp | None = None
+
+        filenames: list[str] = []
+
+        for image_bytes, ext, digest in images:
+            asset: dict | None = await upload_cache.fetch(
+                "pixverse",
+                account_id,
+                digest,
+            )
+
+            if asset is not None:
+                filenames.append(asset["path"])
+                continue
+
+            if token_data is None:
+                token_data = await self.upload_token(token)
+
+            filename = f"{uuid4()}.{ext}"
+
+            await upload_file(
+                image_bytes,
+                filename,
+                **token_data.dict,
+            )
+
+            await self.upload_image(
+                token,
+                filename,
+                size=len(image_bytes),
+            )
+
+            await upload_cache.store(
+                "pixverse",
+                account_id,
+                digest,
+                {"path": filename},
+            )
+
+            filenames.append(filename)
+
+        return filenames
+
+    async def __upload_video(
+        self,
+        token: str,
+        account_id: int,
+        video_bytes: bytes,
+        ext: str,
+        digest: str,
+    ) -> dict:
+        """Загружает видео, если оно еще не загружено на аккаунт.
+
+        Returns:
+            dict: Имя файла (`name`), путь (`path`), ссылка (`url`) и
+                длительность (`duration`) видео
+        """
+        asset: dict | None = await upload_cache.fetch(
+            "pixverse",
+            account_id,
+            digest,
+        )
+
+        if asset is not None:
+            return asset
+
+        token_data: UTResp = await self.upload_token(
+            token,
+        )
+
+        filename = f"{uuid4()}.{ext}"
+
+        await upload_file(
+            video_bytes,
+            filename,
+            **token_data.dict,
+        )
+
+        video_data: Response = await self.upload_video(
+            token,
+            filename,
+            filename,
+        )
+
+        asset = {
+            "name": filename,
+            "path": video_data.resp.path,
+            "url": video_data.resp.url,
+            "duration": video_data.resp.duration,
+        }
+
+        await upload_cache.store(
+            "pixverse",
+            account_id,
+            digest,
+            asset,
+        )
+
+        return asset
+
     async def __get_account_token(
         self,
         account,
@@ -229,25 +382,42 @@ class PixVerseClient:
 
         return token
 
-    async def __get_video_status(
+    def __index_video_statuses(
         self,
         data: Response,
-        id: int,
-    ) -> GenerationStatus | None:
+    ) -> dict[int, GenerationStatus]:
+        statuses: dict[int, GenerationStatus] = {}
+
         for video in data.resp.data:
-            if video.video_id == id:
-                if video.video_status == 1 and video.first_frame:
-                    return GenerationStatus(status="success", video_url=video.url)
-                return GenerationStatus(
-                    status="generating" if video.video_status == 10 else "error"
+            if video.video_status == 1 and video.first_frame:
+                statuses[video.video_id] = GenerationStatus(
+                    status="success",
+                    video_url=video.url,
+                )
+            elif video.video_status in PIXVERSE_FAILED_STATUSES:
+                statuses[video.video_id] = GenerationStatus(
+                    status="error",
+                )
+            else:
+                # 1 без first_frame, 5, 10 и неизвестные коды — генерация
+                # продолжается и остается в опросе
+                statuses[video.video_id] = GenerationStatus(
+                    status="generating",
                 )
 
+        return statuses
+
     async def __reauthenticate(
         self,
         account,
     ) -> str:
         user: AuthRes = await self.auth_user(account)
 
+        await update_account_token(
+            account,
+            user.access_token,
+        )
+
         return user.access_token
 
     async def __handle_success(
@@ -271,24 +441,68 @@ class PixVerseClient:
                 app_id=body.app_id,
             )
         )
+        await status_cache.track(
+            account_id,
+            data.resp.video_id,
+        )
         return data.resp
 
-    async def __handle_failure(
+    def __check_response(
         self,
-        status_code: int,
-        extra: dict[str] = {},
-    ) -> PixverseError:
-        error = PixverseError(
-            status_code=10005 if status_code is None else status_code,
-            extra=extra,
+        data: Response,
+        account,
+    ) -> None:
+        if data.err_code != 0:
+            raise PixverseError(
+                status_code=data.err_code,
+                extra={
+                    "Данные аккаунта": {
+                        "логин": account.username,
+                        "пароль": account.password,
+                    }
+                },
+            )
+
+    async def fetch_account_statuses(
+        self,
+        account,
+    ) -> dict[int, GenerationStatus]:
+        """Запрашивает статусы всех генераций аккаунта одним STATUS запросом.
+
+        Args:
+            account: Аккаунт PixVerse
+
+        Returns:
+            dict[int, GenerationStatus]: Статусы генераций по video_id
+        """
+
+        async def call(
+            token: str,
+        ) -> Response:
+            return await self._core.post(
+                token=token,
+                endpoint=PixverseEndpoint.STATUS,
+                body=StatusBody(),
+            )
+
+        data: Response = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
         )
 
-        raise error
+        return self.__index_video_statuses(data)
 
     async def generation_status(
         self,
         id: int,
     ) -> GenerationStatus:
+        status: GenerationStatus | None = await status_cache.fetch(id)
+
+        if status is not None:
+            return status
+
         generation_data = await user_generations_database.fetch_generation(
             "generation_id",
             id,
@@ -297,74 +511,34 @@ class PixVerseClient:
         if generation_data is None:
             raise PixverseError(status_code=500008)
 
+        if generation_data.generation_url:
+            return GenerationStatus(
+                status="success",
+                video_url=generation_data.generation_url,
+            )
+
+        # в кэше нет статуса (фоновый опрос не запущен или генерация старая):
+        # запрашиваем аккаунт напрямую и кэшируем статусы всех его генераций
         account = await account_database.fetch_account(
             "id",
             generation_data.account_id,
         )
 
-        max_attempts = 10
+        statuses: dict[int, GenerationStatus] = await self.fetch_account_statuses(
+            account,
+        )
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+        await status_cache.store_many(statuses)
+
+        status = statuses.get(id)
+
+        if status is not None and status.status == "generating":
+            await status_cache.track(
+                account.id,
+                id,
             )
 
-            try:
-
-                async def call(
-                    token: str,
-                ) -> Response:
-                    return await self._core.post(
-                        token=token,
-                        endpoint=PixverseEndpoint.STATUS,
-                        body=StatusBody(),
-                    )
-
-                data: Response = await call(token)
-
-                if data.err_code == 0:
-                    return await self.__get_video_status(
-                        data,
-                        id,
-                    )
-
-                elif data.err_code == 10005:
-                    raise PixverseError(data.err_code)
-
-                last_err_code = data.err_code
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if data.err_code == 0:
-                            return await self.__get_video_status(
-                                data,
-                                id,
-                            )
-
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.err_code)
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "Имя аккаунта": account.username,
-                    "Пароль аккаунта": account.password,
-                }
-            },
-        )
+        return status
 
     async def credits_amount(
         self,
@@ -412,6 +586,7 @@ class PixVerseClient:
             raise error
         return data.resp
 
+    @release_accounts
     async def text_to_video(
         self,
         body: T2VBody,
@@ -425,73 +600,29 @@ class PixVerseClient:
 
         account_id = account.id
 
-        max_attempts = 10
-
-        last_err_code = None
-
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+        async def call(token: str) -> Response:
+            return await self._core.post(
+                token=token,
+                endpoint=PixverseEndpoint.TEXT,
+                body=IT2VBody(
+                    prompt=body.prompt,
+                ),
             )
 
-            try:
-
-                async def call(token: str) -> Response:
-                    return await self._core.post(
-                        token=token,
-                        endpoint=PixverseEndpoint.TEXT,
-                        body=IT2VBody(
-                            prompt=body.prompt,
-                        ),
-                    )
-
-                data: Response = await call(token)
-
-                if data.err_code == 0:
-                    return await self.__handle_success(
-                        data,
-                        account_id,
-                        body,
-                    )
-
-                elif data.err_code == 10005:
-                    raise PixverseError(data.err_code)
-
-                last_err_code = data.err_code
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if data.err_code == 0:
-                            return await self.__handle_success(
-                                data,
-                                account_id,
-                                body,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.err_code)
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        data: Response = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
+        )
+
+        return await self.__handle_success(
+            data,
+            account_id,
+            body,
         )
 
+    @release_accounts
     async def image_to_video(
         self,
         body: I2VBody,
@@ -518,86 +649,42 @@ class PixVerseClient:
                 image_bytes,
             )
 
-        filename = f"{uuid4()}.{ext}"
-
-        max_attempts = 10
+        digest: str = await upload_cache.digest(image_bytes)
 
-        last_err_code = None
+        async def call(
+            token: str,
+        ) -> Response:
+            (filename,) = await self.__upload_images(
+                token,
+                account_id,
+                [(image_bytes, ext, digest)],
+            )
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+            data = await self._core.post(
+                token=token,
+                endpoint=PixverseEndpoint.IMAGE,
+                body=II2VBody(
+                    img_path=filename,
+                    img_url=filename,
+                    prompt=body.prompt,
+                ),
             )
+            return data
+
+        data: Response = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
+        )
 
-            try:
-
-                async def call(
-                    token: str,
-                ) -> Response:
-                    token_data: UTResp = await self.upload_token(token)
-
-                    await upload_file(image_bytes, filename, **token_data.dict)
-
-                    await self.upload_image(token, filename, size=len(image_bytes))
-
-                    data = await self._core.post(
-                        token=token,
-                        endpoint=PixverseEndpoint.IMAGE,
-                        body=II2VBody(
-                            img_path=filename,
-                            img_url=filename,
-                            prompt=body.prompt,
-                        ),
-                    )
-                    return data
-
-                data: Response = await call(token)
-
-                if data.err_code == 0:
-                    return await self.__handle_success(
-                        data,
-                        account_id,
-                        body,
-                    )
-
-                elif data.err_code == 10005:
-                    raise PixverseError(data.err_code)
-
-                last_err_code = data.err_code
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if data.err_code == 0:
-                            return await self.__handle_success(
-                                data,
-                                account_id,
-                                body,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.err_code)
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        return await self.__handle_success(
+            data,
+            account_id,
+            body,
         )
 
+    @release_accounts
     async def restyle_video(
         self,
         body: R2VBody,
@@ -624,120 +711,68 @@ class PixVerseClient:
                 video_bytes,
             )
 
-        filename = f"{uuid4()}.{ext}"
+        digest: str = await upload_cache.digest(video_bytes)
 
-        max_attempts = 10
+        async def call(
+            token: str,
+        ) -> Response:
+            style: Style | None = await style_database.fetch_style(
+                "template_id",
+                body.template_id,
+            )
 
-        last_err_code = None
+            if style is None:
+                raise PixverseError(status_code=500070)
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+            video_data: dict = await self.__upload_video(
+                token,
+                account_id,
+                video_bytes,
+                ext,
+                digest,
             )
 
-            try:
-
-                async def call(
-                    token: str,
-                ) -> Response:
-                    token_data: UTResp = await self.upload_token(
-                        token,
-                    )
-
-                    style: Style | None = await style_database.fetch_style(
-                        "template_id",
-                        body.template_id,
-                    )
-
-                    if style is None:
-                        raise PixverseError(status_code=500070)
-
-                    await upload_file(
-                        video_bytes,
-                        filename,
-                        **token_data.dict,
-                    )
-
-                    video_data: Response = await self.upload_video(
-                        token,
-                        filename,
-                        filename,
-                    )
-
-                    video_path_for_frame = video_data.resp.path
-
-                    frame_data = await self._core.post(
-                        token=token,
-                        endpoint=PixverseEndpoint.LAST_FRAME,
-                        body=LFBody(
-                            video_path=video_path_for_frame,
-                        ),
-                    )
-
-                    video_path = video_data.resp.path
-                    video_url = video_data.resp.url
-                    duration_video = ceil(video_data.resp.duration)
-
-                    data: Response = await self._core.post(
-                        token=token,
-                        endpoint=PixverseEndpoint.RESTYLE,
-                        body=IRVBody(
-                            video_path=video_path,
-                            video_url=video_url,
-                            video_duration=duration_video,
-                            prompt=style.prompt,
-                            last_frame_url=frame_data.resp.last_frame,
-                        ),
-                    )
-                    return data
-
-                data: Response = await call(token)
-
-                if data.err_code == 0:
-                    return await self.__handle_success(
-                        data,
-                        account_id,
-                        body,
-                    )
-
-                elif data.err_code == 10005:
-                    raise PixverseError(data.err_code)
-
-                last_err_code = data.err_code
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if data.err_code == 0:
-                            return await self.__handle_success(
-                                data,
-                                account_id,
-                                body,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.err_code)
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+            video_path_for_frame = video_data["path"]
+
+            frame_data = await self._core.post(
+                token=token,
+                endpoint=PixverseEndpoint.LAST_FRAME,
+                body=LFBody(
+                    video_path=video_path_for_frame,
+                ),
+            )
+
+            video_path = video_data["path"]
+            video_url = video_data["url"]
+            duration_video = ceil(video_data["duration"])
+
+            data: Response = await self._core.post(
+                token=token,
+                endpoint=PixverseEndpoint.RESTYLE,
+                body=IRVBody(
+                    video_path=video_path,
+                    video_url=video_url,
+                    video_duration=duration_video,
+                    prompt=style.prompt,
+                    last_frame_url=frame_data.resp.last_frame,
+                ),
+            )
+            return data
+
+        data: Response = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
+        )
+
+        return await self.__handle_success(
+            data,
+            account_id,
+            body,
         )
 
+    @release_accounts
     async def template_video(
         self,
         body: TE2VBody,
@@ -764,105 +799,51 @@ class PixVerseClient:
                 image_bytes,
             )
 
-        filename = f"{uuid4()}.{ext}"
+        digest: str = await upload_cache.digest(image_bytes)
 
-        max_attempts = 10
+        async def call(
+            token: str,
+        ) -> Response:
+            template: Template | None = await templates_database.fetch_template(
+                "template_id",
+                body.template_id,
+            )
 
-        last_err_code = None
+            if template is None:
+                raise PixverseError(status_code=500070)
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+            (filename,) = await self.__upload_images(
+                token,
+                account_id,
+                [(image_bytes, ext, digest)],
+            )
+
+            data: Response = await self._core.post(
+                token=token,
+                endpoint=PixverseEndpoint.IMAGE,
+                body=IIT2VBody(
+                    img_path=filename,
+                    img_url=filename,
+                    prompt=template.prompt,
+                    template_id=body.template_id,
+                ),
             )
+            return data
 
-            try:
-
-                async def call(
-                    token: str,
-                ) -> Response:
-                    token_data: UTResp = await self.upload_token(
-                        token,
-                    )
-
-                    template: Template | None = await templates_database.fetch_template(
-                        "template_id",
-                        body.template_id,
-                    )
-
-                    if template is None:
-                        raise PixverseError(status_code=500070)
-
-                    await upload_file(
-                        image_bytes,
-                        filename,
-                        **token_data.dict,
-                    )
-
-                    await self.upload_image(
-                        token,
-                        filename,
-                        size=len(image_bytes),
-                    )
-
-                    data: Response = await self._core.post(
-                        token=token,
-                        endpoint=PixverseEndpoint.IMAGE,
-                        body=IIT2VBody(
-                            img_path=filename,
-                            img_url=filename,
-                            prompt=template.prompt,
-                            template_id=body.template_id,
-                        ),
-                    )
-                    return data
-
-                data: Response = await call(token)
-
-                if data.err_code == 0:
-                    return await self.__handle_success(
-                        data,
-                        account_id,
-                        body,
-                    )
-
-                elif data.err_code == 10005:
-                    raise PixverseError(data.err_code)
-
-                last_err_code = data.err_code
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if data.err_code == 0:
-                            return await self.__handle_success(
-                                data,
-                                account_id,
-                                body,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.err_code)
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        data: Response = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
         )
 
+        return await self.__handle_success(
+            data,
+            account_id,
+            body,
+        )
+
+    @release_accounts
     async def extend_to_video(
         self,
         body: I2VBody,
@@ -889,106 +870,56 @@ class PixVerseClient:
                 video_bytes,
             )
 
-        filename = f"{uuid4()}.{ext}"
+        digest: str = await upload_cache.digest(video_bytes)
 
-        max_attempts = 10
+        async def call(
+            token: str,
+        ) -> Response:
+            video_data: dict = await self.__upload_video(
+                token,
+                account_id,
+                video_bytes,
+                ext,
+                digest,
+            )
 
-        last_err_code = None
+            filename: str = video_data["name"]
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+            frame_data = await self._core.post(
+                token=token,
+                endpoint=PixverseEndpoint.LAST_FRAME,
+                body=LFBody(
+                    video_path=filename,
+                ),
             )
 
-            try:
-
-                async def call(
-                    token: str,
-                ) -> Response:
-                    token_data: UTResp = await self.upload_token(
-                        token,
-                    )
-
-                    await upload_file(
-                        video_bytes,
-                        filename,
-                        **token_data.dict,
-                    )
-
-                    await self.upload_video(
-                        token,
-                        filename,
-                        filename,
-                    )
-
-                    frame_data = await self._core.post(
-                        token=token,
-                        endpoint=PixverseEndpoint.LAST_FRAME,
-                        body=LFBody(
-                            video_path=filename,
-                        ),
-                    )
-
-                    data: Response = await self._core.post(
-                        token=token,
-                        endpoint=PixverseEndpoint.EXTEND,
-                        body=IEVBody(
-                            video_path=filename,
-                            video_url=filename,
-                            video_duration=5,
-                            prompt=body.prompt,
-                            last_frame_url=frame_data.resp.last_frame,
-                        ),
-                    )
-                    return data
-
-                data: Response = await call(token)
-
-                if data.err_code == 0:
-                    return await self.__handle_success(
-                        data,
-                        account_id,
-                        body,
-                    )
-
-                elif data.err_code == 10005:
-                    raise PixverseError(data.err_code)
-
-                last_err_code = data.err_code
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if data.err_code == 0:
-                            return await self.__handle_success(
-                                data,
-                                account_id,
-                                body,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.err_code)
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+            data: Response = await self._core.post(
+                token=token,
+                endpoint=PixverseEndpoint.EXTEND,
+                body=IEVBody(
+                    video_path=filename,
+                    video_url=filename,
+                    video_duration=5,
+                    prompt=body.prompt,
+                    last_frame_url=frame_data.resp.last_frame,
+                ),
+            )
+            return data
+
+        data: Response = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
+        )
+
+        return await self.__handle_success(
+            data,
+            account_id,
+            body,
         )
 
+    @release_accounts
     async def transition_to_video(
         self,
         body: I2VBody,
@@ -1019,94 +950,42 @@ class PixVerseClient:
 
                 exts[i] = ext
 
-        filenames = [f"{uuid4()}.{ext}" for ext in exts]
-
-        max_attempts = 10
+        digests: list[str] = [
+            await upload_cache.digest(image_bytes) for image_bytes in images_bytes
+        ]
 
-        last_err_code = None
+        async def call(
+            token: str,
+        ) -> Response:
+            filenames: list[str] = await self.__upload_images(
+                token,
+                account_id,
+                list(zip(images_bytes, exts, digests)),
+            )
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+            data = await self._core.post(
+                token=token,
+                endpoint=PixverseEndpoint.TRANSITION,
+                body=ITRVBody(
+                    img_paths=filenames,
+                    img_urls=filenames,
+                    prompt=body.prompt,
+                    prompts=[
+                        body.prompt,
+                    ],
+                ),
             )
+            return data
+
+        data: Response = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
+        )
 
-            try:
-
-                async def call(
-                    token: str,
-                ) -> Response:
-                    token_data: UTResp = await self.upload_token(token)
-
-                    for image_bytes, filename in zip(images_bytes, filenames):
-                        await upload_file(
-                            image_bytes,
-                            filename,
-                            **token_data.dict,
-                        )
-
-                        await self.upload_image(
-                            token,
-                            filename,
-                            size=len(image_bytes),
-                        )
-
-                    data = await self._core.post(
-                        token=token,
-                        endpoint=PixverseEndpoint.TRANSITION,
-                        body=ITRVBody(
-                            img_paths=filenames,
-                            img_urls=filenames,
-                            prompt=body.prompt,
-                            prompts=[
-                                body.prompt,
-                            ],
-                        ),
-                    )
-                    return data
-
-                data: Response = await call(token)
-
-                if data.err_code == 0:
-                    return await self.__handle_success(
-                        data,
-                        account_id,
-                        body,
-                    )
-
-                elif data.err_code == 10005:
-                    raise PixverseError(data.err_code)
-
-                last_err_code = data.err_code
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if data.err_code == 0:
-                            return await self.__handle_success(
-                                data,
-                                account_id,
-                                body,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.err_code)
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        return await self.__handle_success(
+            data,
+            account_id,
+            body,
         )
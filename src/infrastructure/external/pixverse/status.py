@@ -0,0 +1,123 @@
+# coding utf-8
+
+from time import time
+
+from redis.asyncio import Redis
+
+from ....domain.repositories import IRedis
+
+from ....domain.constants import (
+    PIXVERSE_STATUS,
+    PIXVERSE_PENDING,
+)
+
+from ....interface.schemas.external import GenerationStatus
+
+
+class GenerationStatusCache:
+    """Кэш статусов генераций PixVerse в Redis.
+
+    Фоновый опрос (`PixverseStatusCelery`) делает один STATUS запрос на
+    аккаунт за тик и раскладывает результат по `video_id`, а эндпоинт
+    статуса читает готовое значение из кэша. Незавершенные генерации
+    хранятся в отсортированном множестве `PIXVERSE_PENDING` с временем
+    создания в качестве веса.
+
+    Args:
+        engine (IRedis): Подключение к Redis
+        window (int): Сколько секунд генерация остается в опросе
+        ttl (int): Время жизни статуса незавершенной генерации (сек.)
+        final_ttl (int): Время жизни итогового статуса (сек.)
+    """
+
+    def __init__(
+        self,
+        engine: IRedis,
+        window: int = 3600,
+        ttl: int = 30,
+        final_ttl: int = 86400,
+    ) -> None:
+        self._engine = engine
+        self._window = window
+        self._ttl = ttl
+        self._final_ttl = final_ttl
+
+    @property
+    def client(
+        self,
+    ) -> Redis:
+        return self._engine.client
+
+    async def fetch(
+        self,
+        video_id: int,
+    ) -> GenerationStatus | None:
+        data: str | None = await self.client.get(
+            PIXVERSE_STATUS.format(video_id=video_id),
+        )
+        if data is None:
+            return None
+        return GenerationStatus.model_validate_json(data)
+
+    async def store_many(
+        self,
+        statuses: dict[int, GenerationStatus],
+    ) -> None:
+        if not statuses:
+            return
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            for video_id, status in statuses.items():
+                pipe.set(
+                    PIXVERSE_STATUS.format(video_id=video_id),
+                    status.model_dump_json(),
+                    ex=self._ttl if status.status == "generating" else self._final_ttl,
+                )
+            await pipe.execute()
+
+    async def track(
+        self,
+        account_id: int,
+        video_id: int,
+    ) -> None:
+        await self.client.zadd(
+            PIXVERSE_PENDING,
+            {f"{account_id}:{video_id}": time()},
+            nx=True,
+        )
+
+    async def untrack(
+        self,
+        pending: dict[int, list[int]],
+    ) -> None:
+        members: list[str] = [
+            f"{account_id}:{video_id}"
+            for account_id, video_ids in pending.items()
+            for video_id in video_ids
+        ]
+        if members:
+            await self.client.zrem(
+                PIXVERSE_PENDING,
+                *members,
+            )
+
+    async def fetch_pending(
+        self,
+    ) -> dict[int, list[int]]:
+        """Возвращает незавершенные генерации, сгруппированные по аккаунту.
+
+        Генерации старше окна опроса удаляются из множества.
+        """
+        await self.client.zremrangebyscore(
+            PIXVERSE_PENDING,
+            "-inf",
+            time() - self._window,
+        )
+
+        pending: dict[int, list[int]] = {}
+
+        for member in await self.client.zrange(PIXVERSE_PENDING, 0, -1):
+            account_id, video_id = member.split(":", 1)
+            pending.setdefault(int(account_id), []).append(int(video_id))
+
+        return pending
@@ -4,6 +4,8 @@ from .core import QwenCore
 
 from os import getenv
 
+from os.path import splitext
+
 from fastapi import (
     HTTPException,
     UploadFile,
@@ -11,8 +13,6 @@ from fastapi import (
 
 from uuid import uuid4
 
-from asyncio import sleep
-
 from json import loads
 
 from ddgs import DDGS
@@ -61,11 +61,17 @@ from ...orm.database.repositories import (
     UserDataRepository,
 )
 
-from ....domain.repositories import IDatabase
+from ....domain.repositories import (
+    IDatabase,
+    release_accounts,
+)
 
 from ....domain.tools import (
     update_account_token,
     upload_qwen_file,
+    upload_cache,
+    image_processor,
+    RetryPolicy,
 )
 
 from ....interface.schemas.external import (
@@ -114,6 +120,18 @@ user_data_database = UserDataRepository(
 )
 
 
+retry_policy = RetryPolicy(
+    "qwen",
+    retry_statuses={400, 408, 409, 425, 429},
+)
+
+
+analysis_retry_policy = RetryPolicy(
+    "qwen_analysis",
+    max_attempts=2,
+)
+
+
 class QwenClient:
     """Клиентский интерфейс для работы с PixVerse API.
 
@@ -175,20 +193,6 @@ class QwenClient:
 
             return content_list[0].content
 
-    async def __handle_failure(
-        self,
-        status_code: int,
-        detail: str,
-        extra: dict[str] = {},
-    ) -> QwenError:
-        error = QwenError(
-            status_code=status_code if status_code is not None else 400,
-            detail=detail,
-            extra=extra,
-        )
-
-        raise error
-
     async def __handle_success(
         self,
         app_id: str,
@@ -216,19 +220,68 @@ class QwenClient:
     async def __fetch_upload_token(
         self,
         token: str,
-        image: UploadFile,
+        filesize: int,
     ) -> QwenUploadData:
         data: QwenResponse = await self._core.post(
             token=token,
             # **kwargs
             endpoint=QwenEndpoint.MEDIA_TOKEN,
             body=IPhotoBody(
-                filesize=image.size,
+                filesize=filesize,
             ),
         )
 
         return data.resp
 
+    async def __upload_image(
+        self,
+        token: str,
+        account_id: int,
+        image: UploadFile,
+        image_bytes: bytes,
+        digest: str,
+    ) -> QwenUploadData:
+        """Загружает изображение в OSS Qwen.
+
+        Идентификатор и ссылка файла кэшируются по аккаунту и хэшу
+        изображения (без STS-ключей) на срок `upload_cache_url_ttl`,
+        повтор запроса загрузку пропускает.
+        """
+        asset: dict | None = await upload_cache.fetch(
+            "qwen",
+            account_id,
+            digest,
+        )
+
+        if asset is not None:
+            return QwenUploadData.model_construct(**asset)
+
+        uploaded_image: QwenUploadData = await self.__fetch_upload_token(
+            token=token,
+            filesize=len(image_bytes),
+        )
+
+        await upload_qwen_file(
+            uploaded_image,
+            image_bytes=image_bytes,
+        )
+
+        await upload_cache.store(
+            "qwen",
+            account_id,
+            digest,
+            uploaded_image.model_dump(
+                include={
+                    "file_id",
+                    "file_path",
+                    "file_url",
+                },
+            ),
+            ttl=conf.upload_cache_url_ttl,
+        )
+
+        return uploaded_image
+
     async def __get_account_token(
         self,
         account: QwenAccounts,
@@ -256,10 +309,18 @@ class QwenClient:
         self,
         account: QwenAccounts,
     ) -> str:
-        return await self.auth_user_account(
+        token: str = await self.auth_user_account(
+            account,
+        )
+
+        await update_account_token(
             account,
+            token,
+            project=AccountProjectToken.QWEN,
         )
 
+        return token
+
     async def __generate_new_chat(
         self,
         token: str,
@@ -287,21 +348,31 @@ class QwenClient:
         image: UploadFile,
         uploaded_image: QwenUploadData,
         user_id: str,
+        image_size: int | None = None,
+        ext: str | None = None,
+        content_type: str | None = None,
     ) -> IQwenFile:
-        file_size = image.file.tell()
+        # подготовленное изображение перекодировано: имя и тип берутся от него
+        file_size = image.file.tell() if image_size is None else image_size
+        filename = (
+            image.filename
+            if ext is None
+            else f"{splitext(image.filename or 'image')[0]}{ext}"
+        )
+        file_type = content_type or image.content_type
 
         return IQwenFile(
             id=uploaded_image.file_id,
             url=uploaded_image.file_url,
             size=file_size,
-            name=image.filename,
-            file_type=image.content_type,
+            name=filename,
+            file_type=file_type,
             file=IQwenFileInfo(
-                filename=image.filename,
+                filename=filename,
                 id=uploaded_image.file_id,
                 meta={
-                    "content_type": image.content_type,
-                    "name": image.filename,
+                    "content_type": file_type,
+                    "name": filename,
                     "size": file_size,
                 },
                 user_id=user_id,
@@ -317,6 +388,9 @@ class QwenClient:
         user_id: str | None = None,
         image: UploadFile | None = None,
         uploaded_image: QwenUploadData | None = None,
+        image_size: int | None = None,
+        ext: str | None = None,
+        content_type: str | None = None,
     ) -> str:
         child_id: str = str(uuid4())
 
@@ -325,6 +399,9 @@ class QwenClient:
                 image,
                 uploaded_image,
                 user_id,
+                image_size,
+                ext,
+                content_type,
             )
 
         message = IQwenChatMessage(
@@ -396,6 +473,7 @@ class QwenClient:
             return images
         return []
 
+    @release_accounts
     async def text_to_photo(
         self,
         body: IT2IBody,
@@ -404,88 +482,43 @@ class QwenClient:
     ) -> QwenPhotoAPIResponse:
         account = await account_database.fetch_next_account()
 
-        max_attempts = 10
+        async def call(
+            token: str,
+        ) -> QwenPhotoAPIResponse:
+            chat_id: str = await self.__generate_new_chat(
+                token=token,
+                chat_type="t2i",
+            )
 
-        last_err_code = None
+            await self.__generate_photo(
+                token=token,
+                chat_id=chat_id,
+                body=body,
+                chat_type="t2i",
+            )
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+            media = await self.__fetch_media_content(
+                token=token,
+                chat_id=chat_id,
+            )
+
+            return QwenPhotoAPIResponse(
+                media_url=media,
             )
 
-            try:
-
-                async def call(
-                    token: str,
-                ) -> QwenPhotoAPIResponse:
-                    chat_id: str = await self.__generate_new_chat(
-                        token=token,
-                        chat_type="t2i",
-                    )
-
-                    await self.__generate_photo(
-                        token=token,
-                        chat_id=chat_id,
-                        body=body,
-                        chat_type="t2i",
-                    )
-
-                    media = await self.__fetch_media_content(
-                        token=token,
-                        chat_id=chat_id,
-                    )
-
-                    return QwenPhotoAPIResponse(
-                        media_url=media,
-                    )
-
-                data: QwenPhotoAPIResponse = await call(token)
-
-                if isinstance(data, QwenPhotoAPIResponse):
-                    return await self.__handle_success(
-                        app_id,
-                        user_id,
-                        data,
-                    )
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                        project=AccountProjectToken.QWEN,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if isinstance(data, QwenPhotoAPIResponse):
-                            return await self.__handle_success(
-                                app_id,
-                                user_id,
-                                data,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(
-                        400,
-                        detail=last_err_code,
-                    )
-                await sleep(1)
-
-        return await self.__handle_failure(
-            400,
-            detail=last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        data: QwenPhotoAPIResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
         )
 
+        return await self.__handle_success(
+            app_id,
+            user_id,
+            data,
+        )
+
+    @release_accounts
     async def photo_to_photo(
         self,
         body: IT2IBody,
@@ -497,107 +530,62 @@ class QwenClient:
 
         account_id = account.id
 
-        max_attempts = 10
+        image_bytes: bytes = await image.read()
+
+        digest: str = await upload_cache.digest(image_bytes)
+
+        async def call(
+            token: str,
+        ) -> QwenPhotoAPIResponse:
+            uploaded_image: QwenUploadData = await self.__upload_image(
+                token=token,
+                account_id=account_id,
+                image=image,
+                image_bytes=image_bytes,
+                digest=digest,
+            )
 
-        last_err_code = None
+            chat_id: str = await self.__generate_new_chat(
+                token=token,
+                chat_type="image_edit",
+            )
 
-        image_bytes: bytes = await image.read()
+            user_id: str = await self.__fetch_account_user_id(
+                account_id=account_id,
+            )
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+            await self.__generate_photo(
+                token=token,
+                chat_id=chat_id,
+                body=body,
+                chat_type="image_edit",
+                image=image,
+                uploaded_image=uploaded_image,
+                user_id=user_id,
             )
 
-            try:
-
-                async def call(
-                    token: str,
-                ) -> QwenPhotoAPIResponse:
-                    uploaded_image: QwenUploadData = await self.__fetch_upload_token(
-                        token=token,
-                        image=image,
-                    )
-
-                    await upload_qwen_file(
-                        uploaded_image,
-                        image_bytes=image_bytes,
-                    )
-
-                    chat_id: str = await self.__generate_new_chat(
-                        token=token,
-                        chat_type="image_edit",
-                    )
-
-                    user_id: str = await self.__fetch_account_user_id(
-                        account_id=account_id,
-                    )
-
-                    await self.__generate_photo(
-                        token=token,
-                        chat_id=chat_id,
-                        body=body,
-                        chat_type="image_edit",
-                        image=image,
-                        uploaded_image=uploaded_image,
-                        user_id=user_id,
-                    )
-
-                    media: str = await self.__fetch_media_content(
-                        token=token,
-                        chat_id=chat_id,
-                    )
-
-                    return QwenPhotoAPIResponse(
-                        media_url=media,
-                    )
-
-                data: QwenPhotoAPIResponse = await call(token)
-
-                if isinstance(data, QwenPhotoAPIResponse):
-                    return await self.__handle_success(
-                        app_id,
-                        user_id,
-                        data,
-                    )
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                        project=AccountProjectToken.QWEN,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if isinstance(data, QwenPhotoAPIResponse):
-                            return await self.__handle_success(
-                                app_id,
-                                user_id,
-                                data,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(
-                        400,
-                        detail=last_err_code,
-                    )
-                await sleep(1)
-
-        return await self.__handle_failure(
-            400,
-            detail=last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+            media: str = await self.__fetch_media_content(
+                token=token,
+                chat_id=chat_id,
+            )
+
+            return QwenPhotoAPIResponse(
+                media_url=media,
+            )
+
+        data: QwenPhotoAPIResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
+        )
+
+        return await self.__handle_success(
+            app_id,
+            user_id,
+            data,
         )
 
+    @release_accounts
     async def template_to_photo(
         self,
         body: IT2TBody,
@@ -609,111 +597,66 @@ class QwenClient:
 
         account_id = account.id
 
-        max_attempts = 10
+        image_bytes: bytes = await image.read()
 
-        last_err_code = None
+        digest: str = await upload_cache.digest(image_bytes)
+
+        async def call(
+            token: str,
+        ) -> QwenPhotoAPIResponse:
+            uploaded_image: QwenUploadData = await self.__upload_image(
+                token=token,
+                account_id=account_id,
+                image=image,
+                image_bytes=image_bytes,
+                digest=digest,
+            )
 
-        image_bytes: bytes = await image.read()
+            chat_id: str = await self.__generate_new_chat(
+                token=token,
+                chat_type="image_edit",
+            )
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+            user_id: str = await self.__fetch_account_user_id(
+                account_id=account_id,
+            )
+
+            template = await template_database.fetch_with_filters(
+                id=body.template_id
             )
 
-            try:
-
-                async def call(
-                    token: str,
-                ) -> QwenPhotoAPIResponse:
-                    uploaded_image: QwenUploadData = await self.__fetch_upload_token(
-                        token=token,
-                        image=image,
-                    )
-
-                    await upload_qwen_file(
-                        uploaded_image,
-                        image_bytes=image_bytes,
-                    )
-
-                    chat_id: str = await self.__generate_new_chat(
-                        token=token,
-                        chat_type="image_edit",
-                    )
-
-                    user_id: str = await self.__fetch_account_user_id(
-                        account_id=account_id,
-                    )
-
-                    template = await template_database.fetch_with_filters(
-                        id=body.template_id
-                    )
-
-                    await self.__generate_photo(
-                        token=token,
-                        chat_id=chat_id,
-                        body=template,
-                        chat_type="image_edit",
-                        image=image,
-                        uploaded_image=uploaded_image,
-                        user_id=user_id,
-                    )
-
-                    media: str = await self.__fetch_media_content(
-                        token=token,
-                        chat_id=chat_id,
-                    )
-
-                    return QwenPhotoAPIResponse(
-                        media_url=media,
-                    )
-
-                data: QwenPhotoAPIResponse = await call(token)
-
-                if isinstance(data, QwenPhotoAPIResponse):
-                    return await self.__handle_success(
-                        app_id,
-                        user_id,
-                        data,
-                    )
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                        project=AccountProjectToken.QWEN,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if isinstance(data, QwenPhotoAPIResponse):
-                            return await self.__handle_success(
-                                app_id,
-                                user_id,
-                                data,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(
-                        400,
-                        detail=last_err_code,
-                    )
-                await sleep(1)
-
-        return await self.__handle_failure(
-            400,
-            detail=last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+            await self.__generate_photo(
+                token=token,
+                chat_id=chat_id,
+                body=template,
+                chat_type="image_edit",
+                image=image,
+                uploaded_image=uploaded_image,
+                user_id=user_id,
+            )
+
+            media: str = await self.__fetch_media_content(
+                token=token,
+                chat_id=chat_id,
+            )
+
+            return QwenPhotoAPIResponse(
+                media_url=media,
+            )
+
+        data: QwenPhotoAPIResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
+        )
+
+        return await self.__handle_success(
+            app_id,
+            user_id,
+            data,
         )
 
+    @release_accounts
     async def photo_to_toybox(
         self,
         body: IP2BBody,
@@ -725,118 +668,73 @@ class QwenClient:
 
         account_id = account.id
 
-        max_attempts = 10
+        image_bytes: bytes = await image.read()
 
-        last_err_code = None
+        digest: str = await upload_cache.digest(image_bytes)
+
+        async def call(
+            token: str,
+        ) -> QwenPhotoAPIResponse:
+            uploaded_image: QwenUploadData = await self.__upload_image(
+                token=token,
+                account_id=account_id,
+                image=image,
+                image_bytes=image_bytes,
+                digest=digest,
+            )
 
-        image_bytes: bytes = await image.read()
+            chat_id: str = await self.__generate_new_chat(
+                token=token,
+                chat_type="image_edit",
+            )
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+            user_id: str = await self.__fetch_account_user_id(
+                account_id=account_id,
+            )
+
+            if not body.box_color or body.box_name or body.in_box:
+                prompted_body = await template_database.fetch_with_filters(
+                    id=body.template_id
+                )
+
+            prompted_body: R2PBodyPrompt = R2PBodyPrompt.toybox(
+                box_color=body.box_color,
+                in_box=body.in_box,
+                box_name=body.box_name,
+            )
+
+            await self.__generate_photo(
+                token=token,
+                chat_id=chat_id,
+                body=prompted_body,
+                chat_type="image_edit",
+                image=image,
+                uploaded_image=uploaded_image,
+                user_id=user_id,
+            )
+
+            media: str = await self.__fetch_media_content(
+                token=token,
+                chat_id=chat_id,
+            )
+
+            return QwenPhotoAPIResponse(
+                media_url=media,
             )
 
-            try:
-
-                async def call(
-                    token: str,
-                ) -> QwenPhotoAPIResponse:
-                    uploaded_image: QwenUploadData = await self.__fetch_upload_token(
-                        token=token,
-                        image=image,
-                    )
-
-                    await upload_qwen_file(
-                        uploaded_image,
-                        image_bytes=image_bytes,
-                    )
-
-                    chat_id: str = await self.__generate_new_chat(
-                        token=token,
-                        chat_type="image_edit",
-                    )
-
-                    user_id: str = await self.__fetch_account_user_id(
-                        account_id=account_id,
-                    )
-
-                    if not body.box_color or body.box_name or body.in_box:
-                        prompted_body = await template_database.fetch_with_filters(
-                            id=body.template_id
-                        )
-
-                    prompted_body: R2PBodyPrompt = R2PBodyPrompt.toybox(
-                        box_color=body.box_color,
-                        in_box=body.in_box,
-                        box_name=body.box_name,
-                    )
-
-                    await self.__generate_photo(
-                        token=token,
-                        chat_id=chat_id,
-                        body=prompted_body,
-                        chat_type="image_edit",
-                        image=image,
-                        uploaded_image=uploaded_image,
-                        user_id=user_id,
-                    )
-
-                    media: str = await self.__fetch_media_content(
-                        token=token,
-                        chat_id=chat_id,
-                    )
-
-                    return QwenPhotoAPIResponse(
-                        media_url=media,
-                    )
-
-                data: QwenPhotoAPIResponse = await call(token)
-
-                if isinstance(data, QwenPhotoAPIResponse):
-                    return await self.__handle_success(
-                        app_id,
-                        user_id,
-                        data,
-                    )
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                        project=AccountProjectToken.QWEN,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if isinstance(data, QwenPhotoAPIResponse):
-                            return await self.__handle_success(
-                                app_id,
-                                user_id,
-                                data,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(
-                        400,
-                        detail=last_err_code,
-                    )
-                await sleep(1)
-
-        return await self.__handle_failure(
-            400,
-            detail=last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        data: QwenPhotoAPIResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
         )
 
+        return await self.__handle_success(
+            app_id,
+            user_id,
+            data,
+        )
+
+    @release_accounts
     async def reshape_to_photo(
         self,
         body: II2RBody,
@@ -848,112 +746,67 @@ class QwenClient:
 
         account_id = account.id
 
-        max_attempts = 10
+        image_bytes: bytes = await image.read()
 
-        last_err_code = None
+        digest: str = await upload_cache.digest(image_bytes)
+
+        async def call(
+            token: str,
+        ) -> QwenPhotoAPIResponse:
+            uploaded_image: QwenUploadData = await self.__upload_image(
+                token=token,
+                account_id=account_id,
+                image=image,
+                image_bytes=image_bytes,
+                digest=digest,
+            )
 
-        image_bytes: bytes = await image.read()
+            chat_id: str = await self.__generate_new_chat(
+                token=token,
+                chat_type="image_edit",
+            )
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+            user_id: str = await self.__fetch_account_user_id(
+                account_id=account_id,
+            )
+
+            prompted_body: R2PBodyPrompt = R2PBodyPrompt.reshape(
+                body.area,
+                body.strength,
+            )
+
+            await self.__generate_photo(
+                token=token,
+                chat_id=chat_id,
+                body=prompted_body,
+                chat_type="image_edit",
+                user_id=user_id,
+                image=image,
+                uploaded_image=uploaded_image,
+            )
+
+            media: str = await self.__fetch_media_content(
+                token=token,
+                chat_id=chat_id,
+            )
+
+            return QwenPhotoAPIResponse(
+                media_url=media,
             )
 
-            try:
-
-                async def call(
-                    token: str,
-                ) -> QwenPhotoAPIResponse:
-                    uploaded_image: QwenUploadData = await self.__fetch_upload_token(
-                        token=token,
-                        image=image,
-                    )
-
-                    await upload_qwen_file(
-                        uploaded_image,
-                        image_bytes=image_bytes,
-                    )
-
-                    chat_id: str = await self.__generate_new_chat(
-                        token=token,
-                        chat_type="image_edit",
-                    )
-
-                    user_id: str = await self.__fetch_account_user_id(
-                        account_id=account_id,
-                    )
-
-                    prompted_body: R2PBodyPrompt = R2PBodyPrompt.reshape(
-                        body.area,
-                        body.strength,
-                    )
-
-                    await self.__generate_photo(
-                        token=token,
-                        chat_id=chat_id,
-                        body=prompted_body,
-                        chat_type="image_edit",
-                        user_id=user_id,
-                        image=image,
-                        uploaded_image=uploaded_image,
-                    )
-
-                    media: str = await self.__fetch_media_content(
-                        token=token,
-                        chat_id=chat_id,
-                    )
-
-                    return QwenPhotoAPIResponse(
-                        media_url=media,
-                    )
-
-                data: QwenPhotoAPIResponse = await call(token)
-
-                if isinstance(data, QwenPhotoAPIResponse):
-                    return await self.__handle_success(
-                        app_id,
-                        user_id,
-                        data,
-                    )
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                        project=AccountProjectToken.QWEN,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if isinstance(data, QwenPhotoAPIResponse):
-                            return await self.__handle_success(
-                                app_id,
-                                user_id,
-                                data,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(
-                        400,
-                        detail=last_err_code,
-                    )
-                await sleep(1)
-
-        return await self.__handle_failure(
-            400,
-            detail=last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        data: QwenPhotoAPIResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
         )
 
+        return await self.__handle_success(
+            app_id,
+            user_id,
+            data,
+        )
+
+    @release_accounts
     async def photo_to_cosmetic(
         self,
         image: UploadFile,
@@ -964,112 +817,67 @@ class QwenClient:
 
         account_id = account.id
 
-        max_attempts = 10
+        image_bytes: bytes = await image.read()
+
+        digest: str = await upload_cache.digest(image_bytes)
+
+        async def call(
+            token: str,
+        ) -> QwenPhotoAPIResponse:
+            uploaded_image: QwenUploadData = await self.__upload_image(
+                token=token,
+                account_id=account_id,
+                image=image,
+                image_bytes=image_bytes,
+                digest=digest,
+            )
 
-        last_err_code = None
+            chat_id: str = await self.__generate_new_chat(
+                token=token,
+                chat_type="t2t",
+            )
 
-        image_bytes: bytes = await image.read()
+            user_id: str = await self.__fetch_account_user_id(
+                account_id=account_id,
+            )
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+            prompted_body: R2PBodyPrompt = R2PBodyPrompt.cosmetic()
+
+            await self.__generate_photo(
+                token=token,
+                chat_id=chat_id,
+                body=prompted_body,
+                chat_type="t2t",
+                user_id=user_id,
+                image=image,
+                uploaded_image=uploaded_image,
+            )
+
+            media: str = await self.__fetch_media_content(
+                token=token,
+                chat_id=chat_id,
+            )
+
+            return list(
+                ChatGPTCosmetic.model_validate(
+                    item,
+                )
+                for item in loads(media)
             )
 
-            try:
-
-                async def call(
-                    token: str,
-                ) -> QwenPhotoAPIResponse:
-                    uploaded_image: QwenUploadData = await self.__fetch_upload_token(
-                        token=token,
-                        image=image,
-                    )
-
-                    await upload_qwen_file(
-                        uploaded_image,
-                        image_bytes=image_bytes,
-                    )
-
-                    chat_id: str = await self.__generate_new_chat(
-                        token=token,
-                        chat_type="t2t",
-                    )
-
-                    user_id: str = await self.__fetch_account_user_id(
-                        account_id=account_id,
-                    )
-
-                    prompted_body: R2PBodyPrompt = R2PBodyPrompt.cosmetic()
-
-                    await self.__generate_photo(
-                        token=token,
-                        chat_id=chat_id,
-                        body=prompted_body,
-                        chat_type="t2t",
-                        user_id=user_id,
-                        image=image,
-                        uploaded_image=uploaded_image,
-                    )
-
-                    media: str = await self.__fetch_media_content(
-                        token=token,
-                        chat_id=chat_id,
-                    )
-
-                    return list(
-                        ChatGPTCosmetic.model_validate(
-                            item,
-                        )
-                        for item in loads(media)
-                    )
-
-                data: list[ChatGPTCosmetic] = await call(token)
-
-                if isinstance(data, list[ChatGPTCosmetic]):
-                    return await self.__handle_success(
-                        app_id,
-                        user_id,
-                        data,
-                    )
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                        project=AccountProjectToken.QWEN,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if isinstance(data, list[ChatGPTCosmetic]):
-                            return await self.__handle_success(
-                                app_id,
-                                user_id,
-                                data,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(
-                        400,
-                        detail=last_err_code,
-                    )
-                await sleep(1)
-
-        return await self.__handle_failure(
-            400,
-            detail=last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        data: list[ChatGPTCosmetic] = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
         )
 
+        return await self.__handle_success(
+            app_id,
+            user_id,
+            data,
+        )
+
+    @release_accounts
     async def text_to_calories(
         self,
         body: IT2CBody,
@@ -1078,92 +886,47 @@ class QwenClient:
     ) -> ChatGPTCalories:
         account = await account_database.fetch_next_account()
 
-        max_attempts = 10
+        async def call(
+            token: str,
+        ) -> QwenPhotoAPIResponse:
+            chat_id: str = await self.__generate_new_chat(
+                token=token,
+                chat_type="t2t",
+            )
 
-        last_err_code = None
+            prompted_body: R2PBodyPrompt = R2PBodyPrompt.calories(
+                description=body.description,
+            )
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+            await self.__generate_photo(
+                token=token,
+                chat_id=chat_id,
+                body=prompted_body,
+                chat_type="t2t",
+            )
+
+            media: str = await self.__fetch_media_content(
+                token=token,
+                chat_id=chat_id,
+            )
+
+            return ChatGPTCalories(
+                **loads(media),
             )
 
-            try:
-
-                async def call(
-                    token: str,
-                ) -> QwenPhotoAPIResponse:
-                    chat_id: str = await self.__generate_new_chat(
-                        token=token,
-                        chat_type="t2t",
-                    )
-
-                    prompted_body: R2PBodyPrompt = R2PBodyPrompt.calories(
-                        description=body.description,
-                    )
-
-                    await self.__generate_photo(
-                        token=token,
-                        chat_id=chat_id,
-                        body=prompted_body,
-                        chat_type="t2t",
-                    )
-
-                    media: str = await self.__fetch_media_content(
-                        token=token,
-                        chat_id=chat_id,
-                    )
-
-                    return ChatGPTCalories(
-                        **loads(media),
-                    )
-
-                data: ChatGPTCalories = await call(token)
-
-                if isinstance(data, ChatGPTCalories):
-                    return await self.__handle_success(
-                        app_id,
-                        user_id,
-                        data,
-                    )
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                        project=AccountProjectToken.QWEN,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if isinstance(data, ChatGPTCalories):
-                            return await self.__handle_success(
-                                app_id,
-                                user_id,
-                                data,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(
-                        400,
-                        detail=last_err_code,
-                    )
-                await sleep(1)
-
-        return await self.__handle_failure(
-            400,
-            detail=last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        data: ChatGPTCalories = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
         )
 
+        return await self.__handle_success(
+            app_id,
+            user_id,
+            data,
+        )
+
+    @release_accounts
     async def photo_to_calories(
         self,
         image: UploadFile,
@@ -1174,109 +937,64 @@ class QwenClient:
 
         account_id = account.id
 
-        max_attempts = 1
+        image_bytes: bytes = await image.read()
+
+        digest: str = await upload_cache.digest(image_bytes)
+
+        async def call(
+            token: str,
+        ) -> QwenPhotoAPIResponse:
+            uploaded_image: QwenUploadData = await self.__upload_image(
+                token=token,
+                account_id=account_id,
+                image=image,
+                image_bytes=image_bytes,
+                digest=digest,
+            )
 
-        last_err_code = None
+            chat_id: str = await self.__generate_new_chat(
+                token=token,
+                chat_type="t2t",
+            )
 
-        image_bytes: bytes = await image.read()
+            user_id: str = await self.__fetch_account_user_id(
+                account_id=account_id,
+            )
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+            prompted_body: R2PBodyPrompt = R2PBodyPrompt.calories()
+
+            await self.__generate_photo(
+                token=token,
+                chat_id=chat_id,
+                body=prompted_body,
+                chat_type="t2t",
+                user_id=user_id,
+                image=image,
+                uploaded_image=uploaded_image,
+            )
+
+            media: str = await self.__fetch_media_content(
+                token=token,
+                chat_id=chat_id,
+            )
+
+            return ChatGPTCalories(
+                **loads(media),
             )
 
-            try:
-
-                async def call(
-                    token: str,
-                ) -> QwenPhotoAPIResponse:
-                    uploaded_image: QwenUploadData = await self.__fetch_upload_token(
-                        token=token,
-                        image=image,
-                    )
-
-                    await upload_qwen_file(
-                        uploaded_image,
-                        image_bytes=image_bytes,
-                    )
-
-                    chat_id: str = await self.__generate_new_chat(
-                        token=token,
-                        chat_type="t2t",
-                    )
-
-                    user_id: str = await self.__fetch_account_user_id(
-                        account_id=account_id,
-                    )
-
-                    prompted_body: R2PBodyPrompt = R2PBodyPrompt.calories()
-
-                    await self.__generate_photo(
-                        token=token,
-                        chat_id=chat_id,
-                        body=prompted_body,
-                        chat_type="t2t",
-                        user_id=user_id,
-                        image=image,
-                        uploaded_image=uploaded_image,
-                    )
-
-                    media: str = await self.__fetch_media_content(
-                        token=token,
-                        chat_id=chat_id,
-                    )
-
-                    return ChatGPTCalories(
-                        **loads(media),
-                    )
-
-                data: QwenPhotoAPIResponse = await call(token)
-
-                if isinstance(data, ChatGPTCalories):
-                    return await self.__handle_success(
-                        app_id,
-                        user_id,
-                        data,
-                    )
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                        project=AccountProjectToken.QWEN,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if isinstance(data, ChatGPTCalories):
-                            return await self.__handle_success(
-                                app_id,
-                                user_id,
-                                data,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(
-                        400,
-                        detail=last_err_code,
-                    )
-                await sleep(1)
-
-        return await self.__handle_failure(
-            400,
-            detail=last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        data: QwenPhotoAPIResponse = await analysis_retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
         )
 
+        return await self.__handle_success(
+            app_id,
+            user_id,
+            data,
+        )
+
+    @release_accounts
     async def text_to_post(
         self,
         body: IT2PBody,
@@ -1285,104 +1003,53 @@ class QwenClient:
     ) -> ChatGPTInstagram:
         account = await account_database.fetch_next_account()
 
-        max_attempts = 1
+        async def call(
+            token: str,
+        ) -> ChatGPTInstagram:
+            chat_id: str = await self.__generate_new_chat(
+                token=token,
+                chat_type="t2t",
+            )
 
-        last_err_code = None
+            prompted_body: R2PBodyPrompt = R2PBodyPrompt.instagram(
+                body.prompt,
+            )
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+            await self.__generate_photo(
+                token=token,
+                chat_id=chat_id,
+                body=prompted_body,
+                chat_type="t2t",
+            )
+
+            media = await self.__fetch_media_content(
+                token=token,
+                chat_id=chat_id,
+            )
+
+            return ChatGPTInstagram(
+                **loads(media),
+            )
+
+        data: ChatGPTInstagram = await analysis_retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
+        )
+
+        if len(data.description) == 0:
+            raise QwenError(
+                status_code=400,
+                detail="The described text is too small, add a few more words",
             )
 
-            try:
-
-                async def call(
-                    token: str,
-                ) -> ChatGPTInstagram:
-                    chat_id: str = await self.__generate_new_chat(
-                        token=token,
-                        chat_type="t2t",
-                    )
-
-                    prompted_body: R2PBodyPrompt = R2PBodyPrompt.instagram(
-                        body.prompt,
-                    )
-
-                    await self.__generate_photo(
-                        token=token,
-                        chat_id=chat_id,
-                        body=prompted_body,
-                        chat_type="t2t",
-                    )
-
-                    media = await self.__fetch_media_content(
-                        token=token,
-                        chat_id=chat_id,
-                    )
-
-                    return ChatGPTInstagram(
-                        **loads(media),
-                    )
-
-                data: ChatGPTInstagram = await call(token)
-
-                if len(data.description) == 0:
-                    raise QwenError(
-                        status_code=400,
-                        detail="The described text is too small, add a few more words",
-                    )
-
-                elif isinstance(data, ChatGPTInstagram):
-                    return await self.__handle_success(
-                        app_id,
-                        user_id,
-                        data,
-                    )
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                        project=AccountProjectToken.QWEN,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if len(data.description) == 0:
-                            raise QwenError(
-                                status_code=400,
-                                detail="The described text is too small, add a few more words",
-                            )
-
-                        elif isinstance(data, ChatGPTInstagram):
-                            return await self.__handle_success(
-                                app_id,
-                                user_id,
-                                data,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(
-                        400,
-                        detail=last_err_code,
-                    )
-                await sleep(1)
-
-        return await self.__handle_failure(
-            400,
-            detail=last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        return await self.__handle_success(
+            app_id,
+            user_id,
+            data,
         )
 
+    @release_accounts
     async def photo_to_gamestone(
         self,
         image: UploadFile,
@@ -1393,124 +1060,82 @@ class QwenClient:
 
         account_id = account.id
 
-        max_attempts = 1
+        image_bytes, ext, content_type = await image_processor.prepare(
+            await image.read(),
+            "gamestone",
+        )
 
-        last_err_code = None
+        digest: str = await upload_cache.digest(image_bytes)
+
+        async def call(
+            token: str,
+        ) -> QwenPhotoAPIResponse:
+            uploaded_image: QwenUploadData = await self.__upload_image(
+                token=token,
+                account_id=account_id,
+                image=image,
+                image_bytes=image_bytes,
+                digest=digest,
+            )
 
-        image_bytes: bytes = await image.read()
+            chat_id: str = await self.__generate_new_chat(
+                token=token,
+                chat_type="t2t",
+            )
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+            user_id: str = await self.__fetch_account_user_id(
+                account_id=account_id,
             )
 
-            try:
-
-                async def call(
-                    token: str,
-                ) -> QwenPhotoAPIResponse:
-                    uploaded_image: QwenUploadData = await self.__fetch_upload_token(
-                        token=token,
-                        image=image,
-                    )
-
-                    await upload_qwen_file(
-                        uploaded_image,
-                        image_bytes=image_bytes,
-                    )
-
-                    chat_id: str = await self.__generate_new_chat(
-                        token=token,
-                        chat_type="t2t",
-                    )
-
-                    user_id: str = await self.__fetch_account_user_id(
-                        account_id=account_id,
-                    )
-
-                    prompted_body: R2PBodyPrompt = R2PBodyPrompt.gamestone()
-
-                    await self.__generate_photo(
-                        token=token,
-                        chat_id=chat_id,
-                        body=prompted_body,
-                        chat_type="t2t",
-                        user_id=user_id,
-                        image=image,
-                        uploaded_image=uploaded_image,
-                    )
-
-                    media: str = await self.__fetch_media_content(
-                        token=token,
-                        chat_id=chat_id,
-                    )
-
-                    loaded_media = loads(media)
-
-                    images = self.__find_images(
-                        loaded_media.get("name"),
-                    )
-
-                    if len(loaded_media) <= 0:
-                        raise QwenError(
-                            status_code=404,
-                            detail="Gemstone could not be identified",
-                        )
-                    return ChatGPTGemstone(
-                        **loaded_media,
-                        images=images,
-                    )
-
-                data: ChatGPTGemstone = await call(token)
-
-                if isinstance(data, ChatGPTGemstone):
-                    return await self.__handle_success(
-                        app_id,
-                        user_id,
-                        data,
-                    )
-
-            except QwenError as err:
-                raise err
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                        project=AccountProjectToken.QWEN,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if isinstance(data, ChatGPTGemstone):
-                            return await self.__handle_success(
-                                app_id,
-                                user_id,
-                                data,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(
-                        400,
-                        detail=last_err_code,
-                    )
-                await sleep(1)
-
-        return await self.__handle_failure(
-            400,
-            detail=last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+            prompted_body: R2PBodyPrompt = R2PBodyPrompt.gamestone()
+
+            await self.__generate_photo(
+                token=token,
+                chat_id=chat_id,
+                body=prompted_body,
+                chat_type="t2t",
+                user_id=user_id,
+                image=image,
+                uploaded_image=uploaded_image,
+                image_size=len(image_bytes),
+                ext=ext,
+                content_type=content_type,
+            )
+
+            media: str = await self.__fetch_media_content(
+                token=token,
+                chat_id=chat_id,
+            )
+
+            loaded_media = loads(media)
+
+            images = self.__find_images(
+                loaded_media.get("name"),
+            )
+
+            if len(loaded_media) <= 0:
+                raise QwenError(
+                    status_code=404,
+                    detail="Gemstone could not be identified",
+                )
+            return ChatGPTGemstone(
+                **loaded_media,
+                images=images,
+            )
+
+        data: ChatGPTGemstone = await analysis_retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
+        )
+
+        return await self.__handle_success(
+            app_id,
+            user_id,
+            data,
         )
 
+    @release_accounts
     async def fetch_day_fact(
         self,
         app_id: str,
@@ -1518,90 +1143,45 @@ class QwenClient:
     ) -> SharkDectorFactMessage:
         account = await account_database.fetch_next_account()
 
-        max_attempts = 10
+        async def call(
+            token: str,
+        ) -> SharkDectorFactMessage:
+            chat_id: str = await self.__generate_new_chat(
+                token=token,
+                chat_type="t2t",
+            )
 
-        last_err_code = None
+            prompted_body: R2PBodyPrompt = R2PBodyPrompt.day_fact()
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+            await self.__generate_photo(
+                token=token,
+                chat_id=chat_id,
+                body=prompted_body,
+                chat_type="t2t",
+            )
+
+            media: str = await self.__fetch_media_content(
+                token=token,
+                chat_id=chat_id,
             )
 
-            try:
-
-                async def call(
-                    token: str,
-                ) -> SharkDectorFactMessage:
-                    chat_id: str = await self.__generate_new_chat(
-                        token=token,
-                        chat_type="t2t",
-                    )
-
-                    prompted_body: R2PBodyPrompt = R2PBodyPrompt.day_fact()
-
-                    await self.__generate_photo(
-                        token=token,
-                        chat_id=chat_id,
-                        body=prompted_body,
-                        chat_type="t2t",
-                    )
-
-                    media: str = await self.__fetch_media_content(
-                        token=token,
-                        chat_id=chat_id,
-                    )
-
-                    return SharkDectorFactMessage(
-                        **loads(media),
-                    )
-
-                data: SharkDectorFactMessage = await call(token)
-
-                if isinstance(data, SharkDectorFactMessage):
-                    return await self.__handle_success(
-                        app_id,
-                        user_id,
-                        data,
-                    )
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                        project=AccountProjectToken.QWEN,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if isinstance(data, SharkDectorFactMessage):
-                            return await self.__handle_success(
-                                app_id,
-                                user_id,
-                                data,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(
-                        400,
-                        detail=last_err_code,
-                    )
-                await sleep(1)
-
-        return await self.__handle_failure(
-            400,
-            detail=last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+            return SharkDectorFactMessage(
+                **loads(media),
+            )
+
+        data: SharkDectorFactMessage = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
+        )
+
+        return await self.__handle_success(
+            app_id,
+            user_id,
+            data,
         )
 
+    @release_accounts
     async def photo_to_honesty(
         self,
         image: UploadFile,
@@ -1612,108 +1192,59 @@ class QwenClient:
 
         account_id = account.id
 
-        max_attempts = 1
+        image_bytes: bytes = await image.read()
 
-        last_err_code = None
+        digest: str = await upload_cache.digest(image_bytes)
+
+        async def call(
+            token: str,
+        ) -> QwenPhotoAPIResponse:
+            uploaded_image: QwenUploadData = await self.__upload_image(
+                token=token,
+                account_id=account_id,
+                image=image,
+                image_bytes=image_bytes,
+                digest=digest,
+            )
 
-        image_bytes: bytes = await image.read()
+            chat_id: str = await self.__generate_new_chat(
+                token=token,
+                chat_type="t2t",
+            )
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+            user_id: str = await self.__fetch_account_user_id(
+                account_id=account_id,
+            )
+
+            prompted_body: R2PBodyPrompt = R2PBodyPrompt.honestly()
+
+            await self.__generate_photo(
+                token=token,
+                chat_id=chat_id,
+                body=prompted_body,
+                chat_type="t2t",
+                user_id=user_id,
+                image=image,
+                uploaded_image=uploaded_image,
             )
 
-            try:
-
-                async def call(
-                    token: str,
-                ) -> QwenPhotoAPIResponse:
-                    uploaded_image: QwenUploadData = await self.__fetch_upload_token(
-                        token=token,
-                        image=image,
-                    )
-
-                    await upload_qwen_file(
-                        uploaded_image,
-                        image_bytes=image_bytes,
-                    )
-
-                    chat_id: str = await self.__generate_new_chat(
-                        token=token,
-                        chat_type="t2t",
-                    )
-
-                    user_id: str = await self.__fetch_account_user_id(
-                        account_id=account_id,
-                    )
-
-                    prompted_body: R2PBodyPrompt = R2PBodyPrompt.honestly()
-
-                    await self.__generate_photo(
-                        token=token,
-                        chat_id=chat_id,
-                        body=prompted_body,
-                        chat_type="t2t",
-                        user_id=user_id,
-                        image=image,
-                        uploaded_image=uploaded_image,
-                    )
-
-                    media: str = await self.__fetch_media_content(
-                        token=token,
-                        chat_id=chat_id,
-                    )
-
-                    return DialogImageAnalysisMessage.model_validate(
-                        loads(media),
-                    )
-
-                data: DialogImageAnalysisMessage = await call(token)
-
-                if isinstance(data, DialogImageAnalysisMessage):
-                    return await self.__handle_success(
-                        app_id,
-                        user_id,
-                        data,
-                    )
-
-            except QwenError as err:
-                raise err
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                        project=AccountProjectToken.QWEN,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if isinstance(data, DialogImageAnalysisMessage):
-                            return await self.__handle_success(
-                                app_id,
-                                user_id,
-                                data,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(
-                        400,
-                        detail=last_err_code,
-                    )
-                await sleep(1)
-
-        return await self.__handle_failure(
-            400,
-            detail=last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+            media: str = await self.__fetch_media_content(
+                token=token,
+                chat_id=chat_id,
+            )
+
+            return DialogImageAnalysisMessage.model_validate(
+                loads(media),
+            )
+
+        data: DialogImageAnalysisMessage = await analysis_retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
+        )
+
+        return await self.__handle_success(
+            app_id,
+            user_id,
+            data,
         )
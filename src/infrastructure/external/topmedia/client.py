@@ -39,9 +39,15 @@ from ...orm.database.repositories import (
     TopmediaAccountRepository,
 )
 
-from ....domain.repositories import IDatabase
+from ....domain.repositories import (
+    IDatabase,
+    release_accounts,
+)
 
-from ....domain.tools import update_account_token
+from ....domain.tools import (
+    update_account_token,
+    RetryPolicy,
+)
 
 from ....interface.schemas.external import (
     TopmediaResponse,
@@ -70,6 +76,29 @@ account_token_database = TopmediaAccountTokenRepository(
 )
 
 
+SONG_POLL_ATTEMPTS = 10
+
+
+retry_policy = RetryPolicy(
+    "topmedia",
+    fatal_codes={
+        400,
+        503,
+    },
+)
+
+
+song_retry_policy = RetryPolicy(
+    "topmedia_song",
+    max_attempts=2,
+    deadline=300.0,
+    fatal_codes={
+        400,
+        503,
+    },
+)
+
+
 class TopmediaClient:
     """Клиентский интерфейс для работы с PixVerse API.
 
@@ -109,17 +138,21 @@ class TopmediaClient:
             raise error
         return data.resp.access_token
 
-    async def __handle_failure(
+    def __check_response(
         self,
-        status_code: int,
-        extra: dict[str] = {},
-    ) -> TopmediaError:
-        error = TopmediaError(
-            status_code=status_code if status_code is not None else 505,
-            extra=extra,
-        )
-
-        raise error
+        data: TopmediaAPIResponse,
+        account: TopmediaAccounts,
+    ) -> None:
+        if data.resp.status != 200:
+            raise TopmediaError(
+                status_code=data.resp.status,
+                extra={
+                    "Данные аккаунта": {
+                        "логин": account.username,
+                        "пароль": account.password,
+                    }
+                },
+            )
 
     async def __get_account_token(
         self,
@@ -148,10 +181,18 @@ class TopmediaClient:
         self,
         account: TopmediaAccounts,
     ) -> str:
-        return await self.auth_user_account(
+        token: str = await self.auth_user_account(
             account,
         )
 
+        await update_account_token(
+            account,
+            token,
+            project=AccountProjectToken.TOPMEDIA,
+        )
+
+        return token
+
     async def __fetch_token_status(
         self,
         token: str,
@@ -313,6 +354,7 @@ class TopmediaClient:
             data=data,
         )
 
+    @release_accounts
     async def text_to_speech(
         self,
         body: IT2SBody,
@@ -321,97 +363,46 @@ class TopmediaClient:
 
         # account_id = account.id
 
-        max_attempts = 10
+        async def call(
+            token: str,
+        ) -> TopmediaResponse:
+            # await self.__fetch_token_status(
+            #     token=token,
+            # )
 
-        last_err_code = None
+            # await self.__fetch_slang_text_status(
+            #     token=token,
+            #     body=body,
+            # )
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+            speech_data: TopmediaSpeechData = await self.__generate_text_speech(
+                token=token,
+                body=body,
             )
 
-            try:
-
-                async def call(
-                    token: str,
-                ) -> TopmediaResponse:
-                    # await self.__fetch_token_status(
-                    #     token=token,
-                    # )
-
-                    # await self.__fetch_slang_text_status(
-                    #     token=token,
-                    #     body=body,
-                    # )
-
-                    speech_data: TopmediaSpeechData = await self.__generate_text_speech(
-                        token=token,
-                        body=body,
-                    )
-
-                    oss_data: TopmediaResponse = await self.__fetch_text_speech_url(
-                        token=token,
-                        id=speech_data.id,
-                    )
-
-                    return TopmediaAPIResponse(
-                        resp=self.__create_speach_response(
-                            body,
-                            speech_data,
-                            oss_data,
-                        ),
-                    )
-
-                data: TopmediaAPIResponse = await call(token)
-
-                if data.resp.status == 200:
-                    # return await self.__handle_success(
-                    #     data,
-                    #     account_id,
-                    #     body,
-                    # )
-                    return data
-
-                elif data.resp.status == 400:
-                    raise TopmediaError(data.resp.status)
-
-                last_err_code = data.resp.status
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
+            oss_data: TopmediaResponse = await self.__fetch_text_speech_url(
+                token=token,
+                id=speech_data.id,
+            )
 
-                    await update_account_token(
-                        account,
-                        token,
-                        project=AccountProjectToken.TOPMEDIA,
-                    )
+            return TopmediaAPIResponse(
+                resp=self.__create_speach_response(
+                    body,
+                    speech_data,
+                    oss_data,
+                ),
+            )
 
-                    try:
-                        data = await call(token)
-
-                        if data.resp.status == 200:
-                            # return await self.__handle_success(
-                            #     data,
-                            #     account_id,
-                            #     body,
-                            # )
-                            return data
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.resp.status)
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        data: TopmediaAPIResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
         )
 
+        return data
+
+    @release_accounts
     async def text_to_song(
         self,
         body: ITSGBody,
@@ -420,86 +411,46 @@ class TopmediaClient:
 
         # account_id = account.id
 
-        max_attempts = 10
-
-        last_err_code = None
+        async def call(
+            token: str,
+        ) -> TopmediaAPIResponse:
+            generation_data: TopmediaSongData = await self.__generate_text_song(
+                token=token,
+                body=body,
+            )
 
-        for attempt in range(max_attempts):
-            token = await self.__get_account_token(
-                account,
+            music_data: TopmediaResponse = await self.__fetch_song_result(
+                token=token,
+                ids=generation_data.song_ids,
             )
 
-            try:
+            for _ in range(SONG_POLL_ATTEMPTS):
+                music_data: TopmediaResponse = await self.__fetch_song_result(
+                    token=token,
+                    ids=generation_data.song_ids,
+                )
 
-                async def call(
-                    token: str,
-                ) -> TopmediaAPIResponse:
-                    generation_data: TopmediaSongData = await self.__generate_text_song(
-                        token=token,
-                        body=body,
-                    )
+                is_ready: bool = isinstance(
+                    music_data.resp, TopmediaMusicResponse
+                ) and all(
+                    song.song_id is not None for song in music_data.resp.result
+                )
 
-                    music_data: TopmediaResponse = await self.__fetch_song_result(
-                        token=token,
-                        ids=generation_data.song_ids,
+                if is_ready:
+                    return TopmediaAPIResponse(
+                        message="Song",
+                        resp=self.__create_song_response(music_data),
                     )
 
-                    for attempt in range(max_attempts):
-                        music_data: TopmediaResponse = await self.__fetch_song_result(
-                            token=token,
-                            ids=generation_data.song_ids,
-                        )
-
-                        is_ready: bool = isinstance(
-                            music_data.resp, TopmediaMusicResponse
-                        ) and all(
-                            song.song_id is not None for song in music_data.resp.result
-                        )
-
-                        if is_ready:
-                            return TopmediaAPIResponse(
-                                message="Song",
-                                resp=self.__create_song_response(music_data),
-                            )
-
-                        await sleep(10)
-
-                data: TopmediaAPIResponse = await call(token)
+                await sleep(10)
 
-                if data.resp.status == 200:
-                    return data
+            raise TopmediaError(status_code=505)
 
-                elif data.resp.status == 400:
-                    raise TopmediaError(data.resp.status)
-
-                last_err_code = data.resp.status
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    token = await self.__reauthenticate(account)
-
-                    await update_account_token(
-                        account,
-                        token,
-                        project=AccountProjectToken.TOPMEDIA,
-                    )
-
-                    try:
-                        data = await call(token)
-
-                        if data.resp.status == 200:
-                            return data
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.resp.status)
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        data: TopmediaAPIResponse = await song_retry_policy.run(
+            call,
+            token=lambda: self.__get_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
         )
+
+        return data
@@ -1,6 +1,6 @@
 # coding utf-8
 
-from asyncio import sleep
+import logging
 
 from functools import reduce
 
@@ -8,15 +8,34 @@ from httpx import Response
 
 from os import getenv
 
-from fastapi import UploadFile
+from time import (
+    time,
+    monotonic,
+)
+
+from asyncio import sleep
+
+from fastapi import (
+    HTTPException,
+    UploadFile,
+)
 
 from .core import WanCore
 
+from .jobs import WanJobStore
+
 from ....domain.conf import app_conf
 
-from ....domain.errors import WanError
+from ....domain.errors import (
+    WanError,
+    UpstreamError,
+)
 
-from ....domain.repositories import IDatabase
+from ....domain.repositories import (
+    IDatabase,
+    IRedis,
+    release_accounts,
+)
 
 from ....domain.typing.enums import (
     WanEndpoint,
@@ -25,6 +44,10 @@ from ....domain.typing.enums import (
 
 from ....domain.tools import (
     update_account_token,
+    upload_cache,
+    callback_sender,
+    RetryDecision,
+    RetryPolicy,
 )
 
 from ....domain.entities.core import (
@@ -69,6 +92,7 @@ from ....interface.schemas.external import (
     IWanPolicyData,
     GenerationData,
     IWanMediaResponse,
+    IWanJob,
     UsrData,
 )
 
@@ -76,6 +100,9 @@ from ....interface.schemas.external import (
 conf: IConfEnv = app_conf()
 
 
+logger = logging.getLogger(__name__)
+
+
 wan_account_database = WanAccountRepository(
     engine=IDatabase(conf),
 )
@@ -99,6 +126,46 @@ user_data_database = UserDataRepository(
     engine=IDatabase(conf),
 )
 
+retry_policy = RetryPolicy(
+    "wan",
+    fatal_codes={
+        6005,
+        9001,
+        10002,
+        50001,
+    },
+    reauth_codes={
+        4009,
+    },
+    retry_codes={
+        4007,
+        9006,
+    },
+)
+
+status_retry_policy = RetryPolicy(
+    "wan_status",
+    max_attempts=2,
+    fatal_codes={
+        6005,
+        10002,
+    },
+    reauth_codes={
+        4009,
+    },
+)
+
+webhook_retry_policy = RetryPolicy(
+    "wan_webhook",
+    max_attempts=3,
+    deadline=15.0,
+)
+
+job_store = WanJobStore(
+    engine=IRedis(conf),
+    ttl=conf.wan_job_ttl,
+)
+
 
 class WanClient:
     def __init__(
@@ -175,41 +242,54 @@ class WanClient:
             media_id=data.data,
         )
 
-    async def __handle_failure(
+    def __check_response(
         self,
-        status_code: int,
-        extra: dict[str] = {},
-    ) -> WanError:
-        error = WanError(
-            status_code=9999 if status_code is None else status_code,
-            extra=extra,
-        )
-
-        raise error
+        data: WanResponse,
+        account: WanAccounts,
+    ) -> None:
+        if data.error_code != 0:
+            raise WanError(
+                status_code=data.error_code,
+                extra={
+                    "Данные аккаунта": {
+                        "логин": account.username,
+                        "пароль": account.password,
+                    }
+                },
+            )
 
     async def __reauthenticate(
         self,
         account: WanAccounts,
-    ) -> WanCookie:
-        return await self.auth_user(
+    ) -> str:
+        account_cookie: WanCookie = await self.auth_user(
             account,
         )
 
+        cookie: str = account_cookie.generate_cookie()
+
+        await update_account_token(
+            account,
+            cookies=cookie,
+            project="wan",
+        )
+
+        return cookie
+
     async def __upload_file(
         self,
         cookie: str,
         data: IWanPolicyData,
         image: UploadFile,
+        image_bytes: bytes,
     ) -> Response:
-        iamge_bytes: bytes = await image.read()
-
         return await self._core.post(
             cookie=cookie,
             is_serialized=False,
             url_method=WanMethod.OSS,
             data=IIF2UBody(**data.dict),
             files={
-                "file": (image.filename, iamge_bytes, image.content_type),
+                "file": (image.filename, image_bytes, image.content_type),
             },
         )
 
@@ -247,6 +327,56 @@ class WanClient:
             return data.data
         raise WanError(data.error_code)
 
+    async def __upload_image(
+        self,
+        cookie: str,
+        account_id: int,
+        image: UploadFile,
+        image_bytes: bytes,
+        digest: str,
+    ) -> str:
+        """Загружает изображение в OSS и возвращает ссылку на него.
+
+        Ссылка кэшируется по аккаунту и хэшу изображения на срок
+        `upload_cache_url_ttl`, повтор запроса загрузку пропускает.
+        """
+        asset: dict | None = await upload_cache.fetch(
+            "wan",
+            account_id,
+            digest,
+        )
+
+        if asset is not None:
+            return asset["url"]
+
+        policy_data: IWanPolicyData = await self.__fetch_policy(
+            cookie=cookie,
+            image=image,
+        )
+
+        await self.__upload_file(
+            cookie=cookie,
+            data=policy_data,
+            image=image,
+            image_bytes=image_bytes,
+        )
+
+        oss_url: str = await self.__generate_oss_url(
+            cookie=cookie,
+            data=policy_data,
+        )
+
+        await upload_cache.store(
+            "wan",
+            account_id,
+            digest,
+            {"url": oss_url},
+            ttl=conf.upload_cache_url_ttl,
+        )
+
+        return oss_url
+
+    @release_accounts
     async def text_to_image(
         self,
         body: IT2IBody,
@@ -262,87 +392,34 @@ class WanClient:
 
         account_id = account.id
 
-        max_attempts = 10
-
-        last_err_code = None
-
-        for attempt in range(max_attempts):
-            cookie: str = await self.__fetch_account_cookie(
-                account,
+        async def call(
+            cookie: str,
+        ) -> WanResponse:
+            return await self._core.post(
+                cookie=cookie,
+                url_method=WanMethod.API,
+                endpoint=WanEndpoint.GENERATION,
+                body=IIT2IBody.generate(
+                    prompt=body.prompt,
+                    model_version="2_1_turbo",
+                ),
             )
-            try:
-
-                async def call(
-                    cookie: str,
-                ) -> WanResponse:
-                    return await self._core.post(
-                        cookie=cookie,
-                        url_method=WanMethod.API,
-                        endpoint=WanEndpoint.GENERATION,
-                        body=IIT2IBody.generate(
-                            prompt=body.prompt,
-                            model_version="2_1_turbo",
-                        ),
-                    )
-
-                data: WanResponse = await call(
-                    cookie,
-                )
-
-                if data.error_code == 0:
-                    return await self.__handle_success(
-                        data,
-                        account_id,
-                        user_id,
-                        app_id,
-                    )
-
-                elif data.error_code == 4009:
-                    raise WanError(data.error_code)
-
-                last_err_code = data.error_code
 
-            except Exception:
-                if attempt == max_attempts - 1:
-                    account_cookie: WanCookie = await self.__reauthenticate(
-                        account,
-                    )
-
-                    cookie: str = account_cookie.generate_cookie()
-
-                    await update_account_token(
-                        account,
-                        cookies=cookie,
-                        project="wan",
-                    )
-
-                    try:
-                        data = await call(
-                            cookie,
-                        )
+        data: WanResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__fetch_account_cookie(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
+        )
 
-                        if data.error_code == 0:
-                            return await self.__handle_success(
-                                data,
-                                account_id,
-                                user_id,
-                                app_id,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.error_code)
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        return await self.__handle_success(
+            data,
+            account_id,
+            user_id,
+            app_id,
         )
 
+    @release_accounts
     async def photo_to_photo(
         self,
         body: IT2IBody,
@@ -359,111 +436,54 @@ class WanClient:
 
         account_id = account.id
 
-        max_attempts = 10
+        image_bytes: bytes = await image.read()
 
-        last_err_code = None
+        digest: str = await upload_cache.digest(image_bytes)
 
-        for attempt in range(max_attempts):
-            cookie: str = await self.__fetch_account_cookie(
-                account,
+        async def call(
+            cookie: str,
+        ) -> WanResponse:
+            oss_url: str = await self.__upload_image(
+                cookie=cookie,
+                account_id=account_id,
+                image=image,
+                image_bytes=image_bytes,
+                digest=digest,
             )
-            try:
-
-                async def call(
-                    cookie: str,
-                ) -> WanResponse:
-                    policy_data: IWanPolicyData = await self.__fetch_policy(
-                        cookie=cookie,
-                        image=image,
-                    )
-
-                    await self.__upload_file(
-                        cookie=cookie,
-                        data=policy_data,
-                        image=image,
-                    )
-
-                    oss_url: str = await self.__generate_oss_url(
-                        cookie=cookie,
-                        data=policy_data,
-                    )
-
-                    return await self._core.post(
-                        cookie=cookie,
-                        url_method=WanMethod.API,
-                        endpoint=WanEndpoint.GENERATION,
-                        body=II2IBody.generate(
-                            prompt=body.prompt,
-                            ref_images_url_info=[
-                                WanImageData(
-                                    name=image.filename,
-                                    origin_image=oss_url,
-                                    result_image=oss_url,
-                                )
-                            ],
-                            generation_mode="plain",
-                            sub_type="chat",
-                        ),
-                    )
-
-                data: WanResponse = await call(
-                    cookie,
-                )
 
-                if data.error_code == 0:
-                    return await self.__handle_success(
-                        data,
-                        account_id,
-                        user_id,
-                        app_id,
-                    )
-
-                elif data.error_code == 4009:
-                    raise WanError(data.error_code)
-
-                last_err_code = data.error_code
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    account_cookie: WanCookie = await self.__reauthenticate(
-                        account,
-                    )
-
-                    cookie: str = account_cookie.generate_cookie()
-
-                    await update_account_token(
-                        account,
-                        cookies=cookie,
-                        project="wan",
-                    )
-
-                    try:
-                        data = await call(
-                            cookie,
+            return await self._core.post(
+                cookie=cookie,
+                url_method=WanMethod.API,
+                endpoint=WanEndpoint.GENERATION,
+                body=II2IBody.generate(
+                    prompt=body.prompt,
+                    ref_images_url_info=[
+                        WanImageData(
+                            name=image.filename,
+                            origin_image=oss_url,
+                            result_image=oss_url,
                         )
+                    ],
+                    generation_mode="plain",
+                    sub_type="chat",
+                ),
+            )
 
-                        if data.error_code == 0:
-                            return await self.__handle_success(
-                                data,
-                                account_id,
-                                user_id,
-                                app_id,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.error_code)
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        data: WanResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__fetch_account_cookie(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
+        )
+
+        return await self.__handle_success(
+            data,
+            account_id,
+            user_id,
+            app_id,
         )
 
+    @release_accounts
     async def template_to_photo(
         self,
         id: int,
@@ -480,117 +500,60 @@ class WanClient:
 
         account_id = account.id
 
-        max_attempts = 10
-
-        last_err_code = None
+        image_bytes: bytes = await image.read()
 
-        for attempt in range(max_attempts):
-            cookie: str = await self.__fetch_account_cookie(
-                account,
-            )
-            try:
+        digest: str = await upload_cache.digest(image_bytes)
 
-                async def call(
-                    cookie: str,
-                ) -> WanResponse:
-                    template: PhotoGeneratorTemplates = (
-                        await photo_generator_templates.fetch_with_filters(
-                            id=id,
-                        )
-                    )
-
-                    policy_data: IWanPolicyData = await self.__fetch_policy(
-                        cookie=cookie,
-                        image=image,
-                    )
-
-                    await self.__upload_file(
-                        cookie=cookie,
-                        data=policy_data,
-                        image=image,
-                    )
-
-                    oss_url: str = await self.__generate_oss_url(
-                        cookie=cookie,
-                        data=policy_data,
-                    )
-
-                    return await self._core.post(
-                        cookie=cookie,
-                        url_method=WanMethod.API,
-                        endpoint=WanEndpoint.GENERATION,
-                        body=II2IBody.generate(
-                            prompt=template.prompt,
-                            ref_images_url_info=[
-                                WanImageData(
-                                    name=image.filename,
-                                    origin_image=oss_url,
-                                    result_image=oss_url,
-                                )
-                            ],
-                            generation_mode="plain",
-                            sub_type="chat",
-                        ),
-                    )
-
-                data: WanResponse = await call(
-                    cookie,
+        async def call(
+            cookie: str,
+        ) -> WanResponse:
+            template: PhotoGeneratorTemplates = (
+                await photo_generator_templates.fetch_with_filters(
+                    id=id,
                 )
+            )
 
-                if data.error_code == 0:
-                    return await self.__handle_success(
-                        data,
-                        account_id,
-                        user_id,
-                        app_id,
-                    )
-
-                elif data.error_code == 4009:
-                    raise WanError(data.error_code)
-
-                last_err_code = data.error_code
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    account_cookie: WanCookie = await self.__reauthenticate(
-                        account,
-                    )
-
-                    cookie: str = account_cookie.generate_cookie()
-
-                    await update_account_token(
-                        account,
-                        cookies=cookie,
-                        project="wan",
-                    )
+            oss_url: str = await self.__upload_image(
+                cookie=cookie,
+                account_id=account_id,
+                image=image,
+                image_bytes=image_bytes,
+                digest=digest,
+            )
 
-                    try:
-                        data = await call(
-                            cookie,
+            return await self._core.post(
+                cookie=cookie,
+                url_method=WanMethod.API,
+                endpoint=WanEndpoint.GENERATION,
+                body=II2IBody.generate(
+                    prompt=template.prompt,
+                    ref_images_url_info=[
+                        WanImageData(
+                            name=image.filename,
+                            origin_image=oss_url,
+                            result_image=oss_url,
                         )
+                    ],
+                    generation_mode="plain",
+                    sub_type="chat",
+                ),
+            )
 
-                        if data.error_code == 0:
-                            return await self.__handle_success(
-                                data,
-                                account_id,
-                                user_id,
-                                app_id,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.error_code)
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        data: WanResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__fetch_account_cookie(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
         )
 
+        return await self.__handle_success(
+            data,
+            account_id,
+            user_id,
+            app_id,
+        )
+
+    @release_accounts
     async def template_to_avatar(
         self,
         id: int,
@@ -608,127 +571,70 @@ class WanClient:
 
         account_id = account.id
 
-        max_attempts = 10
+        image_bytes: bytes = await image.read()
 
-        last_err_code = None
+        digest: str = await upload_cache.digest(image_bytes)
 
-        for attempt in range(max_attempts):
-            cookie: str = await self.__fetch_account_cookie(
-                account,
-            )
-            try:
-
-                async def call(
-                    cookie: str,
-                ) -> WanResponse:
-                    template: PhotoGeneratorTemplates = (
-                        await photo_generator_templates.fetch_with_filters(
-                            id=id,
-                        )
-                    )
-
-                    prompt = (
-                        template.prompt
-                        + "\n"
-                        + "Create a high-quality user avatar based on the provided image. "
-                        f"Apply the selected camera angle: {body.angle}. "
-                        f"Use the described pose: {body.pose}. "
-                        "Ensure the avatar looks natural, consistent with the user's appearance, "
-                        "and rendered in the same visual style specified by the template."
-                    )
-
-                    policy_data: IWanPolicyData = await self.__fetch_policy(
-                        cookie=cookie,
-                        image=image,
-                    )
-
-                    await self.__upload_file(
-                        cookie=cookie,
-                        data=policy_data,
-                        image=image,
-                    )
-
-                    oss_url: str = await self.__generate_oss_url(
-                        cookie=cookie,
-                        data=policy_data,
-                    )
-
-                    return await self._core.post(
-                        cookie=cookie,
-                        url_method=WanMethod.API,
-                        endpoint=WanEndpoint.GENERATION,
-                        body=II2IBody.generate(
-                            prompt=prompt,
-                            ref_images_url_info=[
-                                WanImageData(
-                                    name=image.filename,
-                                    origin_image=oss_url,
-                                    result_image=oss_url,
-                                )
-                            ],
-                            generation_mode="plain",
-                            sub_type="chat",
-                        ),
-                    )
-
-                data: WanResponse = await call(
-                    cookie,
+        async def call(
+            cookie: str,
+        ) -> WanResponse:
+            template: PhotoGeneratorTemplates = (
+                await photo_generator_templates.fetch_with_filters(
+                    id=id,
                 )
+            )
 
-                if data.error_code == 0:
-                    return await self.__handle_success(
-                        data,
-                        account_id,
-                        user_id,
-                        app_id,
-                    )
-
-                elif data.error_code == 4009:
-                    raise WanError(data.error_code)
-
-                last_err_code = data.error_code
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    account_cookie: WanCookie = await self.__reauthenticate(
-                        account,
-                    )
-
-                    cookie: str = account_cookie.generate_cookie()
+            prompt = (
+                template.prompt
+                + "\n"
+                + "Create a high-quality user avatar based on the provided image. "
+                f"Apply the selected camera angle: {body.angle}. "
+                f"Use the described pose: {body.pose}. "
+                "Ensure the avatar looks natural, consistent with the user's appearance, "
+                "and rendered in the same visual style specified by the template."
+            )
 
-                    await update_account_token(
-                        account,
-                        cookies=cookie,
-                        project="wan",
-                    )
+            oss_url: str = await self.__upload_image(
+                cookie=cookie,
+                account_id=account_id,
+                image=image,
+                image_bytes=image_bytes,
+                digest=digest,
+            )
 
-                    try:
-                        data = await call(
-                            cookie,
+            return await self._core.post(
+                cookie=cookie,
+                url_method=WanMethod.API,
+                endpoint=WanEndpoint.GENERATION,
+                body=II2IBody.generate(
+                    prompt=prompt,
+                    ref_images_url_info=[
+                        WanImageData(
+                            name=image.filename,
+                            origin_image=oss_url,
+                            result_image=oss_url,
                         )
+                    ],
+                    generation_mode="plain",
+                    sub_type="chat",
+                ),
+            )
 
-                        if data.error_code == 0:
-                            return await self.__handle_success(
-                                data,
-                                account_id,
-                                user_id,
-                                app_id,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.error_code)
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        data: WanResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__fetch_account_cookie(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
+        )
+
+        return await self.__handle_success(
+            data,
+            account_id,
+            user_id,
+            app_id,
         )
 
+    @release_accounts
     async def text_to_video(
         self,
         body: IT2VBody,
@@ -744,89 +650,36 @@ class WanClient:
 
         account_id = account.id
 
-        max_attempts = 10
-
-        last_err_code = None
-
-        for attempt in range(max_attempts):
-            cookie: str = await self.__fetch_account_cookie(
-                account,
+        async def call(
+            cookie: str,
+        ) -> WanResponse:
+            return await self._core.post(
+                cookie=cookie,
+                url_method=WanMethod.API,
+                endpoint=WanEndpoint.GENERATION,
+                body=IIT2VBody.generate(
+                    prompt=body.prompt,
+                    duration=5,
+                    video_sound_switch="on",
+                    resolution="1280*720",
+                ),
             )
-            try:
-
-                async def call(
-                    cookie: str,
-                ) -> WanResponse:
-                    return await self._core.post(
-                        cookie=cookie,
-                        url_method=WanMethod.API,
-                        endpoint=WanEndpoint.GENERATION,
-                        body=IIT2VBody.generate(
-                            prompt=body.prompt,
-                            duration=5,
-                            video_sound_switch="on",
-                            resolution="1280*720",
-                        ),
-                    )
-
-                data: WanResponse = await call(
-                    cookie,
-                )
-
-                if data.error_code == 0:
-                    return await self.__handle_success(
-                        data,
-                        account_id,
-                        user_id,
-                        app_id,
-                    )
-
-                elif data.error_code == 4009:
-                    raise WanError(data.error_code)
-
-                last_err_code = data.error_code
 
-            except Exception:
-                if attempt == max_attempts - 1:
-                    account_cookie: WanCookie = await self.__reauthenticate(
-                        account,
-                    )
-
-                    cookie: str = account_cookie.generate_cookie()
-
-                    await update_account_token(
-                        account,
-                        cookies=cookie,
-                        project="wan",
-                    )
-
-                    try:
-                        data = await call(
-                            cookie,
-                        )
+        data: WanResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__fetch_account_cookie(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
+        )
 
-                        if data.error_code == 0:
-                            return await self.__handle_success(
-                                data,
-                                account_id,
-                                user_id,
-                                app_id,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.error_code)
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        return await self.__handle_success(
+            data,
+            account_id,
+            user_id,
+            app_id,
         )
 
+    @release_accounts
     async def image_to_video(
         self,
         image: UploadFile,
@@ -843,106 +696,49 @@ class WanClient:
 
         account_id = account.id
 
-        max_attempts = 10
+        image_bytes: bytes = await image.read()
 
-        last_err_code = None
+        digest: str = await upload_cache.digest(image_bytes)
 
-        for attempt in range(max_attempts):
-            cookie: str = await self.__fetch_account_cookie(
-                account,
+        async def call(
+            cookie: str,
+        ) -> WanResponse:
+            oss_url: str = await self.__upload_image(
+                cookie=cookie,
+                account_id=account_id,
+                image=image,
+                image_bytes=image_bytes,
+                digest=digest,
             )
-            try:
-
-                async def call(
-                    cookie: str,
-                ) -> WanResponse:
-                    policy_data: IWanPolicyData = await self.__fetch_policy(
-                        cookie=cookie,
-                        image=image,
-                    )
-
-                    await self.__upload_file(
-                        cookie=cookie,
-                        data=policy_data,
-                        image=image,
-                    )
-
-                    oss_url: str = await self.__generate_oss_url(
-                        cookie=cookie,
-                        data=policy_data,
-                    )
-
-                    return await self._core.post(
-                        cookie=cookie,
-                        url_method=WanMethod.API,
-                        endpoint=WanEndpoint.GENERATION,
-                        body=III2VBody.generate(
-                            prompt=body.prompt,
-                            duration=5,
-                            base_image=oss_url,
-                            video_sound_switch="on",
-                            resolution="1280*720",
-                        ),
-                    )
-
-                data: WanResponse = await call(
-                    cookie,
-                )
 
-                if data.error_code == 0:
-                    return await self.__handle_success(
-                        data,
-                        account_id,
-                        user_id,
-                        app_id,
-                    )
-
-                elif data.error_code == 4009:
-                    raise WanError(data.error_code)
-
-                last_err_code = data.error_code
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    account_cookie: WanCookie = await self.__reauthenticate(
-                        account,
-                    )
-
-                    cookie: str = account_cookie.generate_cookie()
-
-                    await update_account_token(
-                        account,
-                        cookies=cookie,
-                        project="wan",
-                    )
+            return await self._core.post(
+                cookie=cookie,
+                url_method=WanMethod.API,
+                endpoint=WanEndpoint.GENERATION,
+                body=III2VBody.generate(
+                    prompt=body.prompt,
+                    duration=5,
+                    base_image=oss_url,
+                    video_sound_switch="on",
+                    resolution="1280*720",
+                ),
+            )
 
-                    try:
-                        data = await call(
-                            cookie,
-                        )
+        data: WanResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__fetch_account_cookie(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
+        )
 
-                        if data.error_code == 0:
-                            return await self.__handle_success(
-                                data,
-                                account_id,
-                                user_id,
-                                app_id,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.error_code)
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        return await self.__handle_success(
+            data,
+            account_id,
+            user_id,
+            app_id,
         )
 
+    @release_accounts
     async def template_to_video(
         self,
         image: UploadFile,
@@ -959,105 +755,47 @@ class WanClient:
 
         account_id = account.id
 
-        max_attempts = 10
+        image_bytes: bytes = await image.read()
 
-        last_err_code = None
+        digest: str = await upload_cache.digest(image_bytes)
 
-        for attempt in range(max_attempts):
-            cookie: str = await self.__fetch_account_cookie(
-                account,
+        async def call(
+            cookie: str,
+        ) -> WanResponse:
+            oss_url: str = await self.__upload_image(
+                cookie=cookie,
+                account_id=account_id,
+                image=image,
+                image_bytes=image_bytes,
+                digest=digest,
             )
-            try:
-
-                async def call(
-                    cookie: str,
-                ) -> WanResponse:
-                    policy_data: IWanPolicyData = await self.__fetch_policy(
-                        cookie=cookie,
-                        image=image,
-                    )
-
-                    await self.__upload_file(
-                        cookie=cookie,
-                        data=policy_data,
-                        image=image,
-                    )
-
-                    oss_url: str = await self.__generate_oss_url(
-                        cookie=cookie,
-                        data=policy_data,
-                    )
-
-                    return await self._core.post(
-                        cookie=cookie,
-                        url_method=WanMethod.API,
-                        endpoint=WanEndpoint.GENERATION,
-                        body=IIE2VBody.generate(
-                            base_image=oss_url,
-                            video_sound_switch="off",
-                            model_version="2_2",
-                            model_ids=[
-                                body.template_id,
-                            ],
-                        ),
-                    )
-
-                data: WanResponse = await call(
-                    cookie,
-                )
-
-                if data.error_code == 0:
-                    return await self.__handle_success(
-                        data,
-                        account_id,
-                        user_id,
-                        app_id,
-                    )
-
-                elif data.error_code == 4009:
-                    raise WanError(data.error_code)
-
-                last_err_code = data.error_code
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    account_cookie: WanCookie = await self.__reauthenticate(
-                        account,
-                    )
 
-                    cookie: str = account_cookie.generate_cookie()
-
-                    await update_account_token(
-                        account,
-                        cookies=cookie,
-                        project="wan",
-                    )
+            return await self._core.post(
+                cookie=cookie,
+                url_method=WanMethod.API,
+                endpoint=WanEndpoint.GENERATION,
+                body=IIE2VBody.generate(
+                    base_image=oss_url,
+                    video_sound_switch="off",
+                    model_version="2_2",
+                    model_ids=[
+                        body.template_id,
+                    ],
+                ),
+            )
 
-                    try:
-                        data = await call(
-                            cookie,
-                        )
+        data: WanResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__fetch_account_cookie(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
+        )
 
-                        if data.error_code == 0:
-                            return await self.__handle_success(
-                                data,
-                                account_id,
-                                user_id,
-                                app_id,
-                            )
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.error_code)
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+        return await self.__handle_success(
+            data,
+            account_id,
+            user_id,
+            app_id,
         )
 
     async def fetch_media_status(
@@ -1079,80 +817,170 @@ class WanClient:
             generation_data.account_id,
         )
 
-        max_attempts = 1
+        async def call(
+            cookie: str,
+        ) -> WanResponse:
+            return await self._core.post(
+                cookie=cookie,
+                url_method=WanMethod.API,
+                endpoint=WanEndpoint.STATUS,
+                body=IIG2MBody(
+                    task_id=id,
+                ),
+            )
 
-        last_err_code = None
+        data: WanResponse = await status_retry_policy.run(
+            call,
+            token=lambda: self.__fetch_account_cookie(account),
+            reauth=lambda: self.__reauthenticate(account),
+            check=lambda data: self.__check_response(data, account),
+        )
 
-        for attempt in range(max_attempts):
-            cookie: str = await self.__fetch_account_cookie(
-                account,
-            )
+        return IWanMediaResponse.from_data(
+            data,
+        )
+
+    async def submit_job(
+        self,
+        data: IWanResponse,
+        callback_url: str | None = None,
+    ) -> IWanJob:
+        """Создает задачу по отправленной генерации.
+
+        Args:
+            data (IWanResponse): Ответ на отправку генерации
+            callback_url (str, optional): URL для webhook с результатом
+
+        Returns:
+            IWanJob: Задача со статусом "generating"
+
+        Raises:
+            WanError: `callback_url` не входит в разрешенные адреса
+        """
+        if callback_url is not None:
             try:
+                callback_sender.validate(callback_url)
+            except ValueError:
+                raise WanError(status_code=6008)
 
-                async def call(
-                    cookie: str,
-                    id: str,
-                ) -> WanResponse:
-                    return await self._core.post(
-                        cookie=cookie,
-                        url_method=WanMethod.API,
-                        endpoint=WanEndpoint.STATUS,
-                        body=IIG2MBody(
-                            task_id=id,
-                        ),
-                    )
-
-                data: WanResponse = await call(
-                    cookie,
-                    id,
-                )
+        return await job_store.create(
+            data.media_id,
+            callback_url,
+        )
+
+    async def advance_job(
+        self,
+        job: IWanJob,
+    ) -> IWanJob:
+        """Запрашивает статус генерации и сохраняет результат задачи.
+
+        Временные ошибки не завершают задачу: она будет опрошена снова.
+        """
+        try:
+            status: IWanMediaResponse = await self.fetch_media_status(
+                job.media_id,
+            )
+        except UpstreamError:
+            return job
+        except Exception as err:
+            if status_retry_policy.classify(err) is not RetryDecision.FATAL:
+                return job
+            job.status = "error"
+            job.detail = (
+                err.detail if isinstance(err, HTTPException) else WanError(6007).detail
+            )
+        else:
+            if status.media_urls != "generating":
+                job.status = "success"
+                job.url = status.media_urls[0]
+            elif time() - job.created_at >= job_store.window:
+                job.status = "error"
+                job.detail = WanError(6007).detail
 
-                if data.error_code == 0:
-                    return IWanMediaResponse.from_data(
-                        data,
-                    )
+        job.updated_at = time()
 
-                elif data.error_code == 10002:
-                    raise WanError(data.error_code)
+        await job_store.save(job)
 
-                last_err_code: int = data.error_code
+        if job.status != "generating" and job.callback_url:
+            await self.__deliver_job(job)
 
-            except Exception:
-                if attempt == max_attempts - 1:
-                    account_cookie = await self.__reauthenticate(
-                        account,
-                    )
+        return job
 
-                    cookie: str = account_cookie.generate_cookie()
+    async def fetch_job(
+        self,
+        job_id: str,
+    ) -> IWanJob:
+        job: IWanJob | None = await job_store.fetch(job_id)
 
-                    await update_account_token(
-                        account,
-                        cookies=cookie,
-                        project="wan",
-                    )
+        if job is None:
+            raise WanError(status_code=6006)
 
-                    try:
-                        data = await call(
-                            cookie,
-                            id,
-                        )
+        # задача продвигается и при чтении, поэтому результат доступен
+        # даже без фонового опроса, но не чаще его периода
+        if (
+            job.status == "generating"
+            and time() - job.updated_at >= conf.wan_job_interval
+        ):
+            job = await self.advance_job(job)
 
-                        if data.error_code == 0:
-                            return IWanMediaResponse.from_data(
-                                data,
-                            )
-
-                    except Exception as final_err:
-                        raise final_err
-                    return await self.__handle_failure(data.error_code)
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
-        )
+        return job
+
+    async def wait_job(
+        self,
+        job_id: str,
+        timeout: float = conf.wan_job_timeout,
+    ) -> IWanJob:
+        """Ждет завершения задачи не дольше `timeout` секунд.
+
+        Returns:
+            IWanJob: Задача; если время вышло, со статусом "generating"
+        """
+        deadline: float = monotonic() + timeout
+
+        while True:
+            job: IWanJob = await self.fetch_job(job_id)
+
+            if job.status != "generating" or monotonic() >= deadline:
+                return job
+
+            await sleep(
+                min(
+                    conf.wan_job_interval,
+                    deadline - monotonic(),
+                )
+            )
+
+    async def __deliver_job(
+        self,
+        job: IWanJob,
+    ) -> None:
+        if not await job_store.claim_callback(job.job_id):
+            return
+
+        try:
+            await callback_sender.check(job.callback_url)
+        except ValueError as err:
+            logger.warning(
+                "wan: webhook for job %s rejected (%s)",
+                job.job_id,
+                err,
+            )
+            return
+
+        async def call() -> Response:
+            return await callback_sender.post(
+                job.callback_url,
+                job.model_dump(exclude={"callback_url"}),
+            )
+
+        try:
+            await webhook_retry_policy.run(
+                call,
+                check=lambda response: response.raise_for_status(),
+            )
+        except Exception as err:
+            logger.warning(
+                "wan: webhook delivery failed for job %s (%s)",
+                job.job_id,
+                err.__class__.__name__,
+            )
@@ -0,0 +1,154 @@
+# coding utf-8
+
+from time import time
+
+from uuid import uuid4
+
+from redis.asyncio import Redis
+
+from ....domain.repositories import IRedis
+
+from ....domain.constants import (
+    WAN_JOB,
+    WAN_PENDING,
+)
+
+from ....interface.schemas.external import IWanJob
+
+
+class WanJobStore:
+    """Хранилище задач генерации Wan в Redis.
+
+    Эндпоинт отправки создает задачу и сразу возвращает ее `job_id`,
+    фоновый опрос (`WanJobCelery`) продвигает незавершенные задачи, а
+    клиент забирает результат по `job_id`. Незавершенные задачи хранятся
+    в отсортированном множестве `WAN_PENDING` с временем создания в
+    качестве веса.
+
+    Args:
+        engine (IRedis): Подключение к Redis
+        ttl (int): Время хранения задачи и ее результата (сек.)
+        window (int): Сколько секунд задача остается в опросе
+    """
+
+    def __init__(
+        self,
+        engine: IRedis,
+        ttl: int = 86400,
+        window: int = 1800,
+    ) -> None:
+        self._engine = engine
+        self._ttl = ttl
+        self._window = window
+
+    @property
+    def client(
+        self,
+    ) -> Redis:
+        return self._engine.client
+
+    @property
+    def window(
+        self,
+    ) -> int:
+        return self._window
+
+    async def create(
+        self,
+        media_id: str,
+        callback_url: str | None = None,
+    ) -> IWanJob:
+        created_at: float = time()
+
+        job = IWanJob(
+            job_id=uuid4().hex,
+            media_id=media_id,
+            callback_url=callback_url,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(
+                WAN_JOB.format(job_id=job.job_id),
+                job.model_dump_json(),
+                ex=self._ttl,
+            )
+            pipe.zadd(
+                WAN_PENDING,
+                {job.job_id: created_at},
+            )
+            await pipe.execute()
+
+        return job
+
+    async def fetch(
+        self,
+        job_id: str,
+    ) -> IWanJob | None:
+        data: str | None = await self.client.get(
+            WAN_JOB.format(job_id=job_id),
+        )
+        if data is None:
+            return None
+        return IWanJob.model_validate_json(data)
+
+    async def save(
+        self,
+        job: IWanJob,
+    ) -> IWanJob:
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(
+                WAN_JOB.format(job_id=job.job_id),
+                job.model_dump_json(),
+                ex=self._ttl,
+            )
+            if job.status != "generating":
+                pipe.zrem(
+                    WAN_PENDING,
+                    job.job_id,
+                )
+            await pipe.execute()
+
+        return job
+
+    async def claim_callback(
+        self,
+        job_id: str,
+    ) -> bool:
+        """Резервирует отправку webhook, чтобы он ушел не более одного раза."""
+        return bool(
+            await self.client.set(
+                f"{WAN_JOB.format(job_id=job_id)}:callback",
+                1,
+                ex=self._ttl,
+                nx=True,
+            )
+        )
+
+    async def fetch_pending(
+        self,
+    ) -> list[IWanJob]:
+        """Возвращает незавершенные задачи.
+
+        Задачи, удаленные по истечении `ttl`, убираются из множества.
+        """
+        job_ids: list[str] = await self.client.zrange(WAN_PENDING, 0, -1)
+
+        if not job_ids:
+            return []
+
+        data: list[str | None] = await self.client.mget(
+            [WAN_JOB.format(job_id=job_id) for job_id in job_ids],
+        )
+
+        expired: list[str] = [
+            job_id for job_id, value in zip(job_ids, data) if value is None
+        ]
+        if expired:
+            await self.client.zrem(
+                WAN_PENDING,
+                *expired,
+            )
+
+        return [IWanJob.model_validate_json(value) for value in data if value]
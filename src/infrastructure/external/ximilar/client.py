@@ -1,7 +1,5 @@
 # coding utf-8
 
-from asyncio import sleep
-
 from os import getenv
 
 from fastapi import UploadFile
@@ -12,7 +10,10 @@ from ....domain.conf import app_conf
 
 from ....domain.errors import WanError
 
-from ....domain.repositories import IDatabase
+from ....domain.repositories import (
+    IDatabase,
+    release_accounts,
+)
 
 from ....domain.typing.enums import (
     XimilarEndpoint,
@@ -21,6 +22,8 @@ from ....domain.typing.enums import (
 
 from ....domain.tools import (
     update_account_token,
+    image_processor,
+    RetryPolicy,
 )
 
 from ....domain.entities.core import (
@@ -70,6 +73,10 @@ user_data_database = UserDataRepository(
     engine=IDatabase(conf),
 )
 
+retry_policy = RetryPolicy(
+    "ximilar",
+)
+
 
 class XimilarClient:
     def __init__(
@@ -138,34 +145,37 @@ class XimilarClient:
         # )
         return data
 
-    async def __handle_failure(
-        self,
-        status_code: int,
-        extra: dict[str] = {},
-    ) -> WanError:
-        error = WanError(
-            status_code=9999 if status_code is None else status_code,
-            extra=extra,
-        )
-
-        raise error
-
     async def __reauthenticate(
         self,
         account: XimilarAccounts,
     ) -> str:
-        return await self.auth_user(
+        token: str = await self.auth_user(
+            account,
+        )
+
+        await update_account_token(
             account,
+            token=token,
+            project="ximilar",
         )
 
+        return token
+
     async def __generate_image(
         self,
         image: UploadFile,
     ) -> XimilarCardBody:
-        return await XimilarCardBody.from_upload(
-            image,
+        image_bytes, _, content_type = await image_processor.prepare(
+            await image.read(),
+            "ximilar",
+        )
+
+        return XimilarCardBody.from_bytes(
+            image_bytes,
+            content_type,
         )
 
+    @release_accounts
     async def image_to_card(
         self,
         image: UploadFile,
@@ -183,87 +193,31 @@ class XimilarClient:
 
         account_id = account.id
 
-        max_attempts = 10
-
-        last_err_code = None
+        body: XimilarCardBody = await self.__generate_image(
+            image=image,
+        )
 
-        for attempt in range(max_attempts):
-            account_token: str = await self.__fetch_account_token(
-                account,
+        async def call(
+            token: str,
+        ) -> CardResponse:
+            data = await self._core.post(
+                token=token,
+                url_method=XimilarMethod.API,
+                endpoint=XimilarEndpoint.CARD,
+                body=body,
             )
-            try:
-
-                async def call(
-                    token: str,
-                    image: UploadFile,
-                ):
-                    body: XimilarCardBody = await self.__generate_image(
-                        image=image,
-                    )
-
-                    data = await self._core.post(
-                        token=token,
-                        url_method=XimilarMethod.API,
-                        endpoint=XimilarEndpoint.CARD,
-                        body=body,
-                    )
-
-                    return CardResponse.from_full_response(data)
-
-                data: CardResponse = await call(
-                    account_token,
-                    image,
-                )
-
-                # if data.error_code == 0:
-                return await self.__handle_success(
-                    data,
-                    account_id,
-                    user_id,
-                    app_id,
-                )
-
-                # elif data.error_code == 4009:
-                #     raise WanError(data.error_code)
-
-                # last_err_code = data.error_code
-
-            except Exception:
-                if attempt == max_attempts - 1:
-                    account_token: str = await self.__reauthenticate(
-                        account,
-                    )
-
-                    await update_account_token(
-                        account,
-                        token=account_token,
-                        project="ximilar",
-                    )
-
-                    try:
-                        data: CardResponse = await call(
-                            account_token,
-                            image,
-                        )
-
-                        # if data.error_code == 0:
-                        return await self.__handle_success(
-                            data,
-                            account_id,
-                            user_id,
-                            app_id,
-                        )
-                    except Exception as final_err:
-                        raise final_err
-                    # return await self.__handle_failure(data.error_code)
-                await sleep(1)
-
-        return await self.__handle_failure(
-            last_err_code,
-            extra={
-                "Данные аккаунта": {
-                    "логин": account.username,
-                    "пароль": account.password,
-                }
-            },
+
+            return CardResponse.from_full_response(data)
+
+        data: CardResponse = await retry_policy.run(
+            call,
+            token=lambda: self.__fetch_account_token(account),
+            reauth=lambda: self.__reauthenticate(account),
+        )
+
+        return await self.__handle_success(
+            data,
+            account_id,
+            user_id,
+            app_id,
         )
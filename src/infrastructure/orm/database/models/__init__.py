@@ -45,6 +45,9 @@ from .instagram import (
     InstagramUsers,
     InstagramUserStats,
     InstagramTracking,
+    InstagramRelationSnapshots,
+    InstagramRelatedProfiles,
+    InstagramDailyStats,
 )
 
 from .topmedia import (
@@ -110,6 +113,9 @@ __all__: list[str] = [
     "InstagramUsers",
     "InstagramUserStats",
     "InstagramTracking",
+    "InstagramRelationSnapshots",
+    "InstagramRelatedProfiles",
+    "InstagramDailyStats",
     "TopmediaAccounts",
     "TopmediaAccountsTokens",
     "TopmediaVoices",
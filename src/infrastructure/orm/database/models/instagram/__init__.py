@@ -12,6 +12,13 @@ from .post import InstagramUserPosts
 
 from .tracking import InstagramTracking
 
+from .snapshot import (
+    InstagramRelationSnapshots,
+    InstagramRelatedProfiles,
+)
+
+from .daily import InstagramDailyStats
+
 __all__: list[str] = [
     "InstagramSessions",
     "InstagramUserStats",
@@ -19,4 +26,7 @@ __all__: list[str] = [
     "InstagramUserRelations",
     "InstagramUserPosts",
     "InstagramTracking",
+    "InstagramRelationSnapshots",
+    "InstagramRelatedProfiles",
+    "InstagramDailyStats",
 ]
@@ -0,0 +1,64 @@
+# coding utf-8
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    Date,
+    ForeignKey,
+    UniqueConstraint,
+)
+
+from ......domain.entities.core import ITable
+
+
+class InstagramDailyStats(ITable):
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "day",
+        ),
+    )
+
+    id: int = Column(
+        Integer,
+        nullable=False,
+        primary_key=True,
+        autoincrement=1,
+    )
+    user_id: int = Column(
+        Integer,
+        ForeignKey(
+            "instagram_users.id",
+            ondelete="CASCADE",
+        ),
+        nullable=False,
+    )
+    day: str = Column(
+        Date,
+        nullable=False,
+    )
+    followers_count: int = Column(
+        Integer,
+        default=0,
+        nullable=False,
+    )
+    following_count: int = Column(
+        Integer,
+        default=0,
+        nullable=False,
+    )
+    mutual_count: int = Column(
+        Integer,
+        default=0,
+        nullable=False,
+    )
+    new_followers_count: int = Column(
+        Integer,
+        default=0,
+        nullable=False,
+    )
+    unfollowers_count: int = Column(
+        Integer,
+        default=0,
+        nullable=False,
+    )
@@ -0,0 +1,73 @@
+# coding utf-8
+
+from sqlalchemy import (
+    Column,
+    BigInteger,
+    Integer,
+    String,
+    DateTime,
+    ForeignKey,
+)
+
+from sqlalchemy.dialects.mysql import LONGBLOB
+
+from ......domain.entities.core import ITable
+
+
+class InstagramRelationSnapshots(ITable):
+    id: int = Column(
+        Integer,
+        nullable=False,
+        primary_key=True,
+        autoincrement=1,
+    )
+    user_id: int = Column(
+        Integer,
+        ForeignKey(
+            "instagram_users.id",
+            ondelete="CASCADE",
+        ),
+        nullable=False,
+        index=True,
+    )
+    relation_type: str = Column(
+        String(32),
+        nullable=False,
+    )
+    ids: bytes = Column(
+        LONGBLOB,
+        nullable=False,
+    )
+    count: int = Column(
+        Integer,
+        nullable=False,
+    )
+    created_at: str = Column(
+        DateTime,
+        nullable=False,
+    )
+
+
+class InstagramRelatedProfiles(ITable):
+    id: int = Column(
+        BigInteger,
+        nullable=False,
+        primary_key=True,
+        autoincrement=False,
+    )
+    username: str = Column(
+        String(128),
+        nullable=False,
+    )
+    full_name: str = Column(
+        String(128),
+        nullable=True,
+    )
+    profile_picture: str = Column(
+        String(1024),
+        nullable=False,
+    )
+    updated_at: str = Column(
+        DateTime,
+        nullable=False,
+    )
@@ -32,6 +32,9 @@ from .instagram import (
     InstagramUserPostsRepository,
     InstagramUserRelationsRepository,
     InstagramTrackingRepository,
+    InstagramRelationSnapshotRepository,
+    InstagramRelatedProfileRepository,
+    InstagramDailyStatsRepository,
 )
 
 from .topmedia import (
@@ -85,6 +88,9 @@ __all__: list[str] = [
     "InstagramUserPostsRepository",
     "InstagramUserRelationsRepository",
     "InstagramTrackingRepository",
+    "InstagramRelationSnapshotRepository",
+    "InstagramRelatedProfileRepository",
+    "InstagramDailyStatsRepository",
     "TopmediaAccountRepository",
     "TopmediaAccountTokenRepository",
     "TopmediaVoiceRepository",
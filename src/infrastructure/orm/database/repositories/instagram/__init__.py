@@ -12,6 +12,13 @@ from .user_relation import InstagramUserRelationsRepository
 
 from .tracking import InstagramTrackingRepository
 
+from .snapshot import (
+    InstagramRelationSnapshotRepository,
+    InstagramRelatedProfileRepository,
+)
+
+from .daily import InstagramDailyStatsRepository
+
 __all__: list[str] = [
     "InstagramUserRepository",
     "InstagramSessionRepository",
@@ -19,4 +26,7 @@ __all__: list[str] = [
     "InstagramUserPostsRepository",
     "InstagramUserRelationsRepository",
     "InstagramTrackingRepository",
+    "InstagramRelationSnapshotRepository",
+    "InstagramRelatedProfileRepository",
+    "InstagramDailyStatsRepository",
 ]
@@ -0,0 +1,48 @@
+# coding utf-8
+
+from datetime import date
+
+from sqlalchemy import select
+
+from ...models import InstagramDailyStats
+
+from ......domain.repositories import (
+    IDatabase,
+    DatabaseRepository,
+)
+
+
+class InstagramDailyStatsRepository(DatabaseRepository):
+    def __init__(
+        self,
+        engine: IDatabase,
+    ) -> None:
+        super().__init__(
+            engine,
+            InstagramDailyStats,
+        )
+
+    async def fetch_since(
+        self,
+        user_id: int,
+        since: date,
+    ) -> list[InstagramDailyStats]:
+        """Возвращает дневную статистику пользователя начиная с `since`.
+
+        Args:
+            user_id (int): Идентификатор пользователя
+            since (date): Первый день
+
+        Returns:
+            list[InstagramDailyStats]: Записи по возрастанию дня
+        """
+        async with self._engine.get_session() as session:
+            result = await session.execute(
+                select(self._model)
+                .where(
+                    self._model.user_id == user_id,
+                    self._model.day >= since,
+                )
+                .order_by(self._model.day),
+            )
+            return list(result.scalars().all())
@@ -1,5 +1,10 @@
 # coding utf-8
 
+from sqlalchemy import (
+    select,
+    func,
+)
+
 from ...models import InstagramSessions
 
 from ......domain.repositories import (
@@ -49,3 +54,34 @@ class InstagramSessionRepository(DatabaseRepository):
             user_id,
             "created_at",
         )
+
+    async def fetch_latest_sessions(
+        self,
+    ) -> list[InstagramSessions]:
+        """Возвращает последнюю сессию каждой пары (ds_user_id, user_id).
+
+        Сессии добавляются по времени, поэтому последней считается запись
+        с наибольшим `id`; выбор выполняется в БД.
+
+        Returns:
+            list[InstagramSessions]: Последние сессии пользователей
+        """
+        latest = (
+            select(
+                func.max(self._model.id).label("id"),
+            )
+            .group_by(
+                self._model.ds_user_id,
+                self._model.user_id,
+            )
+            .subquery()
+        )
+
+        async with self._engine.get_session() as session:
+            result = await session.execute(
+                select(self._model).join(
+                    latest,
+                    self._model.id == latest.c.id,
+                ),
+            )
+            return list(result.scalars().all())
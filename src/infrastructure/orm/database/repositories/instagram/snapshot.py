@@ -0,0 +1,202 @@
+# coding utf-8
+
+from datetime import date
+
+from sqlalchemy import (
+    select,
+    delete,
+    func,
+)
+
+from ...models import (
+    InstagramRelationSnapshots,
+    InstagramRelatedProfiles,
+)
+
+from ......domain.repositories import (
+    IDatabase,
+    DatabaseRepository,
+)
+
+
+class InstagramRelationSnapshotRepository(DatabaseRepository):
+    def __init__(
+        self,
+        engine: IDatabase,
+    ) -> None:
+        super().__init__(
+            engine,
+            InstagramRelationSnapshots,
+        )
+
+    async def fetch_latest(
+        self,
+        user_id: int,
+        relation_type: str,
+        limit: int = 2,
+    ) -> list[InstagramRelationSnapshots]:
+        """Возвращает последние снимки связей пользователя (новые первыми).
+
+        Args:
+            user_id (int): Идентификатор пользователя
+            relation_type (str): Тип связи (`follower` / `following`)
+            limit (int): Сколько снимков вернуть
+
+        Returns:
+            list[InstagramRelationSnapshots]: Снимки по убыванию `id`
+        """
+        async with self._engine.get_session() as session:
+            result = await session.execute(
+                select(self._model)
+                .where(
+                    self._model.user_id == user_id,
+                    self._model.relation_type == relation_type,
+                )
+                .order_by(self._model.id.desc())
+                .limit(limit),
+            )
+            return list(result.scalars().all())
+
+    async def prune(
+        self,
+        user_id: int,
+        relation_type: str,
+        keep: int,
+    ) -> int:
+        """Удаляет старые снимки, оставляя `keep` последних.
+
+        Args:
+            user_id (int): Идентификатор пользователя
+            relation_type (str): Тип связи (`follower` / `following`)
+            keep (int): Сколько последних снимков оставить
+
+        Returns:
+            int: Число удаленных снимков
+        """
+        async with self._engine.get_session() as session:
+            # id самого нового из снимков, выходящих за предел хранения
+            threshold: int | None = await session.scalar(
+                select(self._model.id)
+                .where(
+                    self._model.user_id == user_id,
+                    self._model.relation_type == relation_type,
+                )
+                .order_by(self._model.id.desc())
+                .offset(keep)
+                .limit(1),
+            )
+            if threshold is None:
+                return 0
+
+            result = await session.execute(
+                delete(self._model).where(
+                    self._model.user_id == user_id,
+                    self._model.relation_type == relation_type,
+                    self._model.id <= threshold,
+                ),
+            )
+            await session.commit()
+
+        return result.rowcount
+
+    async def __fetch_latest_by(
+        self,
+        *conditions,
+    ) -> list[InstagramRelationSnapshots]:
+        # последний снимок каждой пары (пользователь, тип связи)
+        latest = (
+            select(
+                func.max(self._model.id).label("id"),
+            )
+            .where(*conditions)
+            .group_by(
+                self._model.user_id,
+                self._model.relation_type,
+            )
+            .subquery()
+        )
+
+        async with self._engine.get_session() as session:
+            result = await session.execute(
+                select(self._model).join(
+                    latest,
+                    self._model.id == latest.c.id,
+                ),
+            )
+            return list(result.scalars().all())
+
+    async def fetch_day(
+        self,
+        day: date,
+    ) -> list[InstagramRelationSnapshots]:
+        """Возвращает последние за день снимки каждого пользователя и типа связи.
+
+        Args:
+            day (date): День
+
+        Returns:
+            list[InstagramRelationSnapshots]: Снимки
+        """
+        return await self.__fetch_latest_by(
+            func.date(self._model.created_at) == day,
+        )
+
+    async def fetch_previous(
+        self,
+        user_ids: list[int],
+        day: date,
+        relation_type: str = "follower",
+    ) -> dict[int, InstagramRelationSnapshots]:
+        """Возвращает последние снимки пользователей до указанного дня.
+
+        Args:
+            user_ids (list[int]): Идентификаторы пользователей
+            day (date): День (снимки за него не учитываются)
+            relation_type (str): Тип связи
+
+        Returns:
+            dict[int, InstagramRelationSnapshots]: Снимки по `user_id`
+        """
+        if not user_ids:
+            return {}
+
+        snapshots = await self.__fetch_latest_by(
+            self._model.user_id.in_(user_ids),
+            self._model.relation_type == relation_type,
+            func.date(self._model.created_at) < day,
+        )
+        return {snapshot.user_id: snapshot for snapshot in snapshots}
+
+
+class InstagramRelatedProfileRepository(DatabaseRepository):
+    def __init__(
+        self,
+        engine: IDatabase,
+    ) -> None:
+        super().__init__(
+            engine,
+            InstagramRelatedProfiles,
+        )
+
+    async def fetch_by_ids(
+        self,
+        ids: list[int],
+    ) -> dict[int, InstagramRelatedProfiles]:
+        """Возвращает профили по id в Instagram.
+
+        Args:
+            ids (list[int]): Идентификаторы пользователей Instagram
+
+        Returns:
+            dict[int, InstagramRelatedProfiles]: Профили по id
+        """
+        if not ids:
+            return {}
+
+        async with self._engine.get_session() as session:
+            result = await session.execute(
+                select(self._model).where(
+                    self._model.id.in_(ids),
+                ),
+            )
+            return {profile.id: profile for profile in result.scalars().all()}
@@ -1,6 +1,23 @@
 # coding utf-8
 
-from ...models import InstagramUserStats
+from typing import Any
+
+from datetime import date
+
+from sqlalchemy import (
+    select,
+    insert,
+    func,
+)
+
+from ...models import (
+    InstagramUserStats,
+    InstagramUserPosts,
+    InstagramTracking,
+    InstagramRelationSnapshots,
+)
+
+from ......domain.entities.core import ISchema
 
 from ......domain.repositories import (
     IDatabase,
@@ -17,3 +34,86 @@ class InstagramUserStatsRepository(DatabaseRepository):
             engine,
             InstagramUserStats,
         )
+
+    async def save_refresh(
+        self,
+        stats: ISchema,
+        posts: list[ISchema],
+        snapshots: list[dict[str, Any]],
+        tracking: ISchema | None = None,
+    ) -> int | None:
+        """Записывает результаты обновления пользователя одной транзакцией.
+
+        Добавляются посты, которых еще нет, снимки связей, запись
+        отслеживания (если ее нет) и статистика за день (если ее еще нет).
+        Профили связей записываются заранее через
+        `InstagramRelatedProfileRepository.upsert_many`.
+
+        Args:
+            stats (ISchema): Статистика пользователя (`tracking_id` задается здесь)
+            posts (list[ISchema]): Последние посты пользователя
+            snapshots (list[dict]): Снимки для `InstagramRelationSnapshots`
+            tracking (ISchema, optional): Отслеживание (`UserTracking`)
+
+        Returns:
+            int | None: Идентификатор отслеживания
+        """
+        async with self._engine.get_session() as session:
+            if posts:
+                stored: set[str] = set(
+                    (
+                        await session.execute(
+                            select(InstagramUserPosts.post_url).where(
+                                InstagramUserPosts.user_id == stats.user_id,
+                                InstagramUserPosts.post_url.in_(
+                                    [post.post_url for post in posts],
+                                ),
+                            ),
+                        )
+                    ).scalars()
+                )
+                new_posts = [
+                    post.dict for post in posts if post.post_url not in stored
+                ]
+                if new_posts:
+                    await session.execute(
+                        insert(InstagramUserPosts).values(new_posts),
+                    )
+
+            if snapshots:
+                await session.execute(
+                    insert(InstagramRelationSnapshots).values(snapshots),
+                )
+
+            tracking_id: int | None = None
+            if tracking is not None:
+                tracking_id = await session.scalar(
+                    select(InstagramTracking.id).where(
+                        InstagramTracking.target_user_id == tracking.target_user_id,
+                        InstagramTracking.owner_user_id == tracking.owner_user_id,
+                    ),
+                )
+                if tracking_id is None:
+                    result = await session.execute(
+                        insert(InstagramTracking).values(**tracking.dict),
+                    )
+                    tracking_id = result.inserted_primary_key[0]
+
+            stats_id: int | None = await session.scalar(
+                select(self._model.id)
+                .where(
+                    self._model.user_id == stats.user_id,
+                    func.date(self._model.created_at) == date.today(),
+                )
+                .limit(1),
+            )
+            if stats_id is None:
+                await session.execute(
+                    insert(self._model).values(
+                        {**stats.dict, "tracking_id": tracking_id},
+                    ),
+                )
+
+            await session.commit()
+
+        return tracking_id
@@ -1,6 +1,19 @@
 # coding utf-8
 
-from ...models import InstagramTracking
+from datetime import date
+
+from sqlalchemy import (
+    Row,
+    select,
+    func,
+    or_,
+)
+
+from ...models import (
+    InstagramTracking,
+    InstagramUsers,
+    InstagramUserStats,
+)
 
 from ......domain.repositories import (
     IDatabase,
@@ -17,3 +30,66 @@ class InstagramTrackingRepository(DatabaseRepository):
             engine,
             InstagramTracking,
         )
+
+    async def fetch_stale(
+        self,
+        before: date,
+        limit: int,
+    ) -> list[Row]:
+        """Возвращает отслеживания без статистики за `before` и позже.
+
+        Вместе с отслеживанием выбираются профиль цели и последняя запись
+        статистики (или None); сначала идут никогда не обновлявшиеся,
+        затем самые давние. Записи статистики добавляются по порядку,
+        поэтому последняя определяется по максимальному id.
+
+        Args:
+            before (date): Статистика раньше этой даты считается устаревшей
+            limit (int): Максимум записей
+
+        Returns:
+            list[Row]: Строки (отслеживание, пользователь, статистика)
+        """
+        latest = (
+            select(
+                InstagramUserStats.tracking_id,
+                func.max(InstagramUserStats.id).label("stats_id"),
+            )
+            .where(InstagramUserStats.tracking_id.is_not(None))
+            .group_by(InstagramUserStats.tracking_id)
+            .subquery()
+        )
+
+        async with self._engine.get_session() as session:
+            result = await session.execute(
+                select(
+                    InstagramTracking,
+                    InstagramUsers,
+                    InstagramUserStats,
+                )
+                .join(
+                    InstagramUsers,
+                    InstagramUsers.id == InstagramTracking.target_user_id,
+                )
+                .outerjoin(
+                    latest,
+                    latest.c.tracking_id == InstagramTracking.id,
+                )
+                .outerjoin(
+                    InstagramUserStats,
+                    InstagramUserStats.id == latest.c.stats_id,
+                )
+                .where(
+                    or_(
+                        InstagramUserStats.id.is_(None),
+                        func.date(InstagramUserStats.created_at) < before,
+                    ),
+                    InstagramUsers.user_id.is_not(None),
+                )
+                .order_by(
+                    InstagramUserStats.id.is_not(None),
+                    InstagramUserStats.created_at,
+                )
+                .limit(limit),
+            )
+            return list(result.all())
@@ -1,5 +1,12 @@
 # coding utf-8
 
+from datetime import date
+
+from sqlalchemy import (
+    select,
+    func,
+)
+
 from ...models import InstagramUserRelations
 
 from ......domain.repositories import (
@@ -17,3 +24,82 @@ class InstagramUserRelationsRepository(DatabaseRepository):
             engine,
             InstagramUserRelations,
         )
+
+    async def fetch_page(
+        self,
+        user_id: int,
+        relation_type: str,
+        size: int,
+        after: int | None = None,
+        created_at: date | None = None,
+    ) -> list[InstagramUserRelations]:
+        """Возвращает страницу связей пользователя по ключу `id`.
+
+        Дубликаты по `related_username` отбрасываются в запросе: остается
+        последняя (с наибольшим `id`) запись. Возвращается до `size + 1`
+        строк, лишняя строка означает, что есть следующая страница.
+
+        Args:
+            user_id (int): Идентификатор пользователя
+            relation_type (str): Тип связи
+            size (int): Размер страницы
+            after (int, optional): `id` последней записи предыдущей страницы
+            created_at (date, optional): Только связи, добавленные в этот день
+
+        Returns:
+            list[InstagramUserRelations]: Записи, упорядоченные по `id`
+        """
+        conditions = [
+            self._model.user_id == user_id,
+            self._model.relation_type == relation_type,
+        ]
+        if created_at is not None:
+            conditions.append(func.date(self._model.created_at) == created_at)
+
+        latest = (
+            select(
+                func.max(self._model.id).label("id"),
+            )
+            .where(*conditions)
+            .group_by(self._model.related_username)
+            .subquery()
+        )
+
+        query = select(self._model).join(
+            latest,
+            self._model.id == latest.c.id,
+        )
+        if after is not None:
+            query = query.where(self._model.id > after)
+
+        async with self._engine.get_session() as session:
+            result = await session.execute(
+                query.order_by(self._model.id).limit(size + 1),
+            )
+            return list(result.scalars().all())
+
+    async def fetch_relations(
+        self,
+        user_id: int,
+        relation_types: list[str],
+    ) -> list[InstagramUserRelations]:
+        """Возвращает связи пользователя указанных типов с известным id.
+
+        Args:
+            user_id (int): Идентификатор пользователя
+            relation_types (list[str]): Типы связей
+
+        Returns:
+            list[InstagramUserRelations]: Записи, упорядоченные по `id`
+        """
+        async with self._engine.get_session() as session:
+            result = await session.execute(
+                select(self._model)
+                .where(
+                    self._model.user_id == user_id,
+                    self._model.relation_type.in_(relation_types),
+                    self._model.related_user_id.is_not(None),
+                )
+                .order_by(self._model.id),
+            )
+            return list(result.scalars().all())
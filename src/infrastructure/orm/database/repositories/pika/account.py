@@ -1,5 +1,7 @@
 # coding utf-8
 
+from typing import Any
+
 from sqlalchemy import select
 
 from ...models import (
@@ -8,9 +10,12 @@ from ...models import (
     PikaAccountApplications,
 )
 
+from ......domain.entities.core import ISchema
+
 from ......domain.repositories import (
     IDatabase,
     DatabaseRepository,
+    AccountScheduler,
 )
 
 from ......domain.errors import PikaError
@@ -25,6 +30,11 @@ class PikaAccountRepository(DatabaseRepository):
             engine,
             PikaAccounts,
         )
+        self._scheduler = AccountScheduler.for_provider(
+            "pika",
+            loader=self.fetch_active_accounts,
+            flusher=self.increment_usage,
+        )
 
     async def fetch_account(
         self,
@@ -37,10 +47,10 @@ class PikaAccountRepository(DatabaseRepository):
             many=False,
         )
 
-    async def fetch_next_account(
+    async def fetch_active_accounts(
         self,
         app_id: str,
-    ) -> PikaAccounts | None:
+    ) -> list[PikaAccounts]:
         stmt = (
             select(PikaAccounts)
             .join(PikaAccountApplications)
@@ -49,19 +59,48 @@ class PikaAccountRepository(DatabaseRepository):
                 PikaApplications.app_id == app_id,
                 PikaAccounts.is_active.is_(True),
             )
-            .order_by(PikaAccounts.usage_count.asc())
-            .limit(1)
         )
 
         async with self._engine.get_session() as session:
             result = await session.execute(stmt)
-            account: PikaAccounts | None = result.scalars().first()
+            return list(result.scalars().all())
+
+    async def increment_usage(
+        self,
+        values: dict[int, int],
+    ) -> None:
+        await self.increment_field(
+            "usage_count",
+            values,
+        )
+
+    async def update_record(
+        self,
+        id: int,
+        data: ISchema | dict[str, Any],
+    ) -> ISchema:
+        result = await super().update_record(id, data)
+        # аккаунт мог быть отключен: пул планировщика загружается заново
+        self._scheduler.invalidate()
+        return result
+
+    async def delete_record(
+        self,
+        id: int,
+    ) -> bool:
+        result: bool = await super().delete_record(id)
+        self._scheduler.invalidate()
+        return result
+
+    async def fetch_next_account(
+        self,
+        app_id: str,
+    ) -> PikaAccounts | None:
+        account: PikaAccounts | None = await self._scheduler.acquire(
+            app_id,
+        )
 
         if account is None:
             raise PikaError(status_code=25)
 
-        await self.update_record(
-            id=account.id,
-            data={"usage_count": int(account.usage_count) + 1},
-        )
         return account
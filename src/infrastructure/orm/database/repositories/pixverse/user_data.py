@@ -2,7 +2,7 @@
 
 from collections import defaultdict
 
-from sqlalchemy import select, and_
+from sqlalchemy import select, update, and_
 
 from ...models import (
     UserData,
@@ -33,6 +33,70 @@ class UserDataRepository(DatabaseRepository):
             UserData,
         )
 
+    async def __change_balance(
+        self,
+        user_id: str,
+        app_id: str,
+        amount: int,
+        usage: int,
+    ) -> bool:
+        conditions = [
+            self._model.user_id == user_id,
+            self._model.app_id == app_id,
+        ]
+        if amount < 0:
+            # списание проходит, только если баланса хватает
+            conditions.append(self._model.balance >= -amount)
+
+        async with self._engine.get_session() as session:
+            result = await session.execute(
+                update(self._model)
+                .where(*conditions)
+                .values(
+                    balance=self._model.balance + amount,
+                    app_id_usage=self._model.app_id_usage + usage,
+                ),
+            )
+            await session.commit()
+            return result.rowcount > 0
+
+    async def debit_balance(
+        self,
+        user_id: str,
+        app_id: str,
+        amount: int,
+    ) -> bool:
+        """Списывает `amount` токенов одним условным UPDATE.
+
+        Args:
+            user_id (str): Идентификатор пользователя
+            app_id (str): Идентификатор приложения
+            amount (int): Стоимость операции
+
+        Returns:
+            bool: False, если пользователя нет или баланса не хватает
+        """
+        return await self.__change_balance(
+            user_id,
+            app_id,
+            -amount,
+            1,
+        )
+
+    async def refund_balance(
+        self,
+        user_id: str,
+        app_id: str,
+        amount: int,
+    ) -> bool:
+        """Возвращает списанные токены, если операция не выполнилась."""
+        return await self.__change_balance(
+            user_id,
+            app_id,
+            amount,
+            -1,
+        )
+
     async def create_or_update_user_data(
         self,
         body: UserUpdateData,
@@ -1,5 +1,10 @@
 # coding utf-8
 
+from sqlalchemy import (
+    update,
+    bindparam,
+)
+
 from ...models import UserGenerations
 
 from ......domain.repositories import (
@@ -28,3 +33,32 @@ class UserGenerationRepository(DatabaseRepository):
             value,
             many=False,
         )
+
+    async def update_generation_urls(
+        self,
+        values: dict[int, str],
+    ) -> None:
+        """Сохраняет ссылки на готовые видео одним executemany.
+
+        Args:
+            values (dict[int, str]): Ссылки по generation_id
+        """
+        if not values:
+            return
+
+        table = self._model.__table__
+
+        async with self._engine.get_session() as session:
+            connection = await session.connection()
+            await connection.execute(
+                update(table)
+                .where(table.c.generation_id == bindparam("video_id"))
+                .values(
+                    generation_url=bindparam("video_url"),
+                ),
+                [
+                    {"video_id": video_id, "video_url": video_url}
+                    for video_id, video_url in values.items()
+                ],
+            )
+            await session.commit()
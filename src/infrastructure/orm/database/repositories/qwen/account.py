@@ -1,14 +1,17 @@
 # coding utf-8
 
+from typing import Any
+
 from ...models import QwenAccounts
 
+from ......domain.entities.core import ISchema
+
 from ......domain.repositories import (
     IDatabase,
     DatabaseRepository,
+    AccountScheduler,
 )
 
-from ......domain.entities.qwen import IQwenAccount
-
 from ......domain.errors import TopmediaError
 
 
@@ -21,6 +24,11 @@ class QwenAccountRepository(DatabaseRepository):
             engine,
             QwenAccounts,
         )
+        self._scheduler = AccountScheduler.for_provider(
+            "qwen",
+            loader=self.fetch_active_accounts,
+            flusher=self.increment_usage,
+        )
 
     async def fetch_account(
         self,
@@ -33,21 +41,49 @@ class QwenAccountRepository(DatabaseRepository):
             many=False,
         )
 
-    async def fetch_next_account(
+    async def fetch_active_accounts(
         self,
-    ) -> QwenAccounts | None:
-        account = await self.fetch_one_with_filter(
-            order_by="usage_count",
+        key: str | None = None,
+    ) -> list[QwenAccounts]:
+        return await self.fetch_with_filters(
+            many=True,
             is_active=True,
         )
+
+    async def increment_usage(
+        self,
+        values: dict[int, int],
+    ) -> None:
+        await self.increment_field(
+            "usage_count",
+            values,
+        )
+
+    async def update_record(
+        self,
+        id: int,
+        data: ISchema | dict[str, Any],
+    ) -> ISchema:
+        result = await super().update_record(id, data)
+        # аккаунт мог быть отключен: пул планировщика загружается заново
+        self._scheduler.invalidate()
+        return result
+
+    async def delete_record(
+        self,
+        id: int,
+    ) -> bool:
+        result: bool = await super().delete_record(id)
+        self._scheduler.invalidate()
+        return result
+
+    async def fetch_next_account(
+        self,
+    ) -> QwenAccounts | None:
+        account: QwenAccounts | None = await self._scheduler.acquire()
+
         if account is None:
             raise TopmediaError(
                 status_code=503,
             )
-        await self.update_record(
-            id=account.id,
-            data=IQwenAccount(
-                usage_count=account.usage_count,
-            ),
-        )
         return account
@@ -0,0 +1,8 @@
+# coding utf-8
+
+from .runner import run_task
+
+
+__all__: list[str] = [
+    "run_task",
+]
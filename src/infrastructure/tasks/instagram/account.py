@@ -1,11 +1,27 @@
 # coding utf-8
 
+import logging
+
 from typing import Any
 
+from time import monotonic
+
+from collections import Counter
+
+from asyncio import (
+    Semaphore,
+    gather,
+)
+
 from .core import InstagramCelery
 
 from ....domain.repositories import IDatabase
 
+from ....domain.tools import (
+    RetryDecision,
+    RetryPolicy,
+)
+
 from ...orm.database.models import InstagramSessions
 
 from ...orm.database.repositories import (
@@ -13,7 +29,19 @@ from ...orm.database.repositories import (
 )
 
 
+logger = logging.getLogger(__name__)
+
+
 class InstagramSessionCelery(InstagramCelery):
+    """Периодическое обновление данных по сессиям Instagram.
+
+    Последняя сессия каждого пользователя выбирается в БД, сессии
+    обновляются параллельно (не больше `instagram_session_concurrency`
+    одновременно) с повторами и экспоненциальной задержкой. Ошибки, при
+    которых повтор бессмыслен (профиль не найден, закрыт и т.п.), не
+    повторяются и учитываются как пропущенные сессии.
+    """
+
     def __init__(
         self,
     ) -> None:
@@ -21,33 +49,77 @@ class InstagramSessionCelery(InstagramCelery):
         self._session_repository = InstagramSessionRepository(
             IDatabase(self._conf),
         )
+        self._retry_policy = RetryPolicy(
+            "instagram_sessions",
+            max_attempts=self._conf.instagram_session_attempts,
+            base_delay=2.0,
+            max_delay=30.0,
+            deadline=600.0,
+        )
 
     async def __fetch_sessions(
         self,
-    ):
-        user_sessions: (
-            list[InstagramSessions] | None
-        ) = await self._session_repository.fetch_all()
+    ) -> list[InstagramSessions]:
+        return await self._session_repository.fetch_latest_sessions()
 
-        latest: dict[tuple[str, int], Any] = {}
-
-        for session in user_sessions:
-            key = (session.ds_user_id, session.user_id)
-            if key not in latest or session.created_at > latest[key].created_at:
-                latest[key] = session
+    async def __refresh_session(
+        self,
+        semaphore: Semaphore,
+        session: InstagramSessions,
+    ) -> str:
+        async with semaphore:
+            try:
+                await self._retry_policy.run(
+                    lambda: self.client.update_user_data(
+                        body=None,
+                        uuid=session.uuid,
+                    ),
+                )
+            except Exception as err:
+                outcome: str = (
+                    "skipped"
+                    if self._retry_policy.classify(err) is RetryDecision.FATAL
+                    else "failed"
+                )
+                logger.warning(
+                    "instagram: session %s refresh %s (%s)",
+                    session.uuid,
+                    outcome,
+                    err.__class__.__name__,
+                )
+                return outcome
 
-        return list(latest.values())
+        return "refreshed"
 
     async def update_sessions_data(
         self,
-    ) -> Any:
-        user_sessions: list[InstagramSessions] | None = await self.__fetch_sessions()
-        for session in user_sessions:
-            try:
-                await self.client.update_user_data(
-                    body=None,
-                    uuid=session.uuid,
+    ) -> dict[str, Any]:
+        started: float = monotonic()
+
+        user_sessions: list[InstagramSessions] = await self.__fetch_sessions()
+
+        semaphore = Semaphore(self._conf.instagram_session_concurrency)
+
+        outcomes: Counter = Counter(
+            await gather(
+                *(
+                    self.__refresh_session(semaphore, session)
+                    for session in user_sessions
                 )
-            except Exception as err:
-                pass
-        return True
+            )
+        )
+
+        report: dict[str, Any] = {
+            "selected": len(user_sessions),
+            "refreshed": outcomes["refreshed"],
+            "skipped": outcomes["skipped"],
+            "failed": outcomes["failed"],
+            "duration": round(monotonic() - started, 3),
+        }
+
+        logger.info(
+            "instagram: sessions refresh %s",
+            report,
+        )
+
+        return report
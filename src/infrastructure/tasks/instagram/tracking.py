@@ -13,3 +13,8 @@ class InstagramTrackingCelery(InstagramCelery):
         self,
     ) -> Any:
         return await self.client.update_all_tracked_users_data()
+
+    async def aggregate_daily_stats(
+        self,
+    ) -> Any:
+        return await self.client.aggregate_daily_stats()
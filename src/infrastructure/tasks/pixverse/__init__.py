@@ -6,8 +6,11 @@ from .template import PixverseTemplateCelery
 
 from .style import PixverseStyleCelery
 
+from .status import PixverseStatusCelery
+
 __all__: list[str] = [
     "PixverseAccountCelery",
     "PixverseTemplateCelery",
     "PixverseStyleCelery",
+    "PixverseStatusCelery",
 ]
@@ -0,0 +1,139 @@
+# coding utf-8
+
+import logging
+
+from typing import Any
+
+from asyncio import (
+    Semaphore,
+    gather,
+)
+
+from .core import PixverseCelery
+
+from ....domain.repositories import IDatabase
+
+from ...orm.database.models import PixverseAccounts
+
+from ...orm.database.repositories import (
+    PixverseAccountRepository,
+    UserGenerationRepository,
+)
+
+from ...external.pixverse.client import status_cache
+
+from ....interface.schemas.external import GenerationStatus
+
+
+logger = logging.getLogger(__name__)
+
+
+class PixverseStatusCelery(PixverseCelery):
+    """Фоновый опрос статусов генераций PixVerse.
+
+    За один тик делается один STATUS запрос на аккаунт, у которого есть
+    незавершенные генерации; ответ раскладывается по `video_id` в кэш
+    статусов, а ссылки на готовые видео сохраняются в базу.
+
+    Args:
+        max_concurrency (int): Максимум одновременно опрашиваемых аккаунтов
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 10,
+    ) -> None:
+        super().__init__()
+        self._max_concurrency = max_concurrency
+        self._account_repository = PixverseAccountRepository(
+            IDatabase(self._conf),
+        )
+        self._generation_repository = UserGenerationRepository(
+            IDatabase(self._conf),
+        )
+
+    async def __poll_account(
+        self,
+        semaphore: Semaphore,
+        account: PixverseAccounts,
+        video_ids: list[int],
+    ) -> dict[int, GenerationStatus]:
+        async with semaphore:
+            try:
+                statuses: dict[int, GenerationStatus] = (
+                    await self.client.fetch_account_statuses(account)
+                )
+            except Exception as err:
+                # генерации остаются в опросе до следующего тика
+                logger.warning(
+                    "pixverse: status poll failed for account %s (%s)",
+                    account.id,
+                    err.__class__.__name__,
+                )
+                return {}
+
+        return {
+            video_id: statuses[video_id]
+            for video_id in video_ids
+            if video_id in statuses
+        }
+
+    async def poll_statuses(
+        self,
+    ) -> dict[str, Any]:
+        pending: dict[int, list[int]] = await status_cache.fetch_pending()
+
+        if not pending:
+            return {"accounts": 0, "tracked": 0, "completed": 0}
+
+        accounts: list[PixverseAccounts] = (
+            await self._account_repository.fetch_field(
+                "id",
+                list(pending),
+            )
+            or []
+        )
+
+        semaphore = Semaphore(self._max_concurrency)
+
+        results: list[dict[int, GenerationStatus]] = await gather(
+            *(
+                self.__poll_account(
+                    semaphore,
+                    account,
+                    pending[account.id],
+                )
+                for account in accounts
+            )
+        )
+
+        statuses: dict[int, GenerationStatus] = {
+            video_id: status for result in results for video_id, status in result.items()
+        }
+
+        await status_cache.store_many(statuses)
+
+        finished: dict[int, list[int]] = {
+            account_id: [
+                video_id
+                for video_id in video_ids
+                if video_id in statuses and statuses[video_id].status != "generating"
+            ]
+            for account_id, video_ids in pending.items()
+        }
+
+        await status_cache.untrack(finished)
+
+        await self._generation_repository.update_generation_urls(
+            {
+                video_id: status.video_url
+                for video_id, status in statuses.items()
+                if status.status == "success" and status.video_url
+            }
+        )
+
+        return {
+            "accounts": len(accounts),
+            "tracked": sum(len(video_ids) for video_ids in pending.values()),
+            "completed": sum(len(video_ids) for video_ids in finished.values()),
+        }
@@ -0,0 +1,50 @@
+# coding utf-8
+
+from typing import (
+    Awaitable,
+    TypeVar,
+)
+
+from asyncio import run
+
+from ...domain.repositories import (
+    AccountScheduler,
+    engine_registry,
+)
+
+from ...domain.tools import CallbackSender
+
+from ..external.core import HttpClient
+
+
+T = TypeVar("T")
+
+
+def run_task(
+    task: Awaitable[T],
+) -> T:
+    """Запускает корутину задачи Celery в новом event loop.
+
+    Каждый тик Celery выполняется через отдельный `asyncio.run`, а пулы
+    соединений (БД, Redis, HTTP) создаются на event loop. Перед закрытием
+    цикла они освобождаются, иначе каждый тик оставлял бы открытые пулы.
+
+    Args:
+        task (Awaitable): Корутина задачи
+
+    Returns:
+        T: Результат задачи
+    """
+
+    async def main() -> T:
+        try:
+            return await task
+        finally:
+            await AccountScheduler.flush_all()
+            await HttpClient.close_clients()
+            await CallbackSender.close_clients()
+            await engine_registry.dispose()
+
+    return run(
+        main(),
+    )
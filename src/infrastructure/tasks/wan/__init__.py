@@ -0,0 +1,7 @@
+# coding utf-8
+
+from .job import WanJobCelery
+
+__all__: list[str] = [
+    "WanJobCelery",
+]
@@ -0,0 +1,36 @@
+# coding utf-8
+
+from functools import cached_property
+
+from ....domain.conf import app_conf
+
+from ....domain.entities.core import IConfEnv
+
+from ....domain.repositories import (
+    ICelery,
+)
+
+from ....infrastructure.external.wan import (
+    WanClient,
+    WanCore,
+)
+
+
+class WanCelery(ICelery):
+    def __init__(
+        self,
+        app_name: str = "wan",
+        conf: IConfEnv = app_conf(),
+    ) -> None:
+        super().__init__(
+            app_name,
+            conf,
+        )
+
+    @cached_property
+    def client(
+        self,
+    ) -> WanClient:
+        return WanClient(
+            core=WanCore(),
+        )
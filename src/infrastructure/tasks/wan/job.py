@@ -0,0 +1,61 @@
+# coding utf-8
+
+from asyncio import (
+    Semaphore,
+    gather,
+)
+
+from .core import WanCelery
+
+from ...external.wan.client import job_store
+
+from ....interface.schemas.external import IWanJob
+
+
+class WanJobCelery(WanCelery):
+    """Фоновый опрос задач генерации Wan.
+
+    Продвигает все незавершенные задачи: запрашивает статус генерации,
+    сохраняет результат и отправляет webhook, если он задан.
+
+    Args:
+        max_concurrency (int): Максимум одновременно опрашиваемых задач
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 10,
+    ) -> None:
+        super().__init__()
+        self._max_concurrency = max_concurrency
+
+    async def __advance_job(
+        self,
+        semaphore: Semaphore,
+        job: IWanJob,
+    ) -> IWanJob:
+        async with semaphore:
+            return await self.client.advance_job(job)
+
+    async def poll_jobs(
+        self,
+    ) -> dict[str, int]:
+        jobs: list[IWanJob] = await job_store.fetch_pending()
+
+        semaphore = Semaphore(self._max_concurrency)
+
+        results: list[IWanJob] = await gather(
+            *(
+                self.__advance_job(
+                    semaphore,
+                    job,
+                )
+                for job in jobs
+            )
+        )
+
+        return {
+            "pending": len(jobs),
+            "success": sum(job.status == "success" for job in results),
+            "error": sum(job.status == "error" for job in results),
+        }
@@ -3,6 +3,7 @@
 from .....schemas.external import (
     IWanResponse,
     IWanMediaResponse,
+    IWanJob,
 )
 
 from ......infrastructure.external.wan import WanClient
@@ -94,3 +95,33 @@ class WanController:
             *args,
             **kwargs,
         )
+
+    async def submit_job(
+        self,
+        *args,
+        **kwargs,
+    ) -> IWanJob:
+        return await self._client.submit_job(
+            *args,
+            **kwargs,
+        )
+
+    async def fetch_job(
+        self,
+        *args,
+        **kwargs,
+    ) -> IWanJob:
+        return await self._client.fetch_job(
+            *args,
+            **kwargs,
+        )
+
+    async def wait_job(
+        self,
+        *args,
+        **kwargs,
+    ) -> IWanJob:
+        return await self._client.wait_job(
+            *args,
+            **kwargs,
+        )
@@ -106,6 +106,7 @@ from .response import (
     WanResponse,
     IWanResponse,
     IWanMediaResponse,
+    IWanJob,
     IWanPolicyData,
     DialogImageAnalysisMessage,
     LocationResponse,
@@ -215,6 +216,7 @@ __all__ = [
     "WanResponse",
     "IWanResponse",
     "IWanMediaResponse",
+    "IWanJob",
     "IWanPolicyData",
     "DialogImageAnalysisMessage",
     "LocationResponse",
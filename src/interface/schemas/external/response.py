@@ -469,6 +469,10 @@ class InstagramUpdateUserResponse(IInstagramResponse):
         str,
         Field(default="Successfull user data updation"),
     ]
+    timings: Annotated[
+        dict[str, float] | None,
+        Field(default=None),
+    ]
 
 
 class InstagramTrackingUserResponse(IInstagramResponse):
@@ -1791,6 +1795,41 @@ class IWanMediaResponse(ISchema):
         )
 
 
+class IWanJob(ISchema):
+    job_id: Annotated[
+        str,
+        Field(...),
+    ]
+    media_id: Annotated[
+        str,
+        Field(...),
+    ]
+    status: Annotated[
+        Literal["generating", "success", "error"],
+        Field(default="generating"),
+    ]
+    url: Annotated[
+        str | None,
+        Field(default=None),
+    ]
+    detail: Annotated[
+        str,
+        Field(default="Success"),
+    ]
+    callback_url: Annotated[
+        str | None,
+        Field(default=None),
+    ]
+    created_at: Annotated[
+        float,
+        Field(...),
+    ]
+    updated_at: Annotated[
+        float,
+        Field(...),
+    ]
+
+
 class LocationResponse(ISchema):
     title: Annotated[
         str,
@@ -19,6 +19,8 @@ from .routers import (
     XimilarRouter,
 )
 
+from .lifespan import app_lifespan
+
 __all__: list[str] = [
     "PixVerseRouter",
     "DashboardRouter",
@@ -36,4 +38,5 @@ __all__: list[str] = [
     "WanRouter",
     "CheaterBusterRouter",
     "XimilarRouter",
+    "app_lifespan",
 ]
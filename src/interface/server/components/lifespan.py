@@ -0,0 +1,56 @@
+# coding utf-8
+
+from typing import (
+    Any,
+    AsyncGenerator,
+)
+
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from ....domain.conf import app_conf
+
+from ....domain.entities.core import IConfEnv
+
+from ....domain.repositories import (
+    AccountScheduler,
+    engine_registry,
+)
+
+from ....domain.tools import (
+    speech_models,
+    CallbackSender,
+)
+
+from ....infrastructure.external.core import HttpClient
+
+
+conf: IConfEnv = app_conf()
+
+
+@asynccontextmanager
+async def app_lifespan(
+    app: FastAPI,
+) -> AsyncGenerator[None, Any]:
+    """Жизненный цикл FastAPI приложения.
+
+    При старте загружает модели распознавания речи из `speech_preload`.
+    При остановке сервиса записывает накопленные счетчики использования
+    аккаунтов, закрывает пуловые HTTP клиенты внешних API и общие пулы
+    соединений с базой данных.
+
+    Args:
+        app (FastAPI): Экземпляр FastAPI приложения
+    """
+    await speech_models.preload(
+        *conf.speech_preload,
+    )
+
+    try:
+        yield
+    finally:
+        await AccountScheduler.flush_all()
+        await HttpClient.close_clients()
+        await CallbackSender.close_clients()
+        await engine_registry.dispose()
@@ -20,6 +20,7 @@ from ....infrastructure.api.routes.v1 import (
     calories_router,
     application_router,
     media_router,
+    metrics_router,
     instagram_router,
     webhook_router,
     product_router,
@@ -67,6 +68,7 @@ class PixVerseRouter(AppRouting):
                 pixverse_template_router,
                 pixverse_application_router,
                 media_router,
+                metrics_router,
                 webhook_router,
                 user_data_router,
             ],
@@ -96,6 +98,7 @@ class ChatGPTRouter(AppRouting):
                 photo_generator_template_router,
                 photo_generator_application_router,
                 media_router,
+                metrics_router,
             ],
         )
 
@@ -132,6 +135,7 @@ class DashboardRouter(AppRouting):
                 user_data_router,
                 application_router,
                 media_router,
+                metrics_router,
                 product_router,
             ],
         )
@@ -149,6 +153,7 @@ class CaloriesRouter(AppRouting):
             routers=[
                 calories_router,
                 media_router,
+                metrics_router,
             ],
         )
 
@@ -165,6 +170,7 @@ class InstagramRouter(AppRouting):
             routers=[
                 instagram_router,
                 media_router,
+                metrics_router,
             ],
         )
 
@@ -181,6 +187,7 @@ class CosmeticRouter(AppRouting):
             routers=[
                 cosmetic_router,
                 media_router,
+                metrics_router,
             ],
         )
 
@@ -198,6 +205,7 @@ class QwenRouter(AppRouting):
                 qwen_router,
                 qwen_account_router,
                 media_router,
+                metrics_router,
             ],
         )
 
@@ -215,6 +223,7 @@ class TopmediaRouter(AppRouting):
                 topmedia_router,
                 topmedia_voice_router,
                 media_router,
+                metrics_router,
             ],
         )
 
@@ -280,6 +289,7 @@ class PikaRouter(AppRouting):
                 pika_account_router,
                 pika_application_router,
                 media_router,
+                metrics_router,
             ],
         )
 
@@ -296,6 +306,7 @@ class WanRouter(AppRouting):
             routers=[
                 wan_router,
                 media_router,
+                metrics_router,
             ],
         )
 
@@ -312,6 +323,7 @@ class CheaterBusterRouter(AppRouting):
             routers=[
                 cheater_buster_router,
                 media_router,
+                metrics_router,
             ],
         )
 
@@ -328,5 +340,6 @@ class XimilarRouter(AppRouting):
             routers=[
                 ximilar_router,
                 media_router,
+                metrics_router,
             ],
         )